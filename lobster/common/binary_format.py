@@ -0,0 +1,671 @@
+#!/usr/bin/env python3
+#
+# LOBSTER - Lightweight Open BMW Software Traceability Evidence Report
+# Copyright (C) 2026 Bayerische Motoren Werke Aktiengesellschaft (BMW AG)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public
+# License along with this program. If not, see
+# <https://www.gnu.org/licenses/>.
+
+# Binary encoding of the LOBSTER interchange and report formats.
+#
+# The encoding represents exactly the same values as the JSON encoding,
+# so every schema can be stored. A file is the MAGIC bytes, one byte
+# format version, and a single value encoded as a sequence of tokens:
+#
+#   NULL, FALSE, TRUE        no payload
+#   INT                      zig-zag varint
+#   FLOAT                    IEEE 754 double, little endian
+#   STRING                   varint index into the string table
+#   NEW_STRING               varint length, UTF-8; appended to the table
+#   LITERAL                  varint length, UTF-8; not added to the table
+#   OBJECT ... END           alternating keys (strings) and values
+#   ARRAY ... END            values and BATCH records
+#   SHAPE                    defines the next shape, see below
+#
+# Runs of objects in an array (i.e. the items) are stored in BATCH
+# records of up to BATCH_SIZE objects. Each object is described by a
+# shape, the sequence of its keys with the kind of their values, which
+# is only written once per file. The values of all objects with the same
+# shape are stored column by column as little endian uint32 words:
+#
+#   BATCH varint rows, new strings, local strings, words, blob bytes
+#         uint32[strings]  length (in characters) of each new string
+#         uint32[words]    shape id per row, then the columns per shape
+#                          in the order of first appearance
+#         blob             the new strings, UTF-8
+#
+# Strings in a batch are referenced by their index in the string table,
+# where index 0 is null. Short strings (namespaces, file names, tags,
+# messages) are added to the table for good, longer ones only for the
+# duration of the batch. This keeps the table small, while repeated
+# strings are stored (and, when reading, allocated) only once.
+
+import json
+import struct
+import sys
+from array import array
+from itertools import islice
+from typing import Any, BinaryIO, Iterator
+
+from lobster.common.exceptions import LOBSTER_Exception
+from lobster.common.json_stream import Streamed_Array, is_streamed
+
+MAGIC          = b"\x89LOB\r\n\x1a\n"
+FORMAT_VERSION = 1
+
+BATCH_SIZE   = 1024
+INTERN_LIMIT = 128
+
+(T_NULL, T_FALSE, T_TRUE, T_INT, T_FLOAT, T_STRING, T_NEW_STRING,
+ T_LITERAL, T_OBJECT, T_ARRAY, T_END, T_BATCH, T_SHAPE) = range(13)
+T_EOF = -1
+
+(C_STRING, C_INT, C_BOOL, C_LIST, C_OBJECT, C_JSON) = range(6)
+
+# Objects with a Streamed_Array member are never stored in a batch
+C_STREAMED = 0xff
+
+# Integers stored in a column must not collide with local string indices
+_LOCAL     = 1 << 31
+_INT_LIMIT = _LOCAL
+
+_FLUSH_SIZE = 64 * 1024
+
+_TAG_START = {
+    T_NULL       : "n",
+    T_FALSE      : "f",
+    T_TRUE       : "t",
+    T_INT        : "0",
+    T_FLOAT      : "0",
+    T_STRING     : '"',
+    T_NEW_STRING : '"',
+    T_LITERAL    : '"',
+    T_OBJECT     : "{",
+    T_ARRAY      : "[",
+    T_EOF        : "",
+}
+
+
+_VALUE_START = {
+    type(None) : "n",
+    str        : '"',
+    dict       : "{",
+    list       : "[",
+}
+
+_CONSTANTS = {
+    T_NULL  : None,
+    T_FALSE : False,
+    T_TRUE  : True,
+}
+
+
+def _value_start(value) -> str:
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    return _VALUE_START.get(value.__class__, "0")
+
+
+class Binary_Format_Error(LOBSTER_Exception):
+    def __init__(self, message: str, offset: int):
+        super().__init__(f"malformed binary LOBSTER data at byte {offset}: "
+                         f"{message}")
+        self.offset = offset
+
+
+def _to_words(data: bytes) -> array:
+    words = array("I")
+    words.frombytes(data)
+    if sys.byteorder == "big":
+        words.byteswap()
+    return words
+
+
+def _from_words(words: array) -> bytes:
+    if sys.byteorder == "big":
+        words = array("I", words)
+        words.byteswap()
+    return words.tobytes()
+
+
+_SIMPLE_KINDS = {
+    str        : C_STRING,
+    type(None) : C_STRING,
+    bool       : C_BOOL,
+    dict       : C_OBJECT,
+    float      : C_JSON,
+}
+
+
+def _column_kind(value) -> int:
+    kind = _SIMPLE_KINDS.get(value.__class__)
+    if kind is not None:
+        return kind
+
+    if isinstance(value, Streamed_Array):
+        kind = C_STREAMED
+    elif isinstance(value, bool):
+        kind = C_BOOL
+    elif isinstance(value, int):
+        kind = C_INT if 0 <= value < _INT_LIMIT else C_JSON
+    elif isinstance(value, str):
+        kind = C_STRING
+    elif isinstance(value, list):
+        if all(element is None or isinstance(element, str)
+               for element in value):
+            kind = C_LIST
+        else:
+            kind = C_JSON
+    elif isinstance(value, dict):
+        kind = C_OBJECT
+    else:
+        kind = C_JSON
+    return kind
+
+
+def _shape(row: dict) -> tuple:
+    return tuple(zip(row, map(_column_kind, row.values())))
+
+
+def _is_streamed_row(row: dict, shape: tuple) -> bool:
+    return any(kind == C_STREAMED or
+               (kind == C_OBJECT and is_streamed(row[key]))
+               for key, kind in shape)
+
+
+class Binary_Writer:
+    def __init__(self, fd: BinaryIO):
+        self._fd      = fd
+        self._out     = bytearray(MAGIC)
+        self._strings = {None: 0}
+        self._shapes  = {}
+        self._shape_list = []
+        self._out.append(FORMAT_VERSION)
+
+    def _flush(self, force: bool = False):
+        if force or len(self._out) >= _FLUSH_SIZE:
+            self._fd.write(self._out)
+            self._out = bytearray()
+
+    @staticmethod
+    def _varint(out: bytearray, value: int):
+        while value >= 0x80:
+            out.append((value & 0x7f) | 0x80)
+            value >>= 7
+        out.append(value)
+
+    def _write_string(self, out: bytearray, value: str):
+        index = self._strings.get(value)
+        if index is not None:
+            out.append(T_STRING)
+            self._varint(out, index)
+            return
+
+        if len(value) <= INTERN_LIMIT:
+            self._strings[value] = len(self._strings)
+            out.append(T_NEW_STRING)
+        else:
+            out.append(T_LITERAL)
+        data = value.encode("UTF-8", "surrogatepass")
+        self._varint(out, len(data))
+        out += data
+
+    def write(self, value: Any):
+        """Encode value, which may contain Streamed_Array members."""
+        out = self._out
+        if value is None:
+            out.append(T_NULL)
+        elif value is True:
+            out.append(T_TRUE)
+        elif value is False:
+            out.append(T_FALSE)
+        elif isinstance(value, int):
+            out.append(T_INT)
+            self._varint(out, value * 2 if value >= 0 else -value * 2 - 1)
+        elif isinstance(value, float):
+            out.append(T_FLOAT)
+            out += struct.pack("<d", value)
+        elif isinstance(value, str):
+            self._write_string(out, value)
+        elif isinstance(value, dict):
+            out.append(T_OBJECT)
+            for key, member in value.items():
+                self._write_string(self._out, key)
+                self.write(member)
+            self._out.append(T_END)
+        elif isinstance(value, (list, tuple, Streamed_Array)):
+            self._write_array(value.elements
+                              if isinstance(value, Streamed_Array)
+                              else value)
+        else:
+            raise TypeError(f"Object of type {value.__class__.__name__} "
+                            f"is not JSON serializable")
+        self._flush()
+
+    def _write_array(self, elements):
+        self._out.append(T_ARRAY)
+        rows   = []
+        shapes = []
+        for element in elements:
+            if isinstance(element, dict):
+                shape = _shape(element)
+                if not _is_streamed_row(element, shape):
+                    rows.append(element)
+                    shapes.append(shape)
+                    if len(rows) == BATCH_SIZE:
+                        self._write_batch(rows, shapes)
+                        rows   = []
+                        shapes = []
+                    continue
+            if rows:
+                self._write_batch(rows, shapes)
+                rows   = []
+                shapes = []
+            self.write(element)
+        if rows:
+            self._write_batch(rows, shapes)
+        self._out.append(T_END)
+
+    def _register_shapes(self, rows, shapes, shape_ids: dict,
+                         shapes_out: bytearray):
+        # Shapes are written before the batch, so their keys have to be
+        # added to the string table before any string of the batch
+        for row, shape in zip(rows, shapes):
+            for key, kind in shape:
+                if kind == C_OBJECT:
+                    member = row[key]
+                    self._register_shapes((member,), (_shape(member),),
+                                          shape_ids, shapes_out)
+            shape_id = self._shapes.get(shape)
+            if shape_id is None:
+                shape_id = self._shapes[shape] = len(self._shapes)
+                self._shape_list.append(shape)
+                shapes_out.append(T_SHAPE)
+                self._varint(shapes_out, len(shape))
+                for key, kind in shape:
+                    self._write_string(shapes_out, key)
+                    shapes_out.append(kind)
+            shape_ids[id(row)] = shape_id
+
+    def _encode_rows(self, rows, shape_ids: dict, words: array, ref):
+        groups = {}
+        for row in rows:
+            shape_id = shape_ids[id(row)]
+            words.append(shape_id)
+            groups.setdefault(shape_id, []).append(row)
+
+        for shape_id, group in groups.items():
+            for key, kind in self._shape_list[shape_id]:
+                column = [row[key] for row in group]
+                if kind == C_STRING:
+                    words.extend(map(ref, column))
+                elif kind == C_LIST:
+                    words.extend(map(len, column))
+                    for value in column:
+                        words.extend(map(ref, value))
+                elif kind == C_OBJECT:
+                    self._encode_rows(column, shape_ids, words, ref)
+                elif kind == C_JSON:
+                    words.extend(ref(json.dumps(value)) for value in column)
+                else:
+                    words.extend(map(int, column))
+
+    def _write_batch(self, rows, shapes):
+        new_strings   = []
+        local_strings = {}
+
+        def ref(value):
+            index = self._strings.get(value)
+            if index is None:
+                if len(value) <= INTERN_LIMIT:
+                    index = self._strings[value] = len(self._strings)
+                    new_strings.append(value)
+                else:
+                    index = local_strings.setdefault(
+                        value, _LOCAL | len(local_strings))
+            return index
+
+        shapes_out = bytearray()
+        shape_ids  = {}
+        self._register_shapes(rows, shapes, shape_ids, shapes_out)
+        words = array("I")
+        self._encode_rows(rows, shape_ids, words, ref)
+
+        # Local strings follow the string table as it is after the batch
+        if local_strings:
+            base  = len(self._strings) - _LOCAL
+            words = array("I", [word if word < _LOCAL else word + base
+                                for word in words])
+
+        strings = new_strings + list(local_strings)
+        blob    = "".join(strings).encode("UTF-8", "surrogatepass")
+
+        out = self._out
+        out += shapes_out
+        out.append(T_BATCH)
+        for count in (len(rows), len(new_strings), len(local_strings),
+                      len(words), len(blob)):
+            self._varint(out, count)
+        out += _from_words(array("I", map(len, strings)))
+        out += _from_words(words)
+        out += blob
+
+    def close(self):
+        self._flush(force=True)
+
+
+class Binary_Stream_Reader:
+    """Incremental decoder for the binary encoding.
+
+    It provides the same interface as json_stream.JSON_Stream_Reader, so
+    code walking a document works with either encoding. Objects stored in
+    a batch are decoded together and then handed out one by one.
+    """
+    def __init__(self, fd: BinaryIO):
+        self._fd       = fd
+        self._offset   = 0
+        self._table    = [None]
+        self._shapes   = []
+        self._tag      = None
+        self._consumed = 0
+
+        # Values decoded ahead of time (the rows of a batch). The head is
+        # treated as if it was the next token.
+        self._pending  = []
+
+        if self._read(len(MAGIC)) != MAGIC:
+            raise Binary_Format_Error("not a binary LOBSTER file", 0)
+        version = self._read(1)[0]
+        if version != FORMAT_VERSION:
+            raise Binary_Format_Error(
+                f"format version {version} is not supported", len(MAGIC))
+
+    def _error(self, message: str) -> Binary_Format_Error:
+        return Binary_Format_Error(message, self._offset)
+
+    def _read(self, count: int) -> bytes:
+        data = self._fd.read(count)
+        if len(data) < count:
+            raise self._error("unexpected end of file")
+        self._offset += count
+        return data
+
+    def _varint(self) -> int:
+        value = 0
+        shift = 0
+        while True:
+            byte = self._read(1)[0]
+            value |= (byte & 0x7f) << shift
+            if byte < 0x80:
+                return value
+            shift += 7
+
+    def _next_tag(self) -> int:
+        while self._tag is None:
+            data = self._fd.read(1)
+            if not data:
+                self._tag = T_EOF
+                break
+            self._offset += 1
+            if data[0] == T_SHAPE:
+                self._read_shape()
+            else:
+                self._tag = data[0]
+        return self._tag
+
+    def _take_tag(self) -> int:
+        tag = self._next_tag()
+        self._tag = None
+        self._consumed += 1
+        return tag
+
+    def _read_string(self, tag: int) -> str:
+        if tag == T_STRING:
+            index = self._varint()
+            if not 0 < index < len(self._table):
+                raise self._error(f"invalid string index {index}")
+            return self._table[index]
+        if tag in (T_NEW_STRING, T_LITERAL):
+            value = self._read(self._varint()).decode("UTF-8", "surrogatepass")
+            if tag == T_NEW_STRING:
+                self._table.append(value)
+            return value
+        raise self._error("expected a string")
+
+    def _read_shape(self):
+        shape = []
+        for _ in range(self._varint()):
+            key  = self._read_string(self._read(1)[0])
+            kind = self._read(1)[0]
+            if kind > C_JSON:
+                raise self._error(f"invalid column kind {kind}")
+            shape.append((key, kind))
+        self._shapes.append(tuple(shape))
+
+    def peek(self) -> str:
+        """Return the character the JSON encoding of the next value would
+           start with, or '' at the end of the file."""
+        if self._pending:
+            return _value_start(self._pending[-1])
+        return _TAG_START.get(self._next_tag(), "?")
+
+    def read_value(self) -> Any:
+        """Decode the complete value at the current position."""
+        if self._pending:
+            self._consumed += 1
+            return self._pending.pop()
+
+        tag = self._take_tag()
+        if tag in _CONSTANTS:
+            return _CONSTANTS[tag]
+        if tag in (T_INT, T_FLOAT):
+            return self._read_number(tag)
+        if tag in (T_STRING, T_NEW_STRING, T_LITERAL):
+            return self._read_string(tag)
+        if tag == T_OBJECT:
+            self._tag = tag
+            self._consumed -= 1
+            return {key: self.read_value() for key in self.iter_object()}
+        if tag == T_ARRAY:
+            self._tag = tag
+            self._consumed -= 1
+            return list(self.iter_array())
+        raise self._error("unexpected end of file" if tag == T_EOF
+                          else f"unexpected token {tag}")
+
+    def skip_value(self):
+        """Skip the value at the current position.
+
+        New strings add to the string table, so the value is decoded
+        all the same.
+        """
+        self.read_value()
+
+    def _read_number(self, tag: int):
+        if tag == T_FLOAT:
+            return struct.unpack("<d", self._read(8))[0]
+        value = self._varint()
+        return value >> 1 if not value & 1 else -((value + 1) >> 1)
+
+    def iter_object(self) -> Iterator[str]:
+        """Walk the object at the current position, yielding its keys.
+
+        After each key the caller must consume the member value. A value
+        that was not consumed is decoded and discarded.
+        """
+        if self._pending:
+            value = self._pending.pop()
+            if not isinstance(value, dict):
+                raise self._error("expected an object")
+            for key, member in value.items():
+                self._pending.append(member)
+                mark = len(self._pending)
+                yield key
+                if len(self._pending) == mark:
+                    self._pending.pop()
+            return
+
+        if self._take_tag() != T_OBJECT:
+            raise self._error("expected an object")
+        while self._next_tag() != T_END:
+            key = self._read_string(self._take_tag())
+            mark = self._consumed
+            yield key
+            if self._consumed == mark:
+                self.read_value()
+        self._take_tag()
+
+    def iter_array(self, decode: bool = True) -> Iterator[Any]:
+        """Walk the array at the current position, yielding its elements
+           one at a time.
+
+        If decode is False, None is yielded for each element instead, and
+        the caller consumes the element just like a member value in
+        iter_object.
+        """
+        if self._pending:
+            value = self._pending.pop()
+            if not isinstance(value, list):
+                raise self._error("expected an array")
+            yield from self._iter_decoded(value, decode)
+            return
+
+        if self._take_tag() != T_ARRAY:
+            raise self._error("expected an array")
+        while True:
+            tag = self._next_tag()
+            if tag == T_END:
+                self._take_tag()
+                return
+            if tag == T_BATCH:
+                self._take_tag()
+                yield from self._iter_decoded(self._read_batch(), decode)
+            elif decode:
+                yield self.read_value()
+            else:
+                mark = self._consumed
+                yield None
+                if self._consumed == mark:
+                    self.read_value()
+
+    def _iter_decoded(self, elements: list, decode: bool) -> Iterator[Any]:
+        for element in elements:
+            if decode:
+                self._consumed += 1
+                yield element
+            else:
+                self._pending.append(element)
+                mark = len(self._pending)
+                yield None
+                if len(self._pending) == mark:
+                    self._pending.pop()
+
+    def finish(self):
+        """Check that nothing follows the document."""
+        if self._pending or self._next_tag() != T_EOF:
+            raise self._error("trailing data after document")
+
+    def _read_batch(self) -> list:
+        rows, new_count, local_count, word_count, blob_size = \
+            (self._varint() for _ in range(5))
+        string_count = new_count + local_count
+        words = _to_words(self._read(4 * (string_count + word_count)))
+        blob  = self._read(blob_size).decode("UTF-8", "surrogatepass")
+
+        strings = []
+        start   = 0
+        for length in words[:string_count]:
+            strings.append(blob[start:start + length])
+            start += length
+        if start != len(blob):
+            raise self._error("inconsistent string lengths in batch")
+
+        table = self._table
+        table.extend(strings[:new_count])
+        mark = len(table)
+        table.extend(strings[new_count:])
+        try:
+            values, end = self._decode_rows(words, string_count, rows)
+        except (IndexError, KeyError, ValueError, TypeError) as err:
+            raise self._error(f"malformed batch ({err})") from None
+        finally:
+            del table[mark:]
+        if end != len(words):
+            raise self._error("inconsistent batch size")
+        return values
+
+    def _decode_rows(self, words: array, pos: int, count: int):
+        shape_ids = words[pos:pos + count]
+        pos += count
+
+        get = self._table.__getitem__
+        groups = {}
+        for shape_id in dict.fromkeys(shape_ids):
+            shape = self._shapes[shape_id]
+            size  = shape_ids.count(shape_id)
+            columns = []
+            for _, kind in shape:
+                if kind == C_STRING:
+                    column = list(map(get, words[pos:pos + size]))
+                    pos += size
+                elif kind == C_LIST:
+                    lengths = words[pos:pos + size]
+                    pos += size
+                    total = sum(lengths)
+                    flat = iter(list(map(get, words[pos:pos + total])))
+                    pos += total
+                    column = [list(islice(flat, length)) if length else []
+                              for length in lengths]
+                elif kind == C_OBJECT:
+                    column, pos = self._decode_rows(words, pos, size)
+                elif kind == C_JSON:
+                    column = [json.loads(get(word))
+                              for word in words[pos:pos + size]]
+                    pos += size
+                elif kind == C_BOOL:
+                    column = [word == 1 for word in words[pos:pos + size]]
+                    pos += size
+                else:
+                    column = words[pos:pos + size].tolist()
+                    pos += size
+                columns.append(column)
+
+            keys = [key for key, _ in shape]
+            if keys:
+                groups[shape_id] = [dict(zip(keys, values))
+                                    for values in zip(*columns)]
+            else:
+                groups[shape_id] = [{} for _ in range(size)]
+
+        if len(groups) == 1:
+            return groups.popitem()[1], pos
+        iterators = {shape_id: iter(values)
+                     for shape_id, values in groups.items()}
+        return [next(iterators[shape_id]) for shape_id in shape_ids], pos
+
+
+def dump(value: Any, fd: BinaryIO):
+    """Write value to the binary file fd, expanding Streamed_Array
+       members incrementally."""
+    writer = Binary_Writer(fd)
+    writer.write(value)
+    writer.close()
+
+
+def load(fd: BinaryIO) -> Any:
+    """Read a complete value from the binary file fd."""
+    reader = Binary_Stream_Reader(fd)
+    value = reader.read_value()
+    reader.finish()
+    return value
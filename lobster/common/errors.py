@@ -74,3 +74,29 @@ class Message_Handler:
         assert isinstance(message, str)
 
         self.emit(location, "warning", message)
+
+
+class Message_Recorder(Message_Handler):
+    """Message handler that records messages instead of printing them,
+       e.g. in a worker process, so that they can be replayed later."""
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, location, severity, message):
+        assert isinstance(location, Location)
+        assert severity in ("warning", "lex error", "error")
+        assert isinstance(message, str)
+
+        if severity == "warning":
+            self.warnings += 1
+        else:
+            self.errors += 1
+
+        self.messages.append((location, severity, message))
+
+    def replay(self, mh):
+        """Emit all recorded messages to mh, in order."""
+        assert isinstance(mh, Message_Handler)
+        for location, severity, message in self.messages:
+            mh.emit(location, severity, message)
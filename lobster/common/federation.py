@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+#
+# lobster_diff - Compare two LOBSTER reports
+# Copyright (C) 2026 Bayerische Motoren Werke Aktiengesellschaft (BMW AG)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public
+# License along with this program. If not, see
+# <https://www.gnu.org/licenses/>.
+
+# The data a report needs to be merged with those of other components,
+# see lobster.common.merge.
+#
+# The references of each report are resolved within its component only;
+# references to the items of other components gave errors. A report
+# written with mergeable records, for each item with such errors, the
+# tracing targets as read from the source and the number of messages
+# before references were resolved (see Report.resolve_references), and
+# for each item the number of messages its status gave. All report
+# formats hold them as the member "mergeable", see mergeable_data and
+# parse_mergeable.
+
+from lobster.common.location import Location
+
+
+def mergeable_data(report) -> dict:
+    """Return the member "mergeable" of report when written to a file."""
+    # Both in item order, whatever order they were recorded in
+    assert report.mergeable
+    return {name: {key: recorded[key] for key in report.items
+                   if key in recorded}
+            for name, recorded in (("unresolved", report.unresolved),
+                                   ("status_messages",
+                                    report.status_messages))}
+
+
+def parse_mergeable(report, data: dict, loc: Location):
+    """Set what report records for a merge from the member "mergeable"
+       of the loaded data; without it, the report is not mergeable."""
+    mergeable        = data.get("mergeable")
+    report.mergeable = mergeable is not None
+    if not report.mergeable:
+        return
+    if not isinstance(mergeable, dict) or \
+       not isinstance(mergeable.get("unresolved"), dict) or \
+       not all(isinstance(entry, dict) and
+               isinstance(entry.get("refs"), list) and
+               all(isinstance(ref, str) for ref in entry["refs"]) and
+               isinstance(entry.get("messages"), int)
+               for entry in mergeable["unresolved"].values()) or \
+       not isinstance(mergeable.get("status_messages"), dict) or \
+       not all(isinstance(count, int)
+               for count in mergeable["status_messages"].values()):
+        report.mh.error(loc, "mergeable is not an object with unresolved "
+                             "and status_messages")
+    report.unresolved      = mergeable["unresolved"]
+    report.status_messages = mergeable["status_messages"]
@@ -0,0 +1,409 @@
+#!/usr/bin/env python3
+#
+# LOBSTER - Lightweight Open BMW Software Traceability Evidence Report
+# Copyright (C) 2026 Bayerische Motoren Werke Aktiengesellschaft (BMW AG)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public
+# License along with this program. If not, see
+# <https://www.gnu.org/licenses/>.
+
+
+# Incremental update of a report, for lobster-report --incremental.
+#
+# Next to the report, the state file records for each source of the
+# lobster.conf file a digest of its content, and for each of its items
+# the key, the tracing targets given in the source and the number of
+# messages it came with. An update only reads the sources that changed.
+# Everything else is taken from the previous report, except for items
+# whose links may have changed: the items of changed sources, the items
+# tracing to any of those (old or new), and the items any of those trace
+# to. For these the raw item is rebuilt from the report and the state,
+# and the references and status are computed as in a full build. The
+# coverage is updated by subtracting the old and adding the new status
+# of these items.
+#
+# Whenever the update could differ from a full build (no or outdated
+# state, a changed policy, duplicate items, errors while reading, or a
+# previous report without what a mergeable one needs) it falls back to
+# one.
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from lobster.common import binary_format, json_backend
+from lobster.common.errors import LOBSTER_Error, Message_Recorder
+from lobster.common.io import file_digest, iter_lobster_items
+from lobster.common.item_store import Lazy_Item
+from lobster.common.items import (Tracing_Status, Tracing_Tag,
+                                  compile_policy, level_bits)
+from lobster.common.parser import load as load_config
+from lobster.common.report import Coverage, Report, item_key
+from lobster.common.source_cache import Source_Cache
+from lobster.common.version import LOBSTER_VERSION
+
+STATE_SUFFIX  = ".state"
+STATE_SCHEMA  = "lobster-report-state"
+STATE_VERSION = 1
+
+_OK_STATUSES = (Tracing_Status.OK, Tracing_Status.JUSTIFIED)
+
+
+def state_file_for(report_file: str) -> str:
+    return report_file + STATE_SUFFIX
+
+
+@dataclass
+class Source_State:
+    file     : str
+    level    : str
+    info     : Dict[str, Any]
+    digest   : Optional[str]
+    # False if reading the source gave messages; it is then read again
+    clean    : bool
+    keys     : List[str]
+    refs     : List[List[str]]
+    messages : List[int]
+
+    def to_json(self) -> dict:
+        return {"file"     : self.file,
+                "level"    : self.level,
+                "info"     : self.info,
+                "digest"   : self.digest,
+                "clean"    : self.clean,
+                "keys"     : self.keys,
+                "refs"     : self.refs,
+                "messages" : self.messages}
+
+    @classmethod
+    def from_json(cls, data: dict) -> "Source_State":
+        return cls(**{name: data[name] for name in (
+            "file", "level", "info", "digest", "clean", "keys", "refs",
+            "messages")})
+
+
+class Incremental_State:
+    """The sources of a report, as recorded by Report.parse_config."""
+    def __init__(self, trust_inputs: bool = False):
+        self.trust_inputs = trust_inputs
+        self.sources      = []
+        # Digest of the report file the state belongs to
+        self.report       = None
+
+    def add_source(self, job, items, clean: bool,
+                   digest: Optional[str] = None):
+        """Record a source (as file, level, source info and trust_inputs)
+           and its items, before their references are resolved."""
+        file_name, level, info, _ = job
+        self.sources.append(Source_State(
+            file     = file_name,
+            level    = level,
+            info     = info,
+            digest   = digest if digest else file_digest(file_name),
+            clean    = clean,
+            keys     = [item.tag.key() for item in items],
+            refs     = [[tag.to_json() for tag in item.unresolved_references]
+                        for item in items],
+            messages = [len(item.messages) for item in items]))
+
+    def save(self, report_file: str):
+        """Write the state for report_file, which must have been written
+           already, next to it."""
+        self.report = file_digest(report_file)
+        with open(state_file_for(report_file), "wb") as fd:
+            binary_format.dump({
+                "schema"       : STATE_SCHEMA,
+                "version"      : STATE_VERSION,
+                "generator"    : LOBSTER_VERSION,
+                "trust_inputs" : self.trust_inputs,
+                "report"       : self.report,
+                "sources"      : [source.to_json()
+                                  for source in self.sources],
+            }, fd)
+
+    @classmethod
+    def load(cls, report_file: str) -> Optional["Incremental_State"]:
+        """Return the state of report_file, or None if there is none or
+           it does not belong to the report as it is now."""
+        try:
+            with open(state_file_for(report_file), "rb") as fd:
+                data = binary_format.load(fd)
+            if (data["schema"], data["version"], data["generator"]) != \
+               (STATE_SCHEMA, STATE_VERSION, LOBSTER_VERSION):
+                return None
+            state = cls(data["trust_inputs"])
+            state.report  = data["report"]
+            state.sources = [Source_State.from_json(source)
+                             for source in data["sources"]]
+        except (OSError, binary_format.Binary_Format_Error, KeyError,
+                TypeError):
+            return None
+        if state.report is None or state.report != file_digest(report_file):
+            return None
+        return state
+
+
+@dataclass
+class Update_Result:
+    report       : Report
+    state        : Incremental_State
+    # True if the report was built from scratch
+    full_build   : bool
+    read_sources : int
+    recomputed   : int
+
+
+def _full_build(config_file, trust_inputs, jobs, cache) -> Update_Result:
+    report = Report()
+    state  = Incremental_State(trust_inputs)
+    report.parse_config(config_file, trust_inputs, jobs=jobs, cache=cache,
+                        state=state)
+    return Update_Result(report, state, True, len(state.sources),
+                         len(report.items))
+
+
+def _read_changed_source(job, cache):
+    # Return the items of a source and the messages reading it gave
+    file_name, level, info, trust_inputs = job
+    key   = cache.key(*job) if cache else None
+    entry = cache.load(key) if key else None
+    if entry is not None:
+        kind, data = entry
+        items = list(kind.from_json_many(level, data, 3)) if kind else []
+        return items, Message_Recorder()
+
+    recorder = Message_Recorder()
+    items = list(iter_lobster_items(recorder, file_name, level, info,
+                                    trust_inputs=trust_inputs))
+    if key and not recorder.messages:
+        cache.store(key, type(items[0]) if items else None,
+                    [item.to_json() for item in items])
+    return items, recorder
+
+
+def _raw_item(previous, source: Source_State, index: int):
+    # Rebuild an unchanged item as it was read from its source, from the
+    # previous report and the state
+    lazy = previous.items[source.keys[index]]
+    data = dict(lazy.to_json())
+    for name in ("ref_up", "ref_down", "tracing_status"):
+        data.pop(name, None)
+    data["messages"] = data["messages"][:source.messages[index]]
+    if source.refs[index]:
+        data["refs"] = source.refs[index]
+    item, = lazy.__class__.from_json_many(source.level, (data,), 3)
+    return item
+
+
+def _tag_of(item) -> Tracing_Tag:
+    # The tag of an item, without building it if it is a Lazy_Item
+    if isinstance(item, Lazy_Item) and not item.is_materialized:
+        return Tracing_Tag.from_json(item.to_json()["tag"])
+    return item.tag
+
+
+def update_report(config_file: str, report_file: str,
+                  trust_inputs: bool = False, *, jobs: int = 1,
+                  cache: Optional[Source_Cache] = None,
+                  mergeable: bool = False) -> Update_Result:
+    """Build the report for config_file, reusing report_file (the report
+       written for it before, with its state file) as far as possible.
+
+    The result is always the same as that of Report.parse_config. Only
+    a full build reads the sources with several processes (jobs); the
+    cache is used in both cases. If the result is to be written with
+    mergeable, so must report_file have been.
+    """
+    result = _update(config_file, report_file, trust_inputs, cache,
+                     mergeable)
+    if result is None:
+        result = _full_build(config_file, trust_inputs, jobs, cache)
+    elif cache is not None:
+        cache.evict()
+    return result
+
+
+def _read_changes(jobs, state, cache):
+    # Read the changed sources, and return the new state, each source
+    # with its items (None if unchanged) and the keys of all items of
+    # changed sources, old and new. Any message means going the safe
+    # way: a full build reports them in the right order.
+    new_state = Incremental_State(state.trust_inputs)
+    sources   = []
+    changed   = set()
+    for job, old in zip(jobs, state.sources):
+        digest = file_digest(job[0])
+        if old.clean and digest is not None and digest == old.digest:
+            new_state.sources.append(old)
+            sources.append((old, None))
+            continue
+        try:
+            items, recorder = _read_changed_source(job, cache)
+        except LOBSTER_Error:
+            return None
+        if recorder.messages:
+            return None
+        new_state.add_source(job, items, True, digest)
+        sources.append((new_state.sources[-1], items))
+        changed.update(old.keys)
+        changed.update(new_state.sources[-1].keys)
+    return new_state, sources, changed
+
+
+def _update(config_file, report_file, trust_inputs, cache, mergeable):
+    # Update the report, or return None if a full build is needed
+    state = Incremental_State.load(report_file)
+    if state is None or state.trust_inputs != trust_inputs:
+        return None
+
+    report = Report()
+    report.config = load_config(report.mh, config_file)
+    jobs = [(source["file"], level, source, trust_inputs)
+            for level in report.config
+            for source in report.config[level].source]
+    if [(job[0], job[1], job[2]) for job in jobs] != \
+       [(old.file, old.level, old.info) for old in state.sources]:
+        return None
+
+    previous = Report()
+    previous.load_report(report_file, lazy=True, trust_inputs=True)
+    policy = json_backend.loads(json_backend.dumps_compact(
+        {key: value.to_json() for key, value in report.config.items()}))
+    if mergeable and not previous.mergeable or \
+       list(previous.config) != list(report.config) or policy != {
+            key: value.to_json() for key, value in previous.config.items()}:
+        return None
+
+    changes = _read_changes(jobs, state, cache)
+    if changes is None:
+        return None
+    new_state, sources, changed = changes
+
+    # All items in order, the unchanged ones as in the previous report
+    for source, items in sources:
+        if items is None:
+            for key in source.keys:
+                report.items[key] = previous.items[key]
+        else:
+            for item in items:
+                if item.tag.key() in report.items:
+                    return None
+                report.items[item.tag.key()] = item
+
+    # Items whose links may have changed
+    affected = set(changed)
+    for old in state.sources:
+        for key, refs in zip(old.keys, old.refs):
+            if key in changed:
+                affected.update(map(item_key, refs))
+    for source, items in sources:
+        if items is None:
+            for key, refs in zip(source.keys, source.refs):
+                if not changed.isdisjoint(map(item_key, refs)):
+                    affected.add(key)
+        else:
+            for refs in source.refs:
+                affected.update(map(item_key, refs))
+    affected.intersection_update(report.items)
+
+    # Coverage by delta: remove the old status of everything recomputed
+    # or gone
+    report.coverage = {level: Coverage(level=level,
+                                       items=coverage.items,
+                                       ok=coverage.ok,
+                                       coverage=None)
+                       for level, coverage in previous.coverage.items()}
+    for key in affected.union(changed):
+        item = previous.items.get(key)
+        if item is not None:
+            report.coverage[item.level].items -= 1
+            if item.tracing_status in _OK_STATUSES:
+                report.coverage[item.level].ok -= 1
+
+    # Rebuild the affected unchanged items as read from their source
+    for source, items in sources:
+        if items is None:
+            for index, key in enumerate(source.keys):
+                if key in affected:
+                    report.items[key] = _raw_item(previous, source, index)
+
+    # References, in the order of a full build
+    ref_down = {key: [] for key in affected}
+    for source, _ in sources:
+        for key, refs in zip(source.keys, source.refs):
+            targets = affected.intersection(map(item_key, refs))
+            if targets:
+                tag = _tag_of(report.items[key])
+                for target in targets:
+                    ref_down[target].append(tag)
+
+    policies = compile_policy(report.config)
+    bits     = level_bits(report.config)
+    for key, item in report.items.items():
+        if key not in affected:
+            continue
+        report.resolve_references(item)
+        item.ref_down = ref_down[key]
+        mask = 0
+        for tag in item.ref_down:
+            mask |= bits[report.items[tag.key()].level]
+        policies[item.level].determine_statuses((item,), (mask,),
+                                                report.status_messages)
+        report.coverage[item.level].items += 1
+        if item.tracing_status in _OK_STATUSES:
+            report.coverage[item.level].ok += 1
+    report.compute_coverage_for_items()
+
+    # Unresolved references and status messages of the items not
+    # recomputed are unchanged
+    report.mergeable = previous.mergeable
+    for recorded, old in ((report.unresolved, previous.unresolved),
+                          (report.status_messages,
+                           previous.status_messages)):
+        for key, value in old.items():
+            if key in report.items and key not in affected:
+                recorded[key] = value
+
+    # The suggestions depend on all keys, so they are always found again
+    report.unknown_targets = {item_key(ref)
+                              for source in new_state.sources
+                              for refs in source.refs
+                              for ref in refs}.difference(report.items)
+    report.suggest_tracing_targets()
+
+    return Update_Result(report, new_state, False,
+                         sum(items is not None for _, items in sources),
+                         len(affected))
+
+
+def first_difference(report: Report, other: Report) -> Optional[str]:
+    """Return a description of the first difference between the content
+       of two reports, or None if they would be written the same."""
+    if list(report.config) != list(other.config):
+        return "levels differ"
+    for name, level in report.config.items():
+        if level.to_json() != other.config[name].to_json():
+            return f"policy of level {name} differs"
+        if report.coverage[name].coverage != other.coverage[name].coverage:
+            return f"coverage of level {name} differs"
+    if list(report.items) != list(other.items):
+        return "items or their order differ"
+    mergeable = report.mergeable and other.mergeable
+    for key, item in report.items.items():
+        if item.to_json() != other.items[key].to_json() or \
+           mergeable and (
+               report.unresolved.get(key) != other.unresolved.get(key) or
+               report.status_messages.get(key) !=
+               other.status_messages.get(key)):
+            return f"item {key} differs"
+    return None if report.suggestions == other.suggestions else \
+        "suggestions differ"
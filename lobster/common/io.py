@@ -17,26 +17,49 @@
 # License along with this program. If not, see
 # <https://www.gnu.org/licenses/>.
 
+import bz2
+import gzip
+import hashlib
+import lzma
 import os
 import json
-from typing import Dict, Optional, Sequence, TextIO, Type, Union, Iterable
+from contextlib import contextmanager
+from io import TextIOWrapper
+from typing import (Any, Dict, IO, Iterator, Optional, Sequence, Type, Union,
+                    Iterable)
 
-from lobster.common.errors import Message_Handler
+from lobster.common.errors import LOBSTER_Error, Message_Handler, \
+    Message_Recorder
+from lobster.common import binary_format, json_backend, json_stream
+from lobster.common.binary_format import Binary_Format_Error, \
+    Binary_Stream_Reader
+from lobster.common.json_stream import JSON_Stream_Reader, Streamed_Array
 from lobster.common.location import File_Reference
-from lobster.common.items import Requirement, Implementation, Activity
+from lobster.common.items import Item, Requirement, Implementation, Activity
 
 
 def lobster_write(
-        fd: TextIO,
+        fd: IO,
         kind: Union[Type[Requirement], Type[Implementation], Type[Activity]],
         generator: str,
         items: Iterable,
-):
-    if not all(isinstance(item, kind) for item in items):
-        raise ValueError(
-            f"All elements in 'items' must be of the type {kind.__name__}!",
-        )
+        *,
+        binary: bool = False,
+        compact: bool = False,
+        content_header: bool = False,
+) -> int:
+    """Write items in the LOBSTER interchange format to fd.
 
+    The items are serialized one by one as they are taken from the
+    iterable, so generators are fine and no list of all items is built.
+    If binary is True, fd must be opened in binary mode and the items are
+    written in the binary encoding instead of JSON. If compact is True,
+    the JSON is written without indentation and optional whitespace.
+    If content_header is True, the document starts with a header holding
+    the item count and content_digest of the data (see
+    read_content_header); the items are then collected in memory first.
+    Returns the number of items written.
+    """
     if kind is Requirement:
         schema  = "lobster-req-trace"
         version = 4
@@ -47,33 +70,348 @@ def lobster_write(
         schema  = "lobster-act-trace"
         version = 3
 
-    data = {"data"      : list(x.to_json() for x in items),
-            "generator" : generator,
-            "schema"    : schema,
-            "version"   : version}
-    json.dump(data, fd, indent=2)
-    fd.write("\n")
+    count = 0
 
+    def serialize():
+        nonlocal count
+        for item in items:
+            if not isinstance(item, kind):
+                raise ValueError(
+                    f"All elements in 'items' must be of the type "
+                    f"{kind.__name__}!",
+                )
+            count += 1
+            yield item.to_json()
 
-def lobster_read(
-        mh,
-        filename: str,
-        level: str,
-        items: Dict[str, Union[Activity, Implementation, Requirement]],
-        source_info: Optional[Dict] = None,
-):
-    loc = File_Reference(filename)
+    rows = serialize()
+    data = {}
+    if content_header:
+        rows = list(rows)
+        data["content"] = content_header_for(count, rows)
+    data.update({"data"      : Streamed_Array(rows, plain=True),
+                 "generator" : generator,
+                 "schema"    : schema,
+                 "version"   : version})
+    write_document(fd, data, binary, compact)
+    return count
+
+
+def content_digest(payload: Any) -> str:
+    """Return a digest of payload, which may contain Streamed_Array
+       members.
+
+    The digest is computed over the compact JSON encoding, so it only
+    depends on the value: the same items give the same digest whether
+    the file is indented, compact, binary or compressed.
+    """
+    digest = hashlib.sha256()
+    for chunk in json_stream.iter_encode(payload, separators=(",", ":")):
+        digest.update(chunk.encode("UTF-8", "surrogatepass"))
+    return f"sha256:{digest.hexdigest()}"
+
+
+def file_digest(filename: str) -> Optional[str]:
+    """Return the SHA-256 of the content of a file, or None if it cannot
+       be read."""
+    digest = hashlib.sha256()
+    try:
+        with open(filename, "rb") as fd:
+            for block in iter(lambda: fd.read(1 << 20), b""):
+                digest.update(block)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+def content_header_for(items: int, payload: Any) -> Dict[str, Any]:
+    """Build the "content" member for a document, see lobster_write."""
+    return {"items"  : items,
+            "digest" : content_digest(payload)}
+
+
+def write_document(fd: IO, data: Any, binary: bool = False,
+                   compact: bool = False):
+    """Write a complete LOBSTER document, which may contain Streamed_Array
+       members, as indented or compact JSON, or in the binary encoding."""
+    if binary:
+        binary_format.dump(data, fd)
+    elif compact:
+        json_stream.dump(data, fd, separators=(",", ":"))
+        fd.write("\n")
+    else:
+        json_stream.dump(data, fd, indent=2)
+        fd.write("\n")
+
+
+def _open_gzip(filename: str, mode: str) -> IO:
+    # Level 6 is zlib's default, much faster than gzip's 9 at almost the
+    # same ratio. The timestamp is omitted so that output is reproducible.
+    return gzip.GzipFile(filename, mode, compresslevel=6, mtime=0)
+
+
+COMPRESSION_SUFFIXES = {
+    ".gz"  : _open_gzip,
+    ".xz"  : lzma.open,
+    ".bz2" : bz2.open,
+}
+
+# Raised while reading corrupt or truncated compressed files
+DECOMPRESSION_ERRORS = (EOFError, OSError, lzma.LZMAError)
+
+
+def open_lobster_file(filename: str, mode: str = "r") -> IO:
+    """Open a LOBSTER file like open(), in text mode with UTF-8 unless mode
+       contains "b".
+
+    If filename ends in one of the COMPRESSION_SUFFIXES, e.g.
+    report.lobster.gz, the data is compressed or decompressed while it is
+    written or read.
+    """
+    binary = "b" in mode
+    opener = COMPRESSION_SUFFIXES.get(os.path.splitext(filename)[1].lower())
+    if opener is None:
+        return open(filename, mode, encoding=None if binary else "UTF-8")
+
+    fd = opener(filename, mode.replace("t", "").replace("b", "") + "b")
+    if binary:
+        return fd
+    return TextIOWrapper(fd, encoding="UTF-8")
+
+
+@contextmanager
+def open_lobster_output(filename: str, mode: str = "w") -> Iterator[IO]:
+    """Open an output file like open_lobster_file, but write to a temporary
+       file next to it, which only replaces filename once the with block
+       completes.
+
+    Items are often produced while they are written, so an error can
+    occur halfway through; filename is then left as it was, and the
+    temporary file is removed. Missing parent directories are created.
+    """
+    ensure_output_directory(filename)
+    # The temporary file keeps the suffix, which selects the compression
+    root, suffix = os.path.splitext(filename)
+    temporary    = root + ".tmp" + suffix
+    try:
+        with open_lobster_file(temporary, mode) as fd:
+            yield fd
+    except BaseException:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+    os.replace(temporary, filename)
+
+
+def is_binary_lobster_file(filename: str) -> bool:
+    """Check whether filename is in the binary encoding."""
+    with open_lobster_file(filename, "rb") as fd:
+        return fd.read(len(binary_format.MAGIC)) == binary_format.MAGIC
+
+
+def _open_input(filename: str, binary: bool) -> IO:
+    return open_lobster_file(filename, "rb" if binary else "r")
+
+
+def _make_reader(fd: IO, binary: bool) -> Union[JSON_Stream_Reader,
+                                                 Binary_Stream_Reader]:
+    if binary:
+        return Binary_Stream_Reader(fd)
+    return JSON_Stream_Reader(fd)
+
+
+@contextmanager
+def open_lobster_reader(filename: str) -> Iterator[Union[JSON_Stream_Reader,
+                                                         Binary_Stream_Reader]]:
+    """Open filename for incremental reading, detecting the encoding.
+
+    The reader raises json.JSONDecodeError or Binary_Format_Error for
+    malformed input.
+    """
+    binary = is_binary_lobster_file(filename)
+    with _open_input(filename, binary) as fd:
+        yield _make_reader(fd, binary)
+
+
+def read_content_header(filename: str) -> Optional[Dict[str, Any]]:
+    """Return the "content" header of a LOBSTER file, or None if the file
+       has none.
+
+    The header is the first member of the top-level object, so only the
+    start of the file is read (and, for a compressed file, decompressed),
+    no matter how large it is. It holds the number of items and the
+    content_digest of the "data" array of an interchange file or of the
+    "levels" of a report. Errors are raised just like by
+    open_lobster_reader.
+    """
+    with open_lobster_reader(filename) as reader:
+        if reader.peek() != "{":
+            return None
+        for key in reader.iter_object():
+            if key != "content":
+                return None
+            header = reader.read_value()
+            return header if isinstance(header, dict) else None
+    return None
+
+
+def load_document(filename: str) -> Any:
+    """Decode a complete LOBSTER file in either encoding."""
+    binary = is_binary_lobster_file(filename)
+    with open_lobster_file(filename, "rb") as fd:
+        if binary:
+            return binary_format.load(fd)
+        return json_backend.loads(fd.read())
+
+
+# Arrays that hold the items of a document, as paths from the top-level
+# object where None matches any array index
+_STREAMED_PATHS = (
+    ("data",),
+    ("levels", None, "items"),
+)
+
+_STREAMED = object()
+_END      = object()
+
+
+def _path_state(path: tuple):
+    """Return whether path is one of _STREAMED_PATHS, or leads to one."""
+    for pattern in _STREAMED_PATHS:
+        if len(path) <= len(pattern) and \
+           all(want is None or want == got
+               for want, got in zip(pattern, path)):
+            return "streamed" if len(path) == len(pattern) else "inside"
+    return None
+
+
+def _read_skeleton(reader, path: tuple = ()):
+    state = _path_state(path)
+    char  = reader.peek()
+    if state == "streamed" and char == "[":
+        for _ in reader.iter_array(decode=False):
+            pass
+        return _STREAMED
+    if state is not None and char == "{":
+        return {key: _read_skeleton(reader, path + (key,))
+                for key in reader.iter_object()}
+    if state is not None and char == "[":
+        return [_read_skeleton(reader, path + (index,))
+                for index, _ in enumerate(reader.iter_array(decode=False))]
+    return reader.read_value()
 
-    # Read and validate JSON
-    with open(filename, encoding="UTF-8") as fd:
-        try:
-            data = json.load(fd)
-        except json.decoder.JSONDecodeError as err:
-            mh.error(File_Reference(filename,
-                                    err.lineno,
-                                    err.colno),
-                     err.msg)
 
+def _iter_streamed(reader, path: tuple = ()):
+    """Yield the elements of all streamed arrays in document order, each
+       array followed by _END."""
+    state = _path_state(path)
+    char  = reader.peek()
+    if state == "streamed" and char == "[":
+        yield from reader.iter_array()
+        yield _END
+    elif state is not None and char == "{":
+        for key in reader.iter_object():
+            yield from _iter_streamed(reader, path + (key,))
+    elif state is not None and char == "[":
+        for index, _ in enumerate(reader.iter_array(decode=False)):
+            yield from _iter_streamed(reader, path + (index,))
+    elif not path:
+        reader.read_value()
+
+
+def _take_array(elements: Iterator):
+    for element in elements:
+        if element is _END:
+            return
+        yield element
+
+
+def _attach(value, elements: Iterator):
+    if value is _STREAMED:
+        return Streamed_Array(_take_array(elements))
+    if isinstance(value, dict):
+        return {key: _attach(member, elements)
+                for key, member in value.items()}
+    if isinstance(value, list):
+        value = [_attach(element, elements) for element in value]
+        if any(map(json_stream.is_streamed, value)):
+            return Streamed_Array(value)
+    return value
+
+
+def _stream_elements(filename: str):
+    binary = is_binary_lobster_file(filename)
+    with _open_input(filename, binary) as fd:
+        reader = _make_reader(fd, binary)
+        yield from _iter_streamed(reader)
+        reader.finish()
+
+
+def stream_document(filename: str) -> Any:
+    """Decode a LOBSTER file of any schema, except for the item arrays
+       (see _STREAMED_PATHS), which are returned as Streamed_Array.
+
+    The items are only read from the file while the Streamed_Array
+    members are consumed, which write_document does in document order.
+    Errors are raised just like by open_lobster_reader.
+    """
+    with open_lobster_reader(filename) as reader:
+        skeleton = _read_skeleton(reader)
+        reader.finish()
+    return _attach(skeleton, _stream_elements(filename))
+
+
+def stream_report(filename: str) -> Any:
+    """Decode a report like stream_document, but with the levels as a
+       list, so that only the items of each level are read from the file
+       while they are consumed."""
+    data = stream_document(filename)
+    if isinstance(data, dict) and isinstance(data.get("levels"),
+                                             Streamed_Array):
+        data["levels"] = list(data["levels"].elements)
+    return data
+
+
+def _read_lobster_header(reader: JSON_Stream_Reader):
+    """Decode the top-level object of a .lobster file, except for the
+       entries of the "data" array which are skipped without decoding."""
+    if reader.peek() != "{":
+        header = reader.read_value()
+        reader.finish()
+        return header
+
+    header = {}
+    for key in reader.iter_object():
+        if key == "data" and reader.peek() == "[":
+            for _ in reader.iter_array(decode=False):
+                pass
+            header[key] = []
+        else:
+            header[key] = reader.read_value()
+    reader.finish()
+    return header
+
+
+def _iter_lobster_data(reader: JSON_Stream_Reader):
+    for key in reader.iter_object():
+        if key == "data":
+            yield from reader.iter_array()
+        else:
+            reader.skip_value()
+    reader.finish()
+
+
+# The item class for each supported schema and version of the interchange
+# format
+LOBSTER_SCHEMAS = {
+    (schema, version): kind
+    for schema, kind in (("lobster-req-trace", Requirement),
+                         ("lobster-imp-trace", Implementation),
+                         ("lobster-act-trace", Activity))
+    for version in kind.SCHEMA_VERSIONS
+}
+
+
+def _validate_lobster_header(mh, loc: File_Reference, data):
     # Validate basic structure
     if not isinstance(data, dict):
         mh.error(loc, "parsed json is not an object")
@@ -104,23 +442,123 @@ def lobster_read(
                  f"version {data['version']} for schema "
                  f"{data['schema']} is not supported")
 
-    duplicate_items = []
-    # Convert to items, and integrate into symbol table
-    for raw in data["data"]:
-        if data["schema"] == "lobster-req-trace":
-            item = Requirement.from_json(level, raw, data["version"])
-        elif data["schema"] == "lobster-imp-trace":
-            item = Implementation.from_json(level, raw, data["version"])
+
+def _lookup_schema(data) -> Optional[Type[Item]]:
+    if not isinstance(data, dict):
+        return None
+    try:
+        return LOBSTER_SCHEMAS.get((data.get("schema"), data.get("version")))
+    except TypeError:
+        # Unhashable values, which the full validation reports
+        return None
+
+
+def lobster_read(
+        mh,
+        filename: str,
+        level: str,
+        items: Dict[str, Union[Activity, Implementation, Requirement]],
+        source_info: Optional[Dict] = None,
+        *,
+        trust_inputs: bool = False,
+):
+    """Read a .lobster file and add its items to the given dictionary.
+
+    The file is read twice: first to validate the top-level keys, and then
+    to convert the entries of the data array one by one. Peak memory
+    therefore depends on the largest item, not on the size of the file.
+
+    If trust_inputs is True, the file must have been written by LOBSTER
+    itself: only the schema and version are looked up, and the items are
+    built with from_json_many, which checks nothing.
+    """
+    add_lobster_items(mh, items,
+                      iter_lobster_items(mh, filename, level, source_info,
+                                         trust_inputs=trust_inputs))
+
+
+@contextmanager
+def _read_errors(mh: Message_Handler, filename: str):
+    # Report the errors of reading a .lobster file as LOBSTER errors
+    try:
+        yield
+    except json.decoder.JSONDecodeError as err:
+        mh.error(File_Reference(filename,
+                                err.lineno,
+                                err.colno),
+                 err.msg)
+    except Binary_Format_Error as err:
+        mh.error(File_Reference(filename), err.message)
+    except FileNotFoundError:
+        raise
+    except DECOMPRESSION_ERRORS as err:
+        mh.error(File_Reference(filename), f"cannot read file: {err}")
+
+
+def iter_lobster_items(
+        mh,
+        filename: str,
+        level: str,
+        source_info: Optional[Dict] = None,
+        *,
+        trust_inputs: bool = False,
+) -> Iterator[Union[Activity, Implementation, Requirement]]:
+    """Yield the items of a .lobster file, see lobster_read.
+
+    The file is validated when the first item is requested.
+    """
+    loc = File_Reference(filename)
+
+    # Read and validate JSON. The entries of "data" are only skipped
+    # here, so syntax errors in them are found by the second pass.
+    with _read_errors(mh, filename):
+        with open_lobster_reader(filename) as reader:
+            data = _read_lobster_header(reader)
+
+    kind = _lookup_schema(data) if trust_inputs else None
+    if kind is None:
+        recorder = Message_Recorder()
+        try:
+            _validate_lobster_header(recorder, loc, data)
+        except LOBSTER_Error:
+            # A syntax error in the skipped entries is the better message
+            if isinstance(data, dict) and isinstance(data.get("data"), list):
+                with _read_errors(mh, filename), \
+                     open_lobster_reader(filename) as reader:
+                    for _ in _iter_lobster_data(reader):
+                        pass
+            recorder.replay(mh)
+            raise
+        kind = LOBSTER_SCHEMAS[(data["schema"], data["version"])]
+
+    with _read_errors(mh, filename), open_lobster_reader(filename) as reader:
+        raw_items = _iter_lobster_data(reader)
+        if trust_inputs:
+            new_items = kind.from_json_many(level, raw_items, data["version"])
         else:
-            item = Activity.from_json(level, raw, data["version"])
+            new_items = (kind.from_json(level, raw, data["version"])
+                         for raw in raw_items)
 
-        if source_info is not None:
-            item.perform_source_checks(source_info)
+        for item in new_items:
+            if source_info is not None:
+                item.perform_source_checks(source_info)
+            yield item
 
+
+def add_lobster_items(
+        mh: Message_Handler,
+        items: Dict[str, Union[Activity, Implementation, Requirement]],
+        new_items: Iterable[Union[Activity, Implementation, Requirement]],
+):
+    """Add new_items to the given dictionary, and report an error for
+       each item that is already defined."""
+    duplicate_items = []
+    # Integrate into symbol table
+    for item in new_items:
         if item.tag.key() in items:
-            # 'duplicate definition' errors are fatal, but the user wants to see all
-            # of them. So store the affected items in a list first, and create
-            # errors later.
+            # 'duplicate definition' errors are fatal, but the user wants
+            # to see all of them. So store the affected items in a list
+            # first, and create errors later.
             duplicate_items.append(item)
         else:
             items[item.tag.key()] = item
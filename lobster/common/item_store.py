@@ -0,0 +1,401 @@
+#!/usr/bin/env python3
+#
+# LOBSTER - Lightweight Open BMW Software Traceability Evidence Report
+# Copyright (C) 2026 Bayerische Motoren Werke Aktiengesellschaft (BMW AG)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public
+# License along with this program. If not, see
+# <https://www.gnu.org/licenses/>.
+
+# Compact storage for the items of a loaded report.
+#
+# Item_Store keeps one row per item: the attributes that passes over all
+# items need (level, tracing status, namespace, file and line) are held
+# in parallel arrays of small integers, with the strings in tables, and
+# everything else as the compact JSON text of the item. An item object
+# is only built when it is looked at in detail, see Stored_Item.
+
+from array import array
+from collections import Counter
+from collections.abc import Mapping
+from itertools import compress
+from typing import (Any, Dict, Iterable, Iterator, List, Optional, Tuple,
+                    Type)
+
+from lobster.common import json_backend
+from lobster.common.items import (ITEM_CLASSES, Item, Tracing_Status,
+                                  check_item_json, item_key)
+from lobster.common.json_stream import Streamed_Array
+
+# Tracing status of a row, as index into STATUSES; NO_STATUS for None
+STATUSES  = tuple(Tracing_Status)
+NO_STATUS = -1
+
+_STATUS_CODES = {status: code for code, status in enumerate(STATUSES)}
+_NAME_CODES   = {status.name: code for status, code in _STATUS_CODES.items()}
+
+# File and line of a row without them
+NO_FILE = -1
+NO_LINE = -1
+
+
+class Lazy_Item:
+    """Stand-in for an item of a loaded report, holding its raw JSON data.
+
+    The item is built with from_json (or from_json_many, if trusted) when
+    any of its attributes is accessed or set for the first time; from then
+    on all access goes to the built item. Only level, tracing_status and
+    the class (so that isinstance works as usual) are answered from the
+    raw data.
+    """
+    __slots__ = ("_level", "_cls", "_data", "_trusted", "_item")
+
+    def __init__(self, level: str, cls, data: dict, trusted: bool = False):
+        object.__setattr__(self, "_level", level)
+        object.__setattr__(self, "_cls", cls)
+        object.__setattr__(self, "_data", data)
+        object.__setattr__(self, "_trusted", trusted)
+        object.__setattr__(self, "_item", None)
+
+    def materialize(self) -> Item:
+        if self._item is None:
+            if self._trusted:
+                item, = self._cls.from_json_many(self._level, (self._data,), 3)
+            else:
+                item = self._cls.from_json(self._level, self._data, 3)
+            object.__setattr__(self, "_item", item)
+            object.__setattr__(self, "_data", None)
+        return self._item
+
+    @property
+    def is_materialized(self) -> bool:
+        return self._item is not None
+
+    def to_json(self):
+        # Trusted data was written by to_json, so it is returned as it is
+        # as long as the item is not built
+        if self._trusted and self._data is not None:
+            return self._data
+        return self.materialize().to_json()
+
+    @property
+    def __class__(self):
+        return self._cls
+
+    @property
+    def level(self) -> str:
+        if self._item is None:
+            return self._level
+        return self._item.level
+
+    @property
+    def tracing_status(self):
+        if self._item is None:
+            status = self._data.get("tracing_status")
+            return Tracing_Status[status] if status else None
+        return self._item.tracing_status
+
+    def __getattr__(self, name):
+        return getattr(self.materialize(), name)
+
+    def __setattr__(self, name, value):
+        setattr(self.materialize(), name, value)
+
+
+class Stored_Item(Lazy_Item):
+    """View of one row of an Item_Store.
+
+    It behaves like Lazy_Item, except that the raw data stays in the
+    store, and the built item is kept by the store: changes made through
+    one view are seen by all later views of the same row.
+    """
+    __slots__ = ("_store", "_row")
+
+    def __init__(self, store: "Item_Store", row: int):
+        super().__init__(store.level_of(row), store.class_of(row), None,
+                         store.trusted)
+        object.__setattr__(self, "_store", store)
+        object.__setattr__(self, "_row", row)
+
+    def materialize(self) -> Item:
+        if self._item is None:
+            object.__setattr__(self, "_item",
+                               self._store.materialize(self._row))
+        return self._item
+
+    @property
+    def tracing_status(self):
+        if self._item is None:
+            return self._store.status_of(self._row)
+        return self._item.tracing_status
+
+
+class String_Table:
+    """Assigns consecutive ids to strings, starting at 0."""
+    def __init__(self):
+        self.strings = []
+        self._ids    = {}
+
+    def id(self, value: str) -> int:
+        result = self._ids.get(value)
+        if result is None:
+            result = self._ids[value] = len(self.strings)
+            self.strings.append(value)
+        return result
+
+    def get(self, value: str) -> Optional[int]:
+        return self._ids.get(value)
+
+    def __getitem__(self, index: int) -> str:
+        return self.strings[index]
+
+    def __len__(self) -> int:
+        return len(self.strings)
+
+
+class Item_Store(Mapping):
+    """Struct-of-arrays storage for the items of a report.
+
+    It is a mapping from item key to item, just like the dictionary
+    Report.items usually is, with rows in insertion order. Looking up an
+    item returns a Stored_Item view (or the item itself, once it has been
+    built), so existing code works unchanged. Passes over all items
+    should instead use count_by_level, select and group_by_file, which
+    only touch the arrays.
+    """
+    def __init__(self, trusted: bool = False):
+        self.trusted = trusted
+
+        self.levels     = String_Table()
+        self.namespaces = String_Table()
+        self.files      = String_Table()
+        self._classes   = []
+
+        # Parallel arrays, one element per row
+        self.level_ids     = array("I")
+        self._status_codes = array("b")
+        self.namespace_ids = array("I")
+        self.file_ids      = array("i")
+        self.lines         = array("i")
+        self.keys_by_row   = []
+        self._data         = []
+
+        self._rows  = {}
+        self._built = {}
+
+    def add(self, key: str, level: str, cls: Type[Item], raw: Dict[str, Any]):
+        """Add an item, given as the raw JSON data of a report entry."""
+        if key in self._rows:
+            raise KeyError(f"duplicate item {key}")
+        level_id = self.levels.id(level)
+        if level_id == len(self._classes):
+            self._classes.append(cls)
+
+        status = raw.get("tracing_status")
+        location = raw.get("location")
+        filename = None
+        line = None
+        if isinstance(location, dict):
+            filename = location.get("file")
+            line = location.get("line")
+
+        self._rows[key] = len(self.keys_by_row)
+        self.keys_by_row.append(key)
+        self.level_ids.append(level_id)
+        self._status_codes.append(_NAME_CODES[status] if status
+                                  else NO_STATUS)
+        self.namespace_ids.append(
+            self.namespaces.id(raw["tag"].split(" ", 1)[0]))
+        self.file_ids.append(self.files.id(filename)
+                             if isinstance(filename, str) else NO_FILE)
+        self.lines.append(line if isinstance(line, int) else NO_LINE)
+        self._data.append(json_backend.dumps_compact(raw))
+
+    def add_level(self, level: Dict[str, Any]):
+        """Add the items of a level of a loaded report, whose items may
+           be a Streamed_Array. Unless trusted, their data is checked, see
+           Item.json_errors."""
+        cls   = ITEM_CLASSES.get(level["kind"])
+        items = level["items"]
+        if isinstance(items, Streamed_Array):
+            items = items.elements
+        for index, raw in enumerate(items, 1):
+            if cls is None:
+                raise ValueError(f"unknown level kind '{level['kind']}'")
+            if not self.trusted:
+                check_item_json(cls, level["name"], index, raw)
+            self.add(item_key(raw["tag"]), level["name"], cls, raw)
+
+    def extend(self, other: "Item_Store"):
+        """Add all items of another store, e.g. one filled by a worker
+           process, after the items of this one."""
+        # pylint: disable=protected-access
+        offset = len(self)
+        for key in other.keys_by_row:
+            if key in self._rows:
+                raise KeyError(f"duplicate item {key}")
+        for level_id, level in enumerate(other.levels.strings):
+            if self.levels.id(level) == len(self._classes):
+                self._classes.append(other._classes[level_id])
+
+        # The ids of the other store's tables are mapped to ours
+        for table, other_table, ids, other_ids in (
+                (self.levels, other.levels, self.level_ids, other.level_ids),
+                (self.namespaces, other.namespaces, self.namespace_ids,
+                 other.namespace_ids),
+                (self.files, other.files, self.file_ids, other.file_ids)):
+            mapping = list(map(table.id, other_table.strings))
+            # NO_FILE (-1) picks the last element
+            mapping.append(NO_FILE)
+            ids.extend(map(mapping.__getitem__, other_ids))
+
+        self._status_codes.extend(other.status_codes)
+        self.lines.extend(other.lines)
+        self._rows.update(zip(other.keys_by_row,
+                              range(offset, offset + len(other))))
+        self.keys_by_row.extend(other.keys_by_row)
+        self._data.extend(other._data)
+        for row, item in other._built.items():
+            self._built[offset + row] = item
+
+    def __getitem__(self, key: str):
+        row = self._rows[key]
+        item = self._built.get(row)
+        if item is None:
+            return Stored_Item(self, row)
+        return item
+
+    def __contains__(self, key) -> bool:
+        return key in self._rows
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys_by_row)
+
+    def __len__(self) -> int:
+        return len(self.keys_by_row)
+
+    def level_of(self, row: int) -> str:
+        return self.levels[self.level_ids[row]]
+
+    def class_of(self, row: int) -> Type[Item]:
+        return self._classes[self.level_ids[row]]
+
+    @property
+    def status_codes(self) -> array:
+        """The tracing status of each row, as index into STATUSES.
+
+        The statuses of built items may have been changed, e.g. by
+        computing them again, so these are written back first.
+        """
+        for row, item in self._built.items():
+            status = item.tracing_status
+            self._status_codes[row] = (NO_STATUS if status is None
+                                       else _STATUS_CODES[status])
+        return self._status_codes
+
+    def status_of(self, row: int) -> Optional[Tracing_Status]:
+        item = self._built.get(row)
+        if item is not None:
+            return item.tracing_status
+        code = self._status_codes[row]
+        return None if code == NO_STATUS else STATUSES[code]
+
+    def raw(self, row: int) -> Dict[str, Any]:
+        """Return the JSON data of a row, from the built item if any."""
+        item = self._built.get(row)
+        if item is not None:
+            return item.to_json()
+        return json_backend.loads(self._data[row])
+
+    def materialize(self, row: int) -> Item:
+        item = self._built.get(row)
+        if item is None:
+            cls   = self.class_of(row)
+            level = self.level_of(row)
+            data  = json_backend.loads(self._data[row])
+            if self.trusted:
+                item, = cls.from_json_many(level, (data,), 3)
+            else:
+                item = cls.from_json(level, data, 3)
+            self._built[row] = item
+            # The text is out of date as soon as the item is changed
+            self._data[row] = None
+        return item
+
+    def count_by_level(
+            self,
+            statuses: Iterable[Tracing_Status] = (),
+    ) -> Dict[str, Tuple[int, int]]:
+        """Return, for each level, the number of items and the number of
+           those items with one of the given statuses."""
+        codes  = {_STATUS_CODES[status] for status in statuses}
+        pairs  = Counter(zip(self.level_ids, self.status_codes))
+        result = {level: (0, 0) for level in self.levels.strings}
+        for (level_id, code), count in pairs.items():
+            items, matching = result[self.levels[level_id]]
+            result[self.levels[level_id]] = (
+                items + count,
+                matching + (count if code in codes else 0))
+        return result
+
+    def _row_mask(self, level: Optional[str],
+                  statuses: Optional[Iterable[Tracing_Status]],
+                  negate: bool) -> Iterable[bool]:
+        mask = None
+        if level is not None:
+            level_id = self.levels.get(level)
+            if level_id is None:
+                return [False] * len(self)
+            mask = [value == level_id for value in self.level_ids]
+        if statuses is not None:
+            codes = {_STATUS_CODES[status] for status in statuses}
+            match = [(code in codes) != negate for code in self.status_codes]
+            mask = match if mask is None else \
+                [a and b for a, b in zip(mask, match)]
+        if mask is None:
+            mask = [True] * len(self)
+        return mask
+
+    def select(self,
+               level: Optional[str] = None,
+               statuses: Optional[Iterable[Tracing_Status]] = None,
+               exclude: bool = False) -> List[str]:
+        """Return the keys of all items in level (if given) whose status
+           is one of statuses (if given), or none of them if exclude is
+           True, in insertion order."""
+        return list(compress(self.keys_by_row,
+                             self._row_mask(level, statuses, exclude)))
+
+    def rows_by_level(self) -> Dict[str, List[int]]:
+        """Return the rows of the items of each level, in insertion
+           order, grouped in one pass."""
+        groups = [[] for _ in self.levels.strings]
+        appends = [group.append for group in groups]
+        for row, level_id in enumerate(self.level_ids):
+            appends[level_id](row)
+        return dict(zip(self.levels.strings, groups))
+
+    def group_by_file(self, level: Optional[str] = None) -> Dict[str,
+                                                                  List[str]]:
+        """Return the keys of all items (in level, if given) that have a
+           file, grouped by file and ordered by line within each file."""
+        groups = {}
+        for row in compress(range(len(self)),
+                            self._row_mask(level, None, False)):
+            file_id = self.file_ids[row]
+            if file_id != NO_FILE:
+                groups.setdefault(file_id, []).append(row)
+        return {self.files[file_id]:
+                [self.keys_by_row[row]
+                 for row in sorted(rows, key=self.lines.__getitem__)]
+                for file_id, rows in groups.items()}
@@ -19,15 +19,66 @@
 
 from enum import Enum, auto
 from abc import ABCMeta
-from hashlib import sha1
-from typing import Optional
+from hashlib import blake2b, sha1
+from typing import Dict, Iterable, Iterator, Optional, Union
+from weakref import WeakValueDictionary
 
+from lobster.common.exceptions import LOBSTER_Exception
 from lobster.common.location import Location
 
+# Schemes for the HTML anchors of items. The default is the SHA-1 digest
+# of the tag key, so that existing links to items keep working; a shorter
+# BLAKE2 digest, which is also cheaper to compute, can be chosen instead.
+ANCHOR_SCHEMES        = ("sha1", "blake2")
+DEFAULT_ANCHOR_SCHEME = "sha1"
+ANCHOR_DIGEST_SIZE    = 10
+
+
+def anchor_for_key(key: str, scheme: str = DEFAULT_ANCHOR_SCHEME) -> str:
+    """Return the anchor of the item with the given tag key."""
+    assert scheme in ANCHOR_SCHEMES
+    if scheme == "sha1":
+        return sha1(key.encode("UTF-8")).hexdigest()
+    return blake2b(key.encode("UTF-8"),
+                   digest_size=ANCHOR_DIGEST_SIZE).hexdigest()
+
+
+def compute_anchors(keys: Iterable[str],
+                    scheme: str = DEFAULT_ANCHOR_SCHEME) -> Dict[str, str]:
+    """Return the anchors for all the given tag keys, by key."""
+    assert scheme in ANCHOR_SCHEMES
+    if scheme == "sha1":
+        return {key: sha1(key.encode("UTF-8")).hexdigest() for key in keys}
+    return {key: blake2b(key.encode("UTF-8"),
+                         digest_size=ANCHOR_DIGEST_SIZE).hexdigest()
+            for key in keys}
+
 
 class Tracing_Tag:
-    def __init__(
-            self,
+    """A tag like "req example.adas_100@3"; namespace, tag and version.
+
+    Tags are interned and immutable: constructing a tag that is equal to
+    an existing one returns the existing object, so equal tags are always
+    identical. Their key and string form are computed once.
+    """
+    __slots__ = ("namespace", "tag", "version", "hash_val", "_key", "_text",
+                 "__weakref__")
+
+    namespace : str
+    tag       : str
+    version   : Optional[Union[str, int]]
+    hash_val  : Optional[str]
+    _key      : str
+    _text     : str
+
+    # All tags still in use, by (namespace, tag, version) and by string
+    # form as given to from_json. A tag is dropped from both once the
+    # last item or report referring to it is gone.
+    _by_parts = WeakValueDictionary()
+    _by_text  = WeakValueDictionary()
+
+    def __new__(
+            cls,
             namespace: str,
             tag: str,
             version: Optional[str] = None,
@@ -36,29 +87,69 @@ class Tracing_Tag:
         assert isinstance(tag, str)
         assert version is None or isinstance(version, (str, int))
         assert not isinstance(version, str) or version != "None"
+        return cls._intern(namespace, tag, version)
 
-        self.namespace = namespace
-        self.tag       = tag
-        self.version   = version
-        self.hash_val  = None
+    @classmethod
+    def _intern(cls, namespace, tag, version):
+        parts = (namespace, tag, version)
+        self = cls._by_parts.get(parts)
+        if self is None:
+            self = object.__new__(cls)
+            key  = namespace + " " + tag
+            for name, value in (("namespace", namespace),
+                                ("tag", tag),
+                                ("version", version),
+                                ("hash_val", None),
+                                ("_key", key),
+                                ("_text",
+                                 f"{key}@{version}" if version else key)):
+                object.__setattr__(self, name, value)
+            cls._by_parts[parts] = self
+        return self
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"cannot set {name}, Tracing_Tag is immutable")
+
+    def __reduce__(self):
+        # Unpickling interns the tag in the receiving process
+        return (Tracing_Tag, (self.namespace, self.tag, self.version))
 
     def __str__(self):
-        rv = f"{self.namespace} {self.tag}"
-        if self.version:
-            rv += f"@{self.version}"
-        return rv
+        return self._text
 
     def key(self) -> str:
-        return self.namespace + " " + self.tag
+        return self._key
 
     def to_json(self) -> str:
-        return str(self)
+        return self._text
 
     @classmethod
     def from_json(cls, json):
-        assert isinstance(json, str)
-        namespace, rest = json.split(" ", 1)
-        return Tracing_Tag.from_text(namespace, rest)
+        tag = Tracing_Tag._by_text.get(json) if isinstance(json, str) \
+            else None
+        if tag is None:
+            assert isinstance(json, str)
+            namespace, rest = json.split(" ", 1)
+            tag = Tracing_Tag.from_text(namespace, rest)
+            if str(tag) == json:
+                Tracing_Tag._by_text[json] = tag
+        return tag
+
+    @classmethod
+    def from_json_trusted(cls, json):
+        """Like from_json, but without any checks; only for data written
+           by LOBSTER itself."""
+        tag = Tracing_Tag._by_text.get(json)
+        if tag is None:
+            namespace, text = json.split(" ", 1)
+            if "@" in text:
+                name, version = text.split("@", 1)
+            else:
+                name, version = text, None
+            tag = Tracing_Tag._intern(namespace, name, version)
+            if tag.to_json() == json:
+                Tracing_Tag._by_text[json] = tag
+        return tag
 
     @classmethod
     def from_text(cls, namespace, text):
@@ -76,9 +167,26 @@ class Tracing_Tag:
         if not self.hash_val:
             hfunc = sha1()
             hfunc.update(self.key().encode("UTF-8"))
-            self.hash_val = hfunc.hexdigest()
+            object.__setattr__(self, "hash_val", hfunc.hexdigest())
         return self.hash_val
 
+    def anchor(self, scheme: str = DEFAULT_ANCHOR_SCHEME) -> str:
+        if scheme == "sha1":
+            return self.hash()
+        return anchor_for_key(self._key, scheme)
+
+
+def item_key(tag_json: str) -> str:
+    """Return Tracing_Tag.from_json(tag_json).key() without building the
+       tag."""
+    namespace, text = tag_json.split(" ", 1)
+    return namespace + " " + text.split("@", 1)[0]
+
+
+def _is_tag_json(value) -> bool:
+    # Whether Tracing_Tag.from_json accepts value
+    return isinstance(value, str) and " " in value
+
 
 class Tracing_Status(Enum):
     OK        = auto()
@@ -88,7 +196,114 @@ class Tracing_Status(Enum):
     ERROR     = auto()
 
 
+def level_bits(config) -> Dict[str, int]:
+    """Return a distinct bit for each level of config, by level name."""
+    return {name: 1 << index for index, name in enumerate(config)}
+
+
+class Level_Policy:
+    """The tracing policy of one level, prepared for checking many items.
+
+    The levels that items trace from are given as a mask of level_bits,
+    so that each breakdown requirement is a single test, and its message
+    is built once.
+    """
+    __slots__ = ("needs_tracing_up", "needs_tracing_down", "partial",
+                 "chains")
+
+    def __init__(self, config, name: str, bits: Dict[str, int]):
+        level = config[name]
+        self.needs_tracing_up   = level.needs_tracing_up
+        self.needs_tracing_down = level.needs_tracing_down
+        # Whether an item can be partially traced
+        self.partial = level.needs_tracing_up and level.needs_tracing_down
+        self.chains  = []
+        if level.needs_tracing_down:
+            for chain in level.breakdown_requirements:
+                mask = 0
+                for src in chain:
+                    mask |= bits[src]
+                self.chains.append(
+                    (mask, f"missing reference to {' or '.join(sorted(chain))}"))
+
+    def determine_statuses(self, items: Iterable["Item"],
+                           down_masks: Iterable[int],
+                           added: Optional[Dict[str, int]] = None):
+        """Set the tracing status of each item of this level, and add
+           messages for missing references, given the mask of the levels
+           of the items tracing to it.
+
+        If added is given, the number of messages added to an item is
+        stored there under its key, for the items that got any.
+        """
+        needs_tracing_up = self.needs_tracing_up
+        chains           = self.chains
+        partial          = self.partial
+        for item, down_mask in zip(items, down_masks):
+            has_just_up     = bool(item.just_up or item.just_global)
+            has_just_down   = bool(item.just_down or item.just_global)
+            init_messages   = len(item.messages)
+            has_init_errors = init_messages > 0
+
+            # Check up references
+            ok_up = True
+            if needs_tracing_up and not item.ref_up and not has_just_up:
+                ok_up = False
+                item.messages.append("missing up reference")
+
+            # Check set of down references
+            ok_down = True
+            if not has_just_down:
+                for mask, message in chains:
+                    if not down_mask & mask:
+                        ok_down = False
+                        item.messages.append(message)
+
+            # Set status
+            if item.has_error:
+                status = Tracing_Status.MISSING
+            elif ok_up and ok_down:
+                if has_just_up or has_just_down:
+                    status = Tracing_Status.JUSTIFIED
+                else:
+                    status = Tracing_Status.OK
+            elif (ok_up or ok_down) and partial:
+                status = Tracing_Status.PARTIAL
+            else:
+                status = Tracing_Status.MISSING
+
+            # Overwrite status if there are initial errors
+            if status == Tracing_Status.OK and has_init_errors:
+                status = Tracing_Status.PARTIAL
+            item.tracing_status = status
+
+            if added is not None and len(item.messages) > init_messages:
+                added[item.tag.key()] = len(item.messages) - init_messages
+
+
+def compile_policy(config) -> Dict[str, Level_Policy]:
+    """Return the Level_Policy of each level of config, by name, using
+       level_bits(config)."""
+    bits = level_bits(config)
+    return {name: Level_Policy(config, name, bits) for name in config}
+
+
 class Item(metaclass=ABCMeta):
+    # Items have no __dict__, large reports hold millions of them
+    __slots__ = ("level", "tag", "location", "name",
+                 "ref_up", "ref_down",
+                 "unresolved_references_cache", "unresolved_references",
+                 "messages", "just_up", "just_down", "just_global",
+                 "tracing_status", "has_error")
+
+    # Schema versions from_json and from_json_many accept
+    SCHEMA_VERSIONS = ()
+
+    # Members of the JSON data that from_json needs as strings, and those
+    # that may also be absent or null, see json_errors
+    JSON_STRINGS          = ()
+    JSON_OPTIONAL_STRINGS = ()
+
     def __init__(self, tag: Tracing_Tag, location: Location):
         assert isinstance(tag, Tracing_Tag)
         assert isinstance(location, Location)
@@ -132,56 +347,22 @@ class Item(metaclass=ABCMeta):
     def perform_source_checks(self, source_info):
         assert isinstance(source_info, dict)
 
-    def determine_status(self, config, stab):
+    def determine_status(self, config, stab, down_levels=None):
+        # down_levels are the levels of the items in ref_down, if already
+        # known (see Report.graph); otherwise they are looked up in stab.
+        # For many items, use Level_Policy.determine_statuses instead.
         assert self.level in config
         assert self.tag.key() in stab
 
-        level = config[self.level]
-
-        has_up_ref      = len(self.ref_up) > 0
-        has_just_up     = len(self.just_up) > 0 or len(self.just_global) > 0
-        has_just_down   = len(self.just_down) > 0 or len(self.just_global) > 0
-        has_init_errors = len(self.messages) > 0
-
-        # Check up references
-        ok_up = True
-        if level.needs_tracing_up and (not has_up_ref) and (not has_just_up):
-            ok_up = False
-            self.messages.append("missing up reference")
-
-        # Check set of down references
-        ok_down = True
-        if level.needs_tracing_down:
-            has_trace = {name : False
-                         for name in config
-                         if self.level in config[name].traces}
-            for ref in self.ref_down:
-                has_trace[stab[ref.key()].level] = True
-            for chain in level.breakdown_requirements:
-                if not any(has_trace[src] for src in chain) and \
-                   not has_just_down:
-                    ok_down = False
-                    chain_str = " or ".join(sorted(chain))
-                    self.messages.append(f"missing reference to {chain_str}")
-
-        # Set status
-        if self.has_error:
-            self.tracing_status = Tracing_Status.MISSING
-        elif ok_up and ok_down:
-            if has_just_up or has_just_down:
-                self.tracing_status = Tracing_Status.JUSTIFIED
-            else:
-                self.tracing_status = Tracing_Status.OK
-        elif (ok_up or ok_down) and \
-             level.needs_tracing_up and \
-             level.needs_tracing_down:
-            self.tracing_status = Tracing_Status.PARTIAL
-        else:
-            self.tracing_status = Tracing_Status.MISSING
-
-        # Overwrite status if there are initial errors
-        if self.tracing_status == Tracing_Status.OK and has_init_errors:
-            self.tracing_status = Tracing_Status.PARTIAL
+        bits   = level_bits(config)
+        policy = Level_Policy(config, self.level, bits)
+        mask   = 0
+        if policy.needs_tracing_down:
+            if down_levels is None:
+                down_levels = [stab[ref.key()].level for ref in self.ref_down]
+            for down_level in down_levels:
+                mask |= bits[down_level]
+        policy.determine_statuses((self,), (mask,))
 
     def additional_data_from_json(self, level, data, schema_version):
         assert isinstance(level, str)
@@ -202,6 +383,88 @@ class Item(metaclass=ABCMeta):
         if "tracing_status" in data:
             self.tracing_status = Tracing_Status[data["tracing_status"]]
 
+    @classmethod
+    def json_errors(cls, data) -> Iterator[str]:
+        """Yield what keeps from_json from building an item from data.
+
+        The members are checked without building the item, except for
+        its location.
+        """
+        if not isinstance(data, dict):
+            yield "item is not an object"
+            return
+        if not _is_tag_json(data.get("tag")):
+            yield "tag is not a string of namespace and name"
+        try:
+            Location.from_json(data.get("location"))
+        except LOBSTER_Exception as err:
+            yield err.message
+        for member in ("refs", "ref_up", "ref_down"):
+            refs = data.get(member, [])
+            if not isinstance(refs, list) or \
+               not all(map(_is_tag_json, refs)):
+                yield f"{member} is not an array of tags"
+        if "tracing_status" in data and \
+           data["tracing_status"] not in Tracing_Status.__members__:
+            yield "tracing_status is not a tracing status"
+        for member in cls.JSON_STRINGS:
+            if not isinstance(data.get(member), str):
+                yield f"{member} is not a string"
+        for member in cls.JSON_OPTIONAL_STRINGS:
+            if not isinstance(data.get(member), (str, type(None))):
+                yield f"{member} is not a string"
+
+    @classmethod
+    def from_json_many(cls, level, data, schema_version):
+        """Build items like from_json(level, raw, schema_version) for each
+           raw entry of data, yielding them one by one.
+
+        Nothing is checked and no constructor is run, so this must only
+        be used for data written by LOBSTER itself, e.g. with
+        --trust-inputs. The schema version is checked once for all items.
+        """
+        assert schema_version in cls.SCHEMA_VERSIONS
+
+        tag_from_json      = Tracing_Tag.from_json_trusted
+        location_from_json = Location.from_json_trusted
+        new_item           = cls.__new__
+        fields_from_json   = cls._fields_from_json
+        for raw in data:
+            item = new_item(cls)
+            item.level    = level
+            item.tag      = tag_from_json(raw["tag"])
+            item.location = location_from_json(raw["location"])
+            item.name     = item.tag.tag
+
+            item.unresolved_references_cache = set()
+            item.unresolved_references = []
+            for ref in raw.get("refs", ()):
+                target = tag_from_json(ref)
+                if target.key() not in item.unresolved_references_cache:
+                    item.unresolved_references.append(target)
+                    item.unresolved_references_cache.add(target.key())
+            item.ref_up   = [tag_from_json(ref)
+                             for ref in raw.get("ref_up", ())]
+            item.ref_down = [tag_from_json(ref)
+                             for ref in raw.get("ref_down", ())]
+
+            item.messages    = raw.get("messages", [])
+            item.just_up     = raw.get("just_up", [])
+            item.just_down   = raw.get("just_down", [])
+            item.just_global = raw.get("just_global", [])
+            if "tracing_status" in raw:
+                item.tracing_status = Tracing_Status[raw["tracing_status"]]
+            else:
+                item.tracing_status = None
+            item.has_error = False
+
+            fields_from_json(item, raw)
+            yield item
+
+    @staticmethod
+    def _fields_from_json(item, data):
+        """Set the attributes specific to the item class from data."""
+
     def to_json(self):
         rv = {
             "tag"         : self.tag.to_json(),
@@ -224,6 +487,13 @@ class Item(metaclass=ABCMeta):
 
 
 class Requirement(Item):
+    __slots__ = ("framework", "kind", "text", "status")
+
+    SCHEMA_VERSIONS = (3, 4)
+
+    JSON_STRINGS          = ("framework", "kind", "name")
+    JSON_OPTIONAL_STRINGS = ("text", "status")
+
     def __init__(
             self,
             tag: Tracing_Tag,
@@ -258,11 +528,19 @@ class Requirement(Item):
     def perform_source_checks(self, source_info):
         assert isinstance(source_info, dict)
 
+    @staticmethod
+    def _fields_from_json(item, data):
+        item.framework = data["framework"]
+        item.kind      = data["kind"]
+        item.name      = data["name"]
+        item.text      = data.get("text", None)
+        item.status    = data.get("status", None)
+
     @classmethod
     def from_json(cls, level, data, schema_version):
         assert isinstance(level, str)
         assert isinstance(data, dict)
-        assert schema_version in (3, 4)
+        assert schema_version in cls.SCHEMA_VERSIONS
 
         item = Requirement(tag       = Tracing_Tag.from_json(data["tag"]),
                            location  = Location.from_json(data["location"]),
@@ -277,6 +555,12 @@ class Requirement(Item):
 
 
 class Implementation(Item):
+    __slots__ = ("language", "kind")
+
+    SCHEMA_VERSIONS = (3,)
+
+    JSON_STRINGS = ("language", "kind", "name")
+
     def __init__(
             self,
             tag: Tracing_Tag,
@@ -300,11 +584,17 @@ class Implementation(Item):
         rv["kind"]     = self.kind
         return rv
 
+    @staticmethod
+    def _fields_from_json(item, data):
+        item.language = data["language"]
+        item.kind     = data["kind"]
+        item.name     = data["name"]
+
     @classmethod
     def from_json(cls, level, data, schema_version):
         assert isinstance(level, str)
         assert isinstance(data, dict)
-        assert schema_version == 3
+        assert schema_version in cls.SCHEMA_VERSIONS
 
         item = Implementation(tag      = Tracing_Tag.from_json(data["tag"]),
                               location = Location.from_json(data["location"]),
@@ -317,6 +607,13 @@ class Implementation(Item):
 
 
 class Activity(Item):
+    __slots__ = ("framework", "kind", "text", "status")
+
+    SCHEMA_VERSIONS = (3,)
+
+    JSON_STRINGS          = ("framework", "kind")
+    JSON_OPTIONAL_STRINGS = ("text", "status")
+
     def __init__(
             self,
             tag: Tracing_Tag,
@@ -346,11 +643,18 @@ class Activity(Item):
         rv["status"]    = self.status
         return rv
 
+    @staticmethod
+    def _fields_from_json(item, data):
+        item.framework = data["framework"]
+        item.kind      = data["kind"]
+        item.text      = data.get("text", None)
+        item.status    = data.get("status", None)
+
     @classmethod
     def from_json(cls, level, data, schema_version):
         assert isinstance(level, str)
         assert isinstance(data, dict)
-        assert schema_version == 3
+        assert schema_version in cls.SCHEMA_VERSIONS
 
         item = Activity(tag       = Tracing_Tag.from_json(data["tag"]),
                         location  = Location.from_json(data["location"]),
@@ -361,3 +665,19 @@ class Activity(Item):
         item.additional_data_from_json(level, data, schema_version)
 
         return item
+
+
+# The item class of each level kind
+ITEM_CLASSES = {
+    "requirements"   : Requirement,
+    "implementation" : Implementation,
+    "activity"       : Activity,
+}
+
+
+def check_item_json(cls, level: str, index: int, data):
+    """Raise ValueError if cls.from_json cannot build the item with the
+       given index (counting from 1) of level from data."""
+    error = next(cls.json_errors(data), None)
+    if error is not None:
+        raise ValueError(f"item {index} of level {level}: {error}")
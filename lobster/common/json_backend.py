@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+#
+# LOBSTER - Lightweight Open BMW Software Traceability Evidence Report
+# Copyright (C) 2026 Bayerische Motoren Werke Aktiengesellschaft (BMW AG)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public
+# License along with this program. If not, see
+# <https://www.gnu.org/licenses/>.
+
+# JSON encoding and decoding for all LOBSTER readers and writers.
+#
+# If orjson is installed it is used, and otherwise the json module of
+# the standard library. The results are always exactly those of the json
+# module with its default settings: orjson output is post-processed to
+# escape non-ASCII characters, and everything orjson would format
+# differently (floats, keys that are not strings, other indentation
+# styles) or does not support (integers beyond 64 bits, lone surrogates)
+# is handed to the json module. Decoding errors are always raised by the
+# json module, so messages and positions do not depend on the backend.
+#
+# Set the environment variable LOBSTER_JSON_BACKEND to "json" to disable
+# orjson, e.g. for benchmarks.
+
+import json
+import os
+import re
+from typing import Any, IO, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if os.environ.get("LOBSTER_JSON_BACKEND") == "json":
+    orjson = None
+
+BACKEND = "orjson" if orjson else "json"
+
+_NON_ASCII   = re.compile("[\x7f-\U0010ffff]")
+_INDENTATION = re.compile("^( +)", re.MULTILINE)
+
+# orjson decodes integers outside of 64 bits as floats. Mapping all
+# digits to 0 and searching for a run of 19 is much faster than a regular
+# expression on large documents. This is done a chunk at a time, so that
+# the data is never copied as a whole; chunks overlap by the length of
+# the run less one.
+_LONG_NUMBER       = "0" * 19
+_LONG_NUMBER_BYTES = b"0" * 19
+_DIGITS            = str.maketrans("123456789", "000000000")
+_DIGITS_BYTES      = bytes.maketrans(b"123456789", b"000000000")
+_CHUNK_SIZE        = 1 << 20
+
+
+def _escape(match: re.Match) -> str:
+    code = ord(match.group())
+    if code < 0x10000:
+        return f"\\u{code:04x}"
+    code -= 0x10000
+    return f"\\u{0xd800 | (code >> 10):04x}\\u{0xdc00 | (code & 0x3ff):04x}"
+
+
+# Types that are certainly not floats and have no members
+_SCALARS = frozenset((str, int, bool, type(None)))
+
+
+def _has_no_floats(value) -> bool:
+    # Walks the value with an explicit stack, the exact types of values
+    # (almost all) are tested first, then subclasses
+    stack  = [value]
+    pop    = stack.pop
+    extend = stack.extend
+    while stack:
+        value = pop()
+        kind  = type(value)
+        if kind in _SCALARS:
+            continue
+        if kind is dict:
+            extend(value.values())
+        elif kind is list or kind is tuple:
+            extend(value)
+        elif isinstance(value, float):
+            return False
+        elif isinstance(value, dict):
+            extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            extend(value)
+    return True
+
+
+def _orjson_dumps(value, indent: Optional[int],
+                  separators: Optional[Tuple[str, str]]) -> Optional[str]:
+    if indent is None:
+        if separators != (",", ":"):
+            return None
+        option = 0
+    else:
+        if not isinstance(indent, int) or \
+           separators not in (None, (",", ": ")):
+            return None
+        option = orjson.OPT_INDENT_2
+
+    # Types orjson would encode but json rejects go to the json module
+    option |= orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_PASSTHROUGH_DATETIME
+
+    if not _has_no_floats(value):
+        return None
+    try:
+        text = orjson.dumps(value, option=option).decode("UTF-8")
+    except orjson.JSONEncodeError:
+        return None
+
+    if not text.isascii() or "\x7f" in text:
+        text = _NON_ASCII.sub(_escape, text)
+    if indent is not None and indent != 2:
+        # Strings never contain a raw newline, so all leading spaces are
+        # indentation
+        text = _INDENTATION.sub(
+            lambda match: " " * (len(match.group(1)) // 2 * indent), text)
+    return text
+
+
+def dumps(value: Any,
+          indent: Optional[int] = None,
+          separators: Optional[Tuple[str, str]] = None) -> str:
+    """Encode value exactly like json.dumps with the same arguments."""
+    if orjson:
+        text = _orjson_dumps(value, indent, separators)
+        if text is not None:
+            return text
+    return json.dumps(value, indent=indent, separators=separators)
+
+
+def dump(value: Any, fd: IO,
+         indent: Optional[int] = None,
+         separators: Optional[Tuple[str, str]] = None):
+    """Write value to fd exactly like json.dump with the same arguments."""
+    fd.write(dumps(value, indent, separators))
+
+
+def dumps_compact(value: Any) -> str:
+    """Encode value as compact JSON, for data that is only read back with
+       loads.
+
+    Unlike dumps, the result may differ from json.dumps in formatting
+    (e.g. of floats), but never in the value, so this is faster.
+    """
+    if orjson:
+        try:
+            # Decoding also drops the spare capacity of orjson's buffer
+            return orjson.dumps(value).decode("UTF-8")
+        except orjson.JSONEncodeError:
+            pass
+    return json.dumps(value, separators=(",", ":"))
+
+
+def _has_long_number(data) -> bool:
+    if isinstance(data, str):
+        table, run = _DIGITS, _LONG_NUMBER
+    else:
+        table, run = _DIGITS_BYTES, _LONG_NUMBER_BYTES
+    overlap = len(run) - 1
+    return any(run in data[start:start + _CHUNK_SIZE + overlap].translate(table)
+               for start in range(0, len(data), _CHUNK_SIZE))
+
+
+def loads(data) -> Any:
+    """Decode a str, bytes or bytearray like json.loads."""
+    if orjson:
+        if not _has_long_number(data):
+            try:
+                return orjson.loads(data)
+            except orjson.JSONDecodeError:
+                # Let the json module decide, it accepts a few things
+                # orjson rejects, and otherwise raises its usual error
+                pass
+    return json.loads(data)
+
+
+def load(fd: IO) -> Any:
+    """Decode the content of fd like json.load."""
+    return loads(fd.read())
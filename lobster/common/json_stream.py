@@ -0,0 +1,369 @@
+#!/usr/bin/env python3
+#
+# LOBSTER - Lightweight Open BMW Software Traceability Evidence Report
+# Copyright (C) 2026 Bayerische Motoren Werke Aktiengesellschaft (BMW AG)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public
+# License along with this program. If not, see
+# <https://www.gnu.org/licenses/>.
+
+import json
+import re
+from itertools import islice
+from typing import Any, Iterable, Iterator, Optional, TextIO, Tuple
+
+from lobster.common import json_backend
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+# Number of elements of a plain Streamed_Array encoded at once
+PLAIN_BATCH_SIZE = 256
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_DECODER    = json.JSONDecoder()
+
+
+def _skip_pattern(nesting: int) -> str:
+    # Text without brackets, except in complete strings and in balanced
+    # groups nested at most nesting deep. Every alternative starts with a
+    # different character, so a failed match backtracks in linear time.
+    text   = r'[^"\[\]{}]*'
+    string = r'"[^"\\]*(?:\\.[^"\\]*)*"'
+    rv     = f"{text}(?:{string}{text})*"
+    for _ in range(nesting):
+        rv = f"{text}(?:(?:{string}|[\\[{{]{rv}[\\]}}]){text})*"
+    return rv
+
+
+# What skip_value steps over in one match. Items nest at most three
+# deep, so the loop over brackets in skip_value is rarely needed.
+_GROUP      = re.compile(f"[\\[{{]{_skip_pattern(2)}[\\]}}]")
+_SKIP       = re.compile(_skip_pattern(3))
+
+
+class JSON_Stream_Reader:
+    """Incremental decoder for a JSON document read from a file object.
+
+    Only the structure of objects and arrays that the caller explicitly
+    walks with iter_object and iter_array is handled here. Every other
+    value is decoded in one piece by the stdlib decoder, so peak memory is
+    bounded by the largest single value and not by the whole document.
+
+    Errors are raised as json.JSONDecodeError, with lineno and colno
+    relative to the start of the document, just as json.load would.
+    """
+    def __init__(self, fd: TextIO, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        assert chunk_size >= 1
+        self._fd         = fd
+        self._chunk_size = chunk_size
+        self._buf        = ""
+        self._pos        = 0
+        self._eof        = False
+
+        # Book-keeping for the part of the document already discarded
+        self._offset     = 0
+        self._line       = 1
+        self._last_nl    = -1
+
+    def _fill(self):
+        # Drop what has been consumed, keeping track of line numbers
+        if self._pos:
+            newlines = self._buf.count("\n", 0, self._pos)
+            if newlines:
+                self._line    += newlines
+                self._last_nl  = (self._offset +
+                                  self._buf.rindex("\n", 0, self._pos))
+            self._offset += self._pos
+            self._buf     = self._buf[self._pos:]
+            self._pos     = 0
+
+        # Grow geometrically so that very large values are re-scanned
+        # only a logarithmic number of times
+        chunk = self._fd.read(max(self._chunk_size, len(self._buf)))
+        if chunk:
+            self._buf += chunk
+        else:
+            self._eof = True
+
+    def _error(self, msg: str, pos: int) -> json.JSONDecodeError:
+        err = json.JSONDecodeError(msg, self._buf, pos)
+        newlines = self._buf.count("\n", 0, pos)
+        if newlines:
+            last_nl = self._offset + self._buf.rindex("\n", 0, pos)
+        else:
+            last_nl = self._last_nl
+        err.pos    = self._offset + pos
+        err.lineno = self._line + newlines
+        err.colno  = err.pos - last_nl
+        err.args   = (f"{msg}: line {err.lineno} column {err.colno} "
+                      f"(char {err.pos})",)
+        return err
+
+    def peek(self) -> str:
+        """Skip whitespace and return the next character, or '' at EOF."""
+        while True:
+            self._pos = _WHITESPACE.match(self._buf, self._pos).end()
+            if self._pos < len(self._buf) or self._eof:
+                break
+            self._fill()
+        return self._buf[self._pos:self._pos + 1]
+
+    def read_value(self) -> Any:
+        """Decode the complete JSON value at the current position."""
+        self.peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError as err:
+                if self._eof:
+                    raise self._error(err.msg, err.pos) from None
+                self._fill()
+                continue
+
+            # A number or literal touching the end of the buffer might
+            # continue in the next chunk
+            if end == len(self._buf) and not self._eof:
+                self._fill()
+                continue
+
+            self._pos = end
+            return value
+
+    def skip_value(self):
+        """Skip the JSON value at the current position without decoding it.
+
+        Objects and arrays are only scanned for brackets and strings, so
+        no Python objects are built for them. They are not checked for
+        anything but balanced brackets and terminated strings; a caller
+        that needs the value checked must decode it.
+        """
+        if self.peek() not in ("[", "{"):
+            self.read_value()
+            return
+
+        match = _GROUP.match(self._buf, self._pos)
+        if match:
+            self._pos = match.end()
+            return
+
+        depth = 0
+        while True:
+            # Everything up to the next bracket that is not in a string
+            self._pos = _SKIP.match(self._buf, self._pos).end()
+            char = self._buf[self._pos:self._pos + 1]
+            if char in ("", '"'):
+                # The end of the buffer, or a string that ends beyond it
+                if self._eof:
+                    raise self._error("Unterminated value", self._pos)
+                self._fill()
+                continue
+
+            self._pos += 1
+            if char in "[{":
+                depth += 1
+            else:
+                depth -= 1
+                if depth == 0:
+                    return
+
+    def iter_object(self) -> Iterator[str]:
+        """Walk the object at the current position, yielding its keys.
+
+        After each key the caller must consume the member value, with
+        read_value, skip_value, iter_object or iter_array. A value that
+        was not consumed is skipped.
+        """
+        if self.peek() != "{":
+            raise self._error("Expecting '{'", self._pos)
+        self._pos += 1
+        if self.peek() == "}":
+            self._pos += 1
+            return
+
+        while True:
+            if self.peek() != '"':
+                raise self._error("Expecting property name enclosed in "
+                                  "double quotes", self._pos)
+            key = self.read_value()
+            if self.peek() != ":":
+                raise self._error("Expecting ':' delimiter", self._pos)
+            self._pos += 1
+            self.peek()
+
+            value_start = self._offset + self._pos
+            yield key
+            if self._offset + self._pos == value_start:
+                self.skip_value()
+
+            char = self.peek()
+            self._pos += 1
+            if char == "}":
+                return
+            if char != ",":
+                raise self._error("Expecting ',' delimiter", self._pos - 1)
+
+    def iter_array(self, decode: bool = True) -> Iterator[Any]:
+        """Walk the array at the current position, yielding its elements
+           one at a time.
+
+        If decode is False, None is yielded for each element instead, and
+        the caller consumes the element just like a member value in
+        iter_object.
+        """
+        if self.peek() != "[":
+            raise self._error("Expecting '['", self._pos)
+        self._pos += 1
+        if self.peek() == "]":
+            self._pos += 1
+            return
+
+        while True:
+            if decode:
+                yield self.read_value()
+            else:
+                element_start = self._offset + self._pos
+                yield None
+                if self._offset + self._pos == element_start:
+                    self.skip_value()
+
+            char = self.peek()
+            self._pos += 1
+            if char == "]":
+                return
+            if char != ",":
+                raise self._error("Expecting ',' delimiter", self._pos - 1)
+
+    def finish(self):
+        """Check that nothing but whitespace follows the document."""
+        if self.peek():
+            raise self._error("Extra data", self._pos)
+
+
+class Streamed_Array:
+    """Placeholder for an array whose elements are produced while writing.
+
+    It may be used as a member value of a dict passed to dump, or as an
+    element of another Streamed_Array. Plain lists are always encoded in
+    one piece, so a list containing streamed values must itself be
+    wrapped. The elements are consumed exactly once, so any iterable,
+    including a generator, is fine.
+
+    If plain is True, the elements must not contain Streamed_Array
+    values; they are then encoded a batch at a time, which is much
+    faster for many small elements such as items.
+    """
+    def __init__(self, elements: Iterable, plain: bool = False):
+        self.elements = elements
+        self.plain    = plain
+
+
+def is_streamed(value) -> bool:
+    """Return True for a Streamed_Array, or a dict that has one among its
+       (possibly nested) member values."""
+    if isinstance(value, Streamed_Array):
+        return True
+    return isinstance(value, dict) and any(map(is_streamed, value.values()))
+
+
+def iter_encode(
+        value: Any,
+        indent: Optional[int] = None,
+        separators: Optional[Tuple[str, str]] = None,
+        _depth: int = 0,
+) -> Iterator[str]:
+    """Encode value like json.dumps, but as a sequence of chunks.
+
+    The output is identical to json.dumps(value, indent=indent,
+    separators=separators), except that Streamed_Array members are
+    encoded one element at a time.
+    """
+    if separators is None:
+        separators = (",", ": ") if indent is not None else (", ", ": ")
+    item_separator, key_separator = separators
+
+    if indent is None:
+        newline      = ""
+        inner_indent = ""
+    else:
+        newline      = "\n" + " " * (indent * _depth)
+        inner_indent = " " * indent
+
+    if isinstance(value, dict) and is_streamed(value):
+        members  = value.items()
+        brackets = "{}"
+    elif isinstance(value, Streamed_Array) and value.plain:
+        yield "["
+        yield from _iter_encode_plain(value.elements, indent, separators,
+                                      newline)
+        yield "]"
+        return
+    elif isinstance(value, Streamed_Array):
+        members  = ((None, element) for element in value.elements)
+        brackets = "[]"
+    else:
+        text = json_backend.dumps(value, indent, separators)
+        yield text.replace("\n", newline) if newline else text
+        return
+
+    yield brackets[0]
+    first = True
+    for key, member in members:
+        if not first:
+            yield item_separator
+        first = False
+        yield newline + inner_indent
+        if key is not None:
+            yield json.dumps(key) + key_separator
+        yield from iter_encode(member, indent, separators, _depth + 1)
+    if not first:
+        yield newline
+    yield brackets[1]
+
+
+def _iter_encode_plain(elements: Iterable, indent: Optional[int],
+                       separators: Tuple[str, str],
+                       newline: str) -> Iterator[str]:
+    # Encode the elements of a plain Streamed_Array, without brackets. A
+    # batch is encoded as a list and then shifted to the depth of the
+    # array, which gives exactly the text of encoding its elements one by
+    # one: a newline and indentation before each element, the item
+    # separator between them, and a newline before the closing bracket.
+    elements = iter(elements)
+    first    = True
+    while True:
+        batch = list(islice(elements, PLAIN_BATCH_SIZE))
+        if not batch:
+            break
+        text = json_backend.dumps(batch, indent, separators)
+        if newline:
+            text = text.replace("\n", newline)
+        if not first:
+            yield separators[0]
+        first = False
+        # Drop the brackets, and for indented output the newline before
+        # the closing one
+        yield text[1:len(text) - len(newline) - 1]
+    if not first and indent is not None:
+        yield newline
+
+
+def dump(
+        value: Any,
+        fd: TextIO,
+        indent: Optional[int] = None,
+        separators: Optional[Tuple[str, str]] = None,
+):
+    """Write value to fd like json.dump, expanding Streamed_Array members
+       incrementally."""
+    for chunk in iter_encode(value, indent, separators):
+        fd.write(chunk)
@@ -24,6 +24,9 @@ from lobster.common.exceptions import LOBSTER_Exception
 
 
 class Location(metaclass=ABCMeta):
+    # Locations have no __dict__, there is one for each item
+    __slots__ = ()
+
     @abstractmethod
     def sorting_key(self) -> Tuple:
         pass
@@ -68,8 +71,18 @@ class Location(metaclass=ABCMeta):
                 f"malformed {json['kind']} location data",
                 json) from err
 
+    @classmethod
+    def from_json_trusted(cls, json):
+        """Like from_json, but without any checks for file references;
+           only for data written by LOBSTER itself."""
+        if json["kind"] == "file":
+            return File_Reference.from_json_trusted(json)
+        return Location.from_json(json)
+
 
 class Void_Reference(Location):
+    __slots__ = ()
+
     def __init__(self):
         pass
 
@@ -93,6 +106,8 @@ class Void_Reference(Location):
 
 
 class File_Reference(Location):
+    __slots__ = ("filename", "line", "column")
+
     def __init__(self, filename, line=None, column=None):
         assert isinstance(filename, str)
         assert line is None or (isinstance(line, int) and
@@ -141,8 +156,21 @@ class File_Reference(Location):
             column = None
         return File_Reference(filename, line, column)
 
+    @classmethod
+    def from_json_trusted(cls, json):
+        ref = cls.__new__(cls)
+        ref.filename = json["file"]
+        ref.line     = json.get("line", None)
+        if ref.line is not None:
+            ref.column = json.get("column", None)
+        else:
+            ref.column = None
+        return ref
+
 
 class Github_Reference(Location):
+    __slots__ = ("gh_root", "gh_repo", "commit", "filename", "line")
+
     def __init__(self, gh_root, filename, line, commit):
         assert isinstance(gh_root, str)
         assert gh_root.startswith("http")
@@ -196,6 +224,8 @@ class Github_Reference(Location):
 
 
 class Codebeamer_Reference(Location):
+    __slots__ = ("cb_root", "tracker", "item", "version", "name")
+
     def __init__(self, cb_root: str, tracker: int, item: int,
                  version: Optional[int] = None, name: Optional[str] = None):
         assert isinstance(cb_root, str)
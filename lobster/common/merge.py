@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+#
+# LOBSTER - Lightweight Open BMW Software Traceability Evidence Report
+# Copyright (C) 2026 Bayerische Motoren Werke Aktiengesellschaft (BMW AG)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public
+# License along with this program. If not, see
+# <https://www.gnu.org/licenses/>.
+
+# Merge of the reports of several components, for lobster-report --merge.
+#
+# Each report must have been written with mergeable, see
+# lobster.common.federation. The merge takes all items as they are, and
+# resolves the references of only the items recorded there again,
+# against the items of all reports. The status is computed again for
+# them, for the items they now trace to, and for all items of a level
+# whose policy the merge changes (e.g. a level that only the lobster.conf
+# of another component traces to). For all other items the status and
+# messages of their report stand, so the work grows with the links
+# between components, not with the number of items. The result is the
+# report a full build from the union of the lobster.conf files would
+# give.
+
+from collections import OrderedDict
+from copy import deepcopy
+from dataclasses import dataclass
+from typing import Dict, List, Sequence, Tuple
+
+from lobster.common.errors import Message_Handler
+from lobster.common.io import signal_duplicate_items
+from lobster.common.item_store import Lazy_Item
+from lobster.common.items import (Tracing_Status, Tracing_Tag,
+                                  compile_policy, level_bits)
+from lobster.common.level_definition import LevelDefinition
+from lobster.common.location import File_Reference
+from lobster.common.report import Coverage, Report
+
+_OK_STATUSES = (Tracing_Status.OK, Tracing_Status.JUSTIFIED)
+
+
+@dataclass
+class Merge_Result:
+    report      : Report
+    # Number of references resolved to items of another report
+    cross_links : int
+    recomputed  : int
+
+
+def _default_breakdown(config, name: str) -> List[List[str]]:
+    # The breakdown requirements of a level without "requires", see
+    # lobster.common.parser.load
+    return [[level.name] for level in config.values() if name in level.traces]
+
+
+def _same_policy(level: LevelDefinition, other: LevelDefinition) -> bool:
+    return (level.needs_tracing_up == other.needs_tracing_up and
+            level.needs_tracing_down == other.needs_tracing_down and
+            sorted(map(sorted, level.breakdown_requirements)) ==
+            sorted(map(sorted, other.breakdown_requirements)))
+
+
+def merge_policies(mh: Message_Handler,
+                   reports: Sequence[Tuple[str, Report]]) -> OrderedDict:
+    """Return the union of the levels of the given (file name, report)
+       pairs, in order of appearance.
+
+    A level defined by several reports must have the same kind; its
+    traces and sources are joined. Breakdown requirements given with
+    "requires" must be the same in all reports giving them; otherwise
+    they are derived from the joined levels, as for a lobster.conf file.
+    """
+    config   = OrderedDict()
+    explicit = {}
+    for filename, report in reports:
+        loc = File_Reference(filename)
+        for name, level in report.config.items():
+            merged = config.get(name)
+            if merged is None:
+                config[name] = deepcopy(level)
+            elif merged.kind != level.kind:
+                mh.error(loc, f"level {name} is of kind {level.kind}, but "
+                              f"of kind {merged.kind} in an earlier report")
+            else:
+                merged.traces.extend(target for target in level.traces
+                                     if target not in merged.traces)
+                merged.source.extend(deepcopy(level.source))
+                merged.needs_tracing_up   |= level.needs_tracing_up
+                merged.needs_tracing_down |= level.needs_tracing_down
+
+            breakdown = level.breakdown_requirements
+            if breakdown != _default_breakdown(report.config, name) and \
+               explicit.setdefault(name, breakdown) != breakdown:
+                mh.error(loc, f"requirements of level {name} differ from "
+                              f"those of an earlier report")
+
+    for name, level in config.items():
+        level.breakdown_requirements = \
+            deepcopy(explicit.get(name)) or _default_breakdown(config, name)
+    return config
+
+
+def _keys_by_level(report: Report) -> Dict[str, List[str]]:
+    result = {}
+    for key, item in report.items.items():
+        result.setdefault(item.level, []).append(key)
+    return result
+
+
+def _report_of(reports: Sequence[Report], key: str) -> int:
+    for index, report in enumerate(reports):
+        if key in report.items:
+            return index
+    raise KeyError(key)
+
+
+def merge_reports(report_files: Sequence[str],
+                  trust_inputs: bool = False) -> Merge_Result:
+    """Merge the reports of several components, see above.
+
+    As in a full build, the items are in the order of the levels; within
+    a level, in the order of the reports given. Items defined by more
+    than one report are an error, as are reports not written with
+    mergeable.
+    """
+    report = Report()
+    files  = list(report_files)
+    parts  = []
+    for filename in files:
+        part = Report()
+        part.load_report(filename, lazy=True, trust_inputs=trust_inputs)
+        if not part.mergeable:
+            report.mh.error(File_Reference(filename),
+                            "report was not written to be merged, see "
+                            "lobster-report --mergeable")
+        parts.append(part)
+    report.config = merge_policies(report.mh, list(zip(files, parts)))
+
+    duplicates = []
+    groups     = [_keys_by_level(part) for part in parts]
+    for name in report.config:
+        for part, group in zip(parts, groups):
+            for key in group.get(name, ()):
+                if key in report.items:
+                    duplicates.append(part.items[key])
+                else:
+                    report.items[key] = part.items[key]
+    signal_duplicate_items(report.mh, report.items, duplicates)
+    level_index = {name: index for index, name in enumerate(report.config)}
+
+    def position(index, key):
+        # Items of the same level and report keep their order
+        return level_index[report.items[key].level], index
+
+    report.coverage = {name: Coverage(level=name, items=0, ok=0,
+                                      coverage=None)
+                       for name in report.config}
+    for part in parts:
+        for name, coverage in part.coverage.items():
+            report.coverage[name].items += coverage.items
+            report.coverage[name].ok    += coverage.ok
+
+    sources = sorted(((index, key, entry)
+                      for index, part in enumerate(parts)
+                      for key, entry in part.unresolved.items()),
+                     key=lambda source: position(*source[:2]))
+    source_keys = {key for _, key, _ in sources}
+    # The items whose status is computed again, with their report and
+    # their status before
+    affected: Dict[str, Tuple[int, Tracing_Status]] = {}
+    for part in parts:
+        report.status_messages.update(part.status_messages)
+
+    def take(key, index):
+        # Build the item, and remove the messages its status gave, unless
+        # they are cut off with those of resolving its references
+        item = report.items[key]
+        if key in affected:
+            return item
+        if isinstance(item, Lazy_Item):
+            item = report.items[key] = item.materialize()
+        affected[key] = (index, item.tracing_status)
+        count = report.status_messages.pop(key, 0)
+        if count and key not in source_keys:
+            item.messages = item.messages[:-count]
+        return item
+
+    for index, part in enumerate(parts):
+        changed = {name for name, level in part.config.items()
+                   if not _same_policy(level, report.config[name])}
+        if changed:
+            for key, item in part.items.items():
+                if item.level in changed:
+                    take(key, index)
+
+    # References, as a full build resolves them
+    cross_links = 0
+    new_down    = {}
+    for index, key, entry in sources:
+        item   = take(key, index)
+        before = {tag.key() for tag in item.ref_up}
+        item.messages  = item.messages[:entry["messages"]]
+        item.ref_up    = []
+        item.has_error = False
+        item.unresolved_references       = []
+        item.unresolved_references_cache = set()
+        for ref in entry["refs"]:
+            item.add_tracing_target(Tracing_Tag.from_json(ref))
+        report.resolve_references(item)
+        for tag in item.ref_up:
+            if tag.key() not in before:
+                new_down.setdefault(tag.key(), []).append((index, item.tag))
+                cross_links += 1
+
+    # The items tracing to an item are in item order; those of its own
+    # report and the new ones of each other report are so already
+    for key, tags in new_down.items():
+        index = _report_of(parts, key)
+        item  = take(key, index)
+        down  = [(index, tag) for tag in item.ref_down] + tags
+        down.sort(key=lambda pair: position(pair[0], pair[1].key()))
+        item.ref_down = [tag for _, tag in down]
+
+    policies = compile_policy(report.config)
+    bits     = level_bits(report.config)
+    for key, (_, status) in affected.items():
+        item     = report.items[key]
+        coverage = report.coverage[item.level]
+        coverage.items -= 1
+        if status in _OK_STATUSES:
+            coverage.ok -= 1
+        mask = 0
+        for tag in item.ref_down:
+            mask |= bits[report.items[tag.key()].level]
+        policies[item.level].determine_statuses((item,), (mask,),
+                                                report.status_messages)
+        coverage.items += 1
+        if item.tracing_status in _OK_STATUSES:
+            coverage.ok += 1
+    report.compute_coverage_for_items()
+    report.suggest_tracing_targets()
+
+    return Merge_Result(report, cross_links, len(affected))
@@ -46,6 +46,26 @@ class MetaDataToolBase(metaclass=ABCMeta):
             version=FULL_NAME,
         )
 
+    def _add_compact_argument(self):
+        """Add the --compact flag for tools that write LOBSTER files."""
+        self._argument_parser.add_argument(
+            "--compact",
+            action="store_true",
+            default=False,
+            help="write JSON without indentation and optional whitespace; "
+                 "smaller and faster to write and read",
+        )
+
+    def _add_trust_inputs_argument(self):
+        """Add the --trust-inputs flag for tools that read LOBSTER files."""
+        self._argument_parser.add_argument(
+            "--trust-inputs",
+            action="store_true",
+            default=False,
+            help="skip validation of the input files; only use this for "
+                 "files written by this version of LOBSTER",
+        )
+
     @property
     def name(self) -> str:
         """The name of the tool, prefixed with 'lobster-'."""
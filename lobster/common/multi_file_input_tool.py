@@ -21,7 +21,7 @@ from abc import ABCMeta
 from typing import Iterable, List, Optional, Type, Union
 from lobster.common.errors import Message_Handler
 from lobster.common.items import Requirement, Implementation, Activity
-from lobster.common.io import lobster_write, ensure_output_directory
+from lobster.common.io import lobster_write, open_lobster_output
 from lobster.common.meta_data_tool_base import MetaDataToolBase
 from lobster.common.multi_file_input_config import Config
 from lobster.common.file_collector import FileCollector
@@ -117,6 +117,7 @@ class MultiFileInputTool(MetaDataToolBase, metaclass=ABCMeta):
             help="Input directories or files"
         )
         self._add_config_argument()
+        self._add_compact_argument()
 
     def _add_config_argument(self):
         self._argument_parser.add_argument(
@@ -130,9 +131,9 @@ class MultiFileInputTool(MetaDataToolBase, metaclass=ABCMeta):
             self,
             schema: Union[Type[Requirement], Type[Implementation], Type[Activity]],
             out_file: str,
-            items: List[Union[Activity, Implementation, Requirement]],
+            items: Iterable[Union[Activity, Implementation, Requirement]],
+            compact: bool = False,
     ):
-        ensure_output_directory(out_file)
-        with open(out_file, "w", encoding="UTF-8") as fd:
-            lobster_write(fd, schema, self.name, items)
-        print(f"{self.name}: wrote {len(items)} items to {out_file}")
+        with open_lobster_output(out_file, "w") as fd:
+            count = lobster_write(fd, schema, self.name, items, compact=compact)
+        print(f"{self.name}: wrote {count} items to {out_file}")
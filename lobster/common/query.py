@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+#
+# LOBSTER - Lightweight Open BMW Software Traceability Evidence Report
+# Copyright (C) 2026 Bayerische Motoren Werke Aktiengesellschaft (BMW AG)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public
+# License along with this program. If not, see
+# <https://www.gnu.org/licenses/>.
+
+# Filter expressions over the items of a report, see
+# documentation/manual-lobster_query.md.
+#
+#   query  ::= or_expr
+#   or_expr  ::= and_expr { "or" and_expr }
+#   and_expr ::= not_expr { [ "and" ] not_expr }
+#   not_expr ::= "not" not_expr | "(" or_expr ")" | FIELD (":" | "~") VALUE
+#
+# Expressions are evaluated against a Report_Index. Conditions on level,
+# status, namespace, file, key and links are answered by the index;
+# regular expressions on text are only matched against the items that
+# the other conditions of the same "and" leave over.
+
+import re
+from abc import ABCMeta, abstractmethod
+from typing import Callable, List
+
+from lobster.common.exceptions import LOBSTER_Exception
+from lobster.common.items import Tracing_Status
+from lobster.common.report_index import Report_Index, bitmap, rows_of
+
+_TOKEN = re.compile(r"""\s*(?:
+      (?P<open>\()
+    | (?P<close>\))
+    | (?P<field>[A-Za-z][A-Za-z_-]*)(?P<operator>[:~])
+      (?:"(?P<quoted>(?:[^"\\]|\\.)*)"|(?P<value>[^\s()"]+))
+    | (?P<word>[^\s()"]+)
+    )""", re.VERBOSE)
+
+# Inside quotes, only quotes and backslashes are escaped, so regular
+# expressions keep their own escapes
+_ESCAPE = re.compile(r'\\(["\\])')
+
+# Fields answered by the index, and the text fields searched with ~
+INDEX_FIELDS = ("level", "status", "namespace", "file", "key",
+                "traces-to", "traced-by")
+TEXT_FIELDS  = ("justification", "message", "text")
+
+
+class Query_Error(LOBSTER_Exception):
+    pass
+
+
+class Expression(metaclass=ABCMeta):
+    # Expressions answered by the index are cheap; the others match
+    # text row by row
+    cheap = True
+
+    @abstractmethod
+    def evaluate(self, index: Report_Index, candidates: int) -> int:
+        """Return the rows among candidates (a bitmap) that match."""
+
+
+class Or_Expression(Expression):
+    def __init__(self, operands: List[Expression]):
+        self.operands = operands
+        self.cheap    = all(operand.cheap for operand in operands)
+
+    def evaluate(self, index, candidates):
+        result = 0
+        for operand in self.operands:
+            result |= operand.evaluate(index, candidates & ~result)
+        return result
+
+
+class And_Expression(Expression):
+    def __init__(self, operands: List[Expression]):
+        # Index lookups first, so that text is matched for fewer items
+        self.operands = sorted(operands, key=lambda operand: not operand.cheap)
+        self.cheap    = all(operand.cheap for operand in operands)
+
+    def evaluate(self, index, candidates):
+        for operand in self.operands:
+            if not candidates:
+                break
+            candidates &= operand.evaluate(index, candidates)
+        return candidates
+
+
+class Not_Expression(Expression):
+    def __init__(self, operand: Expression):
+        self.operand = operand
+        self.cheap   = operand.cheap
+
+    def evaluate(self, index, candidates):
+        return candidates & ~self.operand.evaluate(index, candidates)
+
+
+class Index_Condition(Expression):
+    def __init__(self, lookup: Callable[[Report_Index], int]):
+        self.lookup = lookup
+
+    def evaluate(self, index, candidates):
+        return candidates & self.lookup(index)
+
+
+class Text_Condition(Expression):
+    cheap = False
+
+    def __init__(self, field: str, pattern: re.Pattern):
+        self.field   = field
+        self.pattern = pattern
+
+    def evaluate(self, index, candidates):
+        if self.field == "key":
+            return bitmap(row for row in rows_of(candidates)
+                          if self.pattern.search(index.keys[row]))
+        return index.matching(self.field, self.pattern.search, candidates)
+
+
+def _compile(field: str, text: str) -> re.Pattern:
+    try:
+        return re.compile(text)
+    except re.error as err:
+        raise Query_Error(f"invalid regular expression for {field}: "
+                          f"{err}") from err
+
+
+def _status(text: str) -> str:
+    name = text.upper()
+    if name not in Tracing_Status.__members__:
+        raise Query_Error(f"unknown status {text}, expected one of " +
+                          ", ".join(Tracing_Status.__members__))
+    return name
+
+
+def _condition(field: str, operator: str, value: str) -> Expression:
+    if operator == "~":
+        if field not in TEXT_FIELDS + ("key",):
+            raise Query_Error(f"{field} cannot be matched with ~, only " +
+                              ", ".join(TEXT_FIELDS + ("key",)) + " can")
+        return Text_Condition(field, _compile(field, value))
+
+    lookups = {
+        "level"     : lambda index: index.by_level(value),
+        "namespace" : lambda index: index.by_namespace(value),
+        "file"      : lambda index: index.by_file_prefix(value),
+        "key"       : lambda index: index.by_key(value),
+        "traces-to" : lambda index: index.tracing_to(value),
+        "traced-by" : lambda index: index.traced_by(value),
+    }
+    if field == "status":
+        status = _status(value)
+        return Index_Condition(lambda index: index.by_status(status))
+    if field in lookups:
+        return Index_Condition(lookups[field])
+    if field in TEXT_FIELDS:
+        raise Query_Error(f"{field} can only be matched with ~")
+    raise Query_Error(f"unknown field {field}, expected one of " +
+                      ", ".join(INDEX_FIELDS + TEXT_FIELDS))
+
+
+class Query_Parser:
+    def __init__(self, text: str):
+        self.text   = text
+        self.tokens = []
+        position    = 0
+        text        = text.rstrip()
+        while position < len(text):
+            match = _TOKEN.match(text, position)
+            if match is None or match.end() == position:
+                raise Query_Error(f"cannot parse query at column "
+                                  f"{position + 1}: {text[position:]}")
+            self.tokens.append(match)
+            position = match.end()
+        self.position = 0
+
+    def peek(self):
+        if self.position < len(self.tokens):
+            return self.tokens[self.position]
+        return None
+
+    def peek_word(self, *words) -> bool:
+        token = self.peek()
+        return token is not None and token.group("word") in words
+
+    def advance(self):
+        token = self.peek()
+        self.position += 1
+        return token
+
+    def parse(self) -> Expression:
+        if not self.tokens:
+            raise Query_Error("empty query")
+        result = self.parse_or()
+        token  = self.peek()
+        if token is not None:
+            raise Query_Error(f"unexpected {token.group().strip()} at column "
+                              f"{token.start(0) + 1 + self._indent(token)}")
+        return result
+
+    @staticmethod
+    def _indent(token) -> int:
+        text = token.group()
+        return len(text) - len(text.lstrip())
+
+    def parse_or(self) -> Expression:
+        operands = [self.parse_and()]
+        while self.peek_word("or"):
+            self.advance()
+            operands.append(self.parse_and())
+        return operands[0] if len(operands) == 1 else Or_Expression(operands)
+
+    def parse_and(self) -> Expression:
+        operands = [self.parse_not()]
+        while True:
+            token = self.peek()
+            if token is None or token.group("close") or \
+               self.peek_word("or"):
+                break
+            if self.peek_word("and"):
+                self.advance()
+            operands.append(self.parse_not())
+        return operands[0] if len(operands) == 1 else And_Expression(operands)
+
+    def parse_not(self) -> Expression:
+        token = self.advance()
+        if token is None:
+            raise Query_Error("unexpected end of query")
+        if token.group("word") == "not":
+            return Not_Expression(self.parse_not())
+        if token.group("open"):
+            result = self.parse_or()
+            close  = self.advance()
+            if close is None or not close.group("close"):
+                raise Query_Error("missing )")
+            return result
+        if token.group("field"):
+            value = token.group("value")
+            if value is None:
+                value = _ESCAPE.sub(r"\1", token.group("quoted"))
+            return _condition(token.group("field").lower(),
+                              token.group("operator"), value)
+        raise Query_Error(f"expected a condition, not "
+                          f"{token.group().strip()}")
+
+
+def parse_query(text: str) -> Expression:
+    """Parse a filter expression, raising Query_Error if it is invalid."""
+    return Query_Parser(text).parse()
+
+
+def select(index: Report_Index, text: str) -> List[int]:
+    """Return the rows of the items matching a filter expression, in
+       report order."""
+    return rows_of(parse_query(text).evaluate(index, index.all_rows))
@@ -17,15 +17,36 @@
 # License along with this program. If not, see
 # <https://www.gnu.org/licenses/>.
 import json
+import multiprocessing
 from collections import OrderedDict
+from contextlib import ExitStack, contextmanager
 from dataclasses import dataclass
+from functools import reduce
+from itertools import repeat
+from operator import or_
 
 from lobster.common.level_definition import LevelDefinition
-from lobster.common.items import Tracing_Status, Requirement, Implementation, Activity
+from lobster.common import json_backend, report_shards, report_sqlite
+from lobster.common.items import (Tracing_Status, Tracing_Tag, ITEM_CLASSES,
+                                  DEFAULT_ANCHOR_SCHEME, anchor_for_key,
+                                  check_item_json, item_key, compute_anchors,
+                                  compile_policy, level_bits)
 from lobster.common.parser import load as load_config
-from lobster.common.errors import Message_Handler
-from lobster.common.io import lobster_read, ensure_output_directory
+from lobster.common.errors import LOBSTER_Error, Message_Handler, \
+    Message_Recorder
+from lobster.common.binary_format import Binary_Format_Error
+from lobster.common.federation import mergeable_data, parse_mergeable
+from lobster.common.io import (lobster_read, add_lobster_items,
+                               iter_lobster_items, content_header_for,
+                               load_document, open_lobster_output,
+                               stream_report, write_document,
+                               DECOMPRESSION_ERRORS)
+from lobster.common.item_store import Item_Store, Lazy_Item
+from lobster.common.source_cache import Source_Cache
+from lobster.common.suggestions import suggest_targets
+from lobster.common.json_stream import Streamed_Array
 from lobster.common.location import File_Reference
+from lobster.common.trace_graph import NO_LEVEL, Trace_Graph
 
 
 @dataclass
@@ -36,6 +57,68 @@ class Coverage:
     coverage : None
 
 
+# Report schemas and versions that load_report supports
+REPORT_SCHEMAS = {("lobster-report", 2)}
+
+
+def _is_supported_report(data) -> bool:
+    return (isinstance(data, dict) and
+            isinstance(data.get("schema"), str) and
+            isinstance(data.get("version"), int) and
+            (data["schema"], data["version"]) in REPORT_SCHEMAS)
+
+
+def _iter_loaded_items(level: dict, lazy: bool, trust_inputs: bool):
+    # Yield key and item for each entry of a level of a loaded report
+    cls = ITEM_CLASSES.get(level["kind"])
+    if cls is None:
+        if level["items"]:
+            raise ValueError(f"unknown level kind '{level['kind']}'")
+        return
+
+    if lazy:
+        # The items are only built when used, but their data is checked
+        # now, as it would be by building them
+        for index, item_data in enumerate(level["items"], 1):
+            if not trust_inputs:
+                check_item_json(cls, level["name"], index, item_data)
+            yield (item_key(item_data["tag"]),
+                   Lazy_Item(level["name"], cls, item_data, trust_inputs))
+    elif trust_inputs:
+        for item in cls.from_json_many(level["name"], level["items"], 3):
+            yield item.tag.key(), item
+    else:
+        for item_data in level["items"]:
+            item = cls.from_json(level["name"], item_data, 3)
+            yield item.tag.key(), item
+
+
+def _read_source(job):
+    # Read and check the items of one source of a lobster.conf in a worker
+    # process. The items are returned as class and compact JSON of their
+    # to_json data, which the main process turns into items much faster
+    # than it would unpickle them; messages are returned to be emitted by
+    # the main process in order. The JSON is None if reading failed, and
+    # the class is None if there are no items.
+    filename, level, source_info, trust_inputs = job
+    mh = Message_Recorder()
+    try:
+        items = list(iter_lobster_items(mh, filename, level, source_info,
+                                        trust_inputs=trust_inputs))
+    except LOBSTER_Error:
+        return None, None, mh
+    kind = type(items[0]) if items else None
+    return kind, json_backend.dumps_compact([item.to_json()
+                                             for item in items]), mh
+
+
+def _items_from_entry(level, kind, data):
+    # Build the items of a source from the class (None if there are no
+    # items) and to_json data returned by _read_source or the cache. They
+    # have been checked when the source was read.
+    return kind.from_json_many(level, data, 3) if kind else []
+
+
 class Report:
     def __init__(self):
         self.mh          = Message_Handler()
@@ -45,29 +128,68 @@ class Report:
         self.custom_data = {}
         self.source_root = ""
 
-    def parse_config(self, filename):
+        # HTML anchors of the items by key, see compute_anchors
+        self.anchor_scheme = DEFAULT_ANCHOR_SCHEME
+        self.anchors       = {}
+
+        # Tracing links of all items, see graph
+        self._graph = None
+
+        # Keys of the unknown tracing targets found by resolve_references,
+        # and their "did you mean" suggestions, see suggest_tracing_targets
+        self.unknown_targets = set()
+        self.suggestions     = {}
+
+        # For each item (by key) whose references could not all be
+        # resolved: its tracing targets as read from its source, and the
+        # number of messages it had before; and the number of messages
+        # its status gave each item. See lobster.common.federation; a
+        # report loaded from a file without them is not mergeable.
+        self.unresolved      = {}
+        self.status_messages = {}
+        self.mergeable       = True
+
+    def parse_config(self, filename, trust_inputs=False, *, jobs=1,
+                     cache=None, state=None):
         """
         Function parses the lobster config file to generate a .lobster file.
         Parameters
         ----------
-        filename - configuration file
+        filename     - configuration file
+        trust_inputs - skip validation of the .lobster files, see lobster_read
+        jobs         - number of processes reading the .lobster files
+        cache        - Source_Cache to take unchanged .lobster files from
+        state        - Incremental_State to record the sources in, for a
+                       later incremental update of the report
 
         Returns - Nothing
         -------
 
         """
+        assert isinstance(jobs, int) and jobs >= 1
+        assert cache is None or isinstance(cache, Source_Cache)
 
         # Load config
         self.config = load_config(self.mh, filename)
 
         # Load requested files
-        for level in self.config:
-            for source in self.config[level].source:
-                lobster_read(self.mh, source["file"], level, self.items,
-                             source)
+        sources = [(source["file"], level, source, trust_inputs)
+                   for level in self.config
+                   for source in self.config[level].source]
+        if jobs > 1 and len(sources) > 1:
+            self._read_sources_in_parallel(sources, jobs, cache, state)
+        elif cache is not None or state is not None:
+            self._read_sources_serially(sources, cache, state)
+        else:
+            for file_name, level, source, _ in sources:
+                lobster_read(self.mh, file_name, level, self.items,
+                             source, trust_inputs=trust_inputs)
+        if cache is not None:
+            cache.evict()
 
         # Resolve references for items
         self.resolve_references_for_items()
+        self.suggest_tracing_targets()
 
         # Compute status and items count
         self.compute_item_count_and_status()
@@ -75,28 +197,175 @@ class Report:
         # Compute coverage for items
         self.compute_coverage_for_items()
 
+    def _read_sources_serially(self, sources, cache=None, state=None):
+        for job in sources:
+            file_name, level, source, trust_inputs = job
+            key = cache.key(*job) if cache else None
+            entry = cache.load(key) if key else None
+            clean = True
+            if entry is None:
+                recorder = Message_Recorder()
+                try:
+                    items = list(iter_lobster_items(
+                        recorder, file_name, level, source,
+                        trust_inputs=trust_inputs))
+                finally:
+                    recorder.replay(self.mh)
+                # Sources with messages are not cached, so that the
+                # messages are reported on every run
+                clean = not recorder.messages
+                if key and clean:
+                    cache.store(key, type(items[0]) if items else None,
+                                [item.to_json() for item in items])
+            else:
+                items = list(_items_from_entry(level, *entry))
+            if state is not None:
+                state.add_source(job, items, clean)
+            add_lobster_items(self.mh, self.items, items)
+
+    def _read_sources_in_parallel(self, sources, jobs, cache=None,
+                                  state=None):
+        # The sources are read concurrently, but merged strictly in config
+        # order, so messages and duplicate definitions are exactly those
+        # of reading them one after another. Sources found in the cache
+        # are not sent to the workers at all.
+        keys    = [cache.key(*job) if cache else None for job in sources]
+        entries = [cache.load(key) if key else None for key in keys]
+        misses  = [job for job, entry in zip(sources, entries) if entry is None]
+
+        with ExitStack() as stack:
+            results = iter(())
+            if misses:
+                pool = stack.enter_context(
+                    multiprocessing.Pool(min(jobs, len(misses))))
+                results = pool.imap(_read_source, misses)
+            for job, key, entry in zip(sources, keys, entries):
+                clean = True
+                if entry is None:
+                    kind, data, recorder = next(results)
+                    recorder.replay(self.mh)
+                    if data is None:
+                        location, _, message = recorder.messages[-1]
+                        raise LOBSTER_Error(location, message)
+                    entry = kind, json_backend.loads(data)
+                    clean = not recorder.messages
+                    if key and clean:
+                        cache.store(key, *entry)
+                items = list(_items_from_entry(job[1], *entry))
+                if state is not None:
+                    state.add_source(job, items, clean)
+                add_lobster_items(self.mh, self.items, items)
+
     def resolve_references_for_items(self):
         for src_item in self.items.values():
-            while src_item.unresolved_references:
-                dst_tag = src_item.unresolved_references.pop()
-                if dst_tag.key() not in self.items:
-                    src_item.error(f"unknown tracing target {dst_tag.key()}")
-                    continue
-                dst_item = self.items[dst_tag.key()]
-                # TODO: Check if policy allows this link
-                src_item.ref_up.append(dst_tag)
+            for dst_item in self.resolve_references(src_item):
                 dst_item.ref_down.append(src_item.tag)
+        self._graph = None
+
+    def resolve_references(self, src_item):
+        """Resolve the unresolved references of src_item against
+           self.items, and return the items it now traces to.
 
-                # Check versions match, if specified
-                if dst_tag.version is not None:
-                    if dst_item.tag.version is None:
-                        src_item.error(
-                            f"tracing destination {dst_tag.key()} is unversioned"
-                        )
-                    elif dst_tag.version != dst_item.tag.version:
-                        msg = (f"tracing destination {dst_tag.key()} has version "
-                               f"{dst_item.tag.version} (expected {dst_tag.version})")
-                        src_item.error(msg)
+        The ref_down of those items is left to the caller. If any
+        reference gives an error, the item is recorded in self.unresolved.
+        """
+        dst_items = []
+        messages  = len(src_item.messages)
+        ref_up    = len(src_item.ref_up)
+        while src_item.unresolved_references:
+            dst_tag = src_item.unresolved_references.pop()
+            if dst_tag.key() not in self.items:
+                self._record_unresolved(src_item, ref_up, messages, dst_tag)
+                src_item.error(f"unknown tracing target {dst_tag.key()}")
+                self.unknown_targets.add(dst_tag.key())
+                continue
+            dst_item = self.items[dst_tag.key()]
+            # TODO: Check if policy allows this link
+            src_item.ref_up.append(dst_tag)
+            dst_items.append(dst_item)
+
+            # Check versions match, if specified
+            if dst_tag.version is not None:
+                if dst_item.tag.version is None:
+                    self._record_unresolved(src_item, ref_up, messages)
+                    src_item.error(
+                        f"tracing destination {dst_tag.key()} is unversioned"
+                    )
+                elif dst_tag.version != dst_item.tag.version:
+                    self._record_unresolved(src_item, ref_up, messages)
+                    msg = (f"tracing destination {dst_tag.key()} has version "
+                           f"{dst_item.tag.version} (expected {dst_tag.version})")
+                    src_item.error(msg)
+        return dst_items
+
+    def _record_unresolved(self, src_item, ref_up, messages, dst_tag=None):
+        # Called on errors: up to the first one, all popped targets were
+        # added to ref_up, so the targets as read are the remaining ones
+        # followed by the popped ones in reverse
+        key = src_item.tag.key()
+        if key in self.unresolved:
+            return
+        popped = src_item.ref_up[ref_up:]
+        if dst_tag is not None:
+            popped.append(dst_tag)
+        self.unresolved[key] = {
+            "refs"     : [tag.to_json() for tag in
+                          src_item.unresolved_references + popped[::-1]],
+            "messages" : messages,
+        }
+
+    def suggest_tracing_targets(self):
+        """Find the item keys most similar to each unknown tracing target,
+           see Key_Index, and store them in self.suggestions."""
+        self.suggestions = suggest_targets(self.items.keys(),
+                                           self.unknown_targets)
+
+    @property
+    def graph(self):
+        """The tracing links of all items as a Trace_Graph.
+
+        It is built on first use, once the references are resolved (or the
+        report is loaded). Item n of self.items is node n of the graph.
+        """
+        if self._graph is None:
+            if isinstance(self.items, Item_Store):
+                self._graph = self._build_store_graph()
+            else:
+                items = list(self.items.values())
+                self._graph = Trace_Graph.build(
+                    self.items.keys(), items,
+                    [item.level for item in items],
+                    [item.ref_up for item in items],
+                    [item.ref_down for item in items],
+                    ref_key=Tracing_Tag.key)
+        return self._graph
+
+    def _build_store_graph(self):
+        # Read the links from the raw data, without building items
+        store = self.items
+        ups   = []
+        downs = []
+        for row in range(len(store)):
+            data = store.raw(row)
+            ups.append(data.get("ref_up", []))
+            downs.append(data.get("ref_down", []))
+        return Trace_Graph.build(store.keys_by_row, store.values(),
+                                 map(store.level_of, range(len(store))),
+                                 ups, downs, ref_key=item_key)
+
+    def trace_up(self, key):
+        """Return key and item (None if unknown) of everything the item
+           with the given key traces up to, in link order."""
+        graph = self.graph
+        node  = graph.node(key)
+        return [] if node is None else graph.neighbours(node, True)
+
+    def trace_down(self, key):
+        """Return key and item (None if unknown) of everything tracing to
+           the item with the given key, in link order."""
+        graph = self.graph
+        node  = graph.node(key)
+        return [] if node is None else graph.neighbours(node, False)
 
     def compute_coverage_for_items(self):
         for level_obj in self.coverage.values():
@@ -109,74 +378,308 @@ class Report:
         for level in self.config:
             coverage = Coverage(level=level, items=0, ok=0, coverage=None)
             self.coverage.update({level: coverage})
+
+        # The status of all items of a level is determined in one pass,
+        # with the policy of the level compiled once. The levels of the
+        # items tracing to an item are a mask of level bits, which only
+        # levels with breakdown requirements look at.
+        graph     = self.graph
+        policies  = compile_policy(self.config)
+        bits      = level_bits(self.config)
+        node_bits = [0 if level_id == NO_LEVEL else
+                     bits[graph.levels[level_id]]
+                     for level_id in graph.level_ids]
+        nodes_by_level = {}
+        for node, level_id in enumerate(graph.level_ids[:graph.item_count]):
+            nodes_by_level.setdefault(level_id, []).append(node)
+
+        for level_id, nodes in nodes_by_level.items():
+            name   = graph.levels[level_id]
+            policy = policies[name]
+            items  = [graph.items[node] for node in nodes]
+            if policy.chains:
+                start, targets = graph.down_start, graph.down_targets
+                masks = [reduce(or_, map(node_bits.__getitem__,
+                                         targets[start[node]:start[node + 1]]),
+                                0)
+                         for node in nodes]
+            else:
+                masks = repeat(0)
+            policy.determine_statuses(items, masks, self.status_messages)
+
+            coverage = self.coverage[name]
+            coverage.items += len(items)
+            coverage.ok    += sum(item.tracing_status in (
+                Tracing_Status.OK, Tracing_Status.JUSTIFIED) for item in items)
+
+    def _items_by_level(self):
+        # Group the items (rows, for an Item_Store) by level in one pass,
+        # keeping their order
+        if isinstance(self.items, Item_Store):
+            return self.items.rows_by_level()
+        groups = {name: [] for name in self.config}
         for item in self.items.values():
-            item.determine_status(self.config, self.items)
-            self.coverage[item.level].items += 1
-            if item.tracing_status in (Tracing_Status.OK,
-                                       Tracing_Status.JUSTIFIED):
-                self.coverage[item.level].ok += 1
+            group = groups.get(item.level)
+            if group is not None:
+                group.append(item)
+        return groups
+
+    def _level_items(self, group):
+        if isinstance(self.items, Item_Store):
+            return map(self.items.raw, group)
+        return (item.to_json() for item in group)
+
+    def _level(self, level_config, group):
+        return {
+            "name"     : level_config.name,
+            "kind"     : level_config.kind,
+            "items"    : Streamed_Array(self._level_items(group), plain=True),
+            "coverage" : self.coverage[level_config.name].coverage
+        }
 
-    def write_report(self, filename):
-
-        levels = []
-        for level_config in self.config.values():
-            level = {
-                "name"     : level_config.name,
-                "kind"     : level_config.kind,
-                "items"    : [item.to_json()
-                              for item in self.items.values()
-                              if item.level == level_config.name],
-                "coverage" : self.coverage[level_config.name].coverage
-            }
-            levels.append(level)
-
-        report = {
+    def _levels(self, groups):
+        return Streamed_Array([
+            self._level(level_config, groups.get(level_config.name, ()))
+            for level_config in self.config.values()])
+
+    def write_report(self, filename, binary=False, compact=False,
+                     content_header=False, *, sharded=False, mergeable=False):
+        """Write the report to filename.
+
+        If content_header is True, the report starts with a header holding
+        the item count and a digest of the levels, see
+        read_content_header. Computing the digest serializes all items
+        an additional time.
+
+        The items are grouped by level in one pass and each level is
+        written as it is encoded, a batch of items at a time, so the
+        report is never held in memory as a whole.
+
+        If sharded is True, the items of each level are written to a file
+        of their own (see report_shards), and filename only holds the
+        policy, the coverage of each level and the names and digests of
+        the level files. load_report can then read just some of the
+        levels, see there. With content_header, each level file gets a
+        header.
+
+        If mergeable is True, the report also holds what
+        lobster-report --merge needs, see self.unresolved.
+        """
+        if sharded:
+            report_shards.write_report(self, filename, binary, compact,
+                                       content_header, mergeable=mergeable)
+            return
+
+        groups = self._items_by_level()
+        report = {}
+        if content_header:
+            report["content"] = content_header_for(len(self.items),
+                                                   self._levels(groups))
+        report.update({
             "schema"    : "lobster-report",
             "version"   : 2,
             "generator" : "lobster_report",
-            "levels"    : levels,
+            "levels"    : self._levels(groups),
             "policy"    : {key: value.to_json()
                            for key, value in self.config.items()},
             "matrix"    : [],
-        }
+        })
+        if self.suggestions:
+            report["suggestions"] = self.suggestions
+        if mergeable:
+            report["mergeable"] = mergeable_data(self)
 
-        ensure_output_directory(filename)
-        with open(filename, "w", encoding="UTF-8") as fd:
-            json.dump(report, fd, indent=2)
-            fd.write("\n")
+        with open_lobster_output(filename, "wb" if binary else "w") as fd:
+            write_document(fd, report, binary, compact)
 
-    def load_report(self, filename):
+    def write_sqlite(self, filename, mergeable=False):
+        """Write the report to an SQLite database, see report_sqlite.
+
+        Like write_report, the items are grouped by level in one pass
+        and inserted a page at a time. See there for mergeable.
+        """
+        report_sqlite.write_report(self, filename, mergeable)
+
+    def load_report(self, filename, lazy=False, trust_inputs=False,
+                    columnar=False, *, anchor_scheme=None, levels=None,
+                    jobs=1):
+        """Load a report written by write_report.
+
+        If lazy is True, the values of self.items are Lazy_Item proxies,
+        which build the actual item only once it is used. This is much
+        cheaper for tools that only look at some of the items.
+
+        If columnar is True, self.items is an Item_Store instead of a
+        dictionary, and the items are read from the file one at a time.
+        This needs a fraction of the memory, and lets passes over all
+        items work on compact arrays.
+
+        If trust_inputs is True, the report must have been written by
+        LOBSTER itself: the top-level structure is not validated if schema
+        and version are supported, and items are built with
+        from_json_many.
+
+        If anchor_scheme is given, the anchors of all items are computed
+        right away, see compute_anchors.
+
+        If levels is given, only the items of the levels named in it are
+        loaded; all levels keep their coverage. Of a sharded report (see
+        write_report) only the files of these levels are read at all, and
+        with columnar, up to jobs of them are read at the same time by
+        worker processes.
+
+        filename may also be a database written by write_sqlite, see
+        load_sqlite.
+        """
+        if report_sqlite.is_sqlite_file(filename):
+            self.load_sqlite(filename, lazy, trust_inputs, columnar,
+                             anchor_scheme=anchor_scheme, levels=levels)
+            return
 
         loc = File_Reference(filename)
+        self._graph = None
 
         # Read and validate JSON
-        with open(filename, encoding="UTF-8") as fd:
-            try:
-                data = json.load(fd)
-            except json.decoder.JSONDecodeError as err:
-                self.mh.error(File_Reference(filename,
-                                             err.lineno,
-                                             err.colno),
-                              err.msg)
+        with self._report_read_errors(filename):
+            if columnar:
+                data = stream_report(filename)
+            else:
+                data = load_document(filename)
 
-        # Validate basic structure
-        self.validate_basic_structure_of_lobster_file(data, loc)
+        if isinstance(data, dict) and \
+           data.get("schema") == report_shards.MANIFEST_SCHEMA:
+            report_shards.load_report(self, filename, data, lazy=lazy,
+                                      trust_inputs=trust_inputs,
+                                      columnar=columnar, levels=levels,
+                                      jobs=jobs)
+            if anchor_scheme is not None:
+                self.compute_anchors(anchor_scheme)
+            return
 
-        # Validate indicated schema
-        self.validate_indicated_schema(data, loc)
+        if not (trust_inputs and _is_supported_report(data)):
+            # Validate basic structure
+            self.validate_basic_structure_of_lobster_file(data, loc)
+
+            # Validate indicated schema
+            self.validate_indicated_schema(data, loc)
 
         # Validate and parse custom data
         self.parse_custom_data(data)
+        self.parse_suggestions(data, loc)
+        parse_mergeable(self, data, loc)
 
         # Read in data
-        self.compute_items_and_coverage_for_items(data)
+        if columnar:
+            # The items are only now read from the file
+            with self._report_read_errors(filename), \
+                 self._level_errors(filename):
+                self._store_items_and_coverage(data, trust_inputs, levels)
+        else:
+            with self._level_errors(filename):
+                self.compute_items_and_coverage_for_items(data, lazy,
+                                                          trust_inputs, levels)
+
+        if anchor_scheme is not None:
+            self.compute_anchors(anchor_scheme)
+
+    def load_sqlite(self, filename, lazy=False, trust_inputs=False,
+                    columnar=False, *, anchor_scheme=None, levels=None):
+        """Load a report database written by write_sqlite.
+
+        The arguments are those of load_report. The items are read a page
+        at a time, but the report still holds them all (with columnar, as
+        their JSON data in an Item_Store).
+        """
+        self._graph = None
+        report_sqlite.load_report(self, filename, lazy=lazy,
+                                  trust_inputs=trust_inputs,
+                                  columnar=columnar, levels=levels)
+
+        if anchor_scheme is not None:
+            self.compute_anchors(anchor_scheme)
 
-    def compute_items_and_coverage_for_items(self, data):
+    def compute_anchors(self, scheme=DEFAULT_ANCHOR_SCHEME):
+        """Compute the HTML anchors of all items in one go.
+
+        The anchors only depend on the item keys, so no item is built
+        for this, not even for lazy or columnar reports.
+        """
+        self.anchor_scheme = scheme
+        self.anchors       = compute_anchors(self.items.keys(), scheme)
+
+    def anchor(self, key):
+        """Return the HTML anchor of the item with the given key."""
+        result = self.anchors.get(key)
+        if result is None:
+            result = self.anchors[key] = anchor_for_key(key,
+                                                        self.anchor_scheme)
+        return result
+
+    @contextmanager
+    def _report_read_errors(self, filename):
+        loc = File_Reference(filename)
+        try:
+            yield
+        except json.decoder.JSONDecodeError as err:
+            self.mh.error(File_Reference(filename,
+                                         err.lineno,
+                                         err.colno),
+                          err.msg)
+        except Binary_Format_Error as err:
+            self.mh.error(loc, err.message)
+        except FileNotFoundError:
+            raise
+        except DECOMPRESSION_ERRORS as err:
+            self.mh.error(loc, f"cannot read file: {err}")
+
+    @contextmanager
+    def _level_errors(self, filename):
+        # Malformed levels and items, see check_item_json
+        try:
+            yield
+        except ValueError as err:
+            self.mh.error(File_Reference(filename), str(err))
+
+    def _store_items_and_coverage(self, data, trust_inputs, levels=None):
+        self.config = {key: LevelDefinition.from_json(value)
+                       for key, value in data["policy"].items()}
+        self.items = Item_Store(trust_inputs)
+        for level in data["levels"]:
+            self._add_level_coverage(level)
+            if levels is None or level["name"] in levels:
+                self.items.add_level(level)
+            else:
+                self._count_skipped_level(level)
+        self._count_stored_items()
+
+    def _count_stored_items(self):
+        # Set the coverage of the levels with items in self.items, an
+        # Item_Store
+        counts = self.items.count_by_level((Tracing_Status.OK,
+                                            Tracing_Status.JUSTIFIED))
+        for level, (items, ok) in counts.items():
+            self.coverage[level].items = items
+            self.coverage[level].ok = ok
+
+    def _add_level_coverage(self, level, items=0, ok=0):
+        # Add the coverage of a level of a loaded report
+        if level["name"] not in self.config:
+            raise KeyError(f"level '{level['name']}' not found in config")
+        self.coverage[level["name"]] = Coverage(
+            level=level["name"], items=items, ok=ok, coverage=level["coverage"]
+        )
+
+    def compute_items_and_coverage_for_items(self, data, lazy=False,
+                                             trust_inputs=False, levels=None):
         """
         Function calculates items and coverage for the items
         Parameters
         ----------
-        data - contents of lobster json file.
+        data         - contents of lobster json file.
+        lazy         - create Lazy_Item proxies instead of items.
+        trust_inputs - build items with from_json_many.
+        levels       - names of the levels whose items are loaded, or
+                       None for all; the others are only counted.
 
         Returns - Nothing
         -------
@@ -185,38 +688,45 @@ class Report:
         self.config = {key: LevelDefinition.from_json(value)
                        for key, value in data["policy"].items()}
         for level in data["levels"]:
-            if level["name"] not in self.config:
-                raise KeyError(f"level '{level['name']}' not found in config")
-            coverage = Coverage(
-                level=level["name"], items=0, ok=0, coverage=level["coverage"]
-            )
-            self.coverage.update({level["name"]: coverage})
-
-            for item_data in level["items"]:
-                if level["kind"] == "requirements":
-                    item = Requirement.from_json(level["name"],
-                                                 item_data,
-                                                 3)
-                elif level["kind"] == "implementation":
-                    item = Implementation.from_json(level["name"],
-                                                    item_data,
-                                                    3)
-                else:
-                    if level["kind"] != "activity":
-                        raise ValueError(f"unknown level kind '{level['kind']}'")
-                    item = Activity.from_json(level["name"],
-                                              item_data,
-                                              3)
-
-                self.items[item.tag.key()] = item
-                self.coverage[item.level].items += 1
-                if item.tracing_status in (Tracing_Status.OK,
-                                           Tracing_Status.JUSTIFIED):
-                    self.coverage[item.level].ok += 1
+            self._add_level_coverage(level)
+            if levels is None or level["name"] in levels:
+                self._add_loaded_level(level, lazy, trust_inputs)
+            else:
+                self._count_skipped_level(level)
+
+    def _add_loaded_level(self, level, lazy, trust_inputs):
+        for key, item in _iter_loaded_items(level, lazy, trust_inputs):
+            self.items[key] = item
+            self.coverage[item.level].items += 1
+            if item.tracing_status in (Tracing_Status.OK,
+                                       Tracing_Status.JUSTIFIED):
+                self.coverage[item.level].ok += 1
+
+    def _count_skipped_level(self, level):
+        # The items of a level that is not loaded still count for its
+        # coverage
+        coverage = self.coverage[level["name"]]
+        items    = level["items"]
+        if isinstance(items, Streamed_Array):
+            items = items.elements
+        for item_data in items:
+            coverage.items += 1
+            if item_data.get("tracing_status") in ("OK", "JUSTIFIED"):
+                coverage.ok += 1
 
     def parse_custom_data(self, data):
         self.custom_data = data.get('custom_data', None)
 
+    def parse_suggestions(self, data, loc):
+        suggestions = data.get("suggestions", {})
+        if not isinstance(suggestions, dict) or \
+           not all(isinstance(candidates, list) and
+                   all(isinstance(key, str) for key in candidates)
+                   for candidates in suggestions.values()):
+            self.mh.error(loc, "suggestions is not an object of arrays of "
+                               "strings")
+        self.suggestions = suggestions
+
     def validate_indicated_schema(self, data, loc):
         """
         Function validates the schema and version.
@@ -0,0 +1,463 @@
+#!/usr/bin/env python3
+#
+# LOBSTER - Lightweight Open BMW Software Traceability Evidence Report
+# Copyright (C) 2026 Bayerische Motoren Werke Aktiengesellschaft (BMW AG)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public
+# License along with this program. If not, see
+# <https://www.gnu.org/licenses/>.
+
+# Secondary indexes over the items of a report, for lobster-query.
+#
+# Item n of the report is row n. Sets of rows are Python integers used
+# as bitmaps (bit n for row n), so that and, or and not of whole sets
+# are single operations on machine words. The index holds:
+#
+# * the key, level, status, namespace, file and line of each row, as
+#   arrays of ids into string tables; the rows of each level, status and
+#   namespace are bitmaps built from these arrays,
+# * the rows ordered by file name, with the start of each file, so that
+#   the rows under a path prefix are a contiguous slice,
+# * the up and down links of each row as compressed sparse rows (see
+#   Trace_Graph),
+# * the justifications, messages and text of the rows that have any, for
+#   regular expression searches.
+#
+# The index can be saved next to the report (REPORT.index) and is only
+# loaded again while the report is unchanged.
+
+import base64
+import sys
+from array import array
+from bisect import bisect_left
+from itertools import accumulate, compress
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from lobster.common import json_backend
+from lobster.common.io import file_digest
+from lobster.common.item_store import STATUSES, Item_Store, String_Table
+from lobster.common.report import Report, item_key
+from lobster.common.trace_graph import Trace_Graph
+from lobster.common.version import LOBSTER_VERSION
+
+INDEX_SUFFIX  = ".index"
+INDEX_SCHEMA  = "lobster-report-index"
+INDEX_VERSION = 1
+
+# Text fields that can be searched, and the item attributes they are
+# made of
+TEXT_FIELDS = {
+    "justification" : ("just_up", "just_down", "just_global"),
+    "message"       : ("messages",),
+    "text"          : ("text",),
+}
+
+# File and line of a row without them
+NO_FILE = -1
+NO_LINE = -1
+
+# Translates "0" and "1" to false and true bytes
+_BITS = bytes.maketrans(b"01", b"\x00\x01")
+
+# The largest character, to find all strings with a prefix by bisection
+_LAST = chr(sys.maxunicode)
+
+
+def index_file_for(report_file: str) -> str:
+    return report_file + INDEX_SUFFIX
+
+
+def _pack(values: array) -> str:
+    # Arrays are stored little endian and base64 encoded, which is much
+    # faster to read than a list of numbers
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return base64.b64encode(values.tobytes()).decode("ascii")
+
+
+def _unpack(typecode: str, text: str) -> array:
+    values = array(typecode)
+    values.frombytes(base64.b64decode(text))
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+def bitmap(rows: Iterable[int]) -> int:
+    """Return the bitmap of the given rows."""
+    rows = list(rows)
+    if len(rows) < 8:
+        mask = 0
+        for row in rows:
+            mask |= 1 << row
+        return mask
+    bits = bytearray(b"0") * (max(rows) + 1)
+    for row in rows:
+        bits[row] = 49  # "1"
+    bits.reverse()
+    return int(bits, 2)
+
+
+def rows_of(mask: int) -> List[int]:
+    """Return the rows of a bitmap, in ascending order."""
+    if not mask:
+        return []
+    bits = bin(mask)[:1:-1].encode("ascii").translate(_BITS)
+    return list(compress(range(len(bits)), bits))
+
+
+def _bitmaps(ids: array, count: int) -> List[int]:
+    # The bitmap of the rows with each id of a table of count strings.
+    # Each is made at once by translating the ids (as bytes) to "0" and
+    # "1", which keeps the work per row out of Python.
+    if count > 255:
+        groups = [[] for _ in range(count)]
+        for row, value in enumerate(ids):
+            groups[value].append(row)
+        return [bitmap(group) for group in groups]
+    data = array("B", ids).tobytes()[::-1]
+    result = []
+    for value in range(count):
+        table = bytearray(b"0") * 256
+        table[value] = 49
+        result.append(int(data.translate(table), 2) if data else 0)
+    return result
+
+
+class Report_Index:
+    """Secondary indexes over the items of a report.
+
+    Use build (from a loaded Report) or load (from a saved index), and
+    query.select or the lookup methods, which return bitmaps of rows.
+    """
+    def __init__(self):
+        self.keys          = []
+        self.levels        = String_Table()
+        self.statuses      = String_Table()
+        self.namespaces    = String_Table()
+        self.files         = String_Table()
+        self.level_ids     = array("I")
+        self.status_ids    = array("I")
+        self.namespace_ids = array("I")
+        self.file_ids      = array("i")
+        self.lines         = array("i")
+
+        # Rows ordered by file name; the rows of the file with the n-th
+        # smallest name are file_rows[file_start[n]:file_start[n + 1]]
+        self.sorted_files = []
+        self.file_start   = array("I", [0])
+        self.file_rows    = array("I")
+
+        # Links, see Trace_Graph; nodes after the rows are referenced
+        # keys that are not items
+        self.graph = Trace_Graph()
+
+        # Rows and content of the rows with text, by field
+        self.text_rows = {field: array("I") for field in TEXT_FIELDS}
+        self.texts     = {field: [] for field in TEXT_FIELDS}
+
+        self._texts_by_row   = {}
+        self._level_maps     = None
+        self._status_maps    = None
+        self._namespace_maps = None
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    @property
+    def all_rows(self) -> int:
+        return (1 << len(self.keys)) - 1
+
+    @classmethod
+    def build(cls, report: Report) -> "Report_Index":
+        """Build the index for the items of a loaded report."""
+        index = cls()
+        store = report.items if isinstance(report.items, Item_Store) \
+            else None
+        if store is not None:
+            index._copy_columns(store)
+        ups   = []
+        downs = []
+        for row, (key, level, data) in enumerate(_raw_items(report)):
+            if store is None:
+                index._add_columns(key, level, data)
+            index._add_texts(row, data)
+            ups.append(data.get("ref_up", ()))
+            downs.append(data.get("ref_down", ()))
+        index.graph = Trace_Graph.build(index.keys, index.keys,
+                                        map(index.levels.__getitem__,
+                                            index.level_ids),
+                                        ups, downs, ref_key=item_key)
+        index._sort_files()
+        return index
+
+    def _copy_columns(self, store: Item_Store):
+        # The columns of a columnar report are the same as those of the
+        # index, except that statuses are codes (see Item_Store)
+        self.keys = list(store.keys_by_row)
+        for table, other in ((self.levels, store.levels),
+                             (self.namespaces, store.namespaces),
+                             (self.files, store.files)):
+            for string in other.strings:
+                table.id(string)
+        self.level_ids     = array("I", store.level_ids)
+        self.namespace_ids = array("I", store.namespace_ids)
+        self.file_ids      = array("i", store.file_ids)
+        self.lines         = array("i", store.lines)
+
+        # NO_STATUS (-1) picks the last element
+        status_ids = [self.statuses.id(status.name) for status in STATUSES]
+        status_ids.append(self.statuses.id(""))
+        self.status_ids = array("I", map(status_ids.__getitem__,
+                                         store.status_codes))
+
+    def _add_columns(self, key: str, level: str, data: dict):
+        self.keys.append(key)
+        self.level_ids.append(self.levels.id(level))
+        self.status_ids.append(
+            self.statuses.id(data.get("tracing_status") or ""))
+        self.namespace_ids.append(self.namespaces.id(key.split(" ", 1)[0]))
+
+        location = data.get("location")
+        filename = None
+        line     = None
+        if isinstance(location, dict):
+            filename = location.get("file")
+            line     = location.get("line")
+        self.file_ids.append(self.files.id(filename)
+                             if isinstance(filename, str) else NO_FILE)
+        self.lines.append(line if isinstance(line, int) else NO_LINE)
+
+    def _add_texts(self, row: int, data: dict):
+        for field, names in TEXT_FIELDS.items():
+            parts = []
+            for name in names:
+                value = data.get(name)
+                if isinstance(value, list):
+                    parts.extend(value)
+                elif isinstance(value, str):
+                    parts.append(value)
+            if parts:
+                self.text_rows[field].append(row)
+                self.texts[field].append("\n".join(parts))
+
+    def _sort_files(self):
+        order = sorted(range(len(self.files)), key=self.files.__getitem__)
+        rank  = array("I", bytes(4 * len(order)))
+        for position, file_id in enumerate(order):
+            rank[file_id] = position
+        groups = [[] for _ in order]
+        for row, file_id in enumerate(self.file_ids):
+            if file_id != NO_FILE:
+                groups[rank[file_id]].append(row)
+        for group in groups:
+            group.sort(key=self.lines.__getitem__)
+        self.sorted_files = [self.files[file_id] for file_id in order]
+        self.file_start   = array("I", accumulate(map(len, groups),
+                                                  initial=0))
+        self.file_rows    = array("I", (row for group in groups
+                                        for row in group))
+
+    # Lookups, each returning a bitmap
+
+    def by_level(self, level: str) -> int:
+        if self._level_maps is None:
+            self._level_maps = _bitmaps(self.level_ids, len(self.levels))
+        level_id = self.levels.get(level)
+        return 0 if level_id is None else self._level_maps[level_id]
+
+    def by_status(self, status: str) -> int:
+        if self._status_maps is None:
+            self._status_maps = _bitmaps(self.status_ids,
+                                         len(self.statuses))
+        status_id = self.statuses.get(status)
+        return 0 if status_id is None else self._status_maps[status_id]
+
+    def by_namespace(self, namespace: str) -> int:
+        if self._namespace_maps is None:
+            self._namespace_maps = _bitmaps(self.namespace_ids,
+                                            len(self.namespaces))
+        namespace_id = self.namespaces.get(namespace)
+        return 0 if namespace_id is None else \
+            self._namespace_maps[namespace_id]
+
+    def by_file_prefix(self, prefix: str) -> int:
+        """Rows whose file name starts with prefix."""
+        first = bisect_left(self.sorted_files, prefix)
+        last  = bisect_left(self.sorted_files, prefix + _LAST, first)
+        return bitmap(self.file_rows[self.file_start[first]:
+                                     self.file_start[last]])
+
+    def _node(self, key: str) -> Optional[int]:
+        if " " not in key:
+            return None
+        return self.graph.node(item_key(key))
+
+    def by_key(self, key: str) -> int:
+        node = self._node(key)
+        return 0 if node is None or node >= len(self.keys) else 1 << node
+
+    def tracing_to(self, key: str) -> int:
+        """Rows that trace up to key."""
+        node = self._node(key)
+        return 0 if node is None else bitmap(self.graph.down(node))
+
+    def traced_by(self, key: str) -> int:
+        """Rows that key traces up to."""
+        node = self._node(key)
+        if node is None:
+            return 0
+        return bitmap(target for target in self.graph.up(node)
+                      if target < len(self.keys))
+
+    def matching(self, field: str, predicate, candidates: int) -> int:
+        """Rows among candidates whose text field satisfies predicate."""
+        texts = self._texts_by_row.get(field)
+        if texts is None:
+            texts = self._texts_by_row[field] = \
+                dict(zip(self.text_rows[field], self.texts[field]))
+        return bitmap(row for row in rows_of(candidates)
+                      if row in texts and predicate(texts[row]))
+
+    def describe(self, row: int) -> dict:
+        """Return the key, level, status and location of a row."""
+        file_id = self.file_ids[row]
+        line    = self.lines[row]
+        return {"key"    : self.keys[row],
+                "level"  : self.levels[self.level_ids[row]],
+                "status" : self.statuses[self.status_ids[row]] or None,
+                "file"   : None if file_id == NO_FILE else self.files[file_id],
+                "line"   : None if line == NO_LINE else line}
+
+    # Persistence
+
+    def to_json(self) -> dict:
+        graph = self.graph
+        return {
+            "keys"          : self.keys,
+            "levels"        : self.levels.strings,
+            "statuses"      : self.statuses.strings,
+            "namespaces"    : self.namespaces.strings,
+            "files"         : self.files.strings,
+            "level_ids"     : _pack(self.level_ids),
+            "status_ids"    : _pack(self.status_ids),
+            "namespace_ids" : _pack(self.namespace_ids),
+            "file_ids"      : _pack(self.file_ids),
+            "lines"         : _pack(self.lines),
+            "sorted_files"  : self.sorted_files,
+            "file_start"    : _pack(self.file_start),
+            "file_rows"     : _pack(self.file_rows),
+            "unknown_keys"  : graph.keys[len(self.keys):],
+            "up_start"      : _pack(graph.up_start),
+            "up_targets"    : _pack(graph.up_targets),
+            "down_start"    : _pack(graph.down_start),
+            "down_targets"  : _pack(graph.down_targets),
+            "text_rows"     : {field: _pack(rows)
+                               for field, rows in self.text_rows.items()},
+            "texts"         : self.texts,
+        }
+
+    @classmethod
+    def from_json(cls, data: dict) -> "Report_Index":
+        index = cls()
+        index.keys = data["keys"]
+        for table, name in ((index.levels, "levels"),
+                            (index.statuses, "statuses"),
+                            (index.namespaces, "namespaces"),
+                            (index.files, "files")):
+            for string in data[name]:
+                table.id(string)
+        index.level_ids     = _unpack("I", data["level_ids"])
+        index.status_ids    = _unpack("I", data["status_ids"])
+        index.namespace_ids = _unpack("I", data["namespace_ids"])
+        index.file_ids      = _unpack("i", data["file_ids"])
+        index.lines         = _unpack("i", data["lines"])
+        index.sorted_files  = data["sorted_files"]
+        index.file_start    = _unpack("I", data["file_start"])
+        index.file_rows     = _unpack("I", data["file_rows"])
+
+        index.graph = Trace_Graph.from_arrays(
+            index.keys + data["unknown_keys"], index.keys,
+            (_unpack("I", data["up_start"]), _unpack("I", data["up_targets"])),
+            (_unpack("I", data["down_start"]),
+             _unpack("I", data["down_targets"])))
+
+        index.text_rows = {field: _unpack("I", data["text_rows"][field])
+                           for field in TEXT_FIELDS}
+        index.texts     = {field: data["texts"][field]
+                           for field in TEXT_FIELDS}
+        return index
+
+    def save(self, report_file: str):
+        """Write the index of report_file next to it."""
+        with open(index_file_for(report_file), "w", encoding="UTF-8") as fd:
+            fd.write(json_backend.dumps_compact({
+                "schema"    : INDEX_SCHEMA,
+                "version"   : INDEX_VERSION,
+                "generator" : LOBSTER_VERSION,
+                "report"    : file_digest(report_file),
+                "index"     : self.to_json(),
+            }))
+
+    @classmethod
+    def load(cls, report_file: str) -> Optional["Report_Index"]:
+        """Return the saved index of report_file, or None if there is
+           none or it does not belong to the report as it is now."""
+        try:
+            with open(index_file_for(report_file), encoding="UTF-8") as fd:
+                data = json_backend.load(fd)
+            if (data["schema"], data["version"], data["generator"]) != \
+               (INDEX_SCHEMA, INDEX_VERSION, LOBSTER_VERSION) or \
+               data["report"] != file_digest(report_file):
+                return None
+            return cls.from_json(data["index"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+
+def _raw_items(report: Report) -> Iterator[Tuple[str, str, dict]]:
+    # Key, level and JSON data of all items, without building the items
+    # of a columnar report
+    if isinstance(report.items, Item_Store):
+        store = report.items
+        for row in range(len(store)):
+            yield store.keys_by_row[row], store.level_of(row), store.raw(row)
+    else:
+        for key, item in report.items.items():
+            yield key, item.level, item.to_json()
+
+
+def build_index(report_file: str,
+                trust_inputs: bool = False) -> Report_Index:
+    """Load a report and build its index.
+
+    The report is validated unless trust_inputs is True.
+    """
+    report = Report()
+    report.load_report(report_file, columnar=True, trust_inputs=trust_inputs)
+    return Report_Index.build(report)
+
+
+def load_index(report_file: str, trust_inputs: bool = False) -> Report_Index:
+    """Return the index of a report, from the saved index if it is up to
+       date, and otherwise built from the report and saved, if the
+       directory of the report is writable."""
+    index = Report_Index.load(report_file)
+    if index is None:
+        index = build_index(report_file, trust_inputs)
+        try:
+            index.save(report_file)
+        except OSError:
+            pass
+    return index
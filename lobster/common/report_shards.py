@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+#
+# lobster_diff - Compare two LOBSTER reports
+# Copyright (C) 2026 Bayerische Motoren Werke Aktiengesellschaft (BMW AG)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public
+# License along with this program. If not, see
+# <https://www.gnu.org/licenses/>.
+
+# Sharded reports, see documentation/schemas.md.
+#
+# The items of each level are written to a level file of their own,
+# next to the report, which then becomes a manifest: the policy, and
+# for each level its coverage, the number of items and the name and
+# digest of its level file. Report.write_report and Report.load_report
+# use write_report and load_report to write and read them.
+
+import multiprocessing
+import os
+from contextlib import ExitStack
+
+from lobster.common.federation import mergeable_data, parse_mergeable
+from lobster.common.io import (COMPRESSION_SUFFIXES, content_header_for,
+                               file_digest, load_document,
+                               open_lobster_output, stream_report,
+                               write_document)
+from lobster.common.item_store import Item_Store
+from lobster.common.json_stream import Streamed_Array
+from lobster.common.level_definition import LevelDefinition
+from lobster.common.location import File_Reference
+
+MANIFEST_SCHEMA = "lobster-report-manifest"
+SHARD_SCHEMA    = "lobster-report-shard"
+SHARDS_VERSION  = 1
+
+
+def shard_file_name(manifest: str, index: int) -> str:
+    """Return the name of the file holding level index (counting from 0)
+       of a sharded report, relative to the directory of the manifest.
+
+    The level number is inserted before the extension, e.g.
+    report.0.lobster or report.0.lobster.gz, so that the shards have
+    the encoding and compression of the manifest.
+    """
+    name = os.path.basename(manifest)
+    base, suffix = os.path.splitext(name)
+    compression = ""
+    if suffix.lower() in COMPRESSION_SUFFIXES:
+        name, compression = base, suffix
+    stem, extension = os.path.splitext(name)
+    return f"{stem}.{index}{extension}{compression}"
+
+
+def is_manifest_level(level) -> bool:
+    """Return whether level is a valid level of a manifest."""
+    return (isinstance(level, dict) and
+            all(isinstance(level.get(key), str)
+                for key in ("name", "kind", "shard", "digest")) and
+            all(isinstance(level.get(key), int) for key in ("items", "ok")))
+
+
+def shard_level(data, name: str) -> dict:
+    """Return the level of a loaded level file of a sharded report,
+       raising ValueError if it is not the level file of level name."""
+    if not (isinstance(data, dict) and
+            data.get("schema") == SHARD_SCHEMA and
+            data.get("version") == SHARDS_VERSION and
+            isinstance(data.get("levels"), list) and
+            len(data["levels"]) == 1 and
+            isinstance(data["levels"][0], dict) and
+            data["levels"][0].get("name") == name):
+        raise ValueError(f"not the level file of level {name}")
+    return data["levels"][0]
+
+
+def _read_level_store(job):
+    # Read the items of a level file into an Item_Store, in a worker
+    # process or in the main process
+    filename, name, trust_inputs = job
+    store = Item_Store(trust_inputs)
+    store.add_level(shard_level(stream_report(filename), name))
+    return store
+
+
+def write_report(report, filename: str, binary: bool, compact: bool,
+                 content_header: bool, *, mergeable: bool):
+    """Write report as a manifest and level files, see
+       Report.write_report."""
+    # pylint: disable=protected-access
+    groups    = report._items_by_level()
+    directory = os.path.dirname(filename)
+    levels    = []
+    for index, level_config in enumerate(report.config.values()):
+        group = groups.get(level_config.name, ())
+        shard = shard_file_name(filename, index)
+        path  = os.path.join(directory, shard)
+        document = {}
+        if content_header:
+            document["content"] = content_header_for(
+                len(group),
+                Streamed_Array([report._level(level_config, group)]))
+        document.update({
+            "schema"    : SHARD_SCHEMA,
+            "version"   : SHARDS_VERSION,
+            "generator" : "lobster_report",
+            "levels"    : Streamed_Array([report._level(level_config,
+                                                            group)]),
+        })
+        with open_lobster_output(path, "wb" if binary else "w") as fd:
+            write_document(fd, document, binary, compact)
+
+        coverage = report.coverage[level_config.name]
+        levels.append({
+            "name"     : level_config.name,
+            "kind"     : level_config.kind,
+            "coverage" : coverage.coverage,
+            "items"    : len(group),
+            "ok"       : coverage.ok,
+            "shard"    : shard,
+            "digest"   : file_digest(path),
+        })
+
+    manifest = {
+        "schema"    : MANIFEST_SCHEMA,
+        "version"   : SHARDS_VERSION,
+        "generator" : "lobster_report",
+        "levels"    : levels,
+        "policy"    : {key: value.to_json()
+                       for key, value in report.config.items()},
+        "matrix"    : [],
+    }
+    if report.suggestions:
+        manifest["suggestions"] = report.suggestions
+    if mergeable:
+        manifest["mergeable"] = mergeable_data(report)
+    with open_lobster_output(filename, "wb" if binary else "w") as fd:
+        write_document(fd, manifest, binary, compact)
+
+
+def validate_manifest(report, data, loc: File_Reference):
+    """Validate the manifest of a sharded report."""
+    report.validate_basic_structure_of_lobster_file(data, loc)
+    if data["version"] != SHARDS_VERSION:
+        report.mh.error(loc,
+                        f"version {data['version']} for schema "
+                        f"{data['schema']} is not supported")
+    for level in data["levels"]:
+        if not is_manifest_level(level):
+            report.mh.error(loc, "levels must be objects with name, kind, "
+                                 "items, ok, coverage, shard and digest")
+
+
+def load_report(report, filename: str, data: dict, *, lazy: bool,
+                trust_inputs: bool, columnar: bool, levels, jobs: int):
+    """Load the level files of the manifest data read from filename, or
+       those of the given levels, into report, see Report.load_report."""
+    # pylint: disable=protected-access
+    loc = File_Reference(filename)
+    if not trust_inputs:
+        validate_manifest(report, data, loc)
+    report.parse_custom_data(data)
+    report.parse_suggestions(data, loc)
+    parse_mergeable(report, data, loc)
+
+    report.config = {key: LevelDefinition.from_json(value)
+                     for key, value in data["policy"].items()}
+    names = [level["name"] for level in data["levels"]]
+    for name in levels or ():
+        if name not in names:
+            report.mh.error(loc, f"unknown level {name}")
+    wanted = []
+    for level in data["levels"]:
+        report._add_level_coverage(level, level["items"], level["ok"])
+        if levels is None or level["name"] in levels:
+            path = os.path.join(os.path.dirname(filename), level["shard"])
+            if file_digest(path) != level["digest"]:
+                report.mh.error(File_Reference(path),
+                                f"level file of {level['name']} is missing "
+                                f"or does not match {filename}")
+            wanted.append((path, level["name"], trust_inputs))
+
+    if columnar:
+        report.items = Item_Store(trust_inputs)
+        with ExitStack() as stack:
+            if jobs > 1 and len(wanted) > 1:
+                pool = stack.enter_context(
+                    multiprocessing.Pool(min(jobs, len(wanted))))
+                stores = pool.imap(_read_level_store, wanted)
+            else:
+                stores = map(_read_level_store, wanted)
+            for path, _, _ in wanted:
+                with report._report_read_errors(path), \
+                     report._level_errors(path):
+                    report.items.extend(next(stores))
+        report._count_stored_items()
+    else:
+        for path, name, _ in wanted:
+            with report._report_read_errors(path), \
+                 report._level_errors(path):
+                level = shard_level(load_document(path), name)
+                report.coverage[name].items = 0
+                report.coverage[name].ok = 0
+                report._add_loaded_level(level, lazy, trust_inputs)
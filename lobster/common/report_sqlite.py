@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+#
+# lobster_diff - Compare two LOBSTER reports
+# Copyright (C) 2026 Bayerische Motoren Werke Aktiengesellschaft (BMW AG)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public
+# License along with this program. If not, see
+# <https://www.gnu.org/licenses/>.
+
+# LOBSTER reports as SQLite databases, see documentation/schemas.md.
+#
+# Each item is a row of the items table, with its level, status,
+# namespace, file and line as columns and the rest of its JSON data as
+# text. Its links, messages and justifications are rows of separate
+# tables, so that they can be queried with SQL; in the JSON text, these
+# members are empty arrays, which keeps the order of the members. A
+# member the item does not have, such as ref_up and ref_down of an item
+# without links, stays absent, so the item reads back as it was written.
+#
+# The items of a level have consecutive row numbers, so a level is read
+# back one page (a range of rows) at a time, with the links, messages
+# and justifications of the page; the database is never read as a whole.
+# Report.write_sqlite and Report.load_sqlite use write_report and
+# load_report to write and read reports.
+
+import os
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List
+
+from lobster.common import json_backend
+from lobster.common.exceptions import LOBSTER_Exception
+from lobster.common.federation import mergeable_data, parse_mergeable
+from lobster.common.io import ensure_output_directory
+from lobster.common.items import item_key
+from lobster.common.location import File_Reference
+
+SQLITE_SCHEMA  = "lobster-report-sqlite"
+SQLITE_VERSION = 1
+
+# Number of items written or read at a time
+PAGE_SIZE = 2000
+
+_MAGIC = b"SQLite format 3\x00"
+
+# Members of the item data that are stored in tables of their own, as
+# table, kind column value and member
+LINKS          = (("up", "ref_up"), ("down", "ref_down"))
+JUSTIFICATIONS = (("up", "just_up"), ("down", "just_down"),
+                  ("global", "just_global"))
+
+_TABLES = """
+CREATE TABLE meta (
+    name        TEXT PRIMARY KEY,
+    value       TEXT NOT NULL
+);
+CREATE TABLE levels (
+    id          INTEGER PRIMARY KEY,
+    name        TEXT NOT NULL UNIQUE,
+    kind        TEXT NOT NULL,
+    policy      TEXT NOT NULL,
+    items       INTEGER NOT NULL,
+    ok          INTEGER NOT NULL,
+    coverage    REAL,
+    first_row   INTEGER NOT NULL
+);
+CREATE TABLE items (
+    row         INTEGER PRIMARY KEY,
+    key         TEXT NOT NULL,
+    level_id    INTEGER NOT NULL REFERENCES levels (id),
+    namespace   TEXT NOT NULL,
+    status      TEXT,
+    file        TEXT,
+    line        INTEGER,
+    data        TEXT NOT NULL
+);
+CREATE TABLE links (
+    item_row    INTEGER NOT NULL REFERENCES items (row),
+    direction   TEXT NOT NULL,
+    position    INTEGER NOT NULL,
+    target      TEXT NOT NULL,
+    target_key  TEXT NOT NULL
+);
+CREATE TABLE messages (
+    item_row    INTEGER NOT NULL REFERENCES items (row),
+    position    INTEGER NOT NULL,
+    message     TEXT NOT NULL
+);
+CREATE TABLE justifications (
+    item_row    INTEGER NOT NULL REFERENCES items (row),
+    kind        TEXT NOT NULL,
+    position    INTEGER NOT NULL,
+    text        TEXT NOT NULL
+);
+"""
+
+# Created once all rows are inserted, which is much faster than keeping
+# them up to date while inserting
+_INDEXES = """
+CREATE UNIQUE INDEX items_key ON items (key);
+CREATE INDEX items_level_status ON items (level_id, status);
+CREATE INDEX items_file ON items (file, line);
+CREATE INDEX links_item ON links (item_row, direction, position);
+CREATE INDEX links_target ON links (target_key, direction);
+CREATE INDEX messages_item ON messages (item_row, position);
+CREATE INDEX justifications_item ON justifications (item_row, kind, position);
+"""
+
+
+class SQLite_Report_Error(LOBSTER_Exception):
+    pass
+
+
+def is_sqlite_file(filename: str) -> bool:
+    """Return True if filename is an SQLite database."""
+    try:
+        with open(filename, "rb") as fd:
+            return fd.read(len(_MAGIC)) == _MAGIC
+    except OSError:
+        return False
+
+
+def connect_read_only(filename: str) -> sqlite3.Connection:
+    return sqlite3.connect(Path(filename).resolve().as_uri() + "?mode=ro",
+                           uri=True)
+
+
+def _pages(items: Iterable[dict]) -> Iterator[List[dict]]:
+    page = []
+    for item in items:
+        page.append(item)
+        if len(page) == PAGE_SIZE:
+            yield page
+            page = []
+    if page:
+        yield page
+
+
+class Page_Writer:
+    def __init__(self, connection: sqlite3.Connection,
+                 ref_key: Callable[[str], str]):
+        self.connection = connection
+        self.ref_key    = ref_key
+        self.row        = 0
+
+    def add_page(self, level_id: int, page: List[dict]):
+        items          = []
+        links          = []
+        messages       = []
+        justifications = []
+        for row, data in enumerate(page, self.row):
+            data = dict(data)
+            for direction, member in LINKS:
+                targets = data.get(member) or ()
+                links.extend((row, direction, position, target,
+                              self.ref_key(target))
+                             for position, target in enumerate(targets))
+                if member in data:
+                    data[member] = []
+            messages.extend((row, position, message)
+                            for position, message
+                            in enumerate(data.get("messages") or ()))
+            if "messages" in data:
+                data["messages"] = []
+            for kind, member in JUSTIFICATIONS:
+                justifications.extend(
+                    (row, kind, position, text)
+                    for position, text in enumerate(data.get(member) or ()))
+                if member in data:
+                    data[member] = []
+
+            location = data.get("location")
+            if not isinstance(location, dict):
+                location = {}
+            tag = data["tag"]
+            items.append((row, self.ref_key(tag), level_id,
+                          tag.split(" ", 1)[0], data.get("tracing_status"),
+                          location.get("file"), location.get("line"),
+                          json_backend.dumps_compact(data)))
+        self.row += len(page)
+
+        execute = self.connection.executemany
+        execute("INSERT INTO items VALUES (?, ?, ?, ?, ?, ?, ?, ?)", items)
+        execute("INSERT INTO links VALUES (?, ?, ?, ?, ?)", links)
+        execute("INSERT INTO messages VALUES (?, ?, ?)", messages)
+        execute("INSERT INTO justifications VALUES (?, ?, ?, ?)",
+                justifications)
+
+
+def write_database(filename: str, levels: Iterable[Dict[str, Any]],
+                   meta: Dict[str, Any], *,
+                   ref_key: Callable[[str], str]):
+    """Write a report to a new SQLite database.
+
+    levels are dicts with the name, kind, policy (to_json of the level
+    definition), count (of items), ok and coverage of each level, and
+    its items as an iterable of their JSON data; meta are further members of the
+    report, such as schema and suggestions. Tracing tags are turned into
+    item keys with ref_key.
+
+    The database is written to a temporary file which then replaces
+    filename, so a failure never leaves a partial database behind.
+    """
+    temporary = filename + ".tmp"
+    if os.path.exists(temporary):
+        os.remove(temporary)
+    with closing(sqlite3.connect(temporary, isolation_level=None)) \
+            as connection:
+        # Nothing needs to survive a crash before the file is complete
+        connection.execute("PRAGMA journal_mode = OFF")
+        connection.execute("PRAGMA synchronous = OFF")
+        connection.executescript(_TABLES)
+        connection.execute("BEGIN")
+        connection.executemany(
+            "INSERT INTO meta VALUES (?, ?)",
+            [("schema", SQLITE_SCHEMA), ("version", str(SQLITE_VERSION))] +
+            [(name, json_backend.dumps_compact(value))
+             for name, value in meta.items()])
+        writer = Page_Writer(connection, ref_key)
+        for level_id, level in enumerate(levels):
+            first_row = writer.row
+            for page in _pages(level["items"]):
+                writer.add_page(level_id, page)
+            connection.execute(
+                "INSERT INTO levels VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (level_id, level["name"], level["kind"],
+                 json_backend.dumps_compact(level["policy"]),
+                 level["count"],
+                 level["ok"], level["coverage"], first_row))
+        connection.execute("COMMIT")
+        connection.executescript(f"BEGIN; {_INDEXES} COMMIT;")
+    os.replace(temporary, filename)
+
+
+def _level_items(connection: sqlite3.Connection, first: int,
+                 last: int) -> Iterator[dict]:
+    # The items of rows first to last - 1, a page at a time
+    for start in range(first, last, PAGE_SIZE):
+        bounds = (start, min(start + PAGE_SIZE, last))
+        rows   = connection.execute("SELECT row, data FROM items "
+                                    "WHERE row >= ? AND row < ? "
+                                    "ORDER BY row", bounds).fetchall()
+        # Decoding the page as one array is much faster than item by item
+        items  = dict(zip((row for row, _ in rows),
+                          json_backend.loads("[" + ",".join(
+                              data for _, data in rows) + "]")))
+        for row, direction, target in connection.execute(
+                "SELECT item_row, direction, target FROM links "
+                "WHERE item_row >= ? AND item_row < ? "
+                "ORDER BY item_row, direction, position", bounds):
+            items[row]["ref_" + direction].append(target)
+        for row, message in connection.execute(
+                "SELECT item_row, message FROM messages "
+                "WHERE item_row >= ? AND item_row < ? "
+                "ORDER BY item_row, position", bounds):
+            items[row]["messages"].append(message)
+        for row, kind, text in connection.execute(
+                "SELECT item_row, kind, text FROM justifications "
+                "WHERE item_row >= ? AND item_row < ? "
+                "ORDER BY item_row, kind, position", bounds):
+            items[row]["just_" + kind].append(text)
+        yield from items.values()
+
+
+def read_database(connection: sqlite3.Connection) -> Dict[str, Any]:
+    """Return a report database as a report document, like load_document
+       would return it for a report file, except that the items of each
+       level are an iterator which reads them from the database a page at
+       a time while it is consumed. The connection must be open until
+       then.
+
+    Raises SQLite_Report_Error if the database is not a report database
+    of a supported version.
+    """
+    try:
+        meta = dict(connection.execute("SELECT name, value FROM meta"))
+    except sqlite3.DatabaseError as err:
+        raise SQLite_Report_Error(f"not a LOBSTER report database: {err}") \
+            from err
+    if meta.get("schema") != SQLITE_SCHEMA:
+        raise SQLite_Report_Error("not a LOBSTER report database")
+    if meta.get("version") != str(SQLITE_VERSION):
+        raise SQLite_Report_Error(f"version {meta.get('version')} of "
+                                  f"{SQLITE_SCHEMA} is not supported")
+
+    document = {name: json_backend.loads(value)
+                for name, value in meta.items()
+                if name not in ("schema", "version")}
+    levels = []
+    policy = {}
+    for name, kind, level_policy, items, coverage, first_row in \
+            connection.execute("SELECT name, kind, policy, items, coverage, "
+                               "first_row FROM levels ORDER BY id"):
+        levels.append({"name"     : name,
+                       "kind"     : kind,
+                       "items"    : _level_items(connection, first_row,
+                                                 first_row + items),
+                       "coverage" : coverage})
+        policy[name] = json_backend.loads(level_policy)
+    document.update({"levels": levels, "policy": policy})
+    return document
+
+
+def write_report(report, filename: str, mergeable: bool = False):
+    """Write report to a database, see Report.write_sqlite."""
+    # pylint: disable=protected-access
+    groups = report._items_by_level()
+    levels = ({"name"     : name,
+               "kind"     : level_config.kind,
+               "policy"   : level_config.to_json(),
+               "count"    : len(groups.get(name, ())),
+               "ok"       : report.coverage[name].ok,
+               "coverage" : report.coverage[name].coverage,
+               "items"    : report._level_items(groups.get(name, ()))}
+              for name, level_config in report.config.items())
+    meta = {"generator": "lobster_report"}
+    if report.suggestions:
+        meta["suggestions"] = report.suggestions
+    if mergeable:
+        meta["mergeable"] = mergeable_data(report)
+
+    ensure_output_directory(filename)
+    write_database(filename, levels, meta, ref_key=item_key)
+
+
+def load_report(report, filename: str, *, lazy: bool, trust_inputs: bool,
+                columnar: bool, levels):
+    """Load a database into report, see Report.load_sqlite."""
+    # pylint: disable=protected-access
+    loc = File_Reference(filename)
+    try:
+        with closing(connect_read_only(filename)) as connection:
+            data = read_database(connection)
+            report.parse_custom_data(data)
+            report.parse_suggestions(data, loc)
+            parse_mergeable(report, data, loc)
+            if columnar:
+                report._store_items_and_coverage(data, trust_inputs, levels)
+            else:
+                report.compute_items_and_coverage_for_items(
+                    data, lazy, trust_inputs, levels)
+    except SQLite_Report_Error as err:
+        report.mh.error(loc, err.message)
+    except ValueError as err:
+        report.mh.error(loc, str(err))
+    except sqlite3.Error as err:
+        report.mh.error(loc, f"cannot read database: {err}")
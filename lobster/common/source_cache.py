@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+#
+# LOBSTER - Lightweight Open BMW Software Traceability Evidence Report
+# Copyright (C) 2026 Bayerische Motoren Werke Aktiengesellschaft (BMW AG)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public
+# License along with this program. If not, see
+# <https://www.gnu.org/licenses/>.
+
+
+# On-disk cache of the items read from .lobster files, for
+# lobster-report --cache-dir.
+#
+# An entry holds the to_json data of all items of one source, in the
+# binary encoding, and is only written after the file has been read and
+# checked. Its name is a digest of the file content, the level, the
+# source options, whether the input was trusted and the LOBSTER version,
+# so a changed file, configuration or tool simply misses. Once all
+# sources are read, evict removes the least recently used entries (by
+# modification time, which a hit updates) while the cache is larger than
+# its size limit.
+
+import hashlib
+import os
+import tempfile
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+from lobster.common import binary_format, json_backend
+from lobster.common.items import Activity, Implementation, Item, Requirement
+from lobster.common.version import LOBSTER_VERSION
+
+DEFAULT_CACHE_SIZE = 1 << 30
+
+SUFFIX = ".lobster-cache"
+
+_KINDS = {kind.__name__: kind for kind in (Requirement, Implementation,
+                                            Activity)}
+
+# Everything that can go wrong with an entry that is damaged, or was
+# removed by another process meanwhile
+_ENTRY_ERRORS = (OSError, binary_format.Binary_Format_Error, KeyError,
+                 TypeError, ValueError)
+
+
+class Source_Cache:
+    """Cache of the items of .lobster files, in a directory."""
+    def __init__(self, directory: str, max_size: int = DEFAULT_CACHE_SIZE):
+        assert isinstance(max_size, int) and max_size >= 0
+        self.directory = directory
+        self.max_size  = max_size
+        self.hits      = 0
+        self.misses    = 0
+
+    def key(self, filename: str, level: str, source_info: Dict[str, Any],
+            trust_inputs: bool) -> Optional[str]:
+        """Return the key of the entry for a source, or None if the file
+           cannot be read (reading it reports the problem)."""
+        digest = hashlib.sha256()
+        digest.update(json_backend.dumps_compact(
+            [LOBSTER_VERSION, level, source_info, trust_inputs]).encode())
+        try:
+            with open(filename, "rb") as fd:
+                for block in iter(lambda: fd.read(1 << 20), b""):
+                    digest.update(block)
+        except OSError:
+            return None
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + SUFFIX)
+
+    def load(self, key: str) -> Optional[Tuple[Optional[Type[Item]],
+                                               List[Dict[str, Any]]]]:
+        """Return item class (None if there are no items) and to_json
+           data of the items of an entry, or None on a miss."""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as fd:
+                entry = binary_format.load(fd)
+            kind  = _KINDS[entry["kind"]] if entry["kind"] else None
+            items = entry["items"]
+            if not isinstance(items, list):
+                raise ValueError("items is not an array")
+            os.utime(path)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except _ENTRY_ERRORS:
+            # A damaged entry is dropped and written again
+            self._remove(path)
+            self.misses += 1
+            return None
+        self.hits += 1
+        return kind, items
+
+    def store(self, key: str, kind: Optional[Type[Item]],
+              items: List[Dict[str, Any]]):
+        """Store the to_json data of the items of a source.
+
+        The cache may grow beyond max_size until evict is called.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        # Write to a temporary file first, so that concurrent runs never
+        # see half an entry
+        fd, temp_name = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as out:
+                binary_format.dump({"kind"  : kind.__name__ if kind else None,
+                                    "items" : items}, out)
+            os.replace(temp_name, self._path(key))
+        except BaseException:
+            self._remove(temp_name)
+            raise
+
+    def evict(self):
+        """Remove the least recently used entries until the cache is not
+           larger than max_size.
+
+        This lists the whole directory, so it is called once after all
+        sources are read, and not for each entry stored.
+        """
+        entries = []
+        try:
+            with os.scandir(self.directory) as listing:
+                for entry in listing:
+                    if entry.name.endswith(SUFFIX):
+                        try:
+                            stat = entry.stat()
+                        except OSError:
+                            continue
+                        entries.append((stat.st_mtime_ns, stat.st_size,
+                                        entry.path))
+        except OSError:
+            return
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_size:
+                break
+            self._remove(path)
+            total -= size
+
+    @staticmethod
+    def _remove(path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+#
+# LOBSTER - Lightweight Open BMW Software Traceability Evidence Report
+# Copyright (C) 2026 Bayerische Motoren Werke Aktiengesellschaft (BMW AG)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public
+# License along with this program. If not, see
+# <https://www.gnu.org/licenses/>.
+
+# "Did you mean" suggestions for unknown tracing targets.
+#
+# Key_Index finds the item keys closest to a key that does not exist:
+# the keys with the same name in another namespace, and the keys of the
+# same namespace whose names are within a small edit distance of it.
+#
+# For the latter, the names of a namespace are cut into consecutive
+# n-grams, which are held in an inverted index built when the namespace
+# is first asked for. A name within edit distance k of another keeps at
+# least one of its n-grams unchanged if it has more than k of them, and
+# that n-gram occurs somewhere in the other name. A lookup counts, for
+# all n-grams of the unknown name, how many of them each indexed name
+# has, but only for the rarest n-grams up to a fixed number of postings,
+# so it does not get slower with the number of keys. Only the names with
+# the highest counts are compared with the unknown name.
+
+from array import array
+from collections import Counter
+from typing import Dict, Iterable, List, Mapping
+
+UNKNOWN_TARGET = "unknown tracing target "
+
+# Length of the n-grams in the index
+GRAM = 4
+
+# Number of suggestions per key
+MAX_SUGGESTIONS = 3
+
+# Number of postings a lookup counts at most; n-grams with longer
+# posting lists are too common to tell names apart anyway
+POSTING_BUDGET = 5000
+
+# Number of names with the most n-grams in common that are compared
+CANDIDATES = 8
+
+
+def _padded(name: str) -> str:
+    # Padding makes short names and the ends of names count as well
+    return f" {name} "
+
+
+def max_distance(name: str) -> int:
+    """Return the edit distance up to which names are similar to name."""
+    return 1 + len(name) // 10
+
+
+def edit_distance(text: str, other: str, limit: int) -> int:
+    """Return the Levenshtein distance of two strings, or limit + 1 if it
+       is larger than limit."""
+    if abs(len(text) - len(other)) > limit:
+        return limit + 1
+
+    # Common prefix and suffix do not change the distance, and typically
+    # leave little to compare
+    start = 0
+    while start < len(text) and start < len(other) and \
+          text[start] == other[start]:
+        start += 1
+    end = 0
+    while end < len(text) - start and end < len(other) - start and \
+          text[-1 - end] == other[-1 - end]:
+        end += 1
+    text  = text[start:len(text) - end]
+    other = other[start:len(other) - end]
+
+    # Only cells within limit of the diagonal can stay within limit
+    beyond   = limit + 1
+    previous = [min(column, beyond) for column in range(len(other) + 1)]
+    for row, char in enumerate(text, 1):
+        first   = max(1, row - limit)
+        last    = min(len(other), row + limit)
+        current = [beyond] * (len(other) + 1)
+        current[first - 1] = min(row, beyond) if first == 1 else beyond
+        for column in range(first, last + 1):
+            current[column] = min(previous[column] + 1,
+                                  current[column - 1] + 1,
+                                  previous[column - 1] +
+                                  (char != other[column - 1]))
+        if min(current[first - 1:last + 1]) > limit:
+            return beyond
+        previous = current
+    return min(previous[-1], beyond)
+
+
+class Key_Index:
+    """Index over item keys for "did you mean" suggestions."""
+    def __init__(self, keys: Iterable[str]):
+        self._names   = {}
+        self._by_name = {}
+        for key in keys:
+            namespace, name = key.split(" ", 1)
+            self._names.setdefault(namespace, []).append(name)
+            self._by_name.setdefault(name, []).append(key)
+        self._postings = {}
+
+    def _postings_of(self, namespace: str) -> Dict[str, array]:
+        postings = self._postings.get(namespace)
+        if postings is None:
+            postings = {}
+            for number, name in enumerate(self._names.get(namespace, ())):
+                text = _padded(name)
+                for start in range(0, max(len(text) - GRAM + 1, 1), GRAM):
+                    gram = text[start:start + GRAM]
+                    entries = postings.get(gram)
+                    if entries is None:
+                        entries = postings[gram] = array("I")
+                    entries.append(number)
+            self._postings[namespace] = postings
+        return postings
+
+    def suggest(self, key: str) -> List[str]:
+        """Return the keys closest to key, best first."""
+        namespace, name = key.split(" ", 1)
+
+        # The same name in other namespaces is always a good guess
+        distances = {other: 0 for other in self._by_name.get(name, ())
+                     if other != key}
+
+        postings = self._postings_of(namespace)
+        text     = _padded(name)
+        grams    = {text[start:start + GRAM]
+                    for start in range(max(len(text) - GRAM + 1, 1))}
+        counts   = Counter()
+        budget   = POSTING_BUDGET
+        for length, gram in sorted((len(postings[gram]), gram)
+                                   for gram in grams if gram in postings):
+            if length > budget:
+                break
+            budget -= length
+            counts.update(postings[gram])
+
+        names = self._names[namespace] if counts else ()
+        limit = max_distance(name)
+        for number, _ in counts.most_common(CANDIDATES):
+            distance = edit_distance(name, names[number], limit)
+            if 0 < distance <= limit:
+                distances[f"{namespace} {names[number]}"] = distance
+
+        return sorted(distances,
+                      key=lambda other: (distances[other], other))[
+                          :MAX_SUGGESTIONS]
+
+
+def suggest_targets(keys: Iterable[str],
+                    targets: Iterable[str]) -> Dict[str, List[str]]:
+    """Return the suggestions for each of the unknown targets that has
+       any, in the order of the targets."""
+    targets = sorted(set(targets))
+    if not targets:
+        return {}
+    index  = Key_Index(keys)
+    result = {}
+    for target in targets:
+        candidates = index.suggest(target)
+        if candidates:
+            result[target] = candidates
+    return result
+
+
+def with_suggestions(message: str,
+                     suggestions: Mapping[str, List[str]]) -> str:
+    """Return message, followed by the suggestions for its target if it
+       is about an unknown tracing target."""
+    if not message.startswith(UNKNOWN_TARGET):
+        return message
+    candidates = suggestions.get(message[len(UNKNOWN_TARGET):])
+    if not candidates:
+        return message
+    if len(candidates) == 1:
+        alternatives = candidates[0]
+    else:
+        alternatives = ", ".join(candidates[:-1]) + " or " + candidates[-1]
+    return f"{message} (did you mean {alternatives}?)"
@@ -29,7 +29,7 @@ import yaml
 from lobster.common.errors import Message_Handler
 from lobster.common.location import File_Reference
 from lobster.common.items import Requirement, Implementation, Activity
-from lobster.common.io import lobster_write, ensure_output_directory
+from lobster.common.io import lobster_write, open_lobster_output
 from lobster.common.meta_data_tool_base import MetaDataToolBase
 
 
@@ -105,6 +105,7 @@ class LOBSTER_Tool(MetaDataToolBase, SupportedCommonConfigKeys, metaclass=ABCMet
                   f"{self.get_formatted_help_text()}"),
             required=True
         )
+        self._add_compact_argument()
 
     def load_yaml_config(self, config_path):
         """
@@ -256,22 +257,18 @@ class LOBSTER_Tool(MetaDataToolBase, SupportedCommonConfigKeys, metaclass=ABCMet
     def write_output(
             self,
             options: argparse.Namespace,
-            items: List[Union[Activity, Implementation, Requirement]],
+            items: Iterable[Union[Activity, Implementation, Requirement]],
     ):
         assert isinstance(options, argparse.Namespace)
-        assert isinstance(items, list)
-        assert all(isinstance(item, (Requirement,
-                                     Implementation,
-                                     Activity))
-                   for item in items)
 
         if options.out:
-            ensure_output_directory(options.out)
-            with open(options.out, "w", encoding="UTF-8") as fd:
-                lobster_write(fd, self.schema, self.name, items)
-            print(f"{self.name}: wrote {len(items)} items to {options.out}")
+            with open_lobster_output(options.out, "w") as fd:
+                count = lobster_write(fd, self.schema, self.name, items,
+                                      compact=options.compact)
+            print(f"{self.name}: wrote {count} items to {options.out}")
         else:
-            lobster_write(sys.stdout, self.schema, self.name, items)
+            lobster_write(sys.stdout, self.schema, self.name, items,
+                          compact=options.compact)
 
     @abstractmethod
     def process_tool_options(
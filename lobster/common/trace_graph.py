@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+#
+# LOBSTER - Lightweight Open BMW Software Traceability Evidence Report
+# Copyright (C) 2026 Bayerische Motoren Werke Aktiengesellschaft (BMW AG)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public
+# License along with this program. If not, see
+# <https://www.gnu.org/licenses/>.
+
+
+# The tracing links between the items of a report, as a graph over
+# dense integer node ids.
+#
+# Item n of the report is node n. References to keys that are not an
+# item of the report get the nodes after the items; they only have a
+# key. The up links of node n are up_targets[up_start[n]:up_start[n + 1]]
+# and likewise for down links (compressed sparse rows), so following a
+# link is indexing an array instead of looking up a key.
+
+from array import array
+from itertools import accumulate, chain
+from typing import (Any, Callable, Iterable, List, Optional, Sequence,
+                    Tuple)
+
+from lobster.common.item_store import String_Table
+
+# Level id of nodes that are not items
+NO_LEVEL = -1
+
+
+class Trace_Graph:
+    """Up and down links of the items of a report, by node id."""
+    def __init__(self):
+        self.keys         = []
+        self.items        = []
+        self.levels       = String_Table()
+        self.level_ids    = array("i")
+        self.up_start     = array("I", [0])
+        self.up_targets   = array("I")
+        self.down_start   = array("I", [0])
+        self.down_targets = array("I")
+        self._ids         = {}
+        self._pairs       = None
+
+    @classmethod
+    def build(cls,
+              keys: Sequence[str],
+              items: Sequence[Any],
+              levels: Iterable[str],
+              ups: Sequence[Sequence[Any]],
+              downs: Sequence[Sequence[Any]],
+              *,
+              ref_key: Optional[Callable[[Any], str]] = None):
+        """Build the graph from the keys, items and levels of all items,
+           in report order, and for each item the references it traces
+           up to (ups) and the references tracing to it (downs).
+
+        References are keys, or are turned into keys with ref_key.
+        """
+        graph = cls()
+        graph.keys  = list(keys)
+        graph.items = list(items)
+        graph._ids  = dict(zip(graph.keys, range(len(graph.keys))))
+        graph.level_ids = array("i", map(graph.levels.id, levels))
+
+        # All links are resolved in bulk; only references to unknown
+        # items need a look at each one
+        for lists, start, targets in ((ups, graph.up_start, graph.up_targets),
+                                      (downs, graph.down_start,
+                                       graph.down_targets)):
+            refs = chain.from_iterable(lists)
+            if ref_key is not None:
+                refs = map(ref_key, refs)
+            refs  = list(refs)
+            nodes = list(map(graph._ids.get, refs))
+            if None in nodes:
+                nodes = [graph._node_for(ref) if node is None else node
+                         for ref, node in zip(refs, nodes)]
+            targets.extend(nodes)
+            start.extend(accumulate(map(len, lists)))
+
+        # Nodes of unknown items have no links
+        missing = len(graph.keys) - len(graph.items)
+        graph.up_start.extend([len(graph.up_targets)] * missing)
+        graph.down_start.extend([len(graph.down_targets)] * missing)
+        return graph
+
+    @classmethod
+    def from_arrays(cls,
+                    keys: Sequence[str],
+                    items: Sequence[Any],
+                    up: Tuple[array, array],
+                    down: Tuple[array, array]):
+        """Rebuild a graph from the keys, items and the (start, targets)
+           arrays of its up and down links, e.g. as saved by
+           Report_Index. Levels are not kept."""
+        graph = cls()
+        graph.keys  = list(keys)
+        graph.items = list(items)
+        graph._ids  = dict(zip(graph.keys, range(len(graph.keys))))
+        graph.level_ids = array("i", [NO_LEVEL]) * len(graph.keys)
+        graph.up_start, graph.up_targets     = up
+        graph.down_start, graph.down_targets = down
+        return graph
+
+    def _node_for(self, key: str) -> int:
+        node = self._ids.get(key)
+        if node is None:
+            node = self._ids[key] = len(self.keys)
+            self.keys.append(key)
+            self.level_ids.append(NO_LEVEL)
+        return node
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    @property
+    def item_count(self) -> int:
+        return len(self.items)
+
+    def node(self, key: str) -> Optional[int]:
+        """Return the node of key, or None if nothing links to it."""
+        return self._ids.get(key)
+
+    def item(self, node: int):
+        """Return the item of node, or None for an unknown item."""
+        return self.items[node] if node < len(self.items) else None
+
+    def level_of(self, node: int) -> Optional[str]:
+        level_id = self.level_ids[node]
+        return None if level_id == NO_LEVEL else self.levels[level_id]
+
+    def up(self, node: int) -> Sequence[int]:
+        """Return the nodes node traces up to, in link order."""
+        return self.up_targets[self.up_start[node]:self.up_start[node + 1]]
+
+    def down(self, node: int) -> Sequence[int]:
+        """Return the nodes tracing to node, in link order."""
+        return self.down_targets[self.down_start[node]:
+                                 self.down_start[node + 1]]
+
+    def down_levels(self, node: int) -> List[str]:
+        """Return the levels of the items tracing to node."""
+        level_ids = self.level_ids
+        return [self.levels[level_ids[target]]
+                for target in self.down(node)
+                if level_ids[target] != NO_LEVEL]
+
+    def neighbours(self, node: int, up: bool) -> List[Tuple[str, Any]]:
+        """Return key and item (None if unknown) of the nodes node traces
+           up to, or of the nodes tracing to node if up is False."""
+        if up:
+            start, targets = self.up_start, self.up_targets
+        else:
+            start, targets = self.down_start, self.down_targets
+        if self._pairs is None:
+            self._pairs = list(zip(self.keys, self.items))
+            self._pairs.extend((key, None)
+                               for key in self.keys[len(self.items):])
+        return list(map(self._pairs.__getitem__,
+                        targets[start[node]:start[node + 1]]))
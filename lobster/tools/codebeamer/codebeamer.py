@@ -36,7 +36,8 @@ import os
 import sys
 import argparse
 import netrc
-from typing import Dict, Iterable, List, Optional, Sequence, TextIO, Union
+from typing import (ContextManager, Dict, Iterable, List, Optional, Sequence,
+                    TextIO, Union)
 from urllib.parse import quote, urlparse
 from enum import Enum
 from http import HTTPStatus
@@ -51,10 +52,12 @@ from requests.exceptions import (
 import yaml
 from urllib3.util.retry import Retry
 
+from lobster.common import json_backend
 from lobster.common.items import Tracing_Tag, Requirement, Implementation, Activity
 from lobster.common.location import Codebeamer_Reference
 from lobster.common.errors import Message_Handler, LOBSTER_Error
-from lobster.common.io import lobster_read, lobster_write, ensure_output_directory
+from lobster.common.io import (lobster_read, lobster_write,
+                               open_lobster_output)
 from lobster.common.meta_data_tool_base import MetaDataToolBase
 from lobster.tools.codebeamer.bearer_auth import BearerAuth
 from lobster.tools.codebeamer.config import AuthenticationConfig, Config
@@ -98,7 +101,7 @@ def get_authentication(cb_auth_config: AuthenticationConfig) -> requests.auth.Au
 
 def _get_response_message(response: requests.Response) -> str:
     try:
-        data = response.json()
+        data = json_backend.loads(response.content)
         if isinstance(data, dict) and "message" in data:
             return data["message"]
     except ValueError:
@@ -173,7 +176,7 @@ def query_cb_single(cb_config: Config, url: str):
         ) from ex
 
     if response.status_code == 200:
-        return response.json()
+        return json_backend.loads(response.content)
 
     error_message = _get_response_message(response)
     reason = _get_http_reason(response)
@@ -582,6 +585,7 @@ class CodebeamerTool(MetaDataToolBase):
             help=("Name of output file"),
             default="codebeamer.lobster",
         )
+        self._add_compact_argument()
 
     def _run_impl(self, options: argparse.Namespace) -> int:
         try:
@@ -617,6 +621,8 @@ class CodebeamerTool(MetaDataToolBase):
 
         if cb_config.out is None:
             cb_config.out = options.out
+        if options.compact:
+            cb_config.compact = True
 
         update_authentication_parameters(cb_config.cb_auth_conf)
 
@@ -683,16 +689,16 @@ class CodebeamerTool(MetaDataToolBase):
             print(f"Written {len(items)} requirements to {cb_config.out}")
 
 
-def _get_out_stream(config_out: Optional[str]) -> TextIO:
+def _get_out_stream(config_out: Optional[str]) -> ContextManager[TextIO]:
     if config_out:
-        ensure_output_directory(config_out)
-        return open(config_out, "w", encoding="UTF-8")
+        return open_lobster_output(config_out, "w")
     return sys.stdout
 
 
 def _cb_items_to_lobster(items: List[Dict], config: Config, out_file: TextIO) -> None:
     schema_config = get_schema_config(config)
-    lobster_write(out_file, schema_config["class"], TOOL_NAME.replace("-", "_"), items)
+    lobster_write(out_file, schema_config["class"], TOOL_NAME.replace("-", "_"), items,
+                  compact=config.compact)
 
 
 def lobster_codebeamer(config: Config, out_file: str) -> None:
@@ -701,8 +707,7 @@ def lobster_codebeamer(config: Config, out_file: str) -> None:
     """
     # This is an API function.
     items = get_query(config, config.import_query)
-    ensure_output_directory(out_file)
-    with open(out_file, "w", encoding="UTF-8") as fd:
+    with open_lobster_output(out_file, "w") as fd:
         _cb_items_to_lobster(items, config, fd)
 
 
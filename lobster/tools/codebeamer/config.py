@@ -24,6 +24,7 @@ class Config:
     timeout: int
     out: str
     cb_auth_conf: AuthenticationConfig
+    compact: bool = False
 
     @property
     def base(self) -> str:
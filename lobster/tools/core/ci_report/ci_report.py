@@ -24,6 +24,7 @@ from typing import Optional, Sequence
 from lobster.common.report import Report
 from lobster.common.items import Tracing_Status
 from lobster.common.meta_data_tool_base import MetaDataToolBase
+from lobster.common.suggestions import with_suggestions
 
 
 class CiReportTool(MetaDataToolBase):
@@ -39,6 +40,16 @@ class CiReportTool(MetaDataToolBase):
             nargs="?",
             default="report.lobster",
         )
+        self._add_trust_inputs_argument()
+        self._argument_parser.add_argument(
+            "--level",
+            metavar="NAME",
+            action="append",
+            default=None,
+            help="only check the items of level NAME (can be given more "
+                 "than once); of a sharded report, only the files of these "
+                 "levels are read",
+        )
 
     def _run_impl(self, options: Namespace) -> int:
         if not os.path.isfile(options.lobster_report):
@@ -47,17 +58,20 @@ class CiReportTool(MetaDataToolBase):
             else:
                 self._argument_parser.error(f"{options.lobster_report} is not a file")
 
+        # Only items with issues are built, the others are just counted
         report = Report()
-        report.load_report(options.lobster_report)
+        report.load_report(options.lobster_report, columnar=True,
+                           trust_inputs=options.trust_inputs,
+                           levels=options.level)
 
-        for uid in sorted(report.items):
+        for uid in sorted(report.items.select(
+                statuses=(Tracing_Status.OK, Tracing_Status.JUSTIFIED),
+                exclude=True)):
             item = report.items[uid]
-            if item.tracing_status not in (Tracing_Status.OK,
-                                           Tracing_Status.JUSTIFIED):
-                for message in item.messages:
-                    report.mh.error(item.location,
-                                    message,
-                                    fatal = False)
+            for message in item.messages:
+                report.mh.error(item.location,
+                                with_suggestions(message, report.suggestions),
+                                fatal = False)
 
         if report.mh.errors:
             return 1
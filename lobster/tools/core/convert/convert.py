@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+#
+# lobster_convert - Convert LOBSTER files between JSON and binary encoding
+# Copyright (C) 2026 Bayerische Motoren Werke Aktiengesellschaft (BMW AG)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public
+# License along with this program. If not, see
+# <https://www.gnu.org/licenses/>.
+
+from argparse import Namespace
+import json
+import os
+from typing import Optional, Sequence
+
+from lobster.common.binary_format import Binary_Format_Error
+from lobster.common.io import (DECOMPRESSION_ERRORS, is_binary_lobster_file,
+                               open_lobster_output, stream_document,
+                               write_document)
+from lobster.common.meta_data_tool_base import MetaDataToolBase
+
+ENCODINGS = ("json", "binary")
+
+
+class ConvertTool(MetaDataToolBase):
+    def __init__(self):
+        super().__init__(
+            name="convert",
+            description="Convert a LOBSTER file between the JSON and the "
+                        "binary encoding",
+            official=True,
+        )
+        self._argument_parser.add_argument(
+            "input",
+            metavar="FILE",
+            help="LOBSTER file (any schema) in either encoding, optionally "
+                 "compressed",
+        )
+        self._argument_parser.add_argument(
+            "--out",
+            metavar="FILE",
+            required=True,
+        )
+        self._argument_parser.add_argument(
+            "--to",
+            choices=ENCODINGS,
+            default=None,
+            help="encoding of the output file; by default the encoding "
+                 "the input file is not in",
+        )
+        self._add_compact_argument()
+
+    def _run_impl(self, options: Namespace) -> int:
+        if not os.path.isfile(options.input):
+            self._argument_parser.error(f"{options.input} is not a file")
+        if os.path.exists(options.out) and \
+           os.path.samefile(options.input, options.out):
+            self._argument_parser.error("input and output must be different "
+                                        "files")
+
+        try:
+            lobster_convert(options.input, options.out, options.to,
+                            options.compact)
+            return 0
+        except json.JSONDecodeError as err:
+            print(f"{options.input}:{err.lineno}:{err.colno}: {err.msg}")
+        except Binary_Format_Error as err:
+            print(f"{options.input}: {err.message}")
+        except DECOMPRESSION_ERRORS as err:
+            print(f"{options.input}: cannot read file: {err}")
+
+        print(f"{self.name}: aborting due to earlier errors.")
+        return 1
+
+
+def lobster_convert(input_file: str, output_file: str,
+                    encoding: Optional[str] = None,
+                    compact: bool = False):
+    # This is an API function to convert a LOBSTER file. The items are
+    # converted one at a time, so the file is never loaded completely.
+    # An error in the input leaves output_file as it was, see
+    # open_lobster_output.
+    if encoding is None:
+        encoding = "json" if is_binary_lobster_file(input_file) else "binary"
+    assert encoding in ENCODINGS
+
+    document = stream_document(input_file)
+    binary = encoding == "binary"
+    with open_lobster_output(output_file, "wb" if binary else "w") as fd:
+        write_document(fd, document, binary, compact)
+
+
+def main(args: Optional[Sequence[str]] = None) -> int:
+    return ConvertTool().run(args)
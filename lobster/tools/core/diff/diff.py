@@ -0,0 +1,438 @@
+#!/usr/bin/env python3
+#
+# lobster_diff - Compare two LOBSTER reports
+# Copyright (C) 2026 Bayerische Motoren Werke Aktiengesellschaft (BMW AG)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public
+# License along with this program. If not, see
+# <https://www.gnu.org/licenses/>.
+
+# Both reports are read one item at a time. Each item is reduced to a
+# record of its key, level, status, upward links and a digest of the
+# rest of its content. The records are sorted by key in runs of at most
+# chunk_size records, which are written to temporary files if there is
+# more than one, and merged again; the two sorted streams are then
+# compared in a single merge pass. The changes are spooled to a
+# temporary file as well, so that the summary can precede them in the
+# output. Memory use therefore depends on chunk_size, not on the size
+# of the reports.
+#
+# Sharded reports are read level file by level file, and report
+# databases a page of items at a time.
+
+from argparse import Namespace
+import hashlib
+import heapq
+import json
+import os.path
+import sqlite3
+import tempfile
+from contextlib import closing, contextmanager
+from dataclasses import dataclass, field
+from operator import itemgetter
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+
+from lobster.common import json_backend
+from lobster.common.binary_format import Binary_Format_Error
+from lobster.common.exceptions import LOBSTER_Exception
+from lobster.common.io import (DECOMPRESSION_ERRORS, open_lobster_output,
+                               stream_document, write_document)
+from lobster.common.json_stream import Streamed_Array
+from lobster.common.meta_data_tool_base import MetaDataToolBase
+from lobster.common.report import REPORT_SCHEMAS, item_key
+from lobster.common.report_shards import (MANIFEST_SCHEMA, SHARDS_VERSION,
+                                          is_manifest_level, shard_level)
+from lobster.common.report_sqlite import (SQLite_Report_Error,
+                                          connect_read_only, is_sqlite_file,
+                                          read_database)
+
+DEFAULT_CHUNK_SIZE = 250000
+
+OK_STATUSES = ("OK", "JUSTIFIED")
+
+_KEY = itemgetter(0)
+
+
+@dataclass
+class Level_Counts:
+    items    : int = 0
+    ok       : int = 0
+    coverage : Optional[float] = None
+
+    def to_json(self) -> dict:
+        return {"items"    : self.items,
+                "ok"       : self.ok,
+                "coverage" : self.coverage}
+
+
+@dataclass
+class Diff_Summary:
+    # Counts of the levels of the old and new report, by level name
+    old_levels      : Dict[str, Level_Counts] = field(default_factory=dict)
+    new_levels      : Dict[str, Level_Counts] = field(default_factory=dict)
+    added           : int = 0
+    removed         : int = 0
+    status_changes  : int = 0
+    links_added     : int = 0
+    links_removed   : int = 0
+    content_changes : int = 0
+
+    def count(self, change: dict):
+        if change["change"] == "added":
+            self.added += 1
+        elif change["change"] == "removed":
+            self.removed += 1
+        if "old_status" in change:
+            self.status_changes += 1
+        self.links_added   += len(change.get("links_added", ()))
+        self.links_removed += len(change.get("links_removed", ()))
+        if change.get("content_changed"):
+            self.content_changes += 1
+
+    def levels_to_json(self) -> List[dict]:
+        names = list(self.new_levels)
+        names += [name for name in self.old_levels if name not in names]
+        return [{"name" : name,
+                 "old"  : self._counts(self.old_levels, name),
+                 "new"  : self._counts(self.new_levels, name)}
+                for name in names]
+
+    @staticmethod
+    def _counts(levels, name) -> Optional[dict]:
+        return levels[name].to_json() if name in levels else None
+
+    def to_json(self) -> dict:
+        return {"added"           : self.added,
+                "removed"         : self.removed,
+                "status_changes"  : self.status_changes,
+                "links_added"     : self.links_added,
+                "links_removed"   : self.links_removed,
+                "content_changes" : self.content_changes}
+
+
+def _record(level: str, data: dict) -> list:
+    # The record an item is compared by; data is consumed. The digest
+    # covers everything but the status and the links, which are compared
+    # on their own (ref_down is just the reverse of the ref_up of others)
+    status = data.pop("tracing_status", None)
+    refs   = data.pop("ref_up", ())
+    data.pop("ref_down", None)
+    digest = hashlib.blake2b(json_backend.dumps_compact(data).encode("UTF-8"),
+                             digest_size=16).hexdigest()
+    return [item_key(data["tag"]), level, status, sorted(refs), digest]
+
+
+def _spill(records: list, directory: str) -> str:
+    records.sort(key=_KEY)
+    fd, filename = tempfile.mkstemp(dir=directory, suffix=".run")
+    with os.fdopen(fd, "w", encoding="UTF-8") as run:
+        for record in records:
+            run.write(json_backend.dumps_compact(record))
+            run.write("\n")
+    return filename
+
+
+def _read_run(filename: str) -> Iterator[list]:
+    with open(filename, encoding="UTF-8") as run:
+        for line in run:
+            yield json_backend.loads(line)
+
+
+@contextmanager
+def _read_errors(filename: str):
+    # Report the errors of reading a report file as LOBSTER_Exception
+    try:
+        yield
+    except json.JSONDecodeError as err:
+        raise LOBSTER_Exception(
+            f"{filename}:{err.lineno}:{err.colno}: {err.msg}") from err
+    except UnicodeDecodeError as err:
+        raise LOBSTER_Exception(
+            f"{filename} is not a LOBSTER report") from err
+    except Binary_Format_Error as err:
+        raise LOBSTER_Exception(f"{filename}: {err.message}") from err
+    except DECOMPRESSION_ERRORS as err:
+        raise LOBSTER_Exception(
+            f"{filename}: cannot read file: {err}") from err
+    except (KeyError, TypeError, ValueError) as err:
+        raise LOBSTER_Exception(
+            f"{filename}: malformed report ({err})") from err
+
+
+def _sorted_records(filename: str, levels: Dict[str, Level_Counts],
+                    directory: str, chunk_size: int) -> Iterator[list]:
+    # Read all items of a report, count them by level, and return their
+    # records sorted by key
+    if is_sqlite_file(filename):
+        try:
+            with _read_errors(filename), \
+                 closing(connect_read_only(filename)) as connection:
+                return _read_records(read_database(connection)["levels"],
+                                     levels, directory, chunk_size)
+        except SQLite_Report_Error as err:
+            raise LOBSTER_Exception(f"{filename}: {err.message}") from err
+        except sqlite3.Error as err:
+            raise LOBSTER_Exception(
+                f"{filename}: cannot read database: {err}") from err
+
+    with _read_errors(filename):
+        data = stream_document(filename)
+        schema = ((data.get("schema"), data.get("version"))
+                  if isinstance(data, dict) else None)
+        if schema == (MANIFEST_SCHEMA, SHARDS_VERSION):
+            return _read_records(_shard_levels(filename, data), levels,
+                                 directory, chunk_size)
+        if schema not in REPORT_SCHEMAS:
+            raise LOBSTER_Exception(f"{filename} is not a LOBSTER report")
+        return _read_records(_elements(data["levels"]), levels, directory,
+                             chunk_size)
+
+
+def _elements(value) -> Iterable:
+    if isinstance(value, Streamed_Array):
+        return value.elements
+    return value
+
+
+def _shard_levels(filename: str, manifest: dict) -> Iterator[dict]:
+    # The levels of a sharded report, each read from its level file
+    # while its items are consumed
+    for level in manifest["levels"]:
+        if not is_manifest_level(level):
+            raise LOBSTER_Exception(f"{filename}: malformed report")
+        shard = os.path.join(os.path.dirname(filename), level["shard"])
+        with _read_errors(shard):
+            data = stream_document(shard)
+            if isinstance(data, dict):
+                data["levels"] = list(_elements(data.get("levels")))
+            shard_data = shard_level(data, level["name"])
+        yield dict(shard_data,
+                   items=_checked_items(shard, shard_data["items"]))
+
+
+def _checked_items(filename: str, items) -> Iterator[dict]:
+    # The items of a level file; they are read while they are consumed,
+    # so errors have to be reported here
+    with _read_errors(filename):
+        yield from _elements(items)
+
+
+def _read_records(levels_data, levels, directory, chunk_size):
+    runs    = []
+    records = []
+    for level in levels_data:
+        counts = levels[level["name"]] = Level_Counts(
+            coverage=level.get("coverage"))
+        for item in _elements(level["items"]):
+            counts.items += 1
+            if item.get("tracing_status") in OK_STATUSES:
+                counts.ok += 1
+            records.append(_record(level["name"], item))
+            if len(records) >= chunk_size:
+                runs.append(_spill(records, directory))
+                records = []
+
+    if not runs:
+        records.sort(key=_KEY)
+        return iter(records)
+    runs.append(_spill(records, directory))
+    return heapq.merge(*map(_read_run, runs), key=_KEY)
+
+
+def _compare(old: list, new: list) -> Optional[dict]:
+    # The change of an item in both reports, or None if there is none
+    key, level, status, refs, digest = new
+    differences = {}
+    if old[1] != level:
+        differences["old_level"] = old[1]
+    if old[2] != status:
+        differences["old_status"] = old[2]
+    old_refs = set(old[3])
+    new_refs = set(refs)
+    added    = [ref for ref in refs if ref not in old_refs]
+    removed  = [ref for ref in old[3] if ref not in new_refs]
+    if added:
+        differences["links_added"] = added
+    if removed:
+        differences["links_removed"] = removed
+    if old[4] != digest:
+        differences["content_changed"] = True
+    if not differences:
+        return None
+    change = {"key": key, "change": "changed", "level": level,
+              "status": status}
+    change.update(differences)
+    return change
+
+
+def _one_sided(kind: str, record: list) -> dict:
+    key, level, status, refs, _ = record
+    change = {"key": key, "change": kind, "level": level, "status": status}
+    if refs:
+        change["links_added" if kind == "added" else "links_removed"] = refs
+    return change
+
+
+def _merge(old: Iterator[list], new: Iterator[list]) -> Iterator[dict]:
+    # Compare two streams of records sorted by key
+    old_record = next(old, None)
+    new_record = next(new, None)
+    while old_record is not None or new_record is not None:
+        if new_record is None or \
+           (old_record is not None and old_record[0] < new_record[0]):
+            yield _one_sided("removed", old_record)
+            old_record = next(old, None)
+        elif old_record is None or new_record[0] < old_record[0]:
+            yield _one_sided("added", new_record)
+            new_record = next(new, None)
+        else:
+            change = _compare(old_record, new_record)
+            if change is not None:
+                yield change
+            old_record = next(old, None)
+            new_record = next(new, None)
+
+
+def _read_spool(filename: str) -> Iterator[dict]:
+    with open(filename, encoding="UTF-8") as spool:
+        for line in spool:
+            yield json_backend.loads(line)
+
+
+def lobster_diff(old_file: str, new_file: str,
+                 out_file: Optional[str] = None, compact: bool = False,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE) -> Diff_Summary:
+    # This is an API function to compare two reports. The changes, one
+    # per item that differs and in the order of the item keys, are
+    # written to out_file (if given) after the summary.
+    assert chunk_size >= 1
+    summary = Diff_Summary()
+    with tempfile.TemporaryDirectory() as directory:
+        old = _sorted_records(old_file, summary.old_levels, directory,
+                              chunk_size)
+        new = _sorted_records(new_file, summary.new_levels, directory,
+                              chunk_size)
+
+        if out_file is None:
+            for change in _merge(old, new):
+                summary.count(change)
+            return summary
+
+        spool_file = os.path.join(directory, "changes")
+        with open(spool_file, "w", encoding="UTF-8") as spool:
+            for change in _merge(old, new):
+                summary.count(change)
+                spool.write(json_backend.dumps_compact(change))
+                spool.write("\n")
+
+        document = {
+            "schema"    : "lobster-diff",
+            "version"   : 1,
+            "generator" : "lobster_diff",
+            "old"       : old_file,
+            "new"       : new_file,
+            "summary"   : summary.to_json(),
+            "levels"    : summary.levels_to_json(),
+            "changes"   : Streamed_Array(_read_spool(spool_file),
+                                         plain=True),
+        }
+        with open_lobster_output(out_file, "w") as fd:
+            write_document(fd, document, compact=compact)
+
+    return summary
+
+
+def _percent(value: Optional[float]) -> str:
+    return "-" if value is None else f"{value:.1f}%"
+
+
+def format_summary(summary: Diff_Summary) -> str:
+    """Return a human readable summary of the differences."""
+    rows = [["Level", "Items", "OK", "Coverage"]]
+    for level in summary.levels_to_json():
+        row = [level["name"]]
+        for name, show in (("items", str), ("ok", str),
+                           ("coverage", _percent)):
+            old = "-" if level["old"] is None else show(level["old"][name])
+            new = "-" if level["new"] is None else show(level["new"][name])
+            row.append(f"{old} -> {new}")
+        rows.append(row)
+    widths = [max(map(len, column)) for column in zip(*rows)]
+
+    lines = ["  ".join(f"{text:{width}}"
+                       for text, width in zip(row, widths)).rstrip()
+             for row in rows]
+    lines.append("")
+    lines.append(f"{summary.added} items added, {summary.removed} removed, "
+                 f"{summary.content_changes} with other changes")
+    lines.append(f"{summary.status_changes} tracing status changes")
+    lines.append(f"{summary.links_added} links added, "
+                 f"{summary.links_removed} removed")
+    return "\n".join(lines)
+
+
+class DiffTool(MetaDataToolBase):
+    def __init__(self):
+        super().__init__(
+            name="diff",
+            description="Compare two LOBSTER reports: items added or "
+                        "removed, status changes, links added or removed, "
+                        "and the coverage of each level",
+            official=True,
+        )
+        self._argument_parser.add_argument(
+            "old",
+            metavar="OLD_REPORT",
+        )
+        self._argument_parser.add_argument(
+            "new",
+            metavar="NEW_REPORT",
+        )
+        self._argument_parser.add_argument(
+            "--out",
+            metavar="FILE",
+            default=None,
+            help="write all changes as JSON to FILE",
+        )
+        self._add_compact_argument()
+        self._argument_parser.add_argument(
+            "--chunk-size",
+            metavar="N",
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help="number of items sorted in memory at a time; larger "
+                 f"reports are sorted with temporary files (default "
+                 f"{DEFAULT_CHUNK_SIZE})",
+        )
+
+    def _run_impl(self, options: Namespace) -> int:
+        for filename in (options.old, options.new):
+            if not os.path.isfile(filename):
+                self._argument_parser.error(f"{filename} is not a file")
+        if options.chunk_size < 1:
+            self._argument_parser.error("--chunk-size must be positive")
+
+        try:
+            summary = lobster_diff(options.old, options.new, options.out,
+                                   options.compact, options.chunk_size)
+            print(format_summary(summary))
+            return 0
+        except LOBSTER_Exception as err:
+            err.dump()
+
+        print(f"{self.name}: aborting due to earlier errors.")
+        return 1
+
+
+def main(args: Optional[Sequence[str]] = None) -> int:
+    return DiffTool().run(args)
@@ -37,9 +37,10 @@ from lobster.common.location import (Void_Reference,
                                      Codebeamer_Reference)
 from lobster.common.items import (Tracing_Status, Item,
                                   Requirement, Implementation,
-                                  Activity)
+                                  Activity, DEFAULT_ANCHOR_SCHEME)
 from lobster.common.meta_data_tool_base import MetaDataToolBase
 from lobster.common.graphviz_utils import is_dot_available
+from lobster.common.suggestions import with_suggestions
 from lobster.tools.core.html_report.html_report_css import CSS
 from lobster.tools.core.html_report.html_report_js import JAVA_SCRIPT
 
@@ -53,10 +54,14 @@ def name_hash(name):
     return hobj.hexdigest()
 
 
-def xref_item(item, link=True, brief=False):
+def xref_item(item, link=True, brief=False, anchor=None,
+              anchor_scheme=DEFAULT_ANCHOR_SCHEME):
+    # anchor is the anchor of item if known, e.g. from Report.anchor;
+    # otherwise it is computed with anchor_scheme
     assert isinstance(item, Item)
     assert isinstance(link, bool)
     assert isinstance(brief, bool)
+    assert anchor is None or isinstance(anchor, str)
 
     if brief:
         rv = ""
@@ -74,7 +79,9 @@ def xref_item(item, link=True, brief=False):
         rv += " "
 
     if link:
-        rv += f"<a href='#item-{item.tag.hash()}'>{html.escape(item.name)}</a>"
+        if anchor is None:
+            anchor = item.tag.anchor(anchor_scheme)
+        rv += f"<a href='#item-{anchor}'>{html.escape(item.name)}</a>"
     else:
         rv += html.escape(item.name)
 
@@ -192,7 +199,7 @@ def write_item_box_begin(doc, item, report):
     doc.add_line(f'<!-- begin item {html.escape(item.tag.key())} -->')
 
     doc.add_line(f'<div class="item-{html.escape(item.tracing_status.name.lower())}" '
-                 f'id="item-{item.tag.hash()}">')
+                 f'id="item-{report.anchor(item.tag.key())}">')
 
     svg_icon = (
         '<svg class="icon"><use href="#svg-check-square"></use></svg>'
@@ -209,26 +216,27 @@ def write_item_box_begin(doc, item, report):
     doc.add_line("</div>")
 
 
-def write_item_tracing(doc, report, item):
+def write_item_tracing(doc, report, item, node=None):
+    # node is the node of item in report.graph, if known
     assert isinstance(doc, htmldoc.Document)
     assert isinstance(report, Report)
     assert isinstance(item, Item)
 
+    graph = report.graph
+    if node is None:
+        node = graph.node(item.tag.key())
+
     doc.add_line('<div class="attribute">')
-    if item.ref_down:
-        doc.add_line("<div>Traces to:")
-        doc.add_line("<ul>")
-        for ref in item.ref_down:
-            doc.add_line(f"<li>{xref_item(report.items[ref.key()])}</li>")
-        doc.add_line("</ul>")
-        doc.add_line("</div>")
-    if item.ref_up:
-        doc.add_line("<div>Derived from:")
-        doc.add_line("<ul>")
-        for ref in item.ref_up:
-            doc.add_line(f"<li>{xref_item(report.items[ref.key()])}</li>")
-        doc.add_line("</ul>")
-        doc.add_line("</div>")
+    for title, up in (("Traces to", False), ("Derived from", True)):
+        refs = graph.neighbours(node, up)
+        if refs:
+            doc.add_line(f"<div>{title}:")
+            doc.add_line("<ul>")
+            for key, ref_item in refs:
+                xref = xref_item(ref_item, anchor=report.anchor(key))
+                doc.add_line(f"<li>{xref}</li>")
+            doc.add_line("</ul>")
+            doc.add_line("</div>")
 
     if item.tracing_status == Tracing_Status.JUSTIFIED:
         doc.add_line("<div>Justifications:")
@@ -242,6 +250,7 @@ def write_item_tracing(doc, report, item):
         doc.add_line("<div>Issues:")
         doc.add_line("<ul>")
         for msg in item.messages:
+            msg = with_suggestions(msg, report.suggestions)
             doc.add_line(f"<li>{html.escape(msg)}</li>")
         doc.add_line("</ul>")
         doc.add_line("</div>")
@@ -474,14 +483,16 @@ def write_html(report, dot, high_contrast, render_md) -> str:
                        key = lambda x: x.location.sorting_key()):
         if item.tracing_status not in (Tracing_Status.OK,
                                        Tracing_Status.JUSTIFIED):
+            xref = xref_item(item, anchor=report.anchor(item.tag.key()))
             for message in item.messages:
+                message = with_suggestions(message, report.suggestions)
                 if not has_issues:
                     has_issues = True
                     doc.add_line("<ul>")
                 doc.add_line(
                     f'<li class="issue issue-{item.tracing_status.name.lower()}'
                     f' issue-{item.tracing_status.name.lower()}-'
-                    f'{item.tag.namespace}">{xref_item(item)}: {message}</li>'
+                    f'{item.tag.namespace}">{xref}: {message}</li>'
                 )
     if has_issues:
         doc.add_line("</ul>")
@@ -492,11 +503,14 @@ def write_html(report, dot, high_contrast, render_md) -> str:
     ### Report
     file_heading = None
     doc.add_heading(2, "Detailed report", "detailed-report", html_identifier=True)
-    items_by_level = {}
-    for level in report.config:
-        items_by_level[level] = [item
-                                 for item in report.items.values()
-                                 if item.level == level]
+    graph = report.graph
+    nodes_by_level = {level: [] for level in report.config}
+    for node, item in enumerate(graph.items):
+        if item.level in nodes_by_level:
+            nodes_by_level[item.level].append(node)
+
+    def location_order(node):
+        return graph.items[node].location.sorting_key()
     for kind, title in [("requirements",
                          "Requirements and Specification"),
                         ("implementation",
@@ -514,9 +528,10 @@ def write_html(report, dot, high_contrast, render_md) -> str:
                             name_hash(level.name),
                             html_identifier=True,
                             )
-            if items_by_level[level.name]:
-                for item in sorted(items_by_level[level.name],
-                                   key = lambda x: x.location.sorting_key()):
+            if nodes_by_level[level.name]:
+                for node in sorted(nodes_by_level[level.name],
+                                   key = location_order):
+                    item = graph.items[node]
                     if isinstance(item.location, Void_Reference):
                         new_file_heading = "Unknown"
                     elif isinstance(item.location, (File_Reference,
@@ -550,7 +565,7 @@ def write_html(report, dot, high_contrast, render_md) -> str:
                         doc.add_line('<div class="attribute">')
                         doc.add_line(f"<blockquote{bq_class}>{bq_text}</blockquote>")
                         doc.add_line('</div>')
-                    write_item_tracing(doc, report, item)
+                    write_item_tracing(doc, report, item, node)
                     write_item_box_end(doc, item)
             else:
                 doc.add_line("No items recorded at this level.")
@@ -601,13 +616,22 @@ class HtmlReportTool(MetaDataToolBase):
                         help="Prefix to prepend to file reference links, "
                              "e.g. a path from the HTML output location "
                              "back to the workspace root.")
+        ap.add_argument("--blake2-anchors",
+                        action="store_true",
+                        help="Use shorter BLAKE2 item anchors instead of "
+                             "SHA-1 ones. This makes the report smaller, "
+                             "but breaks existing links to items.")
+        self._add_trust_inputs_argument()
 
     def _run_impl(self, options: argparse.Namespace) -> int:
         if not os.path.isfile(options.lobster_report):
             self._argument_parser.error(f"{options.lobster_report} is not a file")
 
         report = Report()
-        report.load_report(options.lobster_report)
+        report.load_report(options.lobster_report,
+                           trust_inputs=options.trust_inputs,
+                           anchor_scheme=("blake2" if options.blake2_anchors
+                                          else DEFAULT_ANCHOR_SCHEME))
         report.source_root = options.source_root
 
         html_content = write_html(
@@ -629,6 +653,9 @@ def lobster_html_report(
     high_contrast: bool = False,
     render_md: bool = False,
     source_root: str = "",
+    *,
+    trust_inputs: bool = False,
+    anchor_scheme: str = DEFAULT_ANCHOR_SCHEME,
 ) -> None:
     """
     API function to generate an HTML report from a LOBSTER report file.
@@ -640,9 +667,13 @@ def lobster_html_report(
         high_contrast (bool, optional): Use high contrast colors.
         render_md (bool, optional): Render Markdown in descriptions.
         source_root (str, optional): Prefix to prepend to file reference links.
+        trust_inputs (bool, optional): Skip validation of the report file.
+        anchor_scheme (str, optional): "sha1", or "blake2" for shorter
+            item anchors.
     """
     report = Report()
-    report.load_report(lobster_report_path)
+    report.load_report(lobster_report_path, trust_inputs=trust_inputs,
+                       anchor_scheme=anchor_scheme)
     report.source_root = source_root
     html_content = write_html(
         report=report,
@@ -174,6 +174,8 @@ class OnlineReportTool(MetaDataToolBase):
             help="output file, by default overwrite input",
             default="online_report.lobster",
         )
+        self._add_compact_argument()
+        self._add_trust_inputs_argument()
 
     def _run_impl(self, options: Namespace) -> int:
         try:
@@ -198,18 +200,20 @@ class OnlineReportTool(MetaDataToolBase):
     def _execute(options: Namespace) -> None:
         config = load_config(options.config)
         lobster_online_report(
-            config, options.out
+            config, options.out, options.compact, options.trust_inputs
         )
 
 
-def lobster_online_report(config: Config, out_file: str) -> None:
+def lobster_online_report(config: Config, out_file: str,
+                          compact: bool = False,
+                          trust_inputs: bool = False) -> None:
     # This is an API function for Lobster online report tool.
     report = Report()
-    report.load_report(config.report)
+    report.load_report(config.report, trust_inputs=trust_inputs)
     add_github_reference_to_items(
         config.repo_root, config.base_url, report, config.commit_id
     )
-    report.write_report(out_file)
+    report.write_report(out_file, compact=compact)
 
 
 def main(args: Optional[Sequence[str]] = None) -> int:
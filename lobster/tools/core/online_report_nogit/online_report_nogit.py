@@ -74,7 +74,10 @@ def apply_github_urls(
         in_file: str,
         out_file: str,
         repository_info: RepoInfo,
-        paths_must_exist: bool = True):
+        paths_must_exist: bool = True,
+        *,
+        compact: bool = False,
+        trust_inputs: bool = False):
     """
     Reads a report file, converts all file references to GitHub references,
     and saves the report.
@@ -85,11 +88,13 @@ def apply_github_urls(
         repo_data (RepoData): object containing remote URL, root path, and commit hash.
         paths_must_exist (bool): If True, then a sanity check is performed. If the path
           is is not a directory and not a file, then a FileNotFoundError is raised.
+        compact (bool): If True, then the report is written without indentation.
+        trust_inputs (bool): If True, then the report is not validated.
     """
     report = Report()
-    report.load_report(in_file)
+    report.load_report(in_file, trust_inputs=trust_inputs)
     _update_items(report.items.values(), repository_info, paths_must_exist)
-    report.write_report(out_file)
+    report.write_report(out_file, compact=compact)
 
 
 class OnlineReportNogitTool(MetaDataToolBase):
@@ -113,6 +118,8 @@ class OnlineReportNogitTool(MetaDataToolBase):
                         help="Output file for the updated LOBSTER report."
                             "It can be the same as the input file in order to "
                             "overwrite the input file.",)
+        self._add_compact_argument()
+        self._add_trust_inputs_argument()
 
     def _run_impl(self, options: argparse.Namespace) -> int:
         try:
@@ -124,6 +131,8 @@ class OnlineReportNogitTool(MetaDataToolBase):
                     commit=options.commit,
                 ),
                 out_file=options.out,
+                compact=options.compact,
+                trust_inputs=options.trust_inputs,
             )
             print(f"LOBSTER report {options.out} created, using remote URL references.")
         except FileNotFoundError as e:
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+#
+# lobster_diff - Compare two LOBSTER reports
+# Copyright (C) 2026 Bayerische Motoren Werke Aktiengesellschaft (BMW AG)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public
+# License along with this program. If not, see
+# <https://www.gnu.org/licenses/>.
+
+# The items of a report are selected through a Report_Index, which is
+# saved next to the report (REPORT.index) the first time, so that later
+# queries of the same report only load the index.
+
+from argparse import Namespace
+import os.path
+from typing import List, Optional, Sequence
+
+from lobster.common import json_backend
+from lobster.common.exceptions import LOBSTER_Exception
+from lobster.common.meta_data_tool_base import MetaDataToolBase
+from lobster.common.query import select
+from lobster.common.report_index import build_index, load_index
+
+
+def lobster_query(report_file: str, query: str,
+                  use_index_file: bool = True,
+                  trust_inputs: bool = False) -> List[dict]:
+    # This is an API function to select the items of a report with a
+    # filter expression. It returns key, level, status, file and line of
+    # each selected item, in report order.
+    if use_index_file:
+        index = load_index(report_file, trust_inputs)
+    else:
+        index = build_index(report_file, trust_inputs)
+    return [index.describe(row) for row in select(index, query)]
+
+
+def format_item(item: dict) -> str:
+    status = item["status"] or "no status"
+    text   = f"{item['key']} ({item['level']}, {status})"
+    if item["file"] is None:
+        return text
+    if item["line"] is None:
+        return f"{item['file']}: {text}"
+    return f"{item['file']}:{item['line']}: {text}"
+
+
+class QueryTool(MetaDataToolBase):
+    def __init__(self):
+        super().__init__(
+            name="query",
+            description="Select the items of a LOBSTER report with a "
+                        "filter expression",
+            official=True,
+        )
+        self._argument_parser.add_argument(
+            "query",
+            metavar="QUERY",
+            help="filter expression, e.g. "
+                 "'level:Requirements not status:ok'",
+        )
+        self._argument_parser.add_argument(
+            "report",
+            metavar="REPORT",
+            nargs="?",
+            default="report.lobster",
+            help="report to query (default report.lobster)",
+        )
+        self._argument_parser.add_argument(
+            "--count",
+            action="store_true",
+            help="only print the number of selected items",
+        )
+        self._argument_parser.add_argument(
+            "--json",
+            action="store_true",
+            help="print the selected items as JSON",
+        )
+        self._argument_parser.add_argument(
+            "--limit",
+            metavar="N",
+            type=int,
+            default=None,
+            help="print at most N items",
+        )
+        self._argument_parser.add_argument(
+            "--no-index-file",
+            action="store_true",
+            help="neither read nor write the index file REPORT.index",
+        )
+        self._add_trust_inputs_argument()
+
+    def _run_impl(self, options: Namespace) -> int:
+        if not os.path.isfile(options.report):
+            self._argument_parser.error(f"{options.report} is not a file")
+        if options.limit is not None and options.limit < 0:
+            self._argument_parser.error("--limit must not be negative")
+
+        try:
+            items = lobster_query(options.report, options.query,
+                                  not options.no_index_file,
+                                  options.trust_inputs)
+        except LOBSTER_Exception as err:
+            err.dump()
+            print(f"{self.name}: aborting due to earlier errors.")
+            return 1
+
+        if options.count:
+            print(len(items))
+            return 0
+        if options.limit is not None:
+            items = items[:options.limit]
+        if options.json:
+            print(json_backend.dumps(items, indent=2))
+        else:
+            for item in items:
+                print(format_item(item))
+        return 0
+
+
+def main(args: Optional[Sequence[str]] = None) -> int:
+    return QueryTool().run(args)
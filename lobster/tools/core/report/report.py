@@ -18,11 +18,15 @@
 # <https://www.gnu.org/licenses/>.
 
 from argparse import Namespace
+import os
 from typing import Optional, Sequence
 
 from lobster.common.exceptions import LOBSTER_Exception
 from lobster.common.errors import LOBSTER_Error
+from lobster.common.merge import merge_reports
+from lobster.common.incremental import first_difference, update_report
 from lobster.common.report import Report
+from lobster.common.source_cache import DEFAULT_CACHE_SIZE, Source_Cache
 from lobster.common.meta_data_tool_base import MetaDataToolBase
 
 
@@ -36,21 +40,167 @@ class ReportTool(MetaDataToolBase):
         self._argument_parser.add_argument(
             "--lobster-config",
             metavar="FILE",
-            default="lobster.conf",
+            default=None,
+            help="the lobster.conf file to read (default: lobster.conf)",
         )
         self._argument_parser.add_argument(
             "--out",
             metavar="FILE",
             default="report.lobster",
         )
+        self._add_compact_argument()
+        self._add_trust_inputs_argument()
+        self._argument_parser.add_argument(
+            "--content-header",
+            action="store_true",
+            default=False,
+            help="start the report with the item count and a digest of its "
+                 "content, so that later steps can tell cheaply whether it "
+                 "changed",
+        )
+        self._argument_parser.add_argument(
+            "--jobs",
+            metavar="N",
+            type=int,
+            default=None,
+            help="read the sources of the lobster.conf file with up to N "
+                 "processes (default: 1)",
+        )
+        self._argument_parser.add_argument(
+            "--cache-dir",
+            metavar="DIR",
+            default=None,
+            help="keep the items read from each source in DIR, and take "
+                 "them from there while the source file is unchanged "
+                 "(default: $LOBSTER_CACHE_DIR, if set)",
+        )
+        self._argument_parser.add_argument(
+            "--cache-size",
+            metavar="MIB",
+            type=int,
+            default=DEFAULT_CACHE_SIZE >> 20,
+            help="remove the least recently used entries of the cache "
+                 "directory while it is larger than MIB mebibytes "
+                 f"(default: {DEFAULT_CACHE_SIZE >> 20})",
+        )
+        self._argument_parser.add_argument(
+            "--no-cache",
+            action="store_true",
+            default=False,
+            help="do not use a cache directory, even if LOBSTER_CACHE_DIR "
+                 "is set",
+        )
+        self._argument_parser.add_argument(
+            "--sharded",
+            action="store_true",
+            default=False,
+            help="write the items of each level to a file of its own next "
+                 "to the report, which then only holds the policy and the "
+                 "coverage, so that tools can read just the levels they "
+                 "need",
+        )
+        self._argument_parser.add_argument(
+            "--mergeable",
+            action="store_true",
+            default=False,
+            help="also record in the report what --merge needs to merge it "
+                 "with the reports of other components",
+        )
+        self._argument_parser.add_argument(
+            "--sqlite",
+            metavar="FILE",
+            default=None,
+            help="also write the report as an SQLite database to FILE, "
+                 "which all report tools can read instead of the report",
+        )
+        self._argument_parser.add_argument(
+            "--incremental",
+            action="store_true",
+            default=False,
+            help="update the report given with --out instead of building it "
+                 "from scratch: only changed sources are read, and only items "
+                 "whose links may have changed are recomputed. The state this "
+                 "needs is kept in a file next to the report.",
+        )
+        self._argument_parser.add_argument(
+            "--merge",
+            metavar="REPORT",
+            nargs="+",
+            default=None,
+            help="instead of reading the sources of a lobster.conf file, "
+                 "merge the given reports of several components: only the "
+                 "references between them are resolved again, and only the "
+                 "items they affect are checked again",
+        )
+        self._argument_parser.add_argument(
+            "--verify-incremental",
+            action="store_true",
+            default=False,
+            help="with --incremental, also build the report from scratch and "
+                 "fail if the result is different",
+        )
 
     def _run_impl(self, options: Namespace) -> int:
+        if options.merge:
+            # The sources of a lobster.conf file are not read at all
+            for name in ("incremental", "lobster_config", "jobs",
+                         "cache_dir"):
+                if getattr(options, name) not in (None, False):
+                    option = "--" + name.replace("_", "-")
+                    self._argument_parser.error(f"--merge cannot be used "
+                                                f"with {option}")
+        if options.lobster_config is None:
+            options.lobster_config = "lobster.conf"
+        if options.jobs is None:
+            options.jobs = 1
+        if options.cache_dir is None:
+            options.cache_dir = os.environ.get("LOBSTER_CACHE_DIR") or None
 
-        report = Report()
+        if options.jobs < 1:
+            self._argument_parser.error("--jobs must be at least 1")
+        if options.cache_size < 0:
+            self._argument_parser.error("--cache-size must not be negative")
+
+        if options.verify_incremental and not options.incremental:
+            self._argument_parser.error("--verify-incremental requires "
+                                        "--incremental")
+        cache = (None if options.no_cache or not options.cache_dir
+                 else Source_Cache(options.cache_dir,
+                                   options.cache_size << 20))
 
         try:
-            report.parse_config(options.lobster_config)
-            report.write_report(options.out)
+            if options.merge:
+                report = merge_reports(options.merge,
+                                       options.trust_inputs).report
+            elif options.incremental:
+                result = update_report(options.lobster_config, options.out,
+                                       options.trust_inputs,
+                                       jobs=options.jobs, cache=cache,
+                                       mergeable=options.mergeable)
+                report = result.report
+                if options.verify_incremental and not result.full_build:
+                    full = Report()
+                    # Not from the cache, which the update has used
+                    full.parse_config(options.lobster_config,
+                                      options.trust_inputs, jobs=options.jobs)
+                    difference = first_difference(report, full)
+                    if difference:
+                        print(f"{self.name}: incremental update differs from "
+                              f"a full build: {difference}")
+                        return 1
+            else:
+                report = Report()
+                report.parse_config(options.lobster_config,
+                                    options.trust_inputs, jobs=options.jobs,
+                                    cache=cache)
+            report.write_report(options.out, compact=options.compact,
+                                content_header=options.content_header,
+                                sharded=options.sharded,
+                                mergeable=options.mergeable)
+            if options.sqlite:
+                report.write_sqlite(options.sqlite, options.mergeable)
+            if options.incremental:
+                result.state.save(options.out)
             return 0
         except FileNotFoundError as e:
             print(e)
@@ -63,11 +213,53 @@ class ReportTool(MetaDataToolBase):
         return 1
 
 
-def lobster_report(lobster_config_file: str, output_file: str) -> dict:
-    # This is an API function to run the lobster report tool
-    report = Report()
-    report.parse_config(lobster_config_file)
-    report.write_report(output_file)
+def lobster_report(lobster_config_file: str, output_file: str,
+                   compact: bool = False, trust_inputs: bool = False,
+                   *, content_header: bool = False, jobs: int = 1,
+                   cache_dir: Optional[str] = None,
+                   cache_size: int = DEFAULT_CACHE_SIZE,
+                   incremental: bool = False,
+                   sqlite_file: Optional[str] = None,
+                   sharded: bool = False,
+                   mergeable: bool = False) -> dict:
+    # This is an API function to run the lobster report tool. The items
+    # read from the sources are cached in cache_dir, if given, which is
+    # kept to at most cache_size bytes. With incremental, output_file is
+    # updated, see lobster.common.incremental.
+    # The report is also written as SQLite database to sqlite_file, if
+    # given. With sharded, each level is written to a file of its own.
+    # With mergeable, the report can be merged with lobster_merge.
+    cache = Source_Cache(cache_dir, cache_size) if cache_dir else None
+    state = None
+    if incremental:
+        result = update_report(lobster_config_file, output_file,
+                               trust_inputs, jobs=jobs, cache=cache,
+                               mergeable=mergeable)
+        report, state = result.report, result.state
+    else:
+        report = Report()
+        report.parse_config(lobster_config_file, trust_inputs, jobs=jobs,
+                            cache=cache)
+    report.write_report(output_file, compact=compact,
+                        content_header=content_header, sharded=sharded,
+                        mergeable=mergeable)
+    if sqlite_file:
+        report.write_sqlite(sqlite_file, mergeable)
+    if state is not None:
+        state.save(output_file)
+
+
+def lobster_merge(report_files: Sequence[str], output_file: str,
+                  compact: bool = False, trust_inputs: bool = False, *,
+                  sharded: bool = False, mergeable: bool = False) -> dict:
+    # This is an API function to merge the reports of several components
+    # into output_file, see lobster.common.merge. The reports must
+    # have been written with mergeable; with mergeable, so is the result.
+    result = merge_reports(report_files, trust_inputs)
+    result.report.write_report(output_file, compact=compact, sharded=sharded,
+                               mergeable=mergeable)
+    return {"cross_links": result.cross_links,
+            "recomputed": result.recomputed}
 
 
 def main(args: Optional[Sequence[str]] = None) -> int:
@@ -36,7 +36,13 @@ from lobster.common.location import (
     Github_Reference,
     Codebeamer_Reference,
 )
-from lobster.common.items import Item, Requirement, Implementation, Activity
+from lobster.common.items import (
+    DEFAULT_ANCHOR_SCHEME,
+    Item,
+    Requirement,
+    Implementation,
+    Activity,
+)
 
 
 class RstUtils:
@@ -88,18 +94,20 @@ class ItemNaming:
     LOBSTER items."""
 
     @staticmethod
-    def item_label(item: Item) -> str:
+    def item_label(item: Item, scheme: str = DEFAULT_ANCHOR_SCHEME) -> str:
         """Return the Sphinx cross-reference label for a tracing item.
 
-        The label is stable as long as the item's hash does not change.
+        The label is stable as long as the item's anchor does not change.
 
         Args:
             item: Any LOBSTER :class:`~lobster.common.items.Item`.
+            scheme: The anchor scheme, as for the HTML report (see
+                :attr:`Report.anchor_scheme`).
 
         Returns:
-            A string of the form ``"lobster-item-<hash>"``.
+            A string of the form ``"lobster-item-<anchor>"``.
         """
-        return "lobster-item-" + item.tag.hash()
+        return "lobster-item-" + item.tag.anchor(scheme)
 
     @staticmethod
     def level_label(level_name: str) -> str:
@@ -128,7 +128,8 @@ class ItemCardBuilder:
         out = []
 
         # Anchor label
-        out.append(f".. _{ItemNaming.item_label(item)}:")
+        label = ItemNaming.item_label(item, self._report.anchor_scheme)
+        out.append(f".. _{label}:")
         out.append("")
 
         # lobster-trace: rst_req.RST_Report_Item_Details
@@ -186,15 +187,16 @@ class ItemCardBuilder:
         # lobster-trace: UseCases.List_Requirements_to_Tests
         # lobster-trace: UseCases.List_Tests_to_Requirements
         # Downward traces section
-        has_down = bool(item.ref_down or down_msgs)
+        refs_down = self._resolve_refs(self._report.trace_down(item.tag.key()))
+        has_down = bool(refs_down or down_msgs)
         if has_down:
             if has_content:
                 sep()
             body("**Traces to:**")
             out.append("")
-            for ref_str in self._resolve_refs(item.ref_down):
+            for ref_str in refs_down:
                 body(f"* {ref_str}")
-            if item.ref_down:
+            if refs_down:
                 out.append("")
             if down_msgs:
                 issue_box(down_msgs)
@@ -203,15 +205,16 @@ class ItemCardBuilder:
         # lobster-trace: UseCases.List_Requirements_without_Tests
         # lobster-trace: UseCases.List_Tests_without_Requirements
         # Upward traces section
-        has_up = bool(item.ref_up or up_msgs)
+        refs_up = self._resolve_refs(self._report.trace_up(item.tag.key()))
+        has_up = bool(refs_up or up_msgs)
         if has_up:
             if has_content:
                 sep()
             body("**Derived from:**")
             out.append("")
-            for ref_str in self._resolve_refs(item.ref_up):
+            for ref_str in refs_up:
                 body(f"* {ref_str}")
-            if item.ref_up:
+            if refs_up:
                 out.append("")
             if up_msgs:
                 issue_box(up_msgs)
@@ -251,19 +254,20 @@ class ItemCardBuilder:
         fall back to a code literal of the reference key.
 
         Args:
-            refs: An iterable of reference objects with a ``key()`` method.
+            refs: An iterable of key and item (``None`` if unknown) pairs,
+                as yielded by :meth:`Report.trace_up`.
 
         Returns:
             A list of RST inline strings (one per reference).
         """
         parts = []
-        for ref in refs:
-            key = ref.key()
-            if key in self._report.items:
-                ref_item = self._report.items[key]
+        for key, ref_item in refs:
+            if ref_item is not None:
+                label = ItemNaming.item_label(ref_item,
+                                              self._report.anchor_scheme)
                 parts.append(
                     f":ref:`{RstUtils.escape(ref_item.name)}"
-                    f" <{ItemNaming.item_label(ref_item)}>`"
+                    f" <{label}>`"
                 )
             else:
                 parts.append(f"``{RstUtils.escape(key)}`` (unresolved)")
@@ -438,9 +442,10 @@ class IssuesListBuilder:
                 continue
             for message in item.messages:
                 tag = TracingClassifier.issue_tag(message)
+                label = ItemNaming.item_label(item, self._report.anchor_scheme)
                 item_ref = (
                     f":ref:`{RstUtils.escape(item.name)}"
-                    f" <{ItemNaming.item_label(item)}>`"
+                    f" <{label}>`"
                 )
                 lines.append(f"* [{item.tracing_status.name} — {tag}] {item_ref}")
                 found_any = True
@@ -367,6 +367,7 @@ class RstReportTool(MetaDataToolBase):
             "path from the RST output location back to the workspace root; "
             "a trailing '/' is optional and will be added automatically",
         )
+        self._add_trust_inputs_argument()
 
     def _run_impl(self, options: argparse.Namespace) -> int:
         """Execute the tool with the parsed command-line options.
@@ -383,7 +384,8 @@ class RstReportTool(MetaDataToolBase):
 
         try:
             report = Report()
-            report.load_report(options.lobster_report)
+            report.load_report(options.lobster_report,
+                               trust_inputs=options.trust_inputs)
         except LOBSTER_Error as err:
             print(err)
             print(f"{self.name}: aborting due to earlier errors.")
@@ -422,6 +424,7 @@ def lobster_rst_report(
     lobster_report_path: str,
     output_rst_path: str,
     source_root: str = "",
+    trust_inputs: bool = False,
 ) -> None:
     """Generate a single-page RST report from a LOBSTER report file.
 
@@ -429,9 +432,10 @@ def lobster_rst_report(
         lobster_report_path: Path to the input ``.lobster`` report file.
         output_rst_path: Path to the output RST file to create.
         source_root: Optional URL prefix prepended to file-reference paths.
+        trust_inputs: Skip validation of the report file.
     """
     report = Report()
-    report.load_report(lobster_report_path)
+    report.load_report(lobster_report_path, trust_inputs=trust_inputs)
     write_rst_to_file(
         write_rst(report=report, source_root=source_root), output_rst_path
     )
@@ -441,6 +445,7 @@ def lobster_rst_report_pages(
     lobster_report_path: str,
     output_dir: str,
     source_root: str = "",
+    trust_inputs: bool = False,
 ) -> None:
     """Generate a multi-page RST report from a LOBSTER report file.
 
@@ -448,9 +453,10 @@ def lobster_rst_report_pages(
         lobster_report_path: Path to the input ``.lobster`` report file.
         output_dir: Directory to write RST pages into.
         source_root: Optional URL prefix prepended to file-reference paths.
+        trust_inputs: Skip validation of the report file.
     """
     report = Report()
-    report.load_report(lobster_report_path)
+    report.load_report(lobster_report_path, trust_inputs=trust_inputs)
     write_rst_pages_to_dir(
         write_rst_pages(report=report, source_root=source_root),
         output_dir,
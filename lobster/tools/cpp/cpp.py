@@ -198,6 +198,7 @@ class CppTool(MultiFileInputTool):
             schema=config.schema,
             out_file=options.out,
             items=db.values(),
+            compact=options.compact,
         )
 
         return 0
@@ -29,7 +29,7 @@ from lobster.common.errors import LOBSTER_Error
 from lobster.common.exceptions import LOBSTER_Exception
 from lobster.common.items import Tracing_Tag, Activity
 from lobster.common.location import File_Reference
-from lobster.common.io import lobster_write, ensure_output_directory
+from lobster.common.io import lobster_write, open_lobster_output
 from lobster.common.file_tag_generator import FileTagGenerator
 from lobster.tools.cpptest.constants import Constants
 from lobster.tools.cpptest.requirements_parser import \
@@ -283,7 +283,8 @@ def create_lobster_items_output_dict_from_test_cases(
     return lobster_items_output_dict
 
 
-def write_lobster_items_output_dict(lobster_items_output_dict: dict):
+def write_lobster_items_output_dict(lobster_items_output_dict: dict,
+                                    compact: bool = False):
     """
     Write the lobster items to the output.
     If the output file name is empty everything is written to stdout.
@@ -292,6 +293,8 @@ def write_lobster_items_output_dict(lobster_items_output_dict: dict):
     ----------
     lobster_items_output_dict : dict
         The lobster items dictionary grouped by output.
+    compact : bool
+        Write JSON without indentation and optional whitespace.
     """
     lobster_generator = Constants.LOBSTER_GENERATOR
     orphan_test_items = lobster_items_output_dict.get(ORPHAN_TESTS, {})
@@ -303,19 +306,19 @@ def write_lobster_items_output_dict(lobster_items_output_dict: dict):
         lobster_items_dict.update(orphan_test_items)
         item_count = len(lobster_items_dict)
 
-        ensure_output_directory(output_file_name)
-        with open(output_file_name, "w", encoding="UTF-8") as output_file:
+        with open_lobster_output(output_file_name, "w") as output_file:
             lobster_write(
                 output_file,
                 Activity,
                 lobster_generator,
-                lobster_items_dict.values()
+                lobster_items_dict.values(),
+                compact=compact,
             )
         print(f'Written {item_count} lobster items to '
                 f'"{output_file_name}".')
 
 
-def run_lobster_cpptest(config: Config):
+def run_lobster_cpptest(config: Config, compact: bool = False):
     """
     The main function to parse requirements from comments
     for the given list of files and/or directories and write the
@@ -325,6 +328,8 @@ def run_lobster_cpptest(config: Config):
     ----------
     config : Config
         The configuration setting
+    compact : bool
+        Write JSON without indentation and optional whitespace.
     """
     test_file_list = \
         get_test_file_list(
@@ -345,7 +350,8 @@ def run_lobster_cpptest(config: Config):
         )
 
     write_lobster_items_output_dict(
-        lobster_items_output_dict=lobster_items_output_dict
+        lobster_items_output_dict=lobster_items_output_dict,
+        compact=compact,
     )
 
 
@@ -362,6 +368,7 @@ class CppTestTool(MetaDataToolBase):
                   "by default (cpptest-config.yaml)"),
             default="cpptest-config.yaml",
         )
+        self._add_compact_argument()
 
     def _run_impl(self, options: Namespace) -> int:
         try:
@@ -386,16 +393,17 @@ class CppTestTool(MetaDataToolBase):
         config = parse_config_file(options.config)
 
         run_lobster_cpptest(
-            config=config
+            config=config,
+            compact=options.compact,
         )
 
 
-def lobster_cpptest(config: Config) -> None:
+def lobster_cpptest(config: Config, compact: bool = False) -> None:
     """Loads items from cpptests and serializes them in the LOBSTER interchange
         format to the given file.
     """
     # This is an API function.
-    run_lobster_cpptest(config=config)
+    run_lobster_cpptest(config=config, compact=compact)
 
 
 def main(args: Optional[Sequence[str]] = None) -> int:
@@ -25,7 +25,7 @@ import xml.etree.ElementTree as ET
 
 from lobster.common.items import Tracing_Tag, Activity
 from lobster.common.location import Void_Reference, File_Reference
-from lobster.common.io import lobster_write, ensure_output_directory
+from lobster.common.io import lobster_write, open_lobster_output
 from lobster.common.meta_data_tool_base import MetaDataToolBase
 
 
@@ -42,6 +42,7 @@ class GtestTool(MetaDataToolBase):
             metavar="FILE|DIR",
         )
         self._argument_parser.add_argument("--out", default=None)
+        self._add_compact_argument()
 
     @staticmethod
     def _is_xml_file(filename: str) -> bool:
@@ -187,12 +188,13 @@ class GtestTool(MetaDataToolBase):
                     items.append(item)
 
         if options.out:
-            ensure_output_directory(options.out)
-            with open(options.out, "w", encoding="UTF-8") as fd:
-                lobster_write(fd, Activity, "lobster_gtest", items)
+            with open_lobster_output(options.out, "w") as fd:
+                lobster_write(fd, Activity, "lobster_gtest", items,
+                              compact=options.compact)
             print(f"Written output for {len(items)} items to {options.out}")
         else:
-            lobster_write(sys.stdout, Activity, "lobster_gtest", items)
+            lobster_write(sys.stdout, Activity, "lobster_gtest", items,
+                          compact=options.compact)
             print()
 
         return 0
@@ -23,6 +23,7 @@ from pathlib import PurePath
 from pprint import pprint
 from typing import Optional, Sequence, Tuple, List, Set
 
+from lobster.common import json_backend
 from lobster.common.tool import LOBSTER_Per_File_Tool
 from lobster.common.items import Tracing_Tag, Activity
 from lobster.common.location import File_Reference
@@ -215,7 +216,7 @@ class LOBSTER_Json(LOBSTER_Per_File_Tool):
 def load_item(file_name, options_test_list):
     try:
         with open(file_name, encoding="UTF-8") as fd:
-            data = json.load(fd)
+            data = json_backend.load(fd)
         data = get_item(root     = data,
                         path     = options_test_list,
                         required = True)
@@ -43,6 +43,7 @@ TSBLOCK = "TsBlock"
 class PkgToolConfig:
     files: Sequence[Path]
     out: Optional[Path] = None
+    compact: bool = False
 
 
 def create_raw_entry(
@@ -294,6 +295,7 @@ class PkgTool(MultiFileInputTool):
                 - files: list of file or directory paths to process
                 - out: output file path (optional; if not set,
                   output is lobster-pkg.lobster)
+                - compact: write JSON without indentation (optional)
         """
         config = Config(
             inputs=None,
@@ -352,6 +354,7 @@ class PkgTool(MultiFileInputTool):
             schema=config.schema,
             out_file=pkg_config.out,
             items=items,
+            compact=pkg_config.compact,
         )
 
     def _run_impl(self, options: Namespace) -> int:
@@ -376,6 +379,7 @@ class PkgTool(MultiFileInputTool):
                 PkgToolConfig(
                     files=[Path(path) for path in options.dir_or_files],
                     out=Path(options.out) if options.out else None,
+                    compact=options.compact,
                 )
             )
             return 0
@@ -395,6 +399,7 @@ def lobster_pkg(config: PkgToolConfig) -> None:
     Expected config attributes:
         - files: list of input files/directories
         - out: output file path (optional)
+        - compact: write JSON without indentation (optional)
     """
     PkgTool().run_from_config(config)
 
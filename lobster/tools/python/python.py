@@ -31,7 +31,7 @@ import libcst as cst
 
 from lobster.common.items import Tracing_Tag, Implementation, Activity
 from lobster.common.location import File_Reference
-from lobster.common.io import lobster_write, ensure_output_directory
+from lobster.common.io import lobster_write, open_lobster_output
 from lobster.common.meta_data_tool_base import MetaDataToolBase
 
 LOBSTER_TRACE_PREFIX = "# lobster-trace: "
@@ -48,6 +48,7 @@ class PythonToolConfig:
     only_tagged_functions: bool = False
     parse_decorator: Optional[Tuple[str, str]] = None
     parse_versioned_decorator: Optional[Tuple[str, str, str]] = None
+    compact: bool = False
 
 
 def count_occurrence_of_last_function_from_function_name_list(function_names):
@@ -470,6 +471,7 @@ class PythonTool(MetaDataToolBase):
                               " an implementation trace"))
         ap.add_argument("--out",
                         default=None)
+        self._add_compact_argument()
         ap.add_argument("--single",
                         action="store_true",
                         default=False,
@@ -507,6 +509,7 @@ class PythonTool(MetaDataToolBase):
             only_tagged_functions=options.only_tagged_functions,
             parse_decorator=parse_decorator,
             parse_versioned_decorator=parse_versioned_decorator,
+            compact=options.compact,
         )
         try:
             if run_lobster_python(config):
@@ -582,12 +585,13 @@ def run_lobster_python(config: PythonToolConfig) -> bool:
     schema = Activity if config.activity else Implementation
 
     if config.out:
-        ensure_output_directory(config.out)
-        with open(config.out, "w", encoding="UTF-8") as fd:
-            lobster_write(fd, schema, "lobster_python", items)
+        with open_lobster_output(config.out, "w") as fd:
+            lobster_write(fd, schema, "lobster_python", items,
+                          compact=config.compact)
         print(f"Written output for {len(items)} items to {config.out}")
     else:
-        lobster_write(sys.stdout, schema, "lobster_python", items)
+        lobster_write(sys.stdout, schema, "lobster_python", items,
+                      compact=config.compact)
         print()
 
     return ok
@@ -48,6 +48,7 @@ class TrlcToolConfig:
     config: str
     dir_or_files: Sequence[str] = ()
     out: str = "lobster-trlc.lobster"
+    compact: bool = False
 
 
 class LOBSTER_Trlc(MultiFileInputTool):
@@ -65,6 +66,7 @@ class LOBSTER_Trlc(MultiFileInputTool):
                 config=LobsterTrlcConfig.from_file(options.config),
                 dir_or_files=options.dir_or_files,
                 out_file=options.out,
+                compact=options.compact,
             )
             return 0
         except YamaleError as e:
@@ -126,6 +128,7 @@ class LOBSTER_Trlc(MultiFileInputTool):
         config: LobsterTrlcConfig,
         dir_or_files: Sequence[str],
         out_file: str,
+        compact: bool = False,
     ) -> None:
         work_list = create_worklist(config, list(dir_or_files))
         trlc_mh = Message_Handler()
@@ -135,19 +138,19 @@ class LOBSTER_Trlc(MultiFileInputTool):
         if not symbol_table:
             raise TrlcFailure("aborting due to TRLC error")
 
-        items = []
         converter = Converter(
             conversion_rules=config.conversion_rules,
             to_string_rules=config.to_string_rules,
             symbol_table=symbol_table,
         )
-        for n_obj in symbol_table.iter_record_objects():
-            item = converter.generate_lobster_object(n_obj)
-            if item:
-                items.append(item)
+        # Items are converted lazily while they are written
+        items = (item
+                 for item in map(converter.generate_lobster_object,
+                                 symbol_table.iter_record_objects())
+                 if item)
 
         # lobster-trace: trlc_req.Output_File
-        self._write_output(Requirement, out_file, items)
+        self._write_output(Requirement, out_file, items, compact)
 
 
 def lobster_trlc(config: TrlcToolConfig) -> None:
@@ -159,6 +162,7 @@ def lobster_trlc(config: TrlcToolConfig) -> None:
         config=LobsterTrlcConfig.from_file(config.config),
         dir_or_files=config.dir_or_files,
         out_file=config.out,
+        compact=config.compact,
     )
 
 
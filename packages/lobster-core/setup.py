@@ -48,9 +48,12 @@ setuptools.setup(
               "lobster.common",
               "lobster.htmldoc",
               "lobster.tools.core.ci_report",
+              "lobster.tools.core.convert",
+              "lobster.tools.core.diff",
               "lobster.tools.core.html_report",
               "lobster.tools.core.online_report",
               "lobster.tools.core.online_report_nogit",
+              "lobster.tools.core.query",
               "lobster.tools.core.report",
               "lobster.tools.core.rst_report"],
     install_requires=[
@@ -59,6 +62,9 @@ setuptools.setup(
         "yamale>=6.0.0",
         "GitPython>=3.1.30",
     ],
+    extras_require={
+        "fast": ["orjson>=3.6"],
+    },
     python_requires=">=3.7, <4",
     classifiers=[
         "Development Status :: 5 - Production/Stable",
@@ -75,6 +81,9 @@ setuptools.setup(
             "lobster-online-report=lobster.tools.core.online_report.online_report:main",
             "lobster-online-report-nogit=lobster.tools.core.online_report_nogit.online_report_nogit:main",
             "lobster-ci-report=lobster.tools.core.ci_report.ci_report:main",
+            "lobster-convert=lobster.tools.core.convert.convert:main",
+            "lobster-diff=lobster.tools.core.diff.diff:main",
+            "lobster-query=lobster.tools.core.query.query:main",
             "lobster-rst-report=lobster.tools.core.rst_report.rst_report:main"
         ]
     },
@@ -59,6 +59,9 @@ setuptools.setup(
         "yamale>=6.0.0",
         "GitPython>=3.1.30",
     ],
+    extras_require={
+        "fast": ["orjson>=3.6"],
+    },
     python_requires=">=3.7, <4",
     classifiers=[
         "Development Status :: 5 - Production/Stable",
@@ -75,6 +78,9 @@ setuptools.setup(
             "lobster-online-report=lobster.tools.core.online_report.online_report:main",
             "lobster-online-report-nogit=lobster.tools.core.online_report_nogit.online_report_nogit:main",
             "lobster-ci-report=lobster.tools.core.ci_report.ci_report:main",
+            "lobster-convert=lobster.tools.core.convert.convert:main",
+            "lobster-diff=lobster.tools.core.diff.diff:main",
+            "lobster-query=lobster.tools.core.query.query:main",
             "lobster-codebeamer = lobster.tools.codebeamer.codebeamer:main",
             "lobster-python = lobster.tools.python.python:main",
             "lobster-cpp = lobster.tools.cpp.cpp:main",
@@ -9,7 +9,7 @@ from sphinx.locale import __
 from sphinx.util.docutils import SphinxTranslator
 from docutils import nodes
 
-import json
+from lobster.common import json_backend
 
 
 class LobsterTranslator(SphinxTranslator):
@@ -96,7 +96,7 @@ class LobsterTranslator(SphinxTranslator):
         self.docname = doc_rel.replace("/", ".").replace(" ", "")
 
     def depart_document(self, node: Element) -> None:
-        self.body = json.dumps(self.lobster_json, indent=4)
+        self.body = json_backend.dumps(self.lobster_json, indent=4)
 
     def visit_comment(self, node: Element) -> None:  # type: ignore[override]
         raise nodes.SkipNode
@@ -170,14 +170,14 @@ class LobsterBuilder(TextBuilder):
         }
         for json_file in sorted(Path(self.outdir).rglob("*.json")):
             with open(json_file, encoding="utf-8") as fh:
-                doc = json.load(fh)
+                doc = json_backend.load(fh)
             merged["data"].extend(doc.get("data", []))
         # NOTE: The output filename "_merged.lobster" is referenced by the
         # Bazel rule that is consuming this output and therefore needs to be
         # in sync.
         merged_path = path.join(self.outdir, "_merged.lobster")
         with open(merged_path, "w", encoding="utf-8") as fh:
-            json.dump(merged, fh, indent=4)
+            json_backend.dump(merged, fh, indent=4)
 
 
 def setup(app: Sphinx):
@@ -16,6 +16,7 @@ class CmdArgs:
     dot: Optional[str] = None
     high_contrast: Optional[str] = None
     render_md: bool = False
+    blake2_anchors: bool = False
 
     def as_list(self) -> List[str]:
         """Returns the command line arguments as a list"""
@@ -31,6 +32,9 @@ class CmdArgs:
         if self.render_md:
             cmd_args.append("--render-md")
 
+        if self.blake2_anchors:
+            cmd_args.append("--blake2-anchors")
+
         append_if_string("--out", self.out)
         append_if_string("--dot", self.dot)
         append_if_string("--high-contrast", self.high_contrast)
@@ -314,6 +314,44 @@ class LobsterHtmlReportcontentTest(LobsterUISystemTestCaseBase):
         asserter.assertExitCode(0)
         asserter.assertOutputFiles()
 
+    def test_blake2_anchors(self):
+        # lobster-trace: UseCases.HTML_file_generation
+        """
+        This test checks that --blake2-anchors produces the shorter BLAKE2
+        item anchors instead of the SHA-1 ones.
+        """
+        output_filename = "octopus_blake2_anchors.html"
+        inputfile = self._data_directory / "report_octopus.lobster"
+
+        self.output_dir = self.create_output_directory_and_copy_expected(
+            self.output_dir, Path(self._data_directory / output_filename))
+        self.test_runner.declare_output_file(self.output_dir / output_filename)
+
+        update_version_in_html_file(
+            self.output_dir / output_filename,
+        )
+        self.test_runner.cmd_args.out = output_filename
+        self.test_runner.cmd_args.lobster_report = str(inputfile)
+        self.test_runner.cmd_args.blake2_anchors = True
+
+        completed_process = self.test_runner.run_tool_test()
+        asserter = Asserter(self, completed_process, self.test_runner)
+
+        if is_dot_available(dot=None):
+            expected_stdout = f"LOBSTER HTML report written to {output_filename}\n"
+
+        else:
+            expected_stdout = (
+                "warning: dot utility not found, report will not include "
+                "the tracing policy visualisation\n"
+                "> please install Graphviz (https://graphviz.org)\n"
+                f"LOBSTER HTML report written to {output_filename}\n"
+            )
+
+        asserter.assertStdOutText(expected_stdout)
+        asserter.assertExitCode(0)
+        asserter.assertOutputFiles()
+
 
 if __name__ == "__main__":
     unittest.main()
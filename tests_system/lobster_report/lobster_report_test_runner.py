@@ -9,6 +9,13 @@ from lobster.tools.core.report.report import main
 class CmdArgs:
     lobster_config: Optional[str] = None
     out: Optional[str] = None
+    compact: bool = False
+    jobs: Optional[int] = None
+    cache_dir: Optional[str] = None
+    cache_size: Optional[int] = None
+    incremental: bool = False
+    verify_incremental: bool = False
+    merge: Optional[List[str]] = None
 
     def as_list(self) -> List[str]:
         """Returns the command line arguments as a list"""
@@ -20,6 +27,18 @@ class CmdArgs:
 
         append_if_string("--lobster-config", self.lobster_config)
         append_if_string("--out", self.out)
+        if self.compact:
+            cmd_args.append("--compact")
+        append_if_string("--jobs", self.jobs)
+        append_if_string("--cache-dir", self.cache_dir)
+        append_if_string("--cache-size", self.cache_size)
+        if self.incremental:
+            cmd_args.append("--incremental")
+        if self.verify_incremental:
+            cmd_args.append("--verify-incremental")
+        if self.merge is not None:
+            cmd_args.append("--merge")
+            cmd_args.extend(self.merge)
         return cmd_args
 
 
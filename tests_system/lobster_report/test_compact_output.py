@@ -0,0 +1,42 @@
+import unittest
+from tests_system.asserter import Asserter
+from tests_system.lobster_report.lobster_report_system_test_case_base import (
+    LobsterReportSystemTestCaseBase)
+
+
+class ReportCompactOutputTest(LobsterReportSystemTestCaseBase):
+    def setUp(self):
+        super().setUp()
+        self._test_runner = self.create_test_runner()
+
+    def test_compact_output(self):
+        self._test_runner.declare_input_file(self._data_directory /
+                                             "message_trace_coverage.conf")
+        self._test_runner.declare_input_file(self._data_directory /
+                                             "python_message_trace_coverage.lobster")
+        self._test_runner.declare_input_file(self._data_directory /
+                                             "trlc_message_trace_coverage.lobster")
+
+        out_file = "report_message_trace_coverage.lobster"
+        self._test_runner.cmd_args.lobster_config = "message_trace_coverage.conf"
+        self._test_runner.cmd_args.out = out_file
+        self._test_runner.cmd_args.compact = True
+        self._test_runner.declare_output_file(self._data_directory / out_file)
+
+        completed_process = self._test_runner.run_tool_test()
+
+        asserter = Asserter(self, completed_process, self._test_runner)
+        asserter.assertNoStdErrText()
+        asserter.assertNoStdOutText()
+        asserter.assertExitCode(0)
+        asserter.assertOutputFiles()
+
+        with open(self._test_runner.working_dir / out_file,
+                  encoding="UTF-8") as fd:
+            content = fd.read()
+        self.assertEqual(content.count("\n"), 1)
+        self.assertTrue(content.startswith('{"schema":"lobster-report",'))
+
+
+if __name__ == "__main__":
+    unittest.main()
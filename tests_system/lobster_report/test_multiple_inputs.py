@@ -47,6 +47,99 @@ class ReportMultipleInputTest(LobsterReportSystemTestCaseBase):
         asserter.assertExitCode(0)
         asserter.assertOutputFiles()
 
+    def test_inputs_read_in_parallel(self):
+        """
+        This test checks that reading the input files with several processes
+        gives the same report as reading them one after another.
+        """
+        for file_name in ("multiple_traces_just.conf",
+                          "just_requirements.lobster",
+                          "multiple_traces_code.lobster",
+                          "multiple_traces_test.lobster"):
+            self._test_runner.declare_input_file(self._data_directory /
+                                                 file_name)
+
+        out_file = "report_multiple_traces_just.lobster"
+        self._test_runner.cmd_args.lobster_config = "multiple_traces_just.conf"
+        self._test_runner.cmd_args.out = out_file
+        self._test_runner.cmd_args.jobs = 3
+        self._test_runner.declare_output_file(self._data_directory / out_file)
+
+        completed_process = self._test_runner.run_tool_test()
+        asserter = Asserter(self, completed_process, self._test_runner)
+        asserter.assertNoStdErrText()
+        asserter.assertNoStdOutText()
+        asserter.assertExitCode(0)
+        asserter.assertOutputFiles()
+
+    def test_inputs_read_from_cache(self):
+        """
+        This test checks that taking the items of the input files from the
+        cache gives the same report as reading the files.
+        """
+        for file_name in ("multiple_traces_just.conf",
+                          "just_requirements.lobster",
+                          "multiple_traces_code.lobster",
+                          "multiple_traces_test.lobster"):
+            self._test_runner.declare_input_file(self._data_directory /
+                                                 file_name)
+
+        out_file = "report_multiple_traces_just.lobster"
+        self._test_runner.cmd_args.lobster_config = "multiple_traces_just.conf"
+        self._test_runner.cmd_args.out = out_file
+        self._test_runner.cmd_args.cache_dir = "cache"
+        self._test_runner.declare_output_file(self._data_directory / out_file)
+
+        # The first run fills the cache, the second one reads from it
+        for _ in range(2):
+            completed_process = self._test_runner.run_tool_test()
+            asserter = Asserter(self, completed_process, self._test_runner)
+            asserter.assertNoStdErrText()
+            asserter.assertNoStdOutText()
+            asserter.assertExitCode(0)
+            asserter.assertOutputFiles()
+        self.assertEqual(
+            len(list((self._test_runner.working_dir / "cache").iterdir())), 3)
+
+        # An empty cache keeps nothing, but gives the same report
+        self._test_runner.cmd_args.cache_size = 0
+        completed_process = self._test_runner.run_tool_test()
+        asserter = Asserter(self, completed_process, self._test_runner)
+        asserter.assertNoStdErrText()
+        asserter.assertNoStdOutText()
+        asserter.assertExitCode(0)
+        asserter.assertOutputFiles()
+        self.assertEqual(
+            list((self._test_runner.working_dir / "cache").iterdir()), [])
+
+    def test_incremental_update(self):
+        """
+        This test checks that updating the report incrementally gives the
+        same report as building it from scratch, both when there is no
+        previous report and when there is one.
+        """
+        for file_name in ("multiple_traces_just.conf",
+                          "just_requirements.lobster",
+                          "multiple_traces_code.lobster",
+                          "multiple_traces_test.lobster"):
+            self._test_runner.declare_input_file(self._data_directory /
+                                                 file_name)
+
+        out_file = "report_multiple_traces_just.lobster"
+        self._test_runner.cmd_args.lobster_config = "multiple_traces_just.conf"
+        self._test_runner.cmd_args.out = out_file
+        self._test_runner.cmd_args.incremental = True
+        self._test_runner.cmd_args.verify_incremental = True
+        self._test_runner.declare_output_file(self._data_directory / out_file)
+
+        for _ in range(2):
+            completed_process = self._test_runner.run_tool_test()
+            asserter = Asserter(self, completed_process, self._test_runner)
+            asserter.assertNoStdErrText()
+            asserter.assertNoStdOutText()
+            asserter.assertExitCode(0)
+            asserter.assertOutputFiles()
+
     def test_missing_required_files_cause_failure(self):
         # lobster-trace: core_report_req.Missing_Required_Files_Error
         """
@@ -116,6 +209,26 @@ class ReportMultipleInputTest(LobsterReportSystemTestCaseBase):
         asserter.assertExitCode(0)
         asserter.assertOutputFiles()
 
+    def test_merge_rejects_build_options(self):
+        """
+        This test checks that --merge cannot be combined with the options
+        of reading the sources of a lobster.conf file, which it does not
+        read.
+        """
+        for option, value in (("lobster_config", "lobster.conf"),
+                              ("jobs", 2), ("cache_dir", "cache")):
+            with self.subTest(option=option):
+                self._test_runner = self.create_test_runner()
+                self._test_runner.cmd_args.merge = ["report_ok.lobster"]
+                setattr(self._test_runner.cmd_args, option, value)
+                completed_process = self._test_runner.run_tool_test()
+                asserter = Asserter(self, completed_process,
+                                    self._test_runner)
+                asserter.assertInStdErr(
+                    "lobster-report: error: --merge cannot be used with "
+                    "--" + option.replace("_", "-"))
+                asserter.assertExitCode(2)
+
 
 if __name__ == "__main__":
     unittest.main()
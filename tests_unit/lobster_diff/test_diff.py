@@ -0,0 +1,182 @@
+import io
+import json
+import os
+import shutil
+import tempfile
+from contextlib import redirect_stdout
+from unittest import TestCase
+
+from lobster.common.io import write_document
+from lobster.common.report import Report
+from lobster.tools.core.diff.diff import format_summary, lobster_diff, main
+
+
+def item(name, status="OK", refs=(), text="text"):
+    return {"tag": f"req {name}",
+            "location": {"kind": "file", "file": "a.trlc", "line": 1,
+                         "column": None},
+            "name": name, "messages": [], "just_up": [], "just_down": [],
+            "just_global": [], "ref_up": [f"req {ref}" for ref in refs],
+            "ref_down": [], "tracing_status": status, "framework": "TRLC",
+            "kind": "Requirement", "text": text, "status": None}
+
+
+def report(levels):
+    return {
+        "schema": "lobster-report",
+        "version": 2,
+        "generator": "lobster_report",
+        "levels": [{"name": name, "kind": "requirements",
+                    "coverage": coverage, "items": items}
+                   for name, coverage, items in levels],
+        "policy": {name: {"name": name, "kind": "requirements",
+                          "traces": [], "source": [],
+                          "needs_tracing_up": False,
+                          "needs_tracing_down": False,
+                          "breakdown_requirements": []}
+                   for name, _, _ in levels},
+        "matrix": [],
+    }
+
+
+class DiffTests(TestCase):
+    OLD = report([
+        ("System", 100.0, [item("s1"), item("s2")]),
+        ("Software", 50.0, [item("a", refs=["s1"]),
+                            item("b", "MISSING", refs=["s2"]),
+                            item("c"), item("gone", refs=["s1"])]),
+    ])
+    NEW = report([
+        ("System", 100.0, [item("s1"), item("s2"), item("s3")]),
+        ("Software", 75.0, [item("new", refs=["s3"]),
+                            item("b", refs=["s1", "s3"]),
+                            item("a", refs=["s1"]),
+                            item("c", text="changed")]),
+    ])
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.old = self.write("old.lobster", self.OLD)
+        self.new = self.write("new.lobster", self.NEW, binary=True)
+
+    def write(self, name, data, binary=False):
+        filename = os.path.join(self.directory, name)
+        with open(filename, "wb" if binary else "w") as fd:
+            write_document(fd, data, binary)
+        return filename
+
+    def test_changes(self):
+        for chunk_size in (1, 2, 1000):
+            with self.subTest(chunk_size=chunk_size):
+                out = os.path.join(self.directory, "diff.json")
+                summary = lobster_diff(self.old, self.new, out,
+                                       chunk_size=chunk_size)
+                with open(out, encoding="UTF-8") as fd:
+                    data = json.load(fd)
+
+                self.assertEqual(data["summary"], summary.to_json())
+                self.assertEqual(data["summary"], {
+                    "added": 2, "removed": 1, "status_changes": 1,
+                    "links_added": 3, "links_removed": 2,
+                    "content_changes": 1})
+                self.assertEqual(data["changes"], [
+                    {"key": "req b", "change": "changed",
+                     "level": "Software", "status": "OK",
+                     "old_status": "MISSING",
+                     "links_added": ["req s1", "req s3"],
+                     "links_removed": ["req s2"]},
+                    {"key": "req c", "change": "changed",
+                     "level": "Software", "status": "OK",
+                     "content_changed": True},
+                    {"key": "req gone", "change": "removed",
+                     "level": "Software", "status": "OK",
+                     "links_removed": ["req s1"]},
+                    {"key": "req new", "change": "added",
+                     "level": "Software", "status": "OK",
+                     "links_added": ["req s3"]},
+                    {"key": "req s3", "change": "added", "level": "System",
+                     "status": "OK"},
+                ])
+                self.assertEqual(data["levels"], [
+                    {"name": "System",
+                     "old": {"items": 2, "ok": 2, "coverage": 100.0},
+                     "new": {"items": 3, "ok": 3, "coverage": 100.0}},
+                    {"name": "Software",
+                     "old": {"items": 4, "ok": 3, "coverage": 50.0},
+                     "new": {"items": 4, "ok": 4, "coverage": 75.0}},
+                ])
+
+    def test_levels_added_and_removed(self):
+        other = self.write("other.lobster", report([
+            ("System", 100.0, [item("s1"), item("s2")]),
+            ("Tests", 0.0, [])]))
+        summary = lobster_diff(self.old, other)
+        self.assertEqual([(level["name"], level["old"] is None,
+                           level["new"] is None)
+                          for level in summary.levels_to_json()],
+                         [("System", False, False), ("Tests", True, False),
+                          ("Software", False, True)])
+        self.assertIn("Tests     - -> 0  - -> 0  - -> 0.0%",
+                      format_summary(summary).splitlines())
+
+    def test_same_report(self):
+        summary = lobster_diff(self.old, self.old)
+        self.assertEqual(set(summary.to_json().values()), {0})
+
+    def test_tool(self):
+        output = io.StringIO()
+        with redirect_stdout(output):
+            self.assertEqual(main([self.old, self.new]), 0)
+        self.assertIn("Software  4 -> 4  3 -> 4  50.0% -> 75.0%",
+                      output.getvalue().splitlines())
+        self.assertIn("2 items added, 1 removed, 1 with other changes",
+                      output.getvalue())
+
+        broken = os.path.join(self.directory, "broken.lobster")
+        with open(broken, "w", encoding="UTF-8") as fd:
+            fd.write('{"schema": "lobster-req-trace", "version": 4}')
+        output = io.StringIO()
+        with redirect_stdout(output):
+            self.assertEqual(main([broken, self.new]), 1)
+        self.assertIn(f"{broken} is not a LOBSTER report", output.getvalue())
+
+    def convert(self, filename, name, **options):
+        report = Report()
+        report.load_report(filename)
+        output = os.path.join(self.directory, name)
+        if name.endswith(".db"):
+            report.write_sqlite(output)
+        else:
+            report.write_report(output, **options)
+        return output
+
+    def test_sharded_and_sqlite_reports(self):
+        expected = lobster_diff(self.old, self.new).to_json()
+        old_sharded = self.convert(self.old, "old_sharded.lobster",
+                                   sharded=True)
+        new_sqlite  = self.convert(self.new, "new.db")
+        for old, new in ((old_sharded, self.old), (self.new, new_sqlite)):
+            with self.subTest(old=old, new=new):
+                self.assertEqual(set(lobster_diff(old, new).to_json()
+                                     .values()), {0})
+        self.assertEqual(lobster_diff(old_sharded, new_sqlite).to_json(),
+                         expected)
+
+        # Broken level files and databases are reported as such
+        os.remove(os.path.join(self.directory, "old_sharded.1.lobster"))
+        broken_db = os.path.join(self.directory, "broken.db")
+        with open(new_sqlite, "rb") as fd:
+            header = fd.read(100)
+        with open(broken_db, "wb") as fd:
+            fd.write(header + b"\xff" * 4000)
+        for old, message in (
+                (old_sharded, "old_sharded.1.lobster: cannot read file"),
+                (broken_db, f"{broken_db}: ")):
+            with self.subTest(message):
+                output = io.StringIO()
+                with redirect_stdout(output):
+                    self.assertEqual(main([old, self.new]), 1)
+                self.assertIn(message, output.getvalue())
+                self.assertIn("aborting due to earlier errors",
+                              output.getvalue())
@@ -1,7 +1,10 @@
 import unittest
 import subprocess
 from datetime import datetime, timezone
-from lobster.tools.core.html_report.html_report import get_commit_timestamp_utc
+from lobster.common.items import Requirement, Tracing_Tag
+from lobster.common.location import Void_Reference
+from lobster.tools.core.html_report.html_report import (get_commit_timestamp_utc,
+                                                        xref_item)
 
 
 class LobsterHtmlReportTests(unittest.TestCase):
@@ -25,6 +28,15 @@ class LobsterHtmlReportTests(unittest.TestCase):
         returned = get_commit_timestamp_utc(invalid_commit)
         self.assertEqual(returned, "Unknown")
 
+    def test_xref_item_anchor_scheme(self):
+        tag = Tracing_Tag("req", "example.req")
+        item = Requirement(tag, Void_Reference(), "framework", "requirement",
+                           "example.req")
+        for scheme in ("sha1", "blake2"):
+            with self.subTest(scheme=scheme):
+                self.assertIn(f"href='#item-{tag.anchor(scheme)}'",
+                              xref_item(item, anchor_scheme=scheme))
+
 
 if __name__ == "__main__":
     unittest.main()
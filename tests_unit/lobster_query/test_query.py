@@ -0,0 +1,187 @@
+import io
+import os
+import shutil
+import tempfile
+from contextlib import redirect_stdout
+from unittest import TestCase
+
+from lobster.common.io import write_document
+from lobster.common.query import Query_Error, parse_query, select
+from lobster.common.report import Report
+from lobster.common.report_index import (Report_Index, bitmap,
+                                         index_file_for, load_index, rows_of)
+from lobster.tools.core.query.query import lobster_query, main
+
+
+def item(name, status="OK", *, file="a.trlc", line=1, up=(), down=(),
+         just=(), text="text"):
+    # pylint: disable=too-many-arguments
+    return {"tag": f"req {name}",
+            "location": {"kind": "file", "file": file, "line": line,
+                         "column": None},
+            "name": name, "messages": [], "just_up": list(just),
+            "just_down": [], "just_global": [],
+            "ref_up": [f"req {ref}" for ref in up],
+            "ref_down": [f"req {ref}" for ref in down],
+            "tracing_status": status, "framework": "TRLC",
+            "kind": "Requirement", "text": text, "status": None}
+
+
+REPORT = {
+    "schema": "lobster-report",
+    "version": 2,
+    "generator": "lobster_report",
+    "levels": [
+        {"name": "System", "kind": "requirements", "coverage": 50.0,
+         "items": [item("s1", file="sys/a.trlc", down=["a", "b"]),
+                   item("s2", "MISSING", file="sys/b.trlc", line=7)]},
+        {"name": "Software", "kind": "requirements", "coverage": 50.0,
+         "items": [item("a", file="sw/x.trlc", line=3, up=["s1"]),
+                   item("b", "JUSTIFIED", file="sw/x.trlc", line=1,
+                        up=["s1", "gone"], just=["Not needed (yet)"]),
+                   item("c", "PARTIAL", file="swx.trlc",
+                        text="Brake \"fast\"")]},
+    ],
+    "policy": {name: {"name": name, "kind": "requirements", "traces": [],
+                      "source": [], "needs_tracing_up": False,
+                      "needs_tracing_down": False,
+                      "breakdown_requirements": []}
+               for name in ("System", "Software")},
+    "matrix": [],
+}
+
+
+class ReportIndexTests(TestCase):
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.report_file = os.path.join(directory, "report.lobster")
+        with open(self.report_file, "w", encoding="UTF-8") as fd:
+            write_document(fd, REPORT)
+        report = Report()
+        report.load_report(self.report_file, columnar=True)
+        self.index = Report_Index.build(report)
+
+    def keys(self, query, index=None):
+        index = index or self.index
+        return [index.keys[row] for row in select(index, query)]
+
+    def test_bitmaps(self):
+        self.assertEqual(rows_of(bitmap([0, 3, 64, 65])), [0, 3, 64, 65])
+        self.assertEqual(rows_of(bitmap([])), [])
+
+    def test_fields(self):
+        for query, keys in (
+                ("level:Software", ["req a", "req b", "req c"]),
+                ("status:ok", ["req s1", "req a"]),
+                ("namespace:req", [f"req {name}"
+                                   for name in ("s1", "s2", "a", "b", "c")]),
+                ("namespace:impl", []),
+                ("file:sw/", ["req a", "req b"]),
+                ("file:sw", ["req a", "req b", "req c"]),
+                ('key:"req b"', ["req b"]),
+                ("key~^req.[ab]$", ["req a", "req b"]),
+                ('traces-to:"req s1"', ["req a", "req b"]),
+                ('traced-by:"req b"', ["req s1"]),
+                ('traced-by:"req gone"', []),
+                ("justification~needed", ["req b"]),
+                ('text~"Brake \\"fast\\""', ["req c"])):
+            with self.subTest(query=query):
+                self.assertEqual(self.keys(query), keys)
+
+    def test_operators(self):
+        for query, keys in (
+                ("level:Software status:ok", ["req a"]),
+                ("level:Software and not status:ok",
+                 ["req b", "req c"]),
+                ("status:missing or status:partial", ["req s2", "req c"]),
+                ("not (level:System or file:sw/) or key:\"req a\"",
+                 ["req a", "req c"]),
+                ("not not level:System", ["req s1", "req s2"])):
+            with self.subTest(query=query):
+                self.assertEqual(self.keys(query), keys)
+
+    def test_errors(self):
+        for query, message in (
+                ("", "empty query"),
+                ("colour:red", "unknown field colour"),
+                ("status:fine", "unknown status fine"),
+                ("level~x", "level cannot be matched with ~"),
+                ("text:x", "text can only be matched with ~"),
+                ('text~"("', "invalid regular expression for text"),
+                ("(level:System", "missing )"),
+                ("level:System)", "unexpected ) at column 13"),
+                ("level:System or", "unexpected end of query"),
+                ("System", "expected a condition, not System")):
+            with self.subTest(query=query):
+                with self.assertRaises(Query_Error) as context:
+                    parse_query(query)
+                self.assertIn(message, context.exception.message)
+
+    def test_build_from_items(self):
+        report = Report()
+        report.load_report(self.report_file)
+        index = Report_Index.build(report)
+        for query in ("status:ok", "namespace:req level:System",
+                      "file:sw", 'traces-to:"req s1"', "text~fast"):
+            with self.subTest(query=query):
+                self.assertEqual(self.keys(query, index), self.keys(query))
+
+    def test_describe(self):
+        self.assertEqual(self.index.describe(1),
+                         {"key": "req s2", "level": "System",
+                          "status": "MISSING", "file": "sys/b.trlc",
+                          "line": 7})
+
+    def test_saved_index(self):
+        index = load_index(self.report_file)
+        self.assertTrue(os.path.isfile(index_file_for(self.report_file)))
+        loaded = Report_Index.load(self.report_file)
+        self.assertIsNotNone(loaded)
+        for query in ("file:sw", "traces-to:\"req s1\"",
+                      "traced-by:\"req b\"", "justification~yet",
+                      "status:ok or level:System"):
+            with self.subTest(query=query):
+                self.assertEqual(self.keys(query, loaded),
+                                 self.keys(query, index))
+
+        # A changed report makes the saved index invalid
+        with open(self.report_file, "a", encoding="UTF-8") as fd:
+            fd.write("\n")
+        self.assertIsNone(Report_Index.load(self.report_file))
+
+    def test_tool(self):
+        self.assertEqual(
+            [entry["key"] for entry in
+             lobster_query(self.report_file, "level:System",
+                           use_index_file=False)],
+            ["req s1", "req s2"])
+        self.assertFalse(os.path.exists(index_file_for(self.report_file)))
+
+        for args, expected in (
+                (["status:missing", self.report_file],
+                 "sys/b.trlc:7: req s2 (System, MISSING)\n"),
+                (["--count", "level:Software", self.report_file], "3\n"),
+                (["--limit", "1", "level:Software", self.report_file],
+                 "sw/x.trlc:3: req a (Software, OK)\n")):
+            with self.subTest(args=args):
+                out = io.StringIO()
+                with redirect_stdout(out):
+                    self.assertEqual(main(args), 0)
+                self.assertEqual(out.getvalue(), expected)
+
+        out = io.StringIO()
+        with redirect_stdout(out):
+            self.assertEqual(main(["colour:red", self.report_file]), 1)
+        self.assertIn("unknown field colour", out.getvalue())
+
+    def test_invalid_report(self):
+        bad_report = os.path.join(os.path.dirname(self.report_file),
+                                  "bad.lobster")
+        with open(bad_report, "w", encoding="UTF-8") as fd:
+            fd.write('{"schema": "lobster-report", "version": 2}')
+        out = io.StringIO()
+        with redirect_stdout(out):
+            self.assertEqual(main(["level:System", bad_report]), 1)
+        self.assertIn("required top-level key", out.getvalue())
+        self.assertFalse(os.path.exists(index_file_for(bad_report)))
@@ -1,7 +1,23 @@
+import copy
+import io
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+from contextlib import closing, redirect_stdout
 from unittest import TestCase
 from unittest.mock import patch
-from lobster.common.report import Coverage, Report
+from lobster.common.errors import LOBSTER_Error
+from lobster.common.io import lobster_write, read_content_header
+from lobster.common.items import (Implementation, Item, Requirement,
+                                  Tracing_Status, Tracing_Tag)
+from lobster.common.location import File_Reference, Void_Reference
+from lobster.common.item_store import Item_Store, Stored_Item
+from lobster.common.report import Coverage, Lazy_Item, Report, item_key
+from lobster.common.source_cache import Source_Cache
 from lobster.tools.core.report.report import lobster_report
+from tests_unit.temp_content_file import TempContentFile
 
 
 class ReportTests(TestCase):
@@ -62,5 +78,502 @@ class ReportTests(TestCase):
             )
 
             # Verify custom parameters were used
-            mock_parse_config.assert_called_once_with(apple_config)
-            mock_write_report.assert_called_once_with(banana_output)
+            mock_parse_config.assert_called_once_with(apple_config, False,
+                                                      jobs=1, cache=None)
+            mock_write_report.assert_called_once_with(banana_output,
+                                                      compact=False,
+                                                      content_header=False,
+                                                      sharded=False,
+                                                      mergeable=False)
+
+
+class LazyLoadReportTests(TestCase):
+    REPORT = {
+        "schema": "lobster-report",
+        "version": 2,
+        "generator": "lobster_report",
+        "levels": [
+            {"name": "Requirements", "kind": "requirements", "coverage": 100.0,
+             "items": [{"tag": "req example.adas_100",
+                        "location": {"kind": "file", "file": "demo.trlc",
+                                     "line": 3, "column": 13},
+                        "name": "example.adas_100",
+                        "messages": [], "just_up": [], "just_down": [],
+                        "just_global": [], "ref_up": [],
+                        "ref_down": ["python software.Example"],
+                        "tracing_status": "OK", "framework": "TRLC",
+                        "kind": "Requirement", "text": "keep lane",
+                        "status": None}]},
+            {"name": "Code", "kind": "implementation", "coverage": 0.0,
+             "items": [{"tag": "python software.Example",
+                        "location": {"kind": "file", "file": "software.py",
+                                     "line": 1, "column": None},
+                        "name": "software.Example",
+                        "messages": ["trace"], "just_up": [], "just_down": [],
+                        "just_global": [],
+                        "ref_up": ["req example.adas_100"], "ref_down": [],
+                        "tracing_status": "PARTIAL", "language": "Python",
+                        "kind": "Function"}]},
+        ],
+        "policy": {
+            "Requirements": {"name": "Requirements", "kind": "requirements",
+                             "traces": [], "source": [],
+                             "needs_tracing_up": False,
+                             "needs_tracing_down": True,
+                             "breakdown_requirements": [["Code"]]},
+            "Code": {"name": "Code", "kind": "implementation",
+                     "traces": ["Requirements"], "source": [],
+                     "needs_tracing_up": True, "needs_tracing_down": False,
+                     "breakdown_requirements": []},
+        },
+        "matrix": [],
+    }
+
+    def load(self, lazy, trust_inputs=False, columnar=False):
+        report = Report()
+        with TempContentFile(json.dumps(self.REPORT)) as filename:
+            report.load_report(filename, lazy=lazy, trust_inputs=trust_inputs,
+                               columnar=columnar)
+        return report
+
+    def test_lazy_items_equal_eager_items(self):
+        eager = self.load(lazy=False)
+        lazy = self.load(lazy=True)
+
+        self.assertEqual(list(lazy.items), list(eager.items))
+        for key, item in lazy.items.items():
+            self.assertEqual(item.to_json(), eager.items[key].to_json())
+        self.assertEqual(lazy.coverage, eager.coverage)
+
+    def test_trusted_items_equal_eager_items(self):
+        eager = self.load(lazy=False)
+        for lazy in (False, True):
+            with self.subTest(lazy=lazy):
+                trusted = self.load(lazy=lazy, trust_inputs=True)
+                self.assertEqual(list(trusted.items), list(eager.items))
+                for key, item in trusted.items.items():
+                    self.assertEqual(item.to_json(),
+                                     eager.items[key].to_json())
+                self.assertEqual(trusted.coverage, eager.coverage)
+
+    def test_content_header(self):
+        report = self.load(lazy=False)
+        with TempContentFile("") as filename:
+            report.write_report(filename)
+            self.assertIsNone(read_content_header(filename))
+
+            report.write_report(filename, content_header=True)
+            header = read_content_header(filename)
+            self.assertEqual(header["items"], 2)
+            report.write_report(filename, compact=True, content_header=True)
+            self.assertEqual(read_content_header(filename), header)
+
+            reloaded = Report()
+            reloaded.load_report(filename)
+            self.assertEqual(list(reloaded.items), list(report.items))
+
+    def test_suggestions(self):
+        data = dict(self.REPORT, suggestions={
+            "req example.adas_10": ["req example.adas_100"]})
+        for kwargs in ({}, {"lazy": True}, {"columnar": True},
+                       {"columnar": True, "trust_inputs": True}):
+            with self.subTest(**kwargs), \
+                 TempContentFile(json.dumps(data)) as filename:
+                report = Report()
+                report.load_report(filename, **kwargs)
+                self.assertEqual(report.suggestions, data["suggestions"])
+
+                report.write_report(filename)
+                reloaded = Report()
+                reloaded.load_report(filename)
+                self.assertEqual(reloaded.suggestions, data["suggestions"])
+
+        # Reports without suggestions are written as before
+        report = self.load(lazy=False)
+        self.assertEqual(report.suggestions, {})
+        with TempContentFile("") as filename:
+            report.write_report(filename)
+            with open(filename, encoding="UTF-8") as fd:
+                self.assertNotIn("suggestions", json.load(fd))
+
+        data["suggestions"] = {"req example.adas_10": "req example.adas_100"}
+        with TempContentFile(json.dumps(data)) as filename, \
+             redirect_stdout(io.StringIO()), \
+             self.assertRaises(LOBSTER_Error):
+            Report().load_report(filename)
+
+    def test_sqlite(self):
+        data = dict(self.REPORT, suggestions={
+            "req example.adas_10": ["req example.adas_100"]})
+        with TempContentFile(json.dumps(data)) as filename, \
+             tempfile.TemporaryDirectory() as directory:
+            report = Report()
+            report.load_report(filename)
+            database = os.path.join(directory, "report.db")
+            report.write_sqlite(database)
+            report.write_report(filename)
+            with open(filename, encoding="UTF-8") as fd:
+                expected = fd.read()
+
+            for kwargs in ({}, {"lazy": True}, {"columnar": True},
+                           {"columnar": True, "trust_inputs": True}):
+                with self.subTest(**kwargs):
+                    loaded = Report()
+                    loaded.load_report(database, **kwargs)
+                    self.assertEqual(list(loaded.items), list(report.items))
+                    self.assertEqual(loaded.coverage, report.coverage)
+                    self.assertEqual(loaded.suggestions, data["suggestions"])
+
+                    output = os.path.join(directory, "report.lobster")
+                    loaded.write_report(output)
+                    with open(output, encoding="UTF-8") as fd:
+                        self.assertEqual(fd.read(), expected)
+
+            with closing(sqlite3.connect(database)) as connection:
+                self.assertEqual(
+                    connection.execute(
+                        "SELECT items.key, links.target_key FROM links "
+                        "JOIN items ON items.row = links.item_row "
+                        "WHERE links.direction = 'up'").fetchall(),
+                    [("python software.Example", "req example.adas_100")])
+                self.assertEqual(
+                    connection.execute("SELECT message FROM messages")
+                    .fetchall(), [("trace",)])
+
+    def test_sqlite_keeps_absent_members(self):
+        data = copy.deepcopy(self.REPORT)
+        requirement = data["levels"][0]["items"][0]
+        del requirement["ref_up"], requirement["ref_down"]
+        with tempfile.TemporaryDirectory() as directory:
+            database = os.path.join(directory, "report.db")
+            report = Report()
+            with TempContentFile(json.dumps(data)) as filename:
+                report.load_report(filename, columnar=True)
+            report.write_sqlite(database)
+            loaded = Report()
+            loaded.load_report(database, columnar=True)
+            self.assertEqual(loaded.items.raw(0), requirement)
+            self.assertEqual(loaded.items.raw(1),
+                             data["levels"][1]["items"][0])
+
+    def test_sqlite_errors(self):
+        with tempfile.TemporaryDirectory() as directory:
+            database = os.path.join(directory, "other.db")
+            with closing(sqlite3.connect(database)) as connection:
+                connection.execute("CREATE TABLE meta (name, value)")
+                connection.commit()
+            out = io.StringIO()
+            with redirect_stdout(out), self.assertRaises(LOBSTER_Error):
+                Report().load_report(database)
+            self.assertIn("not a LOBSTER report database", out.getvalue())
+
+    def test_sharded(self):
+        report = self.load(lazy=False)
+        with tempfile.TemporaryDirectory() as directory:
+            manifest = os.path.join(directory, "report.lobster")
+            report.write_report(manifest)
+            with open(manifest, encoding="UTF-8") as fd:
+                expected = fd.read()
+            report.write_report(manifest, sharded=True)
+            self.assertEqual(sorted(os.listdir(directory)),
+                             ["report.0.lobster", "report.1.lobster",
+                              "report.lobster"])
+
+            for kwargs in ({}, {"lazy": True}, {"columnar": True},
+                           {"columnar": True, "jobs": 2},
+                           {"columnar": True, "trust_inputs": True}):
+                with self.subTest(**kwargs):
+                    loaded = Report()
+                    loaded.load_report(manifest, **kwargs)
+                    self.assertEqual(list(loaded.items), list(report.items))
+                    self.assertEqual(loaded.coverage, report.coverage)
+
+                    output = os.path.join(directory, "monolithic.lobster")
+                    loaded.write_report(output)
+                    with open(output, encoding="UTF-8") as fd:
+                        self.assertEqual(fd.read(), expected)
+
+            # Only the file of the level asked for is read
+            os.remove(os.path.join(directory, "report.0.lobster"))
+            for columnar in (False, True):
+                with self.subTest(levels=["Code"], columnar=columnar):
+                    loaded = Report()
+                    loaded.load_report(manifest, columnar=columnar,
+                                       levels=["Code"])
+                    self.assertEqual(list(loaded.items),
+                                     ["python software.Example"])
+                    self.assertEqual(loaded.coverage, report.coverage)
+
+            out = io.StringIO()
+            with redirect_stdout(out), self.assertRaises(LOBSTER_Error):
+                Report().load_report(manifest)
+            self.assertIn("level file of Requirements is missing or does "
+                          "not match", out.getvalue())
+
+    def test_levels(self):
+        for kwargs in ({}, {"lazy": True}, {"columnar": True}):
+            with self.subTest(**kwargs):
+                report = Report()
+                with TempContentFile(json.dumps(self.REPORT)) as filename:
+                    report.load_report(filename, levels=["Requirements"],
+                                       **kwargs)
+                self.assertEqual(list(report.items), ["req example.adas_100"])
+                self.assertEqual(report.coverage["Code"],
+                                 Coverage(level="Code", items=1, ok=0,
+                                          coverage=0.0))
+
+    def test_items_are_built_on_first_access(self):
+        report = self.load(lazy=True)
+        item = report.items["python software.Example"]
+
+        self.assertIsInstance(item, Lazy_Item)
+        self.assertIsInstance(item, Implementation)
+        self.assertIsInstance(item, Item)
+        self.assertEqual(item.level, "Code")
+        self.assertEqual(item.tracing_status, Tracing_Status.PARTIAL)
+        self.assertEqual(report.coverage["Code"],
+                         Coverage(level="Code", items=1, ok=0, coverage=0.0))
+        self.assertFalse(item.is_materialized)
+
+        self.assertEqual(item.messages, ["trace"])
+        self.assertTrue(item.is_materialized)
+
+        item.location = File_Reference("moved.py")
+        self.assertEqual(item.to_json()["location"]["file"], "moved.py")
+
+    def test_trusted_lazy_items_keep_their_data(self):
+        report = self.load(lazy=True, trust_inputs=True)
+        item = report.items["python software.Example"]
+        self.assertEqual(item.to_json()["tag"], "python software.Example")
+        self.assertFalse(item.is_materialized)
+
+    def test_lazy_items_are_checked_on_load(self):
+        data = copy.deepcopy(self.REPORT)
+        data["levels"][1]["items"][0]["ref_up"] = [42]
+        for kwargs in ({"lazy": True}, {"columnar": True}):
+            with self.subTest(**kwargs), \
+                 TempContentFile(json.dumps(data)) as filename:
+                out = io.StringIO()
+                with redirect_stdout(out), self.assertRaises(LOBSTER_Error):
+                    Report().load_report(filename, **kwargs)
+                self.assertIn(f"{filename}: lobster error: item 1 of level "
+                              f"Code: ref_up is not an array of tags",
+                              out.getvalue())
+
+    def test_columnar_items_equal_eager_items(self):
+        eager = self.load(lazy=False)
+        for trust_inputs in (False, True):
+            with self.subTest(trust_inputs=trust_inputs):
+                columnar = self.load(lazy=False, trust_inputs=trust_inputs,
+                                     columnar=True)
+                self.assertIsInstance(columnar.items, Item_Store)
+                self.assertEqual(list(columnar.items), list(eager.items))
+                for key, item in columnar.items.items():
+                    self.assertEqual(item.to_json(),
+                                     eager.items[key].to_json())
+                self.assertEqual(columnar.coverage, eager.coverage)
+
+    def test_columnar_changes_are_kept(self):
+        report = self.load(lazy=False, columnar=True)
+        view = report.items["python software.Example"]
+        self.assertIsInstance(view, Stored_Item)
+        self.assertIsInstance(view, Implementation)
+        self.assertEqual(view.tracing_status, Tracing_Status.PARTIAL)
+        self.assertFalse(view.is_materialized)
+
+        view.location = File_Reference("moved.py")
+        item = report.items["python software.Example"]
+        self.assertNotIsInstance(item, Stored_Item)
+        self.assertEqual(item.location.filename, "moved.py")
+
+        with TempContentFile("") as filename:
+            report.write_report(filename)
+            reloaded = Report()
+            reloaded.load_report(filename)
+        self.assertEqual(
+            reloaded.items["python software.Example"].location.filename,
+            "moved.py")
+        self.assertEqual(
+            reloaded.items["req example.adas_100"].to_json(),
+            report.items["req example.adas_100"].to_json())
+
+    def test_anchors(self):
+        eager = self.load(lazy=False)
+        for scheme in ("sha1", "blake2"):
+            with self.subTest(scheme=scheme):
+                for options in ({"lazy": True}, {"columnar": True}):
+                    report = Report()
+                    with TempContentFile(json.dumps(self.REPORT)) as filename:
+                        report.load_report(filename, anchor_scheme=scheme,
+                                           **options)
+                    self.assertEqual(list(report.anchors), list(eager.items))
+                    for key, item in eager.items.items():
+                        self.assertEqual(report.anchor(key),
+                                         item.tag.anchor(scheme))
+                    # No item is built for the anchors
+                    for item in report.items.values():
+                        self.assertFalse(item.is_materialized)
+
+    def test_graph(self):
+        for options in ({"lazy": False}, {"lazy": False, "columnar": True}):
+            with self.subTest(**options):
+                report = self.load(**options)
+                self.assertEqual(report.graph.keys, list(report.items))
+                self.assertEqual(
+                    [key for key, _ in report.trace_down("req example.adas_100")],
+                    ["python software.Example"])
+                (key, item), = report.trace_up("python software.Example")
+                self.assertEqual(key, "req example.adas_100")
+                self.assertEqual(item.name, "example.adas_100")
+                self.assertEqual(list(report.trace_up("req example.adas_100")),
+                                 [])
+                self.assertEqual(list(report.trace_up("req unknown")), [])
+
+    def test_item_key(self):
+        for tag in ("req example.adas_100", "req a b@3", "python f@x@y"):
+            with self.subTest(tag=tag):
+                self.assertEqual(item_key(tag),
+                                 Tracing_Tag.from_json(tag).key())
+
+
+class ParallelParseConfigTests(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def write_requirements(self, name, names):
+        items = [Requirement(tag=Tracing_Tag("req", item_name),
+                             location=File_Reference(name, line),
+                             framework="TRLC", kind="Requirement",
+                             name=item_name)
+                 for line, item_name in enumerate(names, start=1)]
+        with open(os.path.join(self.directory, name), "w",
+                  encoding="UTF-8") as fd:
+            lobster_write(fd, Requirement, "test", items)
+
+    def write_code(self, name, names):
+        items = []
+        for item_name in names:
+            item = Implementation(tag=Tracing_Tag("python", item_name),
+                                  location=Void_Reference(),
+                                  language="Python", kind="Function",
+                                  name=item_name)
+            item.add_tracing_target(Tracing_Tag("req", "a"))
+            items.append(item)
+        with open(os.path.join(self.directory, name), "w",
+                  encoding="UTF-8") as fd:
+            lobster_write(fd, Implementation, "test", items)
+
+    def write_config(self, requirement_sources, code_sources):
+        def sources(names):
+            return "".join(f'  source: "{self.directory}/{name}";\n'
+                           for name in names)
+        config = os.path.join(self.directory, "lobster.conf")
+        with open(config, "w", encoding="UTF-8") as fd:
+            fd.write(f'requirements "Requirements" {{\n'
+                     f'{sources(requirement_sources)}}}\n'
+                     f'implementation "Code" {{\n'
+                     f'{sources(code_sources)}'
+                     f'  trace to: "Requirements";\n}}\n')
+        return config
+
+    def parse(self, config, jobs, cache=None):
+        report = Report()
+        output = io.StringIO()
+        error = None
+        with redirect_stdout(output):
+            try:
+                report.parse_config(config, jobs=jobs, cache=cache)
+            except LOBSTER_Error as err:
+                error = err.location.to_string(), err.message
+        return report, output.getvalue(), error
+
+    def test_same_result_as_serial(self):
+        self.write_requirements("a.lobster", ["a", "b"])
+        self.write_requirements("b.lobster", ["c"])
+        self.write_code("c.lobster", ["f", "g"])
+        self.write_code("d.lobster", ["h"])
+        config = self.write_config(["a.lobster", "b.lobster"],
+                                   ["c.lobster", "d.lobster"])
+
+        serial, _, _ = self.parse(config, jobs=1)
+        parallel, output, error = self.parse(config, jobs=3)
+        self.assertEqual((output, error), ("", None))
+        self.assertEqual(list(parallel.items), list(serial.items))
+        for key, item in parallel.items.items():
+            self.assertEqual(item.to_json(), serial.items[key].to_json())
+        self.assertEqual(parallel.coverage, serial.coverage)
+
+    def test_same_errors_as_serial(self):
+        self.write_requirements("a.lobster", ["a", "b"])
+        self.write_requirements("b.lobster", ["b", "c", "a"])
+        self.write_code("c.lobster", ["f"])
+        with open(os.path.join(self.directory, "d.lobster"), "w",
+                  encoding="UTF-8") as fd:
+            fd.write("{ broken")
+        for code_sources in (["c.lobster"], ["d.lobster", "c.lobster"]):
+            with self.subTest(code_sources=code_sources):
+                config = self.write_config(["a.lobster", "b.lobster"],
+                                           code_sources)
+                _, serial_output, serial_error = self.parse(config, jobs=1)
+                _, output, error = self.parse(config, jobs=2)
+                self.assertIsNotNone(serial_error)
+                self.assertIn("duplicate definition of req a", serial_output)
+                self.assertEqual(output, serial_output)
+                self.assertEqual(error, serial_error)
+
+    def test_cache(self):
+        self.write_requirements("a.lobster", ["a", "b"])
+        self.write_requirements("b.lobster", ["c"])
+        self.write_code("c.lobster", ["f", "g"])
+        config = self.write_config(["a.lobster", "b.lobster"], ["c.lobster"])
+        expected, _, _ = self.parse(config, jobs=1)
+
+        cache = Source_Cache(os.path.join(self.directory, "cache"))
+        for jobs, hits, misses in ((1, 0, 3), (1, 3, 3), (2, 6, 3)):
+            with self.subTest(jobs=jobs, hits=hits):
+                report, output, error = self.parse(config, jobs, cache)
+                self.assertEqual((output, error), ("", None))
+                self.assertEqual((cache.hits, cache.misses), (hits, misses))
+                self.assertEqual(
+                    {key: item.to_json() for key, item in report.items.items()},
+                    {key: item.to_json()
+                     for key, item in expected.items.items()})
+                self.assertEqual(report.coverage, expected.coverage)
+
+        # A changed source is read again
+        self.write_requirements("b.lobster", ["c", "d"])
+        for jobs in (1, 2):
+            with self.subTest(jobs=jobs, changed=True):
+                report, _, _ = self.parse(config, jobs, cache)
+                self.assertIn("req d", report.items)
+        self.assertEqual((cache.hits, cache.misses), (11, 4))
+
+    def test_cache_is_evicted_once(self):
+        self.write_requirements("a.lobster", ["a", "b"])
+        self.write_requirements("b.lobster", ["c"])
+        config = self.write_config(["a.lobster", "b.lobster"], [])
+
+        for jobs in (1, 2):
+            with self.subTest(jobs=jobs):
+                cache = Source_Cache(os.path.join(self.directory, "cache"), 0)
+                with patch.object(cache, "evict",
+                                  wraps=cache.evict) as evict:
+                    report, _, _ = self.parse(config, jobs, cache)
+                evict.assert_called_once_with()
+                self.assertEqual((cache.hits, cache.misses), (0, 2))
+                self.assertEqual(os.listdir(cache.directory), [])
+                self.assertIn("req c", report.items)
+
+    def test_cache_keeps_errors(self):
+        self.write_requirements("a.lobster", ["a", "b"])
+        self.write_requirements("b.lobster", ["b", "c", "a"])
+        config = self.write_config(["a.lobster", "b.lobster"], [])
+        _, expected_output, expected_error = self.parse(config, jobs=1)
+
+        cache = Source_Cache(os.path.join(self.directory, "cache"))
+        for jobs in (1, 2, 1):
+            with self.subTest(jobs=jobs):
+                _, output, error = self.parse(config, jobs, cache)
+                self.assertEqual(output, expected_output)
+                self.assertEqual(error, expected_error)
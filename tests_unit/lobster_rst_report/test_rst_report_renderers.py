@@ -19,7 +19,7 @@ def _make_item(status):
     item = MagicMock()
     item.__class__ = Activity
     item.tag = MagicMock()
-    item.tag.hash.return_value = "abc123"
+    item.tag.anchor.return_value = "abc123"
     item.tracing_status = status
     item.name = "test.item"
     item.messages = []
@@ -36,9 +36,12 @@ def _make_item(status):
     return item
 
 
-def _make_report(items=None):
+def _make_report(items=None, down=(), up=()):
     report = MagicMock(spec=Report)
+    report.anchor_scheme = "sha1"
     report.items = items if items is not None else {}
+    report.trace_down.side_effect = lambda key: iter(down)
+    report.trace_up.side_effect = lambda key: iter(up)
     return report
 
 
@@ -73,12 +76,19 @@ class TestItemCardBuilderDropdownState(unittest.TestCase):
 
 
 class TestItemCardBuilderAnchor(unittest.TestCase):
-    def test_anchor_label_contains_hash(self):
+    def test_anchor_label_contains_anchor(self):
         item = _make_item(Tracing_Status.OK)
-        item.tag.hash.return_value = "deadbeef"
+        item.tag.anchor.return_value = "deadbeef"
         text = "\n".join(ItemCardBuilder(item, _make_report()).build())
         self.assertIn("lobster-item-deadbeef", text)
 
+    def test_anchor_label_uses_report_anchor_scheme(self):
+        item = _make_item(Tracing_Status.OK)
+        report = _make_report()
+        report.anchor_scheme = "blake2"
+        ItemCardBuilder(item, report).build()
+        item.tag.anchor.assert_called_with("blake2")
+
 
 class TestItemCardBuilderVoidLocation(unittest.TestCase):
     def test_void_location_renders_unknown_location(self):
@@ -90,22 +100,18 @@ class TestItemCardBuilderVoidLocation(unittest.TestCase):
 class TestItemCardBuilderRefResolution(unittest.TestCase):
     def test_unresolved_down_ref_is_annotated(self):
         item = _make_item(Tracing_Status.MISSING)
-        unresolved = MagicMock()
-        unresolved.key.return_value = "req example.unknown"
-        item.ref_down = [unresolved]
-        text = "\n".join(ItemCardBuilder(item, _make_report()).build())
+        report = _make_report(down=[("req example.unknown", None)])
+        text = "\n".join(ItemCardBuilder(item, report).build())
         self.assertIn("(unresolved)", text)
         self.assertIn("req example.unknown", text)
 
     def test_resolved_down_ref_produces_ref_link(self):
         target = _make_item(Tracing_Status.OK)
         target.name = "example.req_foo"
-        target.tag.hash.return_value = "feed1234"
+        target.tag.anchor.return_value = "feed1234"
         item = _make_item(Tracing_Status.MISSING)
-        ref = MagicMock()
-        ref.key.return_value = "req example.req_foo"
-        item.ref_down = [ref]
-        report = _make_report(items={"req example.req_foo": target})
+        report = _make_report(items={"req example.req_foo": target},
+                              down=[("req example.req_foo", target)])
         text = "\n".join(ItemCardBuilder(item, report).build())
         self.assertIn(":ref:", text)
         self.assertIn("lobster-item-feed1234", text)
@@ -127,10 +133,10 @@ class TestLevelSectionBuilderEdgeCases(unittest.TestCase):
     def test_issues_before_ok_items(self):
         ok_item = _make_item(Tracing_Status.OK)
         ok_item.name = "ok.item"
-        ok_item.tag.hash.return_value = "ok000000"
+        ok_item.tag.anchor.return_value = "ok000000"
         issue_item = _make_item(Tracing_Status.MISSING)
         issue_item.name = "missing.item"
-        issue_item.tag.hash.return_value = "miss0000"
+        issue_item.tag.anchor.return_value = "miss0000"
         lines = LevelSectionBuilder([ok_item, issue_item], _make_report()).build()
         text = "\n".join(lines)
         ok_pos = text.find("lobster-item-ok000000")
@@ -140,7 +146,7 @@ class TestLevelSectionBuilderEdgeCases(unittest.TestCase):
     def test_all_ok_items_renders_without_error(self):
         items = [_make_item(Tracing_Status.OK) for _ in range(3)]
         for i, it in enumerate(items):
-            it.tag.hash.return_value = f"ok{i:06d}"
+            it.tag.anchor.return_value = f"ok{i:06d}"
             it.name = f"item_{i}"
         lines = LevelSectionBuilder(items, _make_report()).build()
         self.assertTrue(len(lines) > 0)
@@ -0,0 +1,176 @@
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from lobster.common import binary_format
+from lobster.common.binary_format import (Binary_Format_Error,
+                                          Binary_Stream_Reader)
+from lobster.common.errors import LOBSTER_Error, Message_Handler
+from lobster.common.io import (is_binary_lobster_file, lobster_read,
+                               lobster_write)
+from lobster.common.items import Requirement, Tracing_Tag
+from lobster.common.json_stream import Streamed_Array
+from lobster.common.location import File_Reference
+from lobster.tools.core.convert.convert import lobster_convert
+
+
+def encode(value):
+    fd = io.BytesIO()
+    binary_format.dump(value, fd)
+    return fd.getvalue()
+
+
+def decode(data):
+    return binary_format.load(io.BytesIO(data))
+
+
+class BinaryFormatTests(unittest.TestCase):
+    VALUES = [
+        None, True, False, 0, -1, 2**31, -2**70, 1.25, "", "text",
+        "x" * 1000, "ä\U0001f600", [], {},
+        [1, "a", None, [True], {"nested": []}],
+        {"data": [{"tag": "req a", "refs": ["b", None], "line": 1,
+                   "location": {"file": "f", "column": None},
+                   "ok": True, "ratio": 0.5, "big": -3,
+                   "mixed": [1, "a"], "text": "y" * 300},
+                  {"tag": "req b"},
+                  {}] * 1500},
+    ]
+
+    def test_round_trip(self):
+        for value in self.VALUES:
+            with self.subTest(value=str(value)[:40]):
+                self.assertEqual(decode(encode(value)), value)
+
+    def test_streamed_arrays(self):
+        value = {"levels": Streamed_Array(
+            {"name": name, "items": Streamed_Array(
+                {"n": n} for n in range(3))}
+            for name in ("a", "b"))}
+        self.assertEqual(
+            decode(encode(value)),
+            {"levels": [{"name": name, "items": [{"n": n} for n in range(3)]}
+                        for name in ("a", "b")]})
+
+    def test_strings_are_stored_once(self):
+        rows = [{"file": "some/long/path/to/file.trlc", "n": n}
+                for n in range(1000)]
+        self.assertEqual(encode(rows).count(b"some/long/path"), 1)
+
+    def test_walk_like_json_reader(self):
+        value = self.VALUES[-1]
+        reader = Binary_Stream_Reader(io.BytesIO(encode(value)))
+        tags = []
+        for _ in reader.iter_object():
+            self.assertEqual(reader.peek(), "[")
+            for _ in reader.iter_array(decode=False):
+                self.assertEqual(reader.peek(), "{")
+                for member in reader.iter_object():
+                    if member == "tag":
+                        tags.append(reader.read_value())
+        reader.finish()
+        self.assertEqual(tags, [row["tag"] for row in value["data"]
+                                if "tag" in row])
+
+    def test_malformed_data(self):
+        data = encode({"data": [{"a": "b"}] * 10})
+        for broken in (b"", b"{}", data[:-1], data + b"\x00",
+                       data[:len(binary_format.MAGIC)] + b"\x02" +
+                       data[len(binary_format.MAGIC) + 1:]):
+            with self.subTest(broken=broken[:20]):
+                with self.assertRaises(Binary_Format_Error):
+                    decode(broken)
+
+
+class BinaryFileTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def path(self, name):
+        return os.path.join(self.directory, name)
+
+    def write_requirements(self, name, binary):
+        items = [Requirement(tag=Tracing_Tag("req", f"r{n}"),
+                             location=File_Reference("a.trlc", n + 1),
+                             framework="TRLC",
+                             kind="Requirement",
+                             name=f"r{n}")
+                 for n in range(3)]
+        with open(self.path(name), "wb" if binary else "w") as fd:
+            self.assertEqual(
+                lobster_write(fd, Requirement, "test", items, binary=binary),
+                3)
+        return [item.to_json() for item in items]
+
+    def test_lobster_read_detects_encoding(self):
+        expected = self.write_requirements("req.lobster", binary=True)
+        self.assertTrue(is_binary_lobster_file(self.path("req.lobster")))
+        items = {}
+        lobster_read(Message_Handler(), self.path("req.lobster"),
+                     "level", items)
+        self.assertEqual([item.to_json() for item in items.values()],
+                         expected)
+
+    def test_lobster_read_reports_malformed_data(self):
+        with open(self.path("broken.lobster"), "wb") as fd:
+            fd.write(binary_format.MAGIC + b"\x01\x08")
+        mh = Message_Handler()
+        with self.assertRaises(LOBSTER_Error):
+            lobster_read(mh, self.path("broken.lobster"), "level", {})
+        self.assertEqual(mh.errors, 1)
+
+    def test_convert_round_trip(self):
+        self.write_requirements("req.lobster", binary=False)
+        lobster_convert(self.path("req.lobster"), self.path("req.bin"))
+        self.assertTrue(is_binary_lobster_file(self.path("req.bin")))
+        lobster_convert(self.path("req.bin"), self.path("req.json"))
+
+        with open(self.path("req.lobster"), encoding="UTF-8") as fd:
+            original = fd.read()
+        with open(self.path("req.json"), encoding="UTF-8") as fd:
+            self.assertEqual(fd.read(), original)
+
+    def test_convert_keeps_output_on_error(self):
+        self.write_requirements("req.lobster", binary=False)
+        with open(self.path("req.lobster"), encoding="UTF-8") as fd:
+            text = fd.read()
+        # Only decoding the items finds the error, once the output is open
+        with open(self.path("broken.lobster"), "w", encoding="UTF-8") as fd:
+            fd.write(text.replace('"TRLC"', "TRLC", 1))
+        for output in ("req.bin", "req.bin.gz"):
+            with self.subTest(output=output):
+                lobster_convert(self.path("req.lobster"), self.path(output))
+                with open(self.path(output), "rb") as fd:
+                    expected = fd.read()
+                with self.assertRaises(json.JSONDecodeError):
+                    lobster_convert(self.path("broken.lobster"),
+                                    self.path(output))
+                with open(self.path(output), "rb") as fd:
+                    self.assertEqual(fd.read(), expected)
+        self.assertEqual(sorted(os.listdir(self.directory)),
+                         ["broken.lobster", "req.bin", "req.bin.gz",
+                          "req.lobster"])
+
+    def test_convert_keeps_key_order_of_report(self):
+        report = {"schema": "lobster-report", "version": 2,
+                  "generator": "test",
+                  "levels": [{"name": "a", "kind": "requirements",
+                              "items": [{"tag": "req x"}], "coverage": 0.0},
+                             {"name": "b", "kind": "requirements",
+                              "items": [], "coverage": 0.0}],
+                  "policy": {}, "matrix": []}
+        with open(self.path("report.lobster"), "w", encoding="UTF-8") as fd:
+            json.dump(report, fd, indent=2)
+        lobster_convert(self.path("report.lobster"), self.path("report.bin"),
+                        "binary")
+        with open(self.path("report.bin"), "rb") as fd:
+            self.assertEqual(list(binary_format.load(fd).items()),
+                             list(report.items()))
+
+
+if __name__ == "__main__":
+    unittest.main()
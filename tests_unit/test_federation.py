@@ -0,0 +1,155 @@
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+from lobster.common.errors import LOBSTER_Error
+from lobster.common.merge import merge_reports
+from lobster.common.incremental import first_difference
+from lobster.common.io import lobster_write
+from lobster.common.items import (Activity, Implementation, Requirement,
+                                  Tracing_Tag)
+from lobster.common.location import File_Reference
+from lobster.common.report import Report
+
+
+class MergeReportsTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+        self.write_items("sys.lobster", Requirement, {"s1": [], "s2": []})
+        self.write_items("a.lobster", Requirement, {"a": ["s1"], "b": []})
+        self.write_items("c.lobster", Implementation,
+                         {"f": ["a"], "g": ["b", "d", "unknown"]})
+        self.write_items("b.lobster", Requirement,
+                         {"d": ["s1@2"], "e": ["s2", "a"]})
+        self.write_items("d.lobster", Implementation,
+                         {"h": ["d", "a"], "i": ["e"]})
+        self.write_items("t.lobster", Activity, {"t": ["a", "e"]})
+
+        system = self.level("requirements", "System", "sys.lobster")
+        self.components = {
+            "a": (system +
+                  self.level("requirements", "Requirements", "a.lobster",
+                             "System") +
+                  self.level("implementation", "Code", "c.lobster",
+                             "Requirements")),
+            "b": (self.level("requirements", "System") +
+                  self.level("requirements", "Requirements", "b.lobster",
+                             "System") +
+                  self.level("implementation", "Code", "d.lobster",
+                             "Requirements")),
+            "full": (system +
+                     self.level("requirements", "Requirements",
+                                ("a.lobster", "b.lobster"), "System") +
+                     self.level("implementation", "Code",
+                                ("c.lobster", "d.lobster"), "Requirements")),
+        }
+
+    def write_items(self, name, kind, targets):
+        items = []
+        for line, (item_name, refs) in enumerate(targets.items(), start=1):
+            tag = Tracing_Tag("python" if kind is Implementation else "req",
+                              item_name)
+            location = File_Reference(name, line)
+            if kind is Requirement:
+                item = Requirement(tag, location, "TRLC", "Requirement",
+                                   item_name)
+            elif kind is Implementation:
+                item = Implementation(tag, location, "Python", "Function",
+                                      item_name)
+            else:
+                tag = Tracing_Tag("test", item_name)
+                item = Activity(tag, location, "pytest", "Test")
+            for ref in refs:
+                item.add_tracing_target(Tracing_Tag.from_text("req", ref))
+            items.append(item)
+        with open(os.path.join(self.directory, name), "w",
+                  encoding="UTF-8") as fd:
+            lobster_write(fd, kind, "test", items)
+
+    def level(self, kind, name, sources=(), target=None):
+        if isinstance(sources, str):
+            sources = (sources,)
+        text = f'{kind} "{name}" {{\n'
+        for source in sources:
+            text += f'  source: "{self.directory}/{source}";\n'
+        if target:
+            text += f'  trace to: "{target}";\n'
+        return text + "}\n"
+
+    def build(self, name, mergeable=True):
+        config = os.path.join(self.directory, f"{name}.conf")
+        with open(config, "w", encoding="UTF-8") as fd:
+            fd.write(self.components[name])
+        report = Report()
+        report.parse_config(config)
+        filename = os.path.join(self.directory, f"report_{name}.lobster")
+        report.write_report(filename, mergeable=mergeable)
+        return report, filename
+
+    def assertSameReport(self, report, full):
+        self.assertIsNone(first_difference(report, full))
+        output = os.path.join(self.directory, "merged.lobster")
+        report.write_report(output, mergeable=True)
+        _, full_file = self.build("full")
+        with open(output, encoding="UTF-8") as fd, \
+             open(full_file, encoding="UTF-8") as full_fd:
+            self.assertEqual(fd.read(), full_fd.read())
+
+    def test_same_as_full_build(self):
+        _, file_a = self.build("a")
+        _, file_b = self.build("b")
+        full, _ = self.build("full")
+        for trust_inputs in (False, True):
+            with self.subTest(trust_inputs=trust_inputs):
+                result = merge_reports([file_a, file_b], trust_inputs)
+                self.assertSameReport(result.report, full)
+                # d -> s1, e -> s2, e -> a, g -> d and h -> a
+                self.assertEqual(result.cross_links, 5)
+                self.assertEqual(
+                    sorted(result.report.unresolved),
+                    ["python g", "req d"])
+                # Those and s1, s2 and a, which they now trace to
+                self.assertEqual(result.recomputed, 7)
+
+    def test_changed_policy(self):
+        # Tests tracing to Requirements are only known to the third
+        # component, so all requirements are checked again
+        self.components["t"] = (
+            self.level("requirements", "Requirements") +
+            self.level("activity", "Test", "t.lobster", "Requirements"))
+        self.components["full"] += self.level("activity", "Test",
+                                              "t.lobster", "Requirements")
+        files = [self.build(name)[1] for name in ("a", "b", "t")]
+        full, _ = self.build("full")
+        result = merge_reports(files)
+        self.assertSameReport(result.report, full)
+
+        # Merging merged reports gives the same
+        merged = os.path.join(self.directory, "ab.lobster")
+        merge_reports(files[:2]).report.write_report(merged, mergeable=True)
+        self.assertSameReport(merge_reports([merged, files[2]]).report, full)
+
+    def test_errors(self):
+        _, file_a = self.build("a")
+        self.components["other"] = self.level("implementation", "System")
+        _, other = self.build("other")
+        _, file_b = self.build("b", mergeable=False)
+        for files, message in (
+                ([file_a, file_a], "duplicate definition of req s1"),
+                ([file_a, other],
+                 "level System is of kind implementation, but of kind "
+                 "requirements in an earlier report"),
+                ([file_a, file_b], "report was not written to be merged")):
+            with self.subTest(message), redirect_stdout(io.StringIO()) as out:
+                with self.assertRaises(LOBSTER_Error):
+                    merge_reports(files)
+                self.assertIn(message, out.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,185 @@
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest.mock import patch
+
+from lobster.common.errors import LOBSTER_Error
+from lobster.common.incremental import (Incremental_State, first_difference,
+                                        state_file_for, update_report)
+from lobster.common.io import lobster_write
+from lobster.common.items import Implementation, Requirement, Tracing_Tag
+from lobster.common.location import File_Reference
+from lobster.common.report import Report
+from lobster.common.source_cache import Source_Cache
+
+
+class IncrementalUpdateTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.report_file = os.path.join(self.directory, "report.lobster")
+
+        self.write_requirements("sys.lobster", {"s1": [], "s2": []})
+        self.write_requirements("a.lobster", {"a": ["s1"], "b": ["s2"],
+                                              "c": []})
+        self.write_requirements("b.lobster", {"d": ["s1@2"], "e": []})
+        self.write_code("c.lobster", {"f": ["a"], "g": ["b", "unknown"]})
+        self.write_code("d.lobster", {"h": ["d", "a"]})
+        self.config = os.path.join(self.directory, "lobster.conf")
+        with open(self.config, "w", encoding="UTF-8") as fd:
+            fd.write(
+                f'requirements "System" {{\n'
+                f'  source: "{self.directory}/sys.lobster";\n}}\n'
+                f'requirements "Requirements" {{\n'
+                f'  source: "{self.directory}/a.lobster";\n'
+                f'  source: "{self.directory}/b.lobster";\n'
+                f'  trace to: "System";\n}}\n'
+                f'implementation "Code" {{\n'
+                f'  source: "{self.directory}/c.lobster";\n'
+                f'  source: "{self.directory}/d.lobster";\n'
+                f'  trace to: "Requirements";\n}}\n')
+
+    def write_requirements(self, name, targets, version=None):
+        items = []
+        for line, (item_name, refs) in enumerate(targets.items(), start=1):
+            item = Requirement(tag=Tracing_Tag("req", item_name, version),
+                               location=File_Reference(name, line),
+                               framework="TRLC", kind="Requirement",
+                               name=item_name)
+            for ref in refs:
+                item.add_tracing_target(Tracing_Tag.from_text("req", ref))
+            items.append(item)
+        with open(os.path.join(self.directory, name), "w",
+                  encoding="UTF-8") as fd:
+            lobster_write(fd, Requirement, "test", items)
+
+    def write_code(self, name, targets):
+        items = []
+        for line, (item_name, refs) in enumerate(targets.items(), start=1):
+            item = Implementation(tag=Tracing_Tag("python", item_name),
+                                  location=File_Reference(name, line),
+                                  language="Python", kind="Function",
+                                  name=item_name)
+            for ref in refs:
+                item.add_tracing_target(Tracing_Tag.from_text("req", ref))
+            items.append(item)
+        with open(os.path.join(self.directory, name), "w",
+                  encoding="UTF-8") as fd:
+            lobster_write(fd, Implementation, "test", items)
+
+    def update(self, mergeable=False):
+        result = update_report(self.config, self.report_file,
+                               mergeable=mergeable)
+        result.report.write_report(self.report_file, mergeable=mergeable)
+        result.state.save(self.report_file)
+
+        full_file = os.path.join(self.directory, "full.lobster")
+        full = Report()
+        full.parse_config(self.config)
+        full.write_report(full_file, mergeable=mergeable)
+        self.assertIsNone(first_difference(result.report, full))
+        with open(self.report_file, encoding="UTF-8") as fd, \
+             open(full_file, encoding="UTF-8") as full_fd:
+            self.assertEqual(fd.read(), full_fd.read())
+        return result
+
+    def test_first_update_is_full_build(self):
+        result = self.update()
+        self.assertTrue(result.full_build)
+        self.assertTrue(os.path.isfile(state_file_for(self.report_file)))
+
+    def test_unchanged(self):
+        self.update()
+        result = self.update()
+        self.assertFalse(result.full_build)
+        self.assertEqual((result.read_sources, result.recomputed), (0, 0))
+
+    def test_changes(self):
+        self.update(mergeable=True)
+        changes = (
+            ("code", lambda: self.write_code("d.lobster",
+                                             {"h": ["e"], "i": ["c", "x"]}),
+             {"python h", "python i", "req a", "req d", "req e", "req c"}),
+            ("requirement", lambda: self.write_requirements(
+                "a.lobster", {"a": ["s1"], "c": [], "z": ["s2"]}),
+             {"req a", "req c", "req z", "req s1", "req s2", "python f",
+              "python g", "python i"}),
+            ("version", lambda: self.write_requirements(
+                "sys.lobster", {"s1": [], "s2": [], "s3": []}, version=2),
+             {"req s1", "req s2", "req s3", "req a", "req d", "req z"}),
+            ("removed", lambda: self.write_requirements("b.lobster",
+                                                        {"d": []}),
+             {"req d", "req s1", "python h"}),
+        )
+        for name, change, recomputed in changes:
+            with self.subTest(name):
+                change()
+                result = self.update(mergeable=True)
+                self.assertFalse(result.full_build)
+                self.assertEqual(result.read_sources, 1)
+                self.assertEqual(result.recomputed, len(recomputed))
+
+    def test_cache_is_evicted_once(self):
+        self.update()
+        self.write_code("c.lobster", {"f": ["a"], "g": ["b"]})
+        cache = Source_Cache(os.path.join(self.directory, "cache"), 0)
+        with patch.object(cache, "evict", wraps=cache.evict) as evict:
+            result = update_report(self.config, self.report_file,
+                                   cache=cache)
+        self.assertFalse(result.full_build)
+        evict.assert_called_once_with()
+        self.assertEqual(cache.misses, 1)
+        self.assertEqual(os.listdir(cache.directory), [])
+
+    def test_suggestions(self):
+        self.update()
+        self.write_requirements("b.lobster", {"d": ["s1@2"], "e": [],
+                                              "unknowns": []})
+        result = self.update()
+        self.assertFalse(result.full_build)
+        self.assertEqual(result.report.suggestions,
+                         {"req unknown": ["req unknowns"]})
+
+    def test_full_build_when_needed(self):
+        self.update()
+        for name, change in (
+                ("duplicate", lambda: self.write_requirements(
+                    "b.lobster", {"d": [], "a": []})),
+                ("report changed", lambda: Report().write_report(
+                    self.report_file)),
+                ("no state", lambda: os.remove(
+                    state_file_for(self.report_file)))):
+            with self.subTest(name):
+                self.write_requirements("b.lobster", {"d": [], "e": []})
+                self.update()
+                change()
+                if name == "duplicate":
+                    with redirect_stdout(io.StringIO()), \
+                         self.assertRaises(LOBSTER_Error):
+                        update_report(self.config, self.report_file)
+                else:
+                    self.assertTrue(self.update().full_build)
+
+        # A mergeable report needs a mergeable previous one
+        self.update()
+        self.assertTrue(self.update(mergeable=True).full_build)
+        self.assertFalse(self.update(mergeable=True).full_build)
+
+    def test_state_roundtrip(self):
+        result = self.update()
+        state = Incremental_State.load(self.report_file)
+        self.assertEqual(state.sources, result.state.sources)
+        self.assertEqual([source.keys for source in state.sources],
+                         [["req s1", "req s2"],
+                          ["req a", "req b", "req c"],
+                          ["req d", "req e"],
+                          ["python f", "python g"],
+                          ["python h"]])
+        self.assertEqual(state.sources[2].refs, [["req s1@2"], []])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,11 +1,16 @@
 import unittest
 import io
 import json
+import os
+import shutil
+import tempfile
 from unittest.mock import patch, create_autospec, mock_open
 from lobster.common.errors import Message_Handler, LOBSTER_Error
 from lobster.common.items import Tracing_Tag, Requirement, Implementation, Activity
-from lobster.common.io import lobster_write, lobster_read
-from lobster.common.location import Location
+from lobster.common.io import (lobster_write, lobster_read, open_lobster_file,
+                               open_lobster_output, read_content_header)
+from lobster.common.location import Location, File_Reference
+from tests_unit.temp_content_file import TempContentFile
 
 class LobsterWriteReadTests(unittest.TestCase):
     # unit tests for io.py file
@@ -57,10 +62,9 @@ class LobsterWriteReadTests(unittest.TestCase):
             "ref_down": ["mock_value"],
         }
 
-    @patch("lobster.common.io.json")
     @patch("lobster.common.items.Tracing_Tag.to_json")
     @patch("lobster.common.items.Item.to_json")
-    def test_lobster_write_requirement(self, mock_item_to_json, mock_tracing_tag_to_json, mock_json):
+    def test_lobster_write_requirement(self, mock_item_to_json, mock_tracing_tag_to_json):
         generator = "mock_generator"
         mock_tracing_tag_to_json.return_value = "mock_value"
         self.source_data["tracing_status"] = "mock_status"
@@ -79,13 +83,11 @@ class LobsterWriteReadTests(unittest.TestCase):
             "version" : 4
         }
         lobster_write(fd_req, Requirement, generator, items)
-        fd_req.seek(0)
-        mock_json.dump.assert_called_once_with(mock_data, fd_req, indent=2)
+        self.assertEqual(fd_req.getvalue(), json.dumps(mock_data, indent=2) + "\n")
 
-    @patch("lobster.common.io.json")
     @patch("lobster.common.items.Tracing_Tag.to_json")
     @patch("lobster.common.items.Item.to_json")
-    def test_lobster_write_implementation(self, mock_item_to_json, mock_tracing_tag_to_json, mock_json):
+    def test_lobster_write_implementation(self, mock_item_to_json, mock_tracing_tag_to_json):
         generator = "mock_generator"
         mock_tracing_tag_to_json.return_value = "mock_value"
         self.source_data["tracing_status"] = "mock_status"
@@ -96,19 +98,17 @@ class LobsterWriteReadTests(unittest.TestCase):
         self.source_data["kind"] = "mock_kind"
         fd_imp = io.StringIO()
         lobster_write(fd_imp, Implementation, generator, items)
-        fd_imp.seek(0)
         mock_data = {
             "data" : [self.source_data],
             "generator" : generator,
             "schema" : "lobster-imp-trace",
             "version" : 3
         }
-        mock_json.dump.assert_called_once_with(mock_data, fd_imp, indent=2)
+        self.assertEqual(fd_imp.getvalue(), json.dumps(mock_data, indent=2) + "\n")
 
-    @patch("lobster.common.io.json")
     @patch("lobster.common.items.Tracing_Tag.to_json")
     @patch("lobster.common.items.Item.to_json")
-    def test_lobster_write_activity(self, mock_item_to_json, mock_tracing_tag_to_json, mock_json):
+    def test_lobster_write_activity(self, mock_item_to_json, mock_tracing_tag_to_json):
         generator = "mock_generator"
         mock_tracing_tag_to_json.return_value = "mock_value"
         self.source_data["tracing_status"] = "mock_status"
@@ -120,14 +120,80 @@ class LobsterWriteReadTests(unittest.TestCase):
         self.source_data["status"] = None
         fd_act = io.StringIO()
         lobster_write(fd_act, Activity, generator, items)
-        fd_act.seek(0)
         mock_data = {
             "data" : [self.source_data],
             "generator" : generator,
             "schema" : "lobster-act-trace",
             "version" : 3
         }
-        mock_json.dump.assert_called_once_with(mock_data, fd_act, indent=2)
+        self.assertEqual(fd_act.getvalue(), json.dumps(mock_data, indent=2) + "\n")
+
+    def test_lobster_write_accepts_generator(self):
+        items = [
+            Implementation(Tracing_Tag("python", f"mod.f{line}"),
+                           File_Reference("mod.py", line),
+                           self.mock_language, self.mock_kind, self.mock_name)
+            for line in range(1, 4)
+        ]
+        fd = io.StringIO()
+        count = lobster_write(fd, Implementation, "mock_generator",
+                              (item for item in items))
+        self.assertEqual(count, 3)
+        self.assertEqual(fd.getvalue(), json.dumps({
+            "data" : [item.to_json() for item in items],
+            "generator" : "mock_generator",
+            "schema" : "lobster-imp-trace",
+            "version" : 3
+        }, indent=2) + "\n")
+
+    def test_lobster_write_empty(self):
+        fd = io.StringIO()
+        self.assertEqual(lobster_write(fd, Activity, "mock_generator", []), 0)
+        self.assertEqual(fd.getvalue(), json.dumps({
+            "data" : [],
+            "generator" : "mock_generator",
+            "schema" : "lobster-act-trace",
+            "version" : 3
+        }, indent=2) + "\n")
+
+    def test_lobster_write_compact(self):
+        items = [
+            Implementation(Tracing_Tag("python", f"mod.f{line}"),
+                           File_Reference("mod.py", line),
+                           self.mock_language, self.mock_kind, self.mock_name)
+            for line in range(1, 4)
+        ]
+        fd = io.StringIO()
+        count = lobster_write(fd, Implementation, "mock_generator",
+                              (item for item in items), compact=True)
+        self.assertEqual(count, 3)
+        self.assertEqual(fd.getvalue(), json.dumps({
+            "data" : [item.to_json() for item in items],
+            "generator" : "mock_generator",
+            "schema" : "lobster-imp-trace",
+            "version" : 3
+        }, separators=(",", ":")) + "\n")
+
+        with TempContentFile(fd.getvalue()) as filename:
+            read_items = {}
+            lobster_read(Message_Handler(), filename, "level", read_items)
+        self.assertEqual([item.to_json() for item in read_items.values()],
+                         [item.to_json() for item in items])
+
+    def test_lobster_write_checks_types_lazily(self):
+        consumed = []
+        requirement = Requirement(self.tracing_tag, File_Reference("a.txt"),
+                                  self.mock_framework, self.mock_kind,
+                                  self.mock_name)
+
+        def items():
+            for item in (requirement, self.activity, requirement):
+                consumed.append(item)
+                yield item
+
+        with self.assertRaises(ValueError):
+            lobster_write(io.StringIO(), Requirement, "mock_generator", items())
+        self.assertEqual(len(consumed), 2)
 
     @patch("lobster.common.items.Item.additional_data_from_json")
     @patch("lobster.common.items.Tracing_Tag.key")
@@ -268,3 +334,196 @@ class LobsterWriteReadTests(unittest.TestCase):
     def test_lobster_read_file_not_found(self, mock_isfile):
         with self.assertRaises(FileNotFoundError):
             lobster_read(self.mh, self.filename, self.level, self.items, self.source_info)
+
+    def test_lobster_read_streams_data_before_header(self):
+        items = [
+            Requirement(Tracing_Tag("req", name), File_Reference("a.trlc", line),
+                        "TRLC", "kind", name)
+            for line, name in enumerate(("a", "b", "a"), start=1)
+        ]
+        fd = io.StringIO()
+        lobster_write(fd, Requirement, "mock_generator", items)
+        self.assertLess(fd.getvalue().index('"data"'),
+                        fd.getvalue().index('"schema"'))
+        with TempContentFile(fd.getvalue()) as filename:
+            with self.assertRaises(LOBSTER_Error) as exc_info:
+                lobster_read(self.mh, filename, self.level, self.items)
+        self.assertEqual(list(self.items), ["req a", "req b"])
+        self.assertEqual(exc_info.exception.location.line, 3)
+        self.assertEqual(
+            exc_info.exception.message,
+            "duplicate definition of req a, previously defined at a.trlc:1",
+        )
+
+    def test_lobster_read_reports_position_of_json_error(self):
+        content = '{\n  "data": [\n    {"tag": "req a",}\n  ]\n}\n'
+        with TempContentFile(content) as filename:
+            with self.assertRaises(LOBSTER_Error) as exc_info:
+                lobster_read(self.mh, filename, self.level, self.items)
+        self.assertEqual(exc_info.exception.location.line, 3)
+        self.assertEqual(exc_info.exception.location.column, 21)
+
+    def test_lobster_read_trust_inputs(self):
+        items = [
+            Implementation(Tracing_Tag("python", name),
+                           File_Reference("a.py", line), "Python", "Function",
+                           name)
+            for line, name in enumerate(("a", "b"), start=1)
+        ]
+        items[0].add_tracing_target(Tracing_Tag("req", "x", "1"))
+        fd = io.StringIO()
+        lobster_write(fd, Implementation, "mock_generator", items)
+        with TempContentFile(fd.getvalue()) as filename:
+            lobster_read(self.mh, filename, self.level, self.items)
+            trusted = {}
+            lobster_read(self.mh, filename, self.level, trusted,
+                         trust_inputs=True)
+        self.assertEqual(list(trusted), list(self.items))
+        for key, item in trusted.items():
+            self.assertIsInstance(item, Implementation)
+            self.assertEqual(item.to_json(), self.items[key].to_json())
+
+    def test_lobster_read_trust_inputs_checks_schema(self):
+        content = ('{"schema": "lobster-req-trace", "version": 5, '
+                   '"generator": "test_gen", "data": []}')
+        with TempContentFile(content) as filename:
+            with self.assertRaises(LOBSTER_Error) as exc_info:
+                lobster_read(self.mh, filename, self.level, self.items,
+                             trust_inputs=True)
+        self.assertEqual(
+            exc_info.exception.message,
+            "version 5 for schema lobster-req-trace is not supported",
+        )
+
+
+class CompressedLobsterFileTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.items = [
+            Requirement(Tracing_Tag("req", name), File_Reference("a.trlc", 1),
+                        "TRLC", "kind", name)
+            for name in ("a", "b")
+        ]
+
+    def test_round_trip(self):
+        for suffix in (".lobster.gz", ".lobster.xz", ".lobster.bz2"):
+            for binary in (False, True):
+                with self.subTest(suffix=suffix, binary=binary):
+                    filename = os.path.join(self.directory, "req" + suffix)
+                    with open_lobster_file(filename,
+                                           "wb" if binary else "w") as fd:
+                        lobster_write(fd, Requirement, "gen", self.items,
+                                      binary=binary)
+                    with open(filename, "rb") as fd:
+                        self.assertNotIn(b"req a", fd.read())
+
+                    items = {}
+                    lobster_read(Message_Handler(), filename, "level", items)
+                    self.assertEqual(list(items), ["req a", "req b"])
+
+    def test_uncompressed_output_is_unchanged(self):
+        filename = os.path.join(self.directory, "req.lobster")
+        with open_lobster_file(filename, "w") as fd:
+            lobster_write(fd, Requirement, "gen", self.items)
+        reference = io.StringIO()
+        lobster_write(reference, Requirement, "gen", self.items)
+        with open(filename, encoding="UTF-8") as fd:
+            self.assertEqual(fd.read(), reference.getvalue())
+
+    def test_failing_generator_leaves_no_output(self):
+        def items():
+            yield self.items[0]
+            raise ValueError("generator failed")
+
+        for suffix in (".lobster", ".lobster.gz"):
+            with self.subTest(suffix=suffix):
+                filename = os.path.join(self.directory, "out", "req" + suffix)
+                with self.assertRaises(ValueError), \
+                     open_lobster_output(filename) as fd:
+                    lobster_write(fd, Requirement, "gen", items())
+                self.assertEqual(os.listdir(os.path.dirname(filename)), [])
+
+                # An existing output file is left as it was
+                with open_lobster_output(filename) as fd:
+                    lobster_write(fd, Requirement, "gen", self.items)
+                with open(filename, "rb") as fd:
+                    expected = fd.read()
+                with self.assertRaises(ValueError), \
+                     open_lobster_output(filename) as fd:
+                    lobster_write(fd, Requirement, "gen", items())
+                self.assertEqual(os.listdir(os.path.dirname(filename)),
+                                 ["req" + suffix])
+                with open(filename, "rb") as fd:
+                    self.assertEqual(fd.read(), expected)
+                os.remove(filename)
+
+    def test_corrupt_file_is_reported(self):
+        filename = os.path.join(self.directory, "req.lobster.gz")
+        with open(filename, "wb") as fd:
+            fd.write(b"not compressed")
+        mh = Message_Handler()
+        with self.assertRaises(LOBSTER_Error) as exc_info:
+            lobster_read(mh, filename, "level", {})
+        self.assertIn("cannot read file", exc_info.exception.message)
+
+
+class ContentHeaderTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    @staticmethod
+    def requirements(text="t"):
+        return [
+            Requirement(Tracing_Tag("req", name), File_Reference("a.trlc", 1),
+                        "TRLC", "kind", name, text)
+            for name in ("a", "b", "c")
+        ]
+
+    def write(self, name, items, **options):
+        filename = os.path.join(self.directory, name)
+        with open_lobster_file(filename,
+                               "wb" if options.get("binary") else "w") as fd:
+            lobster_write(fd, Requirement, "gen", iter(items),
+                          content_header=True, **options)
+        return filename
+
+    def test_digest_does_not_depend_on_encoding(self):
+        reference = read_content_header(
+            self.write("req.lobster", self.requirements()))
+        self.assertEqual(reference["items"], 3)
+        self.assertTrue(reference["digest"].startswith("sha256:"))
+
+        for name, options in (("compact.lobster", {"compact": True}),
+                              ("req.blobster", {"binary": True}),
+                              ("req.lobster.gz", {}),
+                              ("req.blobster.xz", {"binary": True})):
+            with self.subTest(name=name):
+                filename = self.write(name, self.requirements(), **options)
+                self.assertEqual(read_content_header(filename), reference)
+
+                items = {}
+                lobster_read(Message_Handler(), filename, "level", items)
+                self.assertEqual(list(items), ["req a", "req b", "req c"])
+
+    def test_digest_changes_with_content(self):
+        self.assertNotEqual(
+            read_content_header(self.write("a.lobster", self.requirements())),
+            read_content_header(self.write("b.lobster",
+                                           self.requirements("changed"))))
+
+    def test_only_header_is_read(self):
+        header = read_content_header(self.write("req.lobster",
+                                                self.requirements()))
+        content = json.dumps({"content": header})[:-1] + ', "data": [ broken'
+        with TempContentFile(content) as filename:
+            self.assertEqual(read_content_header(filename), header)
+
+    def test_no_header(self):
+        fd = io.StringIO()
+        lobster_write(fd, Requirement, "gen", self.requirements())
+        self.assertNotIn('"content"', fd.getvalue())
+        for content in (fd.getvalue(), "[]"):
+            with TempContentFile(content) as filename:
+                self.assertIsNone(read_content_header(filename))
@@ -0,0 +1,126 @@
+import unittest
+
+from lobster.common.item_store import Item_Store, Stored_Item
+from lobster.common.items import Requirement, Tracing_Status
+
+
+def entry(name, status, file="a.trlc", line=1):
+    return {"tag": f"req {name}",
+            "location": {"kind": "file", "file": file, "line": line,
+                         "column": None},
+            "name": name, "messages": [f"message of {name}"],
+            "just_up": [], "just_down": [], "just_global": [],
+            "ref_up": [], "ref_down": [], "tracing_status": status,
+            "framework": "TRLC", "kind": "Requirement", "text": None,
+            "status": None}
+
+
+class ItemStoreTests(unittest.TestCase):
+    def setUp(self):
+        self.store = Item_Store()
+        for level, name, status, file, line in (
+                ("A", "a1", "OK", "a.trlc", 3),
+                ("A", "a2", "MISSING", "b.trlc", 1),
+                ("B", "b1", "JUSTIFIED", "a.trlc", 1),
+                ("B", "b2", "PARTIAL", "a.trlc", 2),
+                ("B", "b3", None, "a.trlc", None)):
+            self.store.add(f"req {name}", level, Requirement,
+                           entry(name, status, file, line))
+
+    def test_mapping(self):
+        self.assertEqual(len(self.store), 5)
+        self.assertEqual(list(self.store)[:2], ["req a1", "req a2"])
+        self.assertIn("req b1", self.store)
+        self.assertNotIn("req c", self.store)
+        with self.assertRaises(KeyError):
+            _ = self.store["req c"]
+        with self.assertRaises(KeyError):
+            self.store.add("req a1", "A", Requirement,
+                           entry("a1", "OK"))
+
+        item = self.store["req b2"]
+        self.assertIsInstance(item, Stored_Item)
+        self.assertIsInstance(item, Requirement)
+        self.assertEqual(item.level, "B")
+        self.assertEqual(item.tracing_status, Tracing_Status.PARTIAL)
+        self.assertIsNone(self.store["req b3"].tracing_status)
+        self.assertEqual(item.messages, ["message of b2"])
+        self.assertIs(self.store["req b2"], item.materialize())
+
+    def test_count_by_level(self):
+        self.assertEqual(
+            self.store.count_by_level((Tracing_Status.OK,
+                                       Tracing_Status.JUSTIFIED)),
+            {"A": (2, 1), "B": (3, 1)})
+        self.assertEqual(self.store.count_by_level(),
+                         {"A": (2, 0), "B": (3, 0)})
+
+    def test_rows_by_level(self):
+        self.assertEqual(self.store.rows_by_level(),
+                         {"A": [0, 1], "B": [2, 3, 4]})
+        self.assertEqual(Item_Store().rows_by_level(), {})
+
+    def test_select(self):
+        ok = (Tracing_Status.OK, Tracing_Status.JUSTIFIED)
+        self.assertEqual(self.store.select(level="B"),
+                         ["req b1", "req b2", "req b3"])
+        self.assertEqual(self.store.select(statuses=ok),
+                         ["req a1", "req b1"])
+        self.assertEqual(self.store.select(statuses=ok, exclude=True),
+                         ["req a2", "req b2", "req b3"])
+        self.assertEqual(self.store.select(level="A", statuses=ok,
+                                           exclude=True),
+                         ["req a2"])
+        self.assertEqual(self.store.select(level="C"), [])
+
+    def test_group_by_file(self):
+        self.assertEqual(self.store.group_by_file(),
+                         {"a.trlc": ["req b3", "req b1", "req b2", "req a1"],
+                          "b.trlc": ["req a2"]})
+        self.assertEqual(self.store.group_by_file("A"),
+                         {"a.trlc": ["req a1"], "b.trlc": ["req a2"]})
+
+    def test_raw_follows_changes(self):
+        row = list(self.store).index("req a1")
+        self.assertEqual(self.store.raw(row), entry("a1", "OK", line=3))
+        self.store["req a1"].messages.append("new")
+        self.assertEqual(self.store.raw(row)["messages"],
+                         ["message of a1", "new"])
+
+    def test_statuses_follow_changes(self):
+        self.store["req a2"].tracing_status = Tracing_Status.OK
+        self.store["req a1"].materialize().tracing_status = \
+            Tracing_Status.MISSING
+        row = list(self.store).index("req a2")
+        self.assertEqual(self.store.status_of(row), Tracing_Status.OK)
+        self.assertEqual(self.store.count_by_level((Tracing_Status.OK,)),
+                         {"A": (2, 1), "B": (3, 0)})
+        self.assertEqual(self.store.select(statuses=(Tracing_Status.OK,)),
+                         ["req a2"])
+
+    def test_extend(self):
+        other = Item_Store()
+        other.add("req c1", "C", Requirement, entry("c1", "OK", "c.trlc", 2))
+        other.add("req b4", "B", Requirement, entry("b4", "MISSING", "b.trlc"))
+        no_file = entry("c2", None)
+        no_file["location"] = {"kind": "void"}
+        other.add("req c2", "C", Requirement, no_file)
+        other["req c1"].messages.append("new")
+
+        self.store.extend(other)
+        self.assertEqual(list(self.store)[5:], ["req c1", "req b4", "req c2"])
+        self.assertEqual(
+            self.store.count_by_level((Tracing_Status.OK,)),
+            {"A": (2, 1), "B": (4, 0), "C": (2, 1)})
+        self.assertEqual(self.store.group_by_file("C"),
+                         {"c.trlc": ["req c1"]})
+        self.assertEqual(self.store.group_by_file("B")["b.trlc"], ["req b4"])
+        self.assertEqual(self.store["req c1"].messages,
+                         ["message of c1", "new"])
+        self.assertIsNone(self.store["req c2"].tracing_status)
+        with self.assertRaises(KeyError):
+            self.store.extend(other)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,8 +1,13 @@
+import gc
+import pickle
 import unittest
 from unittest.mock import patch, MagicMock,create_autospec
-from hashlib import sha1
+from hashlib import blake2b, sha1
 from lobster.common.level_definition import LevelDefinition
 from lobster.common.items import Tracing_Tag, Tracing_Status, Item, Requirement, Implementation, Activity
+from lobster.common.items import anchor_for_key, compute_anchors
+from lobster.common.items import compile_policy, level_bits
+from lobster.common.location import Void_Reference
 from lobster.common.location import Location
 
 class ItemsTests(unittest.TestCase):
@@ -521,5 +526,264 @@ class TestActivity(ItemsTests):
                     self.assertEqual(result.location.version, location_data["version"])
                     self.assertEqual(result.location.name, location_data["name"])
 
+
+def attributes(obj):
+    return {name: getattr(obj, name)
+            for cls in type(obj).__mro__
+            for name in getattr(cls, "__slots__", ())
+            if name != "__weakref__"}
+
+
+class TestFromJsonMany(unittest.TestCase):
+    LOCATIONS = [
+        {"kind": "file", "file": "a.py", "line": 3, "column": 4},
+        {"kind": "file", "file": "a.py", "line": None, "column": 4},
+        {"kind": "void"},
+        {"kind": "github", "gh_root": "https://x/y", "file": "a.py",
+         "line": 1, "commit": "abc"},
+        {"kind": "codebeamer", "cb_root": "https://cb", "tracker": 1,
+         "item": 2, "version": 3, "name": "n"},
+    ]
+
+    def entries(self, extra):
+        for location in self.LOCATIONS:
+            yield dict(extra,
+                       tag="req pkg.item@2",
+                       location=location,
+                       refs=["req a", "req a@1", "req b"],
+                       ref_up=["req c@5"],
+                       ref_down=["python d"],
+                       messages=["m"],
+                       just_up=["j"],
+                       tracing_status="PARTIAL")
+        yield dict(extra, tag="req minimal", location=self.LOCATIONS[0])
+
+    def test_same_as_from_json(self):
+        for cls, extra in (
+                (Requirement, {"framework": "TRLC", "kind": "r",
+                               "name": "pkg.item", "text": "t"}),
+                (Implementation, {"language": "Python", "kind": "f",
+                                  "name": "pkg.item"}),
+                (Activity, {"framework": "gtest", "kind": "t",
+                            "status": "ok"})):
+            with self.subTest(cls=cls.__name__):
+                entries = list(self.entries(extra))
+                expected = [cls.from_json("level", data, 3)
+                            for data in entries]
+                actual = list(cls.from_json_many("level", entries, 3))
+
+                self.assertEqual(len(actual), len(expected))
+                for item, reference in zip(actual, expected):
+                    self.assertIs(type(item), cls)
+                    self.assertIs(type(item.location), type(reference.location))
+                    self.assertEqual(attributes(item.location),
+                                     attributes(reference.location))
+                    self.assertEqual(item.to_json(), reference.to_json())
+                    self.assertEqual(item.level, reference.level)
+                    self.assertEqual(item.name, reference.name)
+                    self.assertEqual(item.has_error, reference.has_error)
+                    self.assertEqual(item.unresolved_references_cache,
+                                     reference.unresolved_references_cache)
+
+    def test_json_errors(self):
+        extra = {"framework": "TRLC", "kind": "r", "name": "pkg.item"}
+        for data in self.entries(extra):
+            self.assertEqual(list(Requirement.json_errors(data)), [])
+
+        valid = next(self.entries(extra))
+        for member, value in (("tag", "nospace"), ("location", None),
+                              ("ref_up", ["req a", 1]), ("refs", "req a"),
+                              ("tracing_status", "GOOD"),
+                              ("name", None), ("text", 1)):
+            with self.subTest(member=member):
+                data = dict(valid, **{member: value})
+                self.assertTrue(list(Requirement.json_errors(data)))
+                with self.assertRaises(Exception):
+                    Requirement.from_json("level", data, 3)
+
+    def test_tag_from_json_trusted(self):
+        for text in ("req a", "req a@1", "req a b@c@d", "req a@"):
+            with self.subTest(text=text):
+                self.assertEqual(
+                    attributes(Tracing_Tag.from_json_trusted(text)),
+                    attributes(Tracing_Tag.from_json(text)))
+
+
+class TestInterning(unittest.TestCase):
+    def test_equal_tags_are_identical(self):
+        tag = Tracing_Tag("req", "interned.a", "2")
+        self.assertIs(Tracing_Tag("req", "interned.a", "2"), tag)
+        self.assertIs(Tracing_Tag.from_json("req interned.a@2"), tag)
+        self.assertIs(Tracing_Tag.from_json_trusted("req interned.a@2"), tag)
+        self.assertIs(Tracing_Tag.from_text("req", "interned.a@2"), tag)
+        self.assertIs(pickle.loads(pickle.dumps(tag)), tag)
+
+        self.assertIsNot(Tracing_Tag("req", "interned.a"), tag)
+        self.assertIsNot(Tracing_Tag("req", "interned.a", 2), tag)
+        self.assertEqual(Tracing_Tag("req", "interned.a", 2).version, 2)
+
+    def test_unused_tags_are_released(self):
+        tag = Tracing_Tag.from_json("req interned.released@1")
+        self.assertIs(Tracing_Tag("req", "interned.released", "1"), tag)
+        del tag
+        gc.collect()
+        self.assertNotIn(("req", "interned.released", "1"),
+                         Tracing_Tag._by_parts)
+        self.assertNotIn("req interned.released@1", Tracing_Tag._by_text)
+
+    def test_key_and_text_are_shared(self):
+        tag = Tracing_Tag.from_json("req interned.b@1")
+        self.assertIs(tag.key(), tag.key())
+        self.assertIs(tag.to_json(), str(tag))
+        self.assertEqual(tag.key(), "req interned.b")
+        self.assertEqual(str(tag), "req interned.b@1")
+
+    def test_immutable(self):
+        tag = Tracing_Tag("req", "interned.c")
+        for name in ("namespace", "tag", "version", "hash_val", "other"):
+            with self.subTest(name=name):
+                with self.assertRaises(AttributeError):
+                    setattr(tag, name, "x")
+        self.assertEqual(tag.hash(), sha1(b"req interned.c").hexdigest())
+
+    def test_anchor(self):
+        tag = Tracing_Tag("req", "interned.f", 4)
+        self.assertEqual(tag.anchor(), tag.hash())
+        self.assertEqual(tag.anchor("blake2"),
+                         blake2b(b"req interned.f", digest_size=10).hexdigest())
+        self.assertEqual(len(tag.anchor("blake2")), 20)
+        self.assertEqual(compute_anchors([tag.key()]), {tag.key(): tag.hash()})
+        self.assertEqual(compute_anchors([tag.key()], "blake2"),
+                         {tag.key(): tag.anchor("blake2")})
+        self.assertEqual(anchor_for_key(tag.key()), tag.hash())
+
+    def test_references_share_tags(self):
+        items = [Requirement.from_json("level",
+                                       {"tag": f"req interned.d{n}",
+                                        "location": {"kind": "void"},
+                                        "framework": "TRLC",
+                                        "kind": "r",
+                                        "name": f"interned.d{n}",
+                                        "ref_up": ["req interned.e"],
+                                        "refs": ["req interned.e"]},
+                                       3)
+                 for n in range(2)]
+        self.assertIs(items[0].ref_up[0], items[1].ref_up[0])
+        self.assertIs(items[0].unresolved_references[0],
+                      items[1].ref_up[0])
+
+
+class TestSlots(unittest.TestCase):
+    def test_no_instance_dict_and_pickle(self):
+        for location in TestFromJsonMany.LOCATIONS:
+            for cls, extra in (
+                    (Requirement, {"framework": "TRLC", "kind": "r",
+                                   "name": "n", "text": "t"}),
+                    (Implementation, {"language": "Python", "kind": "f",
+                                      "name": "n"}),
+                    (Activity, {"framework": "gtest", "kind": "t"})):
+                with self.subTest(cls=cls.__name__, location=location["kind"]):
+                    item = cls.from_json("level", dict(extra,
+                                                       tag="req n@1",
+                                                       location=location,
+                                                       refs=["req m"],
+                                                       ref_up=["req o"],
+                                                       tracing_status="OK"),
+                                         3)
+                    for obj in (item, item.tag, item.location):
+                        self.assertFalse(hasattr(obj, "__dict__"))
+                        with self.assertRaises(AttributeError):
+                            obj.no_such_attribute = 1
+
+                    for protocol in range(2, pickle.HIGHEST_PROTOCOL + 1):
+                        copy = pickle.loads(pickle.dumps(item, protocol))
+                        self.assertIs(type(copy), cls)
+                        self.assertEqual(attributes(copy.location),
+                                         attributes(item.location))
+                        self.assertEqual(copy.to_json(), item.to_json())
+                        self.assertEqual(copy.level, item.level)
+                        self.assertEqual(copy.unresolved_references_cache,
+                                         item.unresolved_references_cache)
+
+
+class LevelPolicyTests(unittest.TestCase):
+    def setUp(self):
+        self.config = {
+            "System": LevelDefinition(
+                name="System", kind="requirements",
+                needs_tracing_down=True,
+                breakdown_requirements=[["Software", "Hardware"], ["Test"]]),
+            "Software": LevelDefinition(
+                name="Software", kind="implementation", traces=["System"],
+                needs_tracing_up=True),
+            "Hardware": LevelDefinition(
+                name="Hardware", kind="implementation", traces=["System"],
+                needs_tracing_up=True),
+            "Test": LevelDefinition(
+                name="Test", kind="activity", traces=["System"],
+                needs_tracing_up=True),
+        }
+        self.policies = compile_policy(self.config)
+        self.bits = level_bits(self.config)
+
+    def requirement(self, just_down=()):
+        item = Requirement(Tracing_Tag("req", "x"), Void_Reference(),
+                           "TRLC", "Requirement", "x")
+        item.set_level("System")
+        item.just_down = list(just_down)
+        return item
+
+    def test_level_bits(self):
+        self.assertEqual(self.bits, {"System": 1, "Software": 2,
+                                     "Hardware": 4, "Test": 8})
+        self.assertEqual(self.policies["System"].chains,
+                         [(6, "missing reference to Hardware or Software"),
+                          (8, "missing reference to Test")])
+        self.assertEqual(self.policies["Test"].chains, [])
+
+    def test_determine_statuses(self):
+        cases = (
+            (self.bits["Software"] | self.bits["Test"], (),
+             Tracing_Status.OK, []),
+            (self.bits["Hardware"], (), Tracing_Status.MISSING,
+             ["missing reference to Test"]),
+            (0, (), Tracing_Status.MISSING,
+             ["missing reference to Hardware or Software",
+              "missing reference to Test"]),
+            (0, ("not needed",), Tracing_Status.JUSTIFIED, []),
+        )
+        items = [self.requirement(just_down) for _, just_down, _, _ in cases]
+        self.policies["System"].determine_statuses(
+            items, [mask for mask, _, _, _ in cases])
+        for item, (mask, just_down, status, messages) in zip(items, cases):
+            self.assertEqual(item.tracing_status, status)
+            self.assertEqual(item.messages, messages)
+
+            # The number of messages added is recorded for the item
+            added = {}
+            item = self.requirement(just_down)
+            item.messages = ["from the source"]
+            self.policies["System"].determine_statuses((item,), (mask,),
+                                                       added)
+            self.assertEqual(added, {"req x": len(messages)}
+                             if messages else {})
+
+    def test_same_as_determine_status(self):
+        for down_levels in ([], ["Software"], ["Software", "Test"],
+                            ["Hardware", "Test", "Test"]):
+            with self.subTest(down_levels=down_levels):
+                single = self.requirement()
+                single.determine_status(self.config, {"req x": single},
+                                        down_levels)
+                batched = self.requirement()
+                mask = 0
+                for level in down_levels:
+                    mask |= self.bits[level]
+                self.policies["System"].determine_statuses([batched], [mask])
+                self.assertEqual(single.tracing_status,
+                                 batched.tracing_status)
+                self.assertEqual(single.messages, batched.messages)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,95 @@
+import io
+import json
+import unittest
+from unittest.mock import patch
+
+from lobster.common import json_backend
+
+
+class JsonBackendTests(unittest.TestCase):
+    VALUES = [
+        None, True, False, 0, -1, 2**63, -2**63 - 1, 10**30, 1.5, 1e100,
+        "", "text", "quote \" backslash \\ tab \t nl \n", "\x00\x1f\x7f",
+        "äöü", "\U0001f600", " ", [], {}, [1, [2, [3, {}]]],
+        {"b": 1, "a": [None, "x"], "c": {"d": {"e": []}}},
+        {"tag": "req a", "refs": ["b"], "line": 1, "ratio": 0.25},
+        {1: "non-string key"},
+    ]
+
+    FORMATS = [
+        {},
+        {"indent": 2},
+        {"indent": 4},
+        {"indent": 0},
+        {"separators": (",", ":")},
+        {"indent": 2, "separators": (",", ": ")},
+        {"indent": 2, "separators": (", ", ": ")},
+    ]
+
+    def test_dumps_like_json(self):
+        for value in self.VALUES:
+            for kwargs in self.FORMATS:
+                with self.subTest(value=value, **kwargs):
+                    self.assertEqual(json_backend.dumps(value, **kwargs),
+                                     json.dumps(value, **kwargs))
+
+    def test_loads_like_json(self):
+        for value in self.VALUES:
+            text = json.dumps(value)
+            for data in (text, text.encode("UTF-8")):
+                with self.subTest(data=data):
+                    self.assertEqual(json_backend.loads(data),
+                                     json.loads(data))
+
+    def test_loads_keeps_long_integers(self):
+        for text in ("12345678901234567890123", "[-9223372036854775809]"):
+            with self.subTest(text=text):
+                self.assertEqual(json_backend.loads(text), json.loads(text))
+                self.assertIs(type(json_backend.loads(text)),
+                              type(json.loads(text)))
+
+    def test_loads_finds_long_integers_across_chunks(self):
+        with patch.object(json_backend, "_CHUNK_SIZE", 16):
+            for padding in range(20):
+                text = "[" + " " * padding + "12345678901234567890123]"
+                for data in (text, text.encode("UTF-8")):
+                    with self.subTest(data=data):
+                        self.assertEqual(json_backend.loads(data),
+                                         [12345678901234567890123])
+
+    def test_loads_errors_like_json(self):
+        for text in ("", "{", '{"a": 1,}', "[1, 2", "nul"):
+            with self.subTest(text=text):
+                with self.assertRaises(json.JSONDecodeError) as expected:
+                    json.loads(text)
+                with self.assertRaises(json.JSONDecodeError) as actual:
+                    json_backend.loads(text)
+                self.assertEqual(str(actual.exception),
+                                 str(expected.exception))
+
+    def test_dumps_compact_round_trips(self):
+        for backend in (json_backend.orjson, None):
+            with patch.object(json_backend, "orjson", backend):
+                for value in self.VALUES + ["\ud800"]:
+                    with self.subTest(value=value, orjson=bool(backend)):
+                        data = json_backend.dumps_compact(value)
+                        self.assertIsInstance(data, str)
+                        self.assertEqual(json_backend.loads(data),
+                                         json.loads(json.dumps(value)))
+
+    def test_load_and_dump(self):
+        fd = io.StringIO()
+        json_backend.dump({"a": ["b"]}, fd, indent=4)
+        self.assertEqual(fd.getvalue(), json.dumps({"a": ["b"]}, indent=4))
+        fd.seek(0)
+        self.assertEqual(json_backend.load(fd), {"a": ["b"]})
+
+    def test_without_orjson(self):
+        with patch.object(json_backend, "orjson", None):
+            self.assertEqual(json_backend.dumps({"a": "ä"}, indent=2),
+                             json.dumps({"a": "ä"}, indent=2))
+            self.assertEqual(json_backend.loads(b'{"a": 1}'), {"a": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,176 @@
+import io
+import json
+import unittest
+
+from unittest.mock import patch
+
+from lobster.common.json_stream import JSON_Stream_Reader, Streamed_Array, iter_encode
+
+
+def read_document(text, chunk_size):
+    """Rebuild a document with the stream reader, walking every object and
+       array so that all code paths of the reader are used."""
+    reader = JSON_Stream_Reader(io.StringIO(text), chunk_size)
+
+    def walk():
+        char = reader.peek()
+        if char == "{":
+            return {key: walk() for key in reader.iter_object()}
+        if char == "[":
+            rv = []
+            for element in reader.iter_array():
+                rv.append(element)
+            return rv
+        return reader.read_value()
+
+    value = walk()
+    reader.finish()
+    return value
+
+
+class JsonStreamReaderTests(unittest.TestCase):
+    DOCUMENTS = [
+        '{}',
+        '[]',
+        '{"data": [], "schema": "x"}',
+        '{\n  "data": [\n    {"a": 1},\n    {"b": [1, 2, 3]}\n  ],\n'
+        '  "version": 12345678\n}\n',
+        '{"nested": {"deep": [true, false, null, -1.5e3]}}',
+        '  "just a string"  ',
+        '123456789',
+        '[{"key": "value with \\"escaped\\" quotes"}, "\\u00e4"]',
+    ]
+
+    MALFORMED = [
+        '',
+        'invalid',
+        '{"data": [1, 2,]}',
+        '{"data": [1 2]}',
+        '{"data"\n: [\n{"a": }]}',
+        '{"a": 1,\n "b": 2\n\n',
+        '{"a" 1}',
+        '{1: 2}',
+        '{"a": 1} x',
+        '{"a": "unterminated',
+    ]
+
+    def test_matches_json_loads(self):
+        for document in self.DOCUMENTS:
+            for chunk_size in (1, 2, 7, 4096):
+                with self.subTest(document=document, chunk_size=chunk_size):
+                    self.assertEqual(read_document(document, chunk_size),
+                                     json.loads(document))
+
+    def test_error_positions_match_json_loads(self):
+        for document in self.MALFORMED:
+            with self.assertRaises(json.JSONDecodeError) as expected:
+                json.loads(document)
+            for chunk_size in (1, 3, 4096):
+                with self.subTest(document=document, chunk_size=chunk_size):
+                    with self.assertRaises(json.JSONDecodeError) as actual:
+                        read_document(document, chunk_size)
+                    self.assertEqual(
+                        (actual.exception.lineno, actual.exception.colno),
+                        (expected.exception.lineno, expected.exception.colno),
+                    )
+
+    def test_unconsumed_member_is_skipped(self):
+        reader = JSON_Stream_Reader(
+            io.StringIO('{"skip": {"x": [1, 2]}, "keep": 3}'), 2)
+        values = {}
+        for key in reader.iter_object():
+            if key == "keep":
+                values[key] = reader.read_value()
+        reader.finish()
+        self.assertEqual(values, {"keep": 3})
+
+    def test_skip_value_does_not_decode(self):
+        document = ('{"data": [{"a": "]}\\\\", "b": ["\\"[{", {}]}, [[]], 7],'
+                    ' "version": 3}')
+        for chunk_size in (1, 2, 5, 4096):
+            with self.subTest(chunk_size=chunk_size):
+                reader = JSON_Stream_Reader(io.StringIO(document), chunk_size)
+                values = {}
+                with patch.object(reader, "read_value",
+                                  wraps=reader.read_value) as read_value:
+                    for key in reader.iter_object():
+                        if key == "data":
+                            values[key] = sum(
+                                1 for _ in reader.iter_array(decode=False))
+                        else:
+                            values[key] = reader.read_value()
+                    reader.finish()
+                # Only the number 7, the keys and the version are decoded
+                self.assertEqual(read_value.call_count, 4)
+                self.assertEqual(values, {"data": 3, "version": 3})
+
+    def test_skip_value_reports_unterminated_values(self):
+        for document in ('[{"a": [1, 2}', '[{"a": "x]}'):
+            for chunk_size in (1, 4096):
+                with self.subTest(document=document, chunk_size=chunk_size):
+                    reader = JSON_Stream_Reader(io.StringIO(document),
+                                                chunk_size)
+                    with self.assertRaises(json.JSONDecodeError):
+                        for _ in reader.iter_array(decode=False):
+                            pass
+
+    def test_array_elements_are_decoded_lazily(self):
+        fd = io.StringIO('[' + ', '.join(['{"x": "%s"}' % ("y" * 100)] * 100)
+                         + ']')
+        reader = JSON_Stream_Reader(fd, 64)
+        elements = reader.iter_array()
+        next(elements)
+        self.assertLess(fd.tell(), 1024)
+
+
+class IterEncodeTests(unittest.TestCase):
+    VALUE = {
+        "levels": [
+            {"name": "a", "items": [{"tag": "x", "refs": ["y", "z"]}, {}]},
+            {"name": "b", "items": []},
+        ],
+        "policy": {"a": {"traces": []}},
+        "text": "line 1\nline 2",
+        "version": 2,
+    }
+
+    def streamed(self, plain=False):
+        return {
+            "levels": Streamed_Array(
+                {"name": level["name"],
+                 "items": Streamed_Array(iter(level["items"]), plain=plain)}
+                for level in self.VALUE["levels"]
+            ),
+            "policy": self.VALUE["policy"],
+            "text": self.VALUE["text"],
+            "version": self.VALUE["version"],
+        }
+
+    def test_matches_json_dumps(self):
+        for kwargs in ({}, {"indent": 2}, {"indent": 4},
+                       {"separators": (",", ":")}):
+            with self.subTest(**kwargs):
+                self.assertEqual("".join(iter_encode(self.streamed(), **kwargs)),
+                                 json.dumps(self.VALUE, **kwargs))
+
+    def test_plain_arrays_match_json_dumps(self):
+        for batch_size in (1, 2, 256):
+            for kwargs in ({}, {"indent": 2}, {"indent": 4},
+                           {"separators": (",", ":")}):
+                with self.subTest(batch_size=batch_size, **kwargs), \
+                     patch("lobster.common.json_stream.PLAIN_BATCH_SIZE",
+                           batch_size):
+                    self.assertEqual(
+                        "".join(iter_encode(self.streamed(plain=True),
+                                            **kwargs)),
+                        json.dumps(self.VALUE, **kwargs))
+
+    def test_elements_are_consumed_while_writing(self):
+        chunks = iter_encode({"data": Streamed_Array(
+            {"n": n} for n in range(10**9))}, indent=2)
+        self.assertEqual("".join(next(chunks) for _ in range(6)),
+                         '{\n  "data": [\n    {\n      "n": 0\n    }')
+
+
+if __name__ == "__main__":
+    unittest.main()
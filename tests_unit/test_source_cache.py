@@ -0,0 +1,92 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from lobster.common.items import Requirement
+from lobster.common.source_cache import SUFFIX, Source_Cache
+
+ITEMS = [{"tag": "req a", "location": {"kind": "void"}, "name": "a",
+          "messages": [], "just_up": [], "just_down": [], "just_global": [],
+          "framework": "TRLC", "kind": "Requirement", "text": None,
+          "status": None}]
+
+
+class SourceCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.source = os.path.join(self.directory, "a.lobster")
+        self.write_source("content")
+        self.cache = Source_Cache(os.path.join(self.directory, "cache"))
+
+    def write_source(self, content):
+        with open(self.source, "w", encoding="UTF-8") as fd:
+            fd.write(content)
+
+    def entries(self):
+        return sorted(name for name in os.listdir(self.cache.directory)
+                      if name.endswith(SUFFIX))
+
+    def test_roundtrip(self):
+        key = self.cache.key(self.source, "Requirements", {}, False)
+        self.assertIsNone(self.cache.load(key))
+        self.cache.store(key, Requirement, ITEMS)
+        self.assertEqual(self.cache.load(key), (Requirement, ITEMS))
+        self.cache.store(key, None, [])
+        self.assertEqual(self.cache.load(key), (None, []))
+        self.assertEqual((self.cache.hits, self.cache.misses), (2, 1))
+
+    def test_key(self):
+        key = self.cache.key(self.source, "Requirements", {}, False)
+        self.assertEqual(self.cache.key(self.source, "Requirements", {}, False),
+                         key)
+        for other in ((self.source, "System", {}, False),
+                      (self.source, "Requirements", {"x": 1}, False),
+                      (self.source, "Requirements", {}, True)):
+            with self.subTest(other=other):
+                self.assertNotEqual(self.cache.key(*other), key)
+        self.write_source("changed")
+        self.assertNotEqual(
+            self.cache.key(self.source, "Requirements", {}, False), key)
+        self.assertIsNone(self.cache.key(
+            os.path.join(self.directory, "missing.lobster"),
+            "Requirements", {}, False))
+
+    def test_corrupt_entry(self):
+        key = self.cache.key(self.source, "Requirements", {}, False)
+        self.cache.store(key, Requirement, ITEMS)
+        with open(os.path.join(self.cache.directory, key + SUFFIX),
+                  "r+b") as fd:
+            fd.truncate(10)
+        self.assertIsNone(self.cache.load(key))
+        self.assertEqual(self.entries(), [])
+
+    def test_eviction(self):
+        keys = []
+        for content in ("a", "b", "c"):
+            self.write_source(content)
+            keys.append(self.cache.key(self.source, "Requirements", {},
+                                       False))
+        self.cache.store(keys[0], Requirement, ITEMS)
+        size = os.path.getsize(os.path.join(self.cache.directory,
+                                            keys[0] + SUFFIX))
+        self.cache.max_size = 2 * size
+        os.utime(os.path.join(self.cache.directory, keys[0] + SUFFIX),
+                 (1, 1))
+        self.cache.store(keys[1], Requirement, ITEMS)
+        os.utime(os.path.join(self.cache.directory, keys[1] + SUFFIX),
+                 (2, 2))
+
+        # A hit makes keys[0] the most recently used entry
+        self.assertIsNotNone(self.cache.load(keys[0]))
+        self.cache.store(keys[2], Requirement, ITEMS)
+        self.assertEqual(self.entries(),
+                         sorted(key + SUFFIX for key in keys))
+        self.cache.evict()
+        self.assertEqual(self.entries(),
+                         sorted(key + SUFFIX for key in (keys[0], keys[2])))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import unittest
+
+from lobster.common.suggestions import (Key_Index, edit_distance,
+                                        suggest_targets, with_suggestions)
+
+
+class EditDistanceTests(unittest.TestCase):
+    def test_distance(self):
+        for text, other, distance in (
+                ("", "", 0),
+                ("abc", "abc", 0),
+                ("abc", "abd", 1),
+                ("abc", "ab", 1),
+                ("kitten", "sitting", 3),
+                ("", "abc", 3)):
+            with self.subTest(text=text, other=other):
+                self.assertEqual(edit_distance(text, other, 5), distance)
+                self.assertEqual(edit_distance(other, text, 5), distance)
+
+    def test_limit(self):
+        self.assertEqual(edit_distance("kitten", "sitting", 2), 3)
+        self.assertEqual(edit_distance("kitten", "sitting", 3), 3)
+        self.assertEqual(edit_distance("a", "abcdef", 1), 2)
+
+
+class KeyIndexTests(unittest.TestCase):
+    def setUp(self):
+        self.index = Key_Index([
+            "req example.den_security",
+            "req example.den_securities",
+            "req example.den_layout",
+            "req example.rock",
+            "python example.lane_keeping",
+            "python example.lane_keeping_assist",
+        ])
+
+    def test_typos(self):
+        self.assertEqual(self.index.suggest("req example.den_securty"),
+                         ["req example.den_security"])
+        self.assertEqual(self.index.suggest("req example.densecurity"),
+                         ["req example.den_security"])
+        self.assertEqual(self.index.suggest("req example.den_securitie"),
+                         ["req example.den_securities",
+                          "req example.den_security"])
+
+    def test_namespace(self):
+        self.assertEqual(self.index.suggest("req example.lane_keeping"),
+                         ["python example.lane_keeping"])
+
+    def test_nothing_similar(self):
+        self.assertEqual(self.index.suggest("req example.wheel"), [])
+        self.assertEqual(self.index.suggest("req something.else"), [])
+        self.assertEqual(self.index.suggest("gtest example.rock"),
+                         ["req example.rock"])
+
+    def test_common_ngrams(self):
+        # Names that only differ in rare n-grams are still found among
+        # many names that share the common ones
+        index = Key_Index([f"req example.requirement_{number}"
+                           for number in range(20000)] +
+                          ["req example.requirement_special"])
+        self.assertEqual(index.suggest("req example.requirement_spezial"),
+                         ["req example.requirement_special"])
+
+
+class SuggestTargetsTests(unittest.TestCase):
+    def test_suggest_targets(self):
+        self.assertEqual(
+            suggest_targets(["req a.foo_bar", "req a.foo_baz"],
+                            ["req a.foo_bat", "req a.x", "req a.foo_bat"]),
+            {"req a.foo_bat": ["req a.foo_bar", "req a.foo_baz"]})
+        self.assertEqual(suggest_targets(["req a"], []), {})
+
+    def test_with_suggestions(self):
+        suggestions = {"req a": ["req b"], "req c": ["req d", "req e",
+                                                    "req f"]}
+        self.assertEqual(with_suggestions("unknown tracing target req a",
+                                          suggestions),
+                         "unknown tracing target req a "
+                         "(did you mean req b?)")
+        self.assertEqual(with_suggestions("unknown tracing target req c",
+                                          suggestions),
+                         "unknown tracing target req c "
+                         "(did you mean req d, req e or req f?)")
+        self.assertEqual(with_suggestions("unknown tracing target req x",
+                                          suggestions),
+                         "unknown tracing target req x")
+        self.assertEqual(with_suggestions("missing reference", suggestions),
+                         "missing reference")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+import unittest
+
+from lobster.common.trace_graph import Trace_Graph
+
+
+class TraceGraphTests(unittest.TestCase):
+    def setUp(self):
+        self.graph = Trace_Graph.build(
+            keys=["req a", "python f", "python g"],
+            items=["item a", "item f", "item g"],
+            levels=["Requirements", "Code", "Code"],
+            ups=[[], ["req a"], ["req a", "req gone"]],
+            downs=[["python f", "python g"], [], []])
+
+    def test_nodes(self):
+        graph = self.graph
+        self.assertEqual(len(graph), 4)
+        self.assertEqual(graph.item_count, 3)
+        self.assertEqual(graph.keys, ["req a", "python f", "python g",
+                                      "req gone"])
+        self.assertEqual(graph.node("python g"), 2)
+        self.assertIsNone(graph.node("req other"))
+        self.assertEqual(graph.item(1), "item f")
+        self.assertIsNone(graph.item(3))
+        self.assertEqual(graph.level_of(0), "Requirements")
+        self.assertIsNone(graph.level_of(3))
+
+    def test_links(self):
+        graph = self.graph
+        self.assertEqual(list(graph.down(0)), [1, 2])
+        self.assertEqual(list(graph.up(0)), [])
+        self.assertEqual(list(graph.up(2)), [0, 3])
+        self.assertEqual(list(graph.up(3)), [])
+        self.assertEqual(list(graph.down(3)), [])
+        self.assertEqual(graph.down_levels(0), ["Code", "Code"])
+        self.assertEqual(graph.neighbours(2, up=True),
+                         [("req a", "item a"), ("req gone", None)])
+        self.assertEqual(graph.neighbours(0, up=False),
+                         [("python f", "item f"), ("python g", "item g")])
+
+    def test_ref_key(self):
+        graph = Trace_Graph.build(["req a", "req b"], ["a", "b"], ["A", "B"],
+                                  [[], ["REQ A"]], [["REQ B"], []],
+                                  ref_key=str.lower)
+        self.assertEqual(list(graph.up(1)), [0])
+        self.assertEqual(list(graph.down(0)), [1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+#
+# LOBSTER - Lightweight Open BMW Software Traceability Evidence Report
+# Copyright (C) 2026 Bayerische Motoren Werke Aktiengesellschaft (BMW AG)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public
+# License along with this program. If not, see
+# <https://www.gnu.org/licenses/>.
+
+
+# Compare the SHA-1 and the BLAKE2 item anchors of lobster-html-report:
+# computing the anchors of all items of a report, and writing the HTML
+# report with either scheme.
+#
+# Run from the root of the repository:
+#   PYTHONPATH=. python util/benchmarks/anchors.py --items 100000
+
+import argparse
+import gc
+import os
+import tempfile
+
+from lobster.common.items import ANCHOR_SCHEMES, compute_anchors
+from lobster.common.report import Report
+from lobster.tools.core.html_report.html_report import write_html
+
+from util.benchmarks.synthetic import timed, write_inputs
+
+
+def run(directory: str, count: int):
+    results = {}
+    config  = write_inputs(directory, count)
+    report  = os.path.join(directory, "report.lobster")
+    builder = Report()
+    builder.parse_config(config)
+    builder.write_report(report)
+    keys = list(builder.items)
+    del builder
+
+    for scheme in ANCHOR_SCHEMES:
+        gc.collect()
+        with timed(f"compute_anchors ({scheme})", results):
+            compute_anchors(keys, scheme)
+
+    for scheme in ANCHOR_SCHEMES:
+        loaded = Report()
+        loaded.load_report(report, anchor_scheme=scheme)
+        gc.collect()
+        with timed(f"write_html ({scheme})", results):
+            html = write_html(loaded, dot=None, high_contrast=False,
+                              render_md=False)
+        results[f"html size ({scheme})"] = len(html)
+        del loaded, html
+
+    return results
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--items", type=int, default=100000,
+                    help="number of requirements and implementations")
+    options = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        results = run(directory, options.items)
+
+    for label, value in results.items():
+        if label.startswith("html size"):
+            print(f"{label:30} {value / 2**20:10.1f} MiB")
+        else:
+            print(f"{label:30} {value:10.2f} s")
+
+
+if __name__ == "__main__":
+    main()
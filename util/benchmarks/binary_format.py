@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+#
+# LOBSTER - Lightweight Open BMW Software Traceability Evidence Report
+# Copyright (C) 2026 Bayerische Motoren Werke Aktiengesellschaft (BMW AG)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public
+# License along with this program. If not, see
+# <https://www.gnu.org/licenses/>.
+
+# Compare file size and load time of the JSON and the binary encoding,
+# for the interchange format (lobster_read) and for reports
+# (Report.load_report).
+#
+# Run from the root of the repository:
+#   PYTHONPATH=. python util/benchmarks/binary_format.py --items 100000
+
+import argparse
+import gc
+import os
+import tempfile
+
+from lobster.common.errors import Message_Handler
+from lobster.common.io import lobster_read
+from lobster.common.report import Report
+
+from util.benchmarks.synthetic import timed, write_inputs
+
+
+def run(directory: str, count: int):
+    results = {}
+    for binary in (False, True):
+        encoding = "binary" if binary else "json"
+        config   = write_inputs(directory, count, binary)
+        report   = os.path.join(directory, f"report.{encoding}")
+
+        gc.collect()
+        with timed(f"lobster_read ({encoding})", results):
+            items = {}
+            lobster_read(Message_Handler(), os.path.join(
+                directory, "req.blobster" if binary else "req.lobster"),
+                "Requirements", items)
+        del items
+
+        gc.collect()
+        with timed(f"lobster-report ({encoding})", results):
+            builder = Report()
+            builder.parse_config(config)
+            builder.write_report(report, binary=binary)
+        del builder
+
+        gc.collect()
+        with timed(f"load_report ({encoding})", results):
+            Report().load_report(report)
+
+        results[f"report size ({encoding})"] = os.path.getsize(report)
+
+    return results
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--items", type=int, default=100000,
+                    help="number of requirements and implementations")
+    options = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        results = run(directory, options.items)
+
+    for label, value in results.items():
+        if label.startswith("report size"):
+            print(f"{label:30} {value / 2**20:10.1f} MiB")
+        else:
+            print(f"{label:30} {value:10.2f} s")
+
+
+if __name__ == "__main__":
+    main()
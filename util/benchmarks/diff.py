@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+#
+# LOBSTER - Lightweight Open BMW Software Traceability Evidence Report
+# Copyright (C) 2026 Bayerische Motoren Werke Aktiengesellschaft (BMW AG)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public
+# License along with this program. If not, see
+# <https://www.gnu.org/licenses/>.
+
+
+# Time lobster-diff on two reports built from synthetic inputs, the new
+# one with 1% more items (which also changes the status of some of the
+# old ones), sorting in memory and with temporary files.
+#
+# Run from the root of the repository:
+#   PYTHONPATH=. python util/benchmarks/diff.py --items 100000
+
+import argparse
+import gc
+import os
+import tempfile
+
+from lobster.common.report import Report
+from lobster.tools.core.diff.diff import lobster_diff
+
+from util.benchmarks.synthetic import timed, write_inputs
+
+
+def write_report(directory: str, name: str, count: int) -> str:
+    os.makedirs(os.path.join(directory, name))
+    report = Report()
+    report.parse_config(write_inputs(os.path.join(directory, name), count))
+    filename = os.path.join(directory, f"{name}.lobster")
+    report.write_report(filename)
+    return filename
+
+
+def run(directory: str, count: int):
+    old = write_report(directory, "old", count)
+    new = write_report(directory, "new", count + count // 100)
+
+    results = {}
+    for label, chunk_size in (("in memory", 4 * count),
+                              ("chunks of 50000", 50000)):
+        gc.collect()
+        with timed(f"lobster-diff ({label})", results):
+            summary = lobster_diff(old, new,
+                                   os.path.join(directory, "diff.json"),
+                                   chunk_size=chunk_size)
+    return results, summary
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--items", type=int, default=100000,
+                    help="number of requirements and implementations")
+    options = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        results, summary = run(directory, options.items)
+
+    for label, value in results.items():
+        print(f"{label:30} {value:10.2f} s")
+    print(summary.to_json())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+#
+# lobster_diff - Compare two LOBSTER reports
+# Copyright (C) 2026 Bayerische Motoren Werke Aktiengesellschaft (BMW AG)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public
+# License along with this program. If not, see
+# <https://www.gnu.org/licenses/>.
+
+# Time building the report of two components from their sources, and
+# merging the reports of the components, where every thousandth function
+# traces to a requirement of the other component.
+#
+# Run from the root of the repository:
+#   PYTHONPATH=. python util/benchmarks/federation.py --items 100000
+
+import argparse
+import gc
+import os
+import tempfile
+
+from lobster.common.merge import merge_reports
+from lobster.common.io import lobster_write, open_lobster_file
+from lobster.common.items import Implementation, Requirement, Tracing_Tag
+from lobster.common.report import Report
+
+from util.benchmarks.synthetic import implementations, requirements, timed
+
+CROSS_EVERY = 1000
+
+
+def write_component(directory: str, name: str, count: int, offset: int,
+                    other: int) -> str:
+    # Requirements and functions offset .. offset + count - 1, the
+    # functions tracing to the requirements of the same number, or of
+    # that number in the other component
+    reqs = []
+    for item in requirements(offset + count):
+        if len(reqs) < offset:
+            reqs.append(None)
+            continue
+        item.unresolved_references = []
+        item.unresolved_references_cache = set()
+        reqs.append(item)
+    imps = []
+    for i, item in enumerate(implementations(offset + count)):
+        if i >= offset:
+            if i % CROSS_EVERY == 0:
+                item.unresolved_references = [
+                    Tracing_Tag("req", f"pkg.Req_{i - offset + other}")]
+            imps.append(item)
+
+    for suffix, kind, items in (("req", Requirement, reqs[offset:]),
+                                ("imp", Implementation, imps)):
+        with open_lobster_file(os.path.join(directory,
+                                            f"{name}_{suffix}.lobster"),
+                               "w") as fd:
+            lobster_write(fd, kind, "benchmark", items)
+    return (f'requirements "Requirements" {{\n'
+            f'  source: "{directory}/{name}_req.lobster";\n}}\n'
+            f'implementation "Code" {{\n'
+            f'  source: "{directory}/{name}_imp.lobster";\n'
+            f'  trace to: "Requirements";\n}}\n')
+
+
+def write_config(directory: str, name: str, text: str) -> str:
+    filename = os.path.join(directory, f"{name}.conf")
+    with open(filename, "w", encoding="UTF-8") as fd:
+        fd.write(text)
+    return filename
+
+
+def run(directory: str, count: int):
+    full = write_config(directory, "full", (
+        f'requirements "Requirements" {{\n'
+        f'  source: "{directory}/a_req.lobster";\n'
+        f'  source: "{directory}/b_req.lobster";\n}}\n'
+        f'implementation "Code" {{\n'
+        f'  source: "{directory}/a_imp.lobster";\n'
+        f'  source: "{directory}/b_imp.lobster";\n'
+        f'  trace to: "Requirements";\n}}\n'))
+
+    reports = []
+    for name in ("a", "b"):
+        report = Report()
+        report.parse_config(write_config(
+            directory, name,
+            write_component(directory, name, count,
+                            0 if name == "a" else count,
+                            count if name == "a" else 0)))
+        reports.append(os.path.join(directory, f"{name}.lobster"))
+        report.write_report(reports[-1], mergeable=True)
+    del report
+
+    results = {}
+    gc.collect()
+    with timed("full build and write", results):
+        report = Report()
+        report.parse_config(full)
+        report.write_report(os.path.join(directory, "full.lobster"))
+    del report
+    gc.collect()
+    with timed("merge and write", results):
+        result = merge_reports(reports, trust_inputs=True)
+        result.report.write_report(os.path.join(directory, "merged.lobster"))
+    with open(os.path.join(directory, "full.lobster"),
+              encoding="UTF-8") as fd, \
+         open(os.path.join(directory, "merged.lobster"),
+              encoding="UTF-8") as merged_fd:
+        assert fd.read() == merged_fd.read()
+    return results, result.cross_links, result.recomputed
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--items", type=int, default=100000,
+                    help="number of requirements and functions per "
+                         "component")
+    options = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        results, cross_links, recomputed = run(directory, options.items)
+
+    for label, value in results.items():
+        print(f"{label:35} {value:10.3f} s")
+    print(f"{cross_links} references between components, "
+          f"{recomputed} items checked again")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+#
+# LOBSTER - Lightweight Open BMW Software Traceability Evidence Report
+# Copyright (C) 2026 Bayerische Motoren Werke Aktiengesellschaft (BMW AG)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public
+# License along with this program. If not, see
+# <https://www.gnu.org/licenses/>.
+
+
+# Compare building a report from scratch with updating it incrementally
+# (lobster-report --incremental) after one of the code sources changed.
+#
+# Run from the root of the repository:
+#   PYTHONPATH=. python util/benchmarks/incremental_report.py --items 100000
+
+import argparse
+import gc
+import os
+import tempfile
+
+from lobster.common.incremental import update_report
+from lobster.common.report import Report
+
+from util.benchmarks.parallel_sources import write_sources
+from util.benchmarks.synthetic import timed
+
+
+def run(directory: str, count: int, sources: int):
+    results = {}
+    config  = write_sources(directory, count, sources)
+    report  = os.path.join(directory, "report.lobster")
+
+    gc.collect()
+    with timed("full build", results):
+        builder = Report()
+        builder.parse_config(config)
+        builder.write_report(report)
+    del builder
+
+    # The first update only records the state
+    result = update_report(config, report)
+    result.report.write_report(report)
+    result.state.save(report)
+    del result
+
+    # Change one code source
+    changed = os.path.join(directory, "Implementation_0.lobster")
+    with open(changed, "a", encoding="UTF-8") as fd:
+        fd.write("\n")
+
+    gc.collect()
+    with timed("incremental update", results):
+        result = update_report(config, report)
+        result.report.write_report(report)
+        result.state.save(report)
+    assert not result.full_build
+    results["recomputed items"] = result.recomputed
+    return results
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--items", type=int, default=100000,
+                    help="number of requirements and implementations")
+    ap.add_argument("--sources", type=int, default=8,
+                    help="number of files per level")
+    options = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        results = run(directory, options.items, options.sources)
+
+    for label, value in results.items():
+        if isinstance(value, int):
+            print(f"{label:30} {value:10}")
+        else:
+            print(f"{label:30} {value:10.2f} s")
+
+
+if __name__ == "__main__":
+    main()
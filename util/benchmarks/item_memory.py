@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+#
+# LOBSTER - Lightweight Open BMW Software Traceability Evidence Report
+# Copyright (C) 2026 Bayerische Motoren Werke Aktiengesellschaft (BMW AG)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public
+# License along with this program. If not, see
+# <https://www.gnu.org/licenses/>.
+
+# Measure the memory taken by items, in bytes per item for each item
+# kind, as built by from_json from report data. Items, tags and
+# locations have __slots__; for comparison the same objects are also
+# copied into classes with a __dict__, the layout they used to have.
+#
+# Run from the root of the repository:
+#   PYTHONPATH=. python util/benchmarks/item_memory.py --items 100000
+
+import argparse
+import gc
+import tracemalloc
+
+from lobster.common.items import (Item, Tracing_Tag, Requirement,
+                                  Implementation, Activity)
+from lobster.common.location import Location
+
+from util.benchmarks.synthetic import activities, implementations, \
+    requirements
+
+KINDS = (
+    (Requirement, requirements),
+    (Implementation, implementations),
+    (Activity, activities),
+)
+
+_WITH_DICT = {}
+
+
+def with_dict(value):
+    """Copy items, tags and locations in value to objects with a __dict__
+       holding the same attributes."""
+    if isinstance(value, list):
+        return [with_dict(element) for element in value]
+    if not isinstance(value, (Item, Tracing_Tag, Location)):
+        return value
+
+    cls = type(value)
+    if cls not in _WITH_DICT:
+        _WITH_DICT[cls] = type(f"{cls.__name__}_With_Dict", (), {})
+    copy = _WITH_DICT[cls]()
+    for base in cls.__mro__:
+        for name in getattr(base, "__slots__", ()):
+            setattr(copy, name, with_dict(getattr(value, name)))
+    return copy
+
+
+def bytes_per_item(kind, data: list, layout: str) -> float:
+    gc.collect()
+    tracemalloc.start()
+    items = [kind.from_json("level", raw, 3) for raw in data]
+    if layout == "__dict__":
+        items = [with_dict(item) for item in items]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del items
+    return size / len(data)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--items", type=int, default=100000,
+                    help="number of items of each kind")
+    options = ap.parse_args()
+
+    for kind, generate in KINDS:
+        data = [item.to_json() for item in generate(options.items)]
+        for layout in ("__dict__", "__slots__"):
+            print(f"{kind.__name__:15} {layout:10} "
+                  f"{bytes_per_item(kind, data, layout):8.0f} bytes/item")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+#
+# LOBSTER - Lightweight Open BMW Software Traceability Evidence Report
+# Copyright (C) 2026 Bayerische Motoren Werke Aktiengesellschaft (BMW AG)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public
+# License along with this program. If not, see
+# <https://www.gnu.org/licenses/>.
+
+# Compare time and memory of loading a large report into a dictionary
+# of items, of Lazy_Item proxies and into an Item_Store, followed by the
+# pass of lobster-ci-report over all items with issues. Each mode is
+# measured in a fresh interpreter.
+#
+# Run from the root of the repository:
+#   PYTHONPATH=. python util/benchmarks/item_store.py --items 100000
+
+import argparse
+import gc
+import os
+import subprocess
+import sys
+import tempfile
+import tracemalloc
+
+from lobster.common.items import Tracing_Status
+from lobster.common.report import Report
+
+from util.benchmarks.synthetic import timed, write_inputs
+
+MODES = ("eager", "lazy", "columnar")
+
+OK = (Tracing_Status.OK, Tracing_Status.JUSTIFIED)
+
+
+def load(report: str, mode: str) -> Report:
+    result = Report()
+    result.load_report(report, lazy=mode == "lazy",
+                       columnar=mode == "columnar")
+    return result
+
+
+def issues(report: Report, mode: str) -> int:
+    if mode == "columnar":
+        keys = report.items.select(statuses=OK, exclude=True)
+    else:
+        keys = [key for key, item in report.items.items()
+                if item.tracing_status not in OK]
+    return sum(len(report.items[key].messages) for key in sorted(keys))
+
+
+def measure(report: str, mode: str):
+    results = {}
+    gc.collect()
+    with timed("load_report", results):
+        loaded = load(report, mode)
+    with timed("items with issues", results):
+        issues(loaded, mode)
+    del loaded
+
+    gc.collect()
+    tracemalloc.start()
+    loaded = load(report, mode)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    for label, value in results.items():
+        print(f"{mode:9} {label:20} {value:8.2f} s")
+    print(f"{mode:9} {'retained memory':20} {retained / 2**20:8.1f} MiB")
+    print(f"{mode:9} {'peak memory':20} {peak / 2**20:8.1f} MiB")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--items", type=int, default=100000,
+                    help="number of requirements and implementations")
+    ap.add_argument("--measure", nargs=2, metavar=("REPORT", "MODE"),
+                    help=argparse.SUPPRESS)
+    options = ap.parse_args()
+
+    if options.measure:
+        measure(*options.measure)
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        report = os.path.join(directory, "report.lobster")
+        builder = Report()
+        builder.parse_config(write_inputs(directory, options.items))
+        builder.write_report(report)
+        del builder
+
+        for mode in MODES:
+            subprocess.run([sys.executable, __file__, "--measure", report,
+                            mode],
+                           check=True)
+
+
+if __name__ == "__main__":
+    main()
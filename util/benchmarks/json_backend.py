@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+#
+# LOBSTER - Lightweight Open BMW Software Traceability Evidence Report
+# Copyright (C) 2026 Bayerische Motoren Werke Aktiengesellschaft (BMW AG)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public
+# License along with this program. If not, see
+# <https://www.gnu.org/licenses/>.
+
+# Compare writing and loading a large JSON report with the json module
+# of the standard library and with orjson (if installed). Each backend
+# is measured in a fresh interpreter, selected by LOBSTER_JSON_BACKEND.
+#
+# Run from the root of the repository:
+#   PYTHONPATH=. python util/benchmarks/json_backend.py --items 100000
+
+import argparse
+import filecmp
+import gc
+import os
+import subprocess
+import sys
+import tempfile
+
+from lobster.common import json_backend
+from lobster.common.report import Report
+
+from util.benchmarks.synthetic import timed, write_inputs
+
+
+def measure(directory: str):
+    results = {}
+    report  = os.path.join(directory, f"report.{json_backend.BACKEND}")
+
+    builder = Report()
+    builder.parse_config(os.path.join(directory, "lobster.conf"))
+    gc.collect()
+    with timed("write_report", results):
+        builder.write_report(report)
+    del builder
+
+    gc.collect()
+    with timed("load_report", results):
+        Report().load_report(report)
+
+    for label, value in results.items():
+        print(f"{json_backend.BACKEND:8} {label:20} {value:8.2f} s")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--items", type=int, default=100000,
+                    help="number of requirements and implementations")
+    ap.add_argument("--measure", metavar="DIR",
+                    help=argparse.SUPPRESS)
+    options = ap.parse_args()
+
+    if options.measure:
+        measure(options.measure)
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        os.rename(write_inputs(directory, options.items),
+                  os.path.join(directory, "lobster.conf"))
+        for backend in ("json", "orjson"):
+            subprocess.run([sys.executable, __file__, "--measure", directory],
+                           env=dict(os.environ, LOBSTER_JSON_BACKEND=backend),
+                           check=True)
+
+        reports = [os.path.join(directory, f"report.{backend}")
+                   for backend in ("json", "orjson")]
+        if all(map(os.path.isfile, reports)):
+            print("identical output:", filecmp.cmp(*reports, shallow=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+#
+# LOBSTER - Lightweight Open BMW Software Traceability Evidence Report
+# Copyright (C) 2026 Bayerische Motoren Werke Aktiengesellschaft (BMW AG)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public
+# License along with this program. If not, see
+# <https://www.gnu.org/licenses/>.
+
+
+# Time Report.parse_config with the sources read by one process and by
+# several (lobster-report --jobs), for a lobster.conf with many sources.
+#
+# Run from the root of the repository:
+#   PYTHONPATH=. python util/benchmarks/parallel_sources.py --items 100000
+
+import argparse
+import gc
+import itertools
+import os
+import tempfile
+
+from lobster.common.io import lobster_write
+from lobster.common.items import Implementation, Requirement
+from lobster.common.report import Report
+
+from util.benchmarks.synthetic import implementations, requirements, timed
+
+
+def write_sources(directory: str, count: int, sources: int) -> str:
+    """Write count requirements and implementations, each split over
+       sources files, and return the name of a lobster.conf for them."""
+    config = os.path.join(directory, "lobster.conf")
+    with open(config, "w", encoding="UTF-8") as conf:
+        for level, kind, items in (
+                ("requirements \"Requirements\"", Requirement,
+                 requirements(count)),
+                ("implementation \"Code\"", Implementation,
+                 implementations(count))):
+            conf.write(f"{level} {{\n")
+            for number in range(sources):
+                name = os.path.join(directory,
+                                    f"{kind.__name__}_{number}.lobster")
+                with open(name, "w", encoding="UTF-8") as fd:
+                    lobster_write(fd, kind, "benchmark",
+                                  itertools.islice(items, count // sources))
+                conf.write(f'  source: "{name}";\n')
+            if kind is Implementation:
+                conf.write('  trace to: "Requirements";\n')
+            conf.write("}\n")
+    return config
+
+
+def run(directory: str, count: int, sources: int, jobs: int):
+    results = {}
+    config  = write_sources(directory, count, sources)
+    for label, processes in (("parse_config", 1),
+                             (f"parse_config --jobs {jobs}", jobs)):
+        gc.collect()
+        with timed(label, results):
+            Report().parse_config(config, jobs=processes)
+    return results
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--items", type=int, default=100000,
+                    help="number of requirements and implementations")
+    ap.add_argument("--sources", type=int, default=8,
+                    help="number of files per level")
+    ap.add_argument("--jobs", type=int, default=os.cpu_count())
+    options = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        results = run(directory, options.items, options.sources,
+                      options.jobs)
+
+    for label, value in results.items():
+        print(f"{label:30} {value:10.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+#
+# LOBSTER - Lightweight Open BMW Software Traceability Evidence Report
+# Copyright (C) 2026 Bayerische Motoren Werke Aktiengesellschaft (BMW AG)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public
+# License along with this program. If not, see
+# <https://www.gnu.org/licenses/>.
+
+
+# Time the tracing status of all items of a report with a wide policy
+# (many levels, each with several breakdown requirements): checked item
+# by item with Item.determine_status, and level by level with the
+# compiled policy (Report.compute_item_count_and_status).
+#
+# Run from the root of the repository:
+#   PYTHONPATH=. python util/benchmarks/policy.py --items 100000
+
+import argparse
+import gc
+from collections import OrderedDict
+
+from lobster.common.items import Requirement, Tracing_Tag
+from lobster.common.level_definition import LevelDefinition
+from lobster.common.location import Void_Reference
+from lobster.common.report import Report
+
+from util.benchmarks.synthetic import timed
+
+
+def wide_policy(levels: int) -> OrderedDict:
+    """Return a policy where each level is traced by the next four, with
+       one breakdown requirement for each pair of them."""
+    names  = [f"Level_{number}" for number in range(levels)]
+    config = OrderedDict()
+    for number, name in enumerate(names):
+        sources = names[number + 1:number + 5]
+        config[name] = LevelDefinition(
+            name=name,
+            kind="requirements",
+            traces=names[max(0, number - 4):number],
+            needs_tracing_up=number > 0,
+            needs_tracing_down=bool(sources),
+            breakdown_requirements=[sources[index:index + 2]
+                                    for index in range(0, len(sources), 2)])
+    return config
+
+
+def build_report(config: OrderedDict, count: int) -> Report:
+    report = Report()
+    report.config = config
+    names = list(config)
+    for number in range(count):
+        level = names[number % len(names)]
+        item = Requirement(Tracing_Tag("req", f"item_{number}"),
+                           Void_Reference(), "TRLC", "Requirement",
+                           f"item_{number}")
+        item.set_level(level)
+        report.items[item.tag.key()] = item
+        # Trace to the item one level up, in most cases
+        if number >= len(names) and number % 5:
+            item.add_tracing_target(
+                Tracing_Tag("req", f"item_{number - len(names) - 1}"))
+    report.resolve_references_for_items()
+    return report
+
+
+def run(count: int, levels: int):
+    results = {}
+    config = wide_policy(levels)
+
+    report = build_report(config, count)
+    gc.collect()
+    with timed("determine_status per item", results):
+        graph = report.graph
+        for node, item in enumerate(graph.items):
+            item.determine_status(config, report.items,
+                                  graph.down_levels(node))
+    del report
+
+    report = build_report(config, count)
+    gc.collect()
+    with timed("compiled policy per level", results):
+        report.compute_item_count_and_status()
+    return results
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--items", type=int, default=100000,
+                    help="number of items")
+    ap.add_argument("--levels", type=int, default=40,
+                    help="number of levels of the policy")
+    options = ap.parse_args()
+
+    results = run(options.items, options.levels)
+    for label, value in results.items():
+        print(f"{label:30} {value:10.2f} s")
+
+
+if __name__ == "__main__":
+    main()
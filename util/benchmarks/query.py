@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+#
+# LOBSTER - Lightweight Open BMW Software Traceability Evidence Report
+# Copyright (C) 2026 Bayerische Motoren Werke Aktiengesellschaft (BMW AG)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public
+# License along with this program. If not, see
+# <https://www.gnu.org/licenses/>.
+
+# Time building, saving and loading the index of lobster-query for a
+# report built from synthetic inputs, and a few typical queries once the
+# index is loaded.
+#
+# Run from the root of the repository:
+#   PYTHONPATH=. python util/benchmarks/query.py --items 100000
+
+import argparse
+import gc
+import os
+import tempfile
+import time
+
+from lobster.common.query import select
+from lobster.common.report import Report
+from lobster.common.report_index import Report_Index, build_index
+
+from util.benchmarks.synthetic import timed, write_inputs
+
+QUERIES = (
+    "level:Code",
+    "level:Requirements not status:ok",
+    "file:src/module_1/ or file:src/mod1",
+    'traces-to:"req pkg.Req_42"',
+    'traced-by:"python mod42.f42"',
+    "level:Requirements message~missing",
+    "status:missing text~thing.1",
+)
+
+REPEAT = 10
+
+
+def run(directory: str, count: int):
+    report = Report()
+    report.parse_config(write_inputs(directory, count))
+    filename = os.path.join(directory, "report.lobster")
+    report.write_report(filename)
+    del report
+
+    results = {}
+    gc.collect()
+    with timed("load report and build index", results):
+        index = build_index(filename, trust_inputs=True)
+    with timed("save index", results):
+        index.save(filename)
+    del index
+    gc.collect()
+    with timed("load index", results):
+        index = Report_Index.load(filename)
+
+    counts = {}
+    for query in QUERIES:
+        start = time.perf_counter()
+        for _ in range(REPEAT):
+            counts[query] = len(select(index, query))
+        results[query] = (time.perf_counter() - start) / REPEAT
+    return results, counts
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--items", type=int, default=100000,
+                    help="number of requirements and implementations")
+    options = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        results, counts = run(directory, options.items)
+
+    for label, value in results.items():
+        matches = f"{counts[label]:8} items" if label in counts else ""
+        print(f"{label:40} {value * 1000:10.1f} ms {matches}")
+
+
+if __name__ == "__main__":
+    main()
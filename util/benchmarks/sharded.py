@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+#
+# lobster_diff - Compare two LOBSTER reports
+# Copyright (C) 2026 Bayerische Motoren Werke Aktiengesellschaft (BMW AG)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public
+# License along with this program. If not, see
+# <https://www.gnu.org/licenses/>.
+
+# Time loading a report built from synthetic inputs as one file, and
+# loading a sharded report completely, with two processes, and just one
+# of its levels.
+#
+# Run from the root of the repository:
+#   PYTHONPATH=. python util/benchmarks/sharded.py --items 100000
+
+import argparse
+import gc
+import os
+import tempfile
+
+from lobster.common.report import Report
+
+from util.benchmarks.synthetic import timed, write_inputs
+
+
+def run(directory: str, count: int):
+    report = Report()
+    report.parse_config(write_inputs(directory, count))
+    monolithic = os.path.join(directory, "report.lobster")
+    manifest = os.path.join(directory, "sharded", "report.lobster")
+    report.write_report(monolithic)
+    report.write_report(manifest, sharded=True)
+    del report
+
+    results = {}
+    for label, source, kwargs in (
+            ("load report", monolithic, {}),
+            ("load sharded report", manifest, {}),
+            ("load sharded report, 2 jobs", manifest, {"jobs": 2}),
+            ("load level Code of sharded report", manifest,
+             {"levels": ["Code"]})):
+        gc.collect()
+        with timed(label, results):
+            Report().load_report(source, columnar=True, trust_inputs=True,
+                                 **kwargs)
+    return results
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--items", type=int, default=100000,
+                    help="number of requirements and implementations")
+    options = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        results = run(directory, options.items)
+
+    for label, value in results.items():
+        print(f"{label:35} {value:10.3f} s")
+
+
+if __name__ == "__main__":
+    main()
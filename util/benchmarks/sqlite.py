@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+#
+# LOBSTER - Lightweight Open BMW Software Traceability Evidence Report
+# Copyright (C) 2026 Bayerische Motoren Werke Aktiengesellschaft (BMW AG)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public
+# License along with this program. If not, see
+# <https://www.gnu.org/licenses/>.
+
+# Time writing and loading a report built from synthetic inputs as JSON
+# and as SQLite database, and a query on the database.
+#
+# Run from the root of the repository:
+#   PYTHONPATH=. python util/benchmarks/sqlite.py --items 100000
+
+import argparse
+import gc
+import os
+import sqlite3
+import tempfile
+from contextlib import closing
+
+from lobster.common.report import Report
+
+from util.benchmarks.synthetic import timed, write_inputs
+
+QUERY = """
+SELECT levels.name, items.status, COUNT(*)
+  FROM items JOIN levels ON levels.id = items.level_id
+ GROUP BY levels.name, items.status
+"""
+
+
+def run(directory: str, count: int):
+    report = Report()
+    report.parse_config(write_inputs(directory, count))
+    filename = os.path.join(directory, "report.lobster")
+    database = os.path.join(directory, "report.db")
+
+    results = {}
+    gc.collect()
+    with timed("write report", results):
+        report.write_report(filename)
+    gc.collect()
+    with timed("write database", results):
+        report.write_sqlite(database)
+    del report
+
+    for label, source in (("report", filename), ("database", database)):
+        gc.collect()
+        with timed(f"load {label} (columnar)", results):
+            Report().load_report(source, columnar=True, trust_inputs=True)
+
+    with closing(sqlite3.connect(database)) as connection:
+        with timed("count items by level and status", results):
+            counts = connection.execute(QUERY).fetchall()
+        with timed("items tracing to one item", results):
+            connection.execute(
+                "SELECT item_row FROM links WHERE target_key = ? AND "
+                "direction = 'up'", ("req pkg.Req_42",)).fetchall()
+    return results, counts
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--items", type=int, default=100000,
+                    help="number of requirements and implementations")
+    options = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        results, counts = run(directory, options.items)
+
+    for label, value in results.items():
+        print(f"{label:35} {value:10.3f} s")
+    print(counts)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+#
+# LOBSTER - Lightweight Open BMW Software Traceability Evidence Report
+# Copyright (C) 2026 Bayerische Motoren Werke Aktiengesellschaft (BMW AG)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public
+# License along with this program. If not, see
+# <https://www.gnu.org/licenses/>.
+
+
+# Time the "did you mean" suggestions of lobster-report: building the
+# index over all item keys, and looking up unknown tracing targets that
+# are keys with a typo. Reports how many of them get the key they were
+# made from as a suggestion.
+#
+# Run from the root of the repository:
+#   PYTHONPATH=. python util/benchmarks/suggestions.py --items 1000000
+
+import argparse
+import random
+
+from lobster.common.suggestions import Key_Index
+
+from util.benchmarks.synthetic import timed
+
+WORDS = 3000
+
+
+def make_keys(rnd: random.Random, count: int):
+    words = ["".join(rnd.choice("abcdefghijklmnopqrstuvwxyz")
+                     for _ in range(rnd.randint(3, 9)))
+             for _ in range(WORDS)]
+    keys = set()
+    while len(keys) < count:
+        keys.add(f"req {rnd.choice(words)}.{rnd.choice(words)}_"
+                 f"{rnd.choice(words)}_{rnd.choice(words)}")
+    return list(keys)
+
+
+def with_typo(rnd: random.Random, key: str) -> str:
+    position = rnd.randrange(len("req "), len(key))
+    return key[:position] + rnd.choice("xyz") + key[position + 1:]
+
+
+def run(count: int, unknown: int):
+    rnd     = random.Random(42)
+    keys    = make_keys(rnd, count)
+    targets = [(key, with_typo(rnd, key))
+               for key in rnd.sample(keys, unknown)]
+
+    results = {}
+    with timed("build index", results):
+        index = Key_Index(keys)
+        index.suggest(targets[0][1])
+    with timed("suggest", results):
+        found = sum(key in index.suggest(target) for key, target in targets)
+    return results, found
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--items", type=int, default=1000000,
+                    help="number of item keys")
+    ap.add_argument("--unknown", type=int, default=10000,
+                    help="number of unknown tracing targets")
+    options = ap.parse_args()
+
+    results, found = run(options.items, options.unknown)
+    for label, value in results.items():
+        print(f"{label:30} {value:10.2f} s")
+    print(f"{'original key suggested':30} {found:10} of {options.unknown}")
+
+
+if __name__ == "__main__":
+    main()
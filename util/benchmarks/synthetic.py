@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+#
+# LOBSTER - Lightweight Open BMW Software Traceability Evidence Report
+# Copyright (C) 2026 Bayerische Motoren Werke Aktiengesellschaft (BMW AG)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public
+# License along with this program. If not, see
+# <https://www.gnu.org/licenses/>.
+
+# Synthetic tracing data for the benchmarks. The items look like the
+# output of lobster-trlc and lobster-python for a large project: many
+# items share few files and namespaces, some carry messages.
+
+import os
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+from lobster.common.io import lobster_write, open_lobster_file
+from lobster.common.items import (Tracing_Tag, Requirement, Implementation,
+                                  Activity)
+from lobster.common.location import File_Reference
+
+FILES_PER_MODULE = 50
+MODULES          = 500
+
+
+def requirements(count: int) -> Iterator[Requirement]:
+    for i in range(count):
+        item = Requirement(
+            tag       = Tracing_Tag("req", f"pkg.Req_{i}"),
+            location  = File_Reference(
+                f"src/module_{i % MODULES}/file_{i % FILES_PER_MODULE}.trlc",
+                i % 1000 + 1),
+            framework = "TRLC",
+            kind      = "Requirement",
+            name      = f"pkg.Req_{i}",
+            text      = f"The system shall do thing {i} quickly and safely.",
+        )
+        item.add_tracing_target(Tracing_Tag("req", f"sys.Req_{i // 3}"))
+        if i % 7 == 0:
+            item.messages.append("missing up reference")
+        yield item
+
+
+def implementations(count: int) -> Iterator[Implementation]:
+    for i in range(count):
+        item = Implementation(
+            tag      = Tracing_Tag("python", f"mod{i % 100}.f{i}"),
+            location = File_Reference(f"src/mod{i % 100}.py", i % 2000 + 1),
+            language = "Python",
+            kind     = "Function",
+            name     = f"mod{i % 100}.f{i}",
+        )
+        item.add_tracing_target(Tracing_Tag("req", f"pkg.Req_{i}"))
+        yield item
+
+
+def activities(count: int) -> Iterator[Activity]:
+    for i in range(count):
+        item = Activity(
+            tag       = Tracing_Tag("gtest", f"suite{i % 100}.Test_{i}"),
+            location  = File_Reference(f"test/suite{i % 100}.cpp",
+                                       i % 2000 + 1),
+            framework = "GoogleTest",
+            kind      = "test",
+            status    = "ok" if i % 10 else "fail",
+        )
+        item.add_tracing_target(Tracing_Tag("req", f"pkg.Req_{i}"))
+        yield item
+
+
+def write_inputs(directory: str, count: int, binary: bool = False) -> str:
+    """Write requirements and implementations to directory, and return
+       the name of a lobster.conf for them."""
+    suffix = "blobster" if binary else "lobster"
+    for name, kind, items in (("req", Requirement, requirements(count)),
+                              ("imp", Implementation, implementations(count))):
+        with open_lobster_file(os.path.join(directory, f"{name}.{suffix}"),
+                               "wb" if binary else "w") as fd:
+            lobster_write(fd, kind, "benchmark", items, binary=binary)
+
+    config = os.path.join(directory, f"{suffix}.conf")
+    with open(config, "w", encoding="UTF-8") as fd:
+        fd.write(f'requirements "Requirements" {{\n'
+                 f'  source: "{directory}/req.{suffix}";\n'
+                 f'}}\n'
+                 f'implementation "Code" {{\n'
+                 f'  source: "{directory}/imp.{suffix}";\n'
+                 f'  trace to: "Requirements";\n'
+                 f'}}\n')
+    return config
+
+
+@contextmanager
+def timed(label: str, results: dict):
+    start = time.perf_counter()
+    yield
+    results[label] = time.perf_counter() - start
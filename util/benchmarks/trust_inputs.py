@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+#
+# LOBSTER - Lightweight Open BMW Software Traceability Evidence Report
+# Copyright (C) 2026 Bayerische Motoren Werke Aktiengesellschaft (BMW AG)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public
+# License along with this program. If not, see
+# <https://www.gnu.org/licenses/>.
+
+# Compare file size and load time of the JSON and the binary encoding,
+# Compare reading with full validation and with --trust-inputs, for the
+# interchange format (Report.parse_config) and for reports
+# (Report.load_report, eager and lazy).
+#
+# Run from the root of the repository:
+#   PYTHONPATH=. python util/benchmarks/trust_inputs.py --items 100000
+
+import argparse
+import gc
+import os
+import tempfile
+
+from lobster.common.report import Report
+
+from util.benchmarks.synthetic import timed, write_inputs
+
+
+def run(directory: str, count: int):
+    results = {}
+    config = write_inputs(directory, count)
+    report = os.path.join(directory, "report.lobster")
+    builder = Report()
+    builder.parse_config(config)
+    builder.write_report(report)
+    del builder
+
+    for trust_inputs in (False, True):
+        mode = "trusted" if trust_inputs else "validated"
+
+        gc.collect()
+        with timed(f"parse_config ({mode})", results):
+            Report().parse_config(config, trust_inputs)
+
+        for lazy in (False, True):
+            gc.collect()
+            label = "lazy load_report" if lazy else "load_report"
+            with timed(f"{label} ({mode})", results):
+                Report().load_report(report, lazy=lazy,
+                                     trust_inputs=trust_inputs)
+
+    return results
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--items", type=int, default=100000,
+                    help="number of requirements and implementations")
+    options = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        results = run(directory, options.items)
+
+    for label, value in results.items():
+        print(f"{label:35} {value:10.2f} s")
+
+
+if __name__ == "__main__":
+    main()
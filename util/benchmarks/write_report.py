@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+#
+# LOBSTER - Lightweight Open BMW Software Traceability Evidence Report
+# Copyright (C) 2026 Bayerische Motoren Werke Aktiengesellschaft (BMW AG)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public
+# License along with this program. If not, see
+# <https://www.gnu.org/licenses/>.
+
+
+# Time Report.write_report for a report built from synthetic inputs, in
+# the JSON encoding with the default indentation and compact.
+#
+# Run from the root of the repository:
+#   PYTHONPATH=. python util/benchmarks/write_report.py --items 100000
+
+import argparse
+import gc
+import os
+import tempfile
+
+from lobster.common.report import Report
+
+from util.benchmarks.synthetic import timed, write_inputs
+
+
+def run(directory: str, count: int):
+    results = {}
+    report  = Report()
+    report.parse_config(write_inputs(directory, count))
+
+    for compact in (False, True):
+        label = "compact" if compact else "indented"
+        gc.collect()
+        with timed(f"write_report ({label})", results):
+            report.write_report(os.path.join(directory, f"{label}.json"),
+                                compact=compact)
+
+    return results
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--items", type=int, default=100000,
+                    help="number of requirements and implementations")
+    options = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        results = run(directory, options.items)
+
+    for label, value in results.items():
+        print(f"{label:30} {value:10.2f} s")
+
+
+if __name__ == "__main__":
+    main()